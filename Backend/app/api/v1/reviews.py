@@ -1,7 +1,8 @@
 """FastAPI router for review endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from app.schemas.review import ReviewInviteRequest, ReviewSubmission, ReviewNFTResponse, ReviewData
 from app.services.review import send_review_invitation, submit_review, get_worker_reviews
+from app.utils.http_cache import conditional, json_etag
 from app.utils.review_token import verify_review_token
 from app.db.repositories import get_worker_by_phone
 
@@ -55,13 +56,14 @@ async def create_review(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not create review due to an internal error.")
 
 @router.get("/reviews/worker/{worker_code}", response_model=list[ReviewData])
-async def get_worker_reviews_endpoint(worker_code: str):
+async def get_worker_reviews_endpoint(worker_code: str, request: Request, response: Response):
     """
     Fetches all review NFTs for a given worker.
+    Sent with an ETag; an unchanged list is answered with 304 Not Modified.
     """
     try:
         reviews = await get_worker_reviews(worker_code)
-        return reviews
+        return conditional(request, response, json_etag(reviews)) or reviews
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
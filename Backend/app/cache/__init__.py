@@ -1 +1,40 @@
 # Cache helpers (Redis) package
+"""
+Process-wide Redis client.
+
+One ``redis.asyncio`` connection pool per process, created at startup by
+the FastAPI lifespan (or lazily on first use) and closed on shutdown,
+instead of a new client and pool for every call.
+"""
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.config import Config
+
+_async_client: Optional[aioredis.Redis] = None
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Return the shared pooled asyncio client, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            Config.REDIS_URL,
+            max_connections=Config.REDIS_MAX_CONNECTIONS,
+            socket_timeout=Config.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=Config.REDIS_SOCKET_TIMEOUT,
+            health_check_interval=30,
+        )
+    return _async_client
+
+
+async def close_async_redis() -> None:
+    """Close the client's pool (safe to call when it was never created)."""
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None:
+        await client.aclose()
+
+
+__all__ = ["get_async_redis", "close_async_redis"]
@@ -15,10 +15,21 @@ class Config:
 
     # Redis
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
 
     # ── Stellar ──────────────────────────────────────────────────
     STELLAR_NETWORK = os.getenv("STELLAR_NETWORK", "TESTNET")
     STELLAR_FUNDING_SECRET = os.getenv("STELLAR_FUNDING_SECRET", "")
+    # Optional Horizon override (e.g. a local simulator); defaults follow STELLAR_NETWORK
+    HORIZON_URL = os.getenv("HORIZON_URL", "")
+    # Horizon lookups (app/services/horizon.py): confirmed transactions and their
+    # operations never change, so they are kept in an LRU of this many entries
+    # (HORIZON_CACHE_PERSIST also stores them in SQLite, surviving restarts);
+    # the latest ledger is cached in Redis, shared by workers, for the TTL.
+    HORIZON_CACHE_MAX_ENTRIES = int(os.getenv("HORIZON_CACHE_MAX_ENTRIES", "10000"))
+    HORIZON_CACHE_PERSIST = os.getenv("HORIZON_CACHE_PERSIST", "False").lower() in ("true", "1", "yes")
+    HORIZON_LEDGER_TTL_SECONDS = float(os.getenv("HORIZON_LEDGER_TTL_SECONDS", "5"))
 
     # Platform account (the backend's own Stellar account)
     stellar_platform_public = os.getenv("STELLAR_PLATFORM_PUBLIC", "")
@@ -26,6 +37,8 @@ class Config:
 
     @property
     def stellar_horizon_url(self) -> str:
+        if self.HORIZON_URL:
+            return self.HORIZON_URL
         if self.STELLAR_NETWORK.upper() == "TESTNET":
             return "https://horizon-testnet.stellar.org"
         return "https://horizon.stellar.org"
@@ -42,15 +55,52 @@ class Config:
     # ── Africa's Talking ─────────────────────────────────────────
     AT_USERNAME = os.getenv("AT_USERNAME", "")
     AT_API_KEY = os.getenv("AT_API_KEY", "")
+    # Optional REST base URL override (e.g. a local simulator)
+    AT_API_BASE_URL = os.getenv("AT_API_BASE_URL", "")
+    # Outbox dispatch: account send quota (recipients/second) and recipients per API call
+    SMS_RATE_PER_SECOND = float(os.getenv("SMS_RATE_PER_SECOND", "10"))
+    SMS_BATCH_SIZE = int(os.getenv("SMS_BATCH_SIZE", "100"))
+    SMS_MAX_ATTEMPTS = int(os.getenv("SMS_MAX_ATTEMPTS", "5"))
+    # Payday SMS waits this long so several payments to one worker become one message
+    PAYDAY_NOTIFY_COALESCE_SECONDS = int(os.getenv("PAYDAY_NOTIFY_COALESCE_SECONDS", "300"))
+    # USSD balance snapshots: refresh delay so bursts of payments trigger one Horizon fetch
+    SNAPSHOT_COALESCE_SECONDS = int(os.getenv("SNAPSHOT_COALESCE_SECONDS", "2"))
+    # Review NFT minting: how long to gather reviews into one multi-NFT transaction
+    NFT_BATCH_WINDOW_MS = int(os.getenv("NFT_BATCH_WINDOW_MS", "200"))
+    # Review NFT index: re-read an account from Horizon once its last reconcile is this old
+    REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS = int(os.getenv("REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS", "86400"))
+    # Review certificate PDFs: in-memory render cache size (bytes)
+    PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Review certificate PDFs: render processes (0 = one per CPU)
+    PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "0"))
+    # IPFS: concurrent Pinata uploads in one pin_many batch
+    IPFS_PIN_CONCURRENCY = int(os.getenv("IPFS_PIN_CONCURRENCY", "4"))
+
+    @property
+    def at_api_base_url(self) -> str:
+        if self.AT_API_BASE_URL:
+            return self.AT_API_BASE_URL
+        if self.AT_USERNAME == "sandbox":
+            return "https://api.sandbox.africastalking.com"
+        return "https://api.africastalking.com"
 
     # ── USSD ─────────────────────────────────────────────────────
     USSD_API_KEY = os.getenv("USSD_API_KEY", "")
     USSD_SESSION_TTL = int(os.getenv("USSD_SESSION_TTL", "180"))
+    # Session store: "redis" (falls back to memory while Redis is down) or "memory"
+    USSD_SESSION_BACKEND = os.getenv("USSD_SESSION_BACKEND", "redis")
+    USSD_SESSION_MAX_ENTRIES = int(os.getenv("USSD_SESSION_MAX_ENTRIES", "100000"))
+    USSD_REDIS_RETRY_SECONDS = float(os.getenv("USSD_REDIS_RETRY_SECONDS", "30"))
 
-    # ── IPFS (Pinata) ────────────────────────────────────────────
+    # ── IPFS (Pinata or local store) ─────────────────────────────
     PINATA_API_KEY = os.getenv("PINATA_API_KEY", "")
     PINATA_SECRET_KEY = os.getenv("PINATA_SECRET_KEY", "")
     PINATA_GATEWAY = os.getenv("PINATA_GATEWAY", "https://gateway.pinata.cloud/ipfs/")
+    # Pin store: "pinata", or "local" (content-addressed files under
+    # IPFS_LOCAL_DIR, served by this API's /api/v1/ipfs/{cid} gateway)
+    IPFS_BACKEND = os.getenv("IPFS_BACKEND", "pinata")
+    IPFS_LOCAL_DIR = os.getenv("IPFS_LOCAL_DIR", "ipfs_store")
+    IPFS_LOCAL_GATEWAY = os.getenv("IPFS_LOCAL_GATEWAY", "http://localhost:5000/api/v1/ipfs/")
 
     # ── Reviews ──────────────────────────────────────────────────
     REVIEW_UNLOCK_DAYS = int(os.getenv("REVIEW_UNLOCK_DAYS", "0"))
@@ -62,6 +112,18 @@ class Config:
     INTASEND_SECRET = os.getenv("INTASEND_SECRET", "")
     INTASEND_BASE_URL = os.getenv("INTASEND_BASE_URL", "https://sandbox.intasend.com")
     KSH_TO_KES_RATE = float(os.getenv("KSH_TO_KES_RATE", "1.0"))
+    # Shared secret configured as the webhook "challenge" in the IntaSend dashboard
+    INTASEND_WEBHOOK_CHALLENGE = os.getenv("INTASEND_WEBHOOK_CHALLENGE", "")
+
+    # ── Outbound HTTP (pooled clients for integrations) ──────────
+    FRIENDBOT_URL = os.getenv("FRIENDBOT_URL", "https://friendbot.stellar.org")
+    PINATA_API_URL = os.getenv("PINATA_API_URL", "https://api.pinata.cloud")
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
 
     # ── App ──────────────────────────────────────────────────────
     SECRET_KEY = os.getenv("SECRET_KEY", "changeme")
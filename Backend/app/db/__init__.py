@@ -2,6 +2,7 @@
 import sqlite3
 import os
 from app.config import Config
+from app.utils.phone import normalize_phones
 
 _DB_PATH = Config.DB_PATH
 
@@ -15,6 +16,7 @@ CREATE TABLE IF NOT EXISTS workers (
     role TEXT NOT NULL DEFAULT 'worker',
     stellar_public_key TEXT UNIQUE NOT NULL,
     stellar_secret_encrypted TEXT NOT NULL,
+    phone_e164 TEXT,
     created_at TEXT DEFAULT (datetime('now'))
 );
 CREATE INDEX IF NOT EXISTS idx_workers_phone ON workers(phone);
@@ -35,9 +37,17 @@ CREATE TABLE IF NOT EXISTS scheduled_payments (
     FOREIGN KEY (employer_id) REFERENCES workers(worker_id),
     FOREIGN KEY (worker_id) REFERENCES workers(worker_id)
 );
-CREATE INDEX IF NOT EXISTS idx_sched_employer ON scheduled_payments(employer_id);
-CREATE INDEX IF NOT EXISTS idx_sched_worker ON scheduled_payments(worker_id);
+-- Covering indexes for review eligibility (each side's relationships by age)
+-- and the employer/worker pair probe in review_repository.has_relationship.
+-- They also serve the plain employer_id / worker_id lookups.
+DROP INDEX IF EXISTS idx_sched_employer;
+DROP INDEX IF EXISTS idx_sched_worker;
+CREATE INDEX IF NOT EXISTS idx_sched_employer_since ON scheduled_payments(employer_id, created_at, worker_id, schedule_id);
+CREATE INDEX IF NOT EXISTS idx_sched_worker_since ON scheduled_payments(worker_id, created_at, employer_id, schedule_id);
+CREATE INDEX IF NOT EXISTS idx_sched_pair ON scheduled_payments(employer_id, worker_id, created_at);
 CREATE INDEX IF NOT EXISTS idx_sched_next ON scheduled_payments(next_payment_date);
+DROP INDEX IF EXISTS idx_sched_employer_next;
+CREATE INDEX IF NOT EXISTS idx_sched_employer_created ON scheduled_payments(employer_id, created_at);
 
 CREATE TABLE IF NOT EXISTS payment_claims (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -53,8 +63,11 @@ CREATE TABLE IF NOT EXISTS payment_claims (
     FOREIGN KEY (worker_id) REFERENCES workers(worker_id),
     FOREIGN KEY (employer_id) REFERENCES workers(worker_id)
 );
-CREATE INDEX IF NOT EXISTS idx_claims_employer ON payment_claims(employer_id);
-CREATE INDEX IF NOT EXISTS idx_claims_worker ON payment_claims(worker_id);
+-- (owner, created_at) so listings page by keyset; id (the rowid) is implicit in each index.
+DROP INDEX IF EXISTS idx_claims_employer;
+DROP INDEX IF EXISTS idx_claims_worker;
+CREATE INDEX IF NOT EXISTS idx_claims_employer_created ON payment_claims(employer_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_claims_worker_created ON payment_claims(worker_id, created_at);
 
 CREATE TABLE IF NOT EXISTS reviews (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -73,28 +86,246 @@ CREATE TABLE IF NOT EXISTS reviews (
     FOREIGN KEY (reviewee_id) REFERENCES workers(worker_id),
     UNIQUE(reviewer_id, reviewee_id, schedule_id)
 );
-CREATE INDEX IF NOT EXISTS idx_reviews_reviewer ON reviews(reviewer_id);
-CREATE INDEX IF NOT EXISTS idx_reviews_reviewee ON reviews(reviewee_id);
+DROP INDEX IF EXISTS idx_reviews_reviewer;
+CREATE INDEX IF NOT EXISTS idx_reviews_reviewer_schedule ON reviews(reviewer_id, schedule_id);
+CREATE INDEX IF NOT EXISTS idx_reviews_reviewer_created ON reviews(reviewer_id, created_at);
+DROP INDEX IF EXISTS idx_reviews_reviewee;
+CREATE INDEX IF NOT EXISTS idx_reviews_reviewee_created ON reviews(reviewee_id, created_at);
+
+-- Per-user rating aggregate, maintained by review_repository.create
+CREATE TABLE IF NOT EXISTS rating_summary (
+    user_id TEXT PRIMARY KEY,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    stars_1 INTEGER NOT NULL DEFAULT 0,
+    stars_2 INTEGER NOT NULL DEFAULT 0,
+    stars_3 INTEGER NOT NULL DEFAULT 0,
+    stars_4 INTEGER NOT NULL DEFAULT 0,
+    stars_5 INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+
+-- Durable background job queue (see app/services/jobs.py)
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    dedupe_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_after TEXT NOT NULL DEFAULT (datetime('now')),
+    last_error TEXT DEFAULT '',
+    created_at TEXT DEFAULT (datetime('now')),
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, run_after);
+
+-- M-Pesa on-ramp collections (STK Push) and provider webhook events
+CREATE TABLE IF NOT EXISTS mpesa_collections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    invoice_id TEXT UNIQUE NOT NULL,
+    public_key TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    amount_kes TEXT NOT NULL,
+    amount_ksh TEXT NOT NULL,
+    provider TEXT NOT NULL DEFAULT 'intasend',
+    status TEXT NOT NULL DEFAULT 'pending',
+    stellar_tx_hash TEXT DEFAULT '',
+    credit_expires_at INTEGER DEFAULT 0,  -- time bound of the submitted credit transaction (unix)
+    message TEXT DEFAULT '',
+    created_at TEXT DEFAULT (datetime('now')),
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_collections_pk ON mpesa_collections(public_key);
+
+CREATE TABLE IF NOT EXISTS mpesa_collection_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    invoice_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    received_at TEXT DEFAULT (datetime('now')),
+    UNIQUE(invoice_id, state)
+);
+
+-- Off-ramp payouts: KSH burned on Stellar, KES sent via M-Pesa B2C.
+-- 'failed' rows were burned but not paid out and need support follow-up.
+CREATE TABLE IF NOT EXISTS offramp_payouts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    public_key TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    amount_ksh TEXT NOT NULL,
+    stellar_tx_hash TEXT NOT NULL,
+    mpesa_transaction_id TEXT DEFAULT '',
+    status TEXT NOT NULL,  -- completed | pending | failed
+    message TEXT DEFAULT '',
+    created_at TEXT DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_offramp_payouts_status ON offramp_payouts(status, created_at);
+
+-- Outgoing SMS (see app/services/sms_outbox.py)
+CREATE TABLE IF NOT EXISTS sms_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient TEXT NOT NULL,
+    message TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    next_attempt_at TEXT NOT NULL DEFAULT (datetime('now')),
+    provider_message_id TEXT DEFAULT '',
+    provider_status TEXT DEFAULT '',
+    cost TEXT DEFAULT '',
+    last_error TEXT DEFAULT '',
+    created_at TEXT DEFAULT (datetime('now')),
+    updated_at TEXT DEFAULT (datetime('now')),
+    sent_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sms_outbox_ready ON sms_outbox(status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_sms_outbox_provider_id ON sms_outbox(provider_message_id);
+
+-- Payday SMS coalescing: one row per worker per pay date (see app/services/notifications.py)
+CREATE TABLE IF NOT EXISTS payday_notifications (
+    worker_id TEXT NOT NULL,
+    pay_date TEXT NOT NULL,
+    total_amount TEXT NOT NULL DEFAULT '0',
+    pending_amount TEXT NOT NULL DEFAULT '0',
+    pending_payments INTEGER NOT NULL DEFAULT 0,
+    pending_employers TEXT NOT NULL DEFAULT '',
+    notifications_sent INTEGER NOT NULL DEFAULT 0,
+    last_notified_at TEXT,
+    updated_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (worker_id, pay_date)
+);
+
+CREATE TABLE IF NOT EXISTS account_snapshots (
+    worker_id TEXT PRIMARY KEY,
+    balance TEXT,
+    recent_payments TEXT NOT NULL DEFAULT '[]',
+    pending_claims INTEGER NOT NULL DEFAULT 0,
+    generation INTEGER NOT NULL DEFAULT 0,
+    refreshes INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TEXT,
+    updated_at TEXT DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS review_nfts (
+    asset_code TEXT NOT NULL,
+    issuer_public_key TEXT NOT NULL,
+    reviewee_public_key TEXT NOT NULL,
+    review_id TEXT,
+    rating INTEGER NOT NULL DEFAULT 0,
+    role TEXT NOT NULL DEFAULT '',
+    reviewer_type TEXT NOT NULL DEFAULT '',
+    duration TEXT NOT NULL DEFAULT '0',
+    pdf_cid TEXT NOT NULL DEFAULT '',
+    stellar_tx_hash TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'claimable',
+    created_at TEXT DEFAULT (datetime('now')),
+    updated_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (asset_code, issuer_public_key)
+);
+CREATE INDEX IF NOT EXISTS idx_review_nfts_reviewee ON review_nfts(reviewee_public_key, created_at);
+CREATE INDEX IF NOT EXISTS idx_review_nfts_issuer ON review_nfts(issuer_public_key);
+
+-- Last Horizon reconcile of each account's review NFTs (unix seconds)
+CREATE TABLE IF NOT EXISTS review_nft_reconciles (
+    public_key TEXT PRIMARY KEY,
+    reconciled_at INTEGER NOT NULL
+);
+
+-- Content already pinned to IPFS, keyed by pin store and the locally computed CID
+CREATE TABLE IF NOT EXISTS ipfs_pins (
+    content_cid TEXT NOT NULL,
+    backend TEXT NOT NULL DEFAULT 'pinata',
+    cid TEXT NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    pinned_at TEXT DEFAULT (datetime('now')),
+    PRIMARY KEY (content_cid, backend)
+);
+
+-- Confirmed Horizon responses (transactions, their operations); these never change
+CREATE TABLE IF NOT EXISTS horizon_cache (
+    cache_key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    cached_at TEXT DEFAULT (datetime('now'))
+);
 """
 
 _initialised = False
 
 
+def _migrate_phone_e164(conn: sqlite3.Connection):
+    """Add and backfill ``workers.phone_e164``, then enforce it with a unique index.
+
+    Rows whose number normalizes to one already taken (e.g. ``0712…`` and
+    ``254712…`` registered separately) keep ``phone_e164`` NULL so the index
+    can be built; the oldest row owns the number.
+    """
+    try:
+        conn.execute("ALTER TABLE workers ADD COLUMN phone_e164 TEXT")
+    except Exception:
+        pass  # column already exists
+    rows = conn.execute(
+        "SELECT id, phone FROM workers WHERE phone_e164 IS NULL ORDER BY id"
+    ).fetchall()
+    if rows:
+        taken = {r[0] for r in conn.execute("SELECT phone_e164 FROM workers WHERE phone_e164 IS NOT NULL")}
+        updates = []
+        for (row_id, _), msisdn in zip(rows, normalize_phones(r[1] for r in rows)):
+            e164 = "+" + msisdn
+            if e164 not in taken:
+                taken.add(e164)
+                updates.append((e164, row_id))
+        conn.executemany("UPDATE workers SET phone_e164 = ? WHERE id = ?", updates)
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_workers_phone_e164 ON workers(phone_e164)")
+    conn.commit()
+
+
+def rebuild_rating_summary(conn: sqlite3.Connection) -> int:
+    """Recompute ``rating_summary`` from the ``reviews`` table; returns the number of users."""
+    conn.execute("DELETE FROM rating_summary")
+    conn.execute(
+        """INSERT INTO rating_summary
+               (user_id, review_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5)
+           SELECT reviewee_id, COUNT(*), SUM(rating),
+                  SUM(rating = 1), SUM(rating = 2), SUM(rating = 3), SUM(rating = 4), SUM(rating = 5)
+           FROM reviews GROUP BY reviewee_id"""
+    )
+    count = conn.execute("SELECT COUNT(*) FROM rating_summary").fetchone()[0]
+    conn.commit()
+    return count
+
+
+def _migrate_rating_summary(conn: sqlite3.Connection):
+    """Fill ``rating_summary`` once for databases that had reviews before it existed."""
+    has_summary = conn.execute("SELECT 1 FROM rating_summary LIMIT 1").fetchone()
+    has_reviews = conn.execute("SELECT 1 FROM reviews LIMIT 1").fetchone()
+    if has_reviews and not has_summary:
+        rebuild_rating_summary(conn)
+
+
 def _ensure_schema(conn: sqlite3.Connection):
     """Create tables if they don't exist yet."""
     global _initialised
     if not _initialised:
         conn.executescript(_SCHEMA)
         # Migrations: add columns that may be missing on existing tables
-        for col, default in [
-            ("stellar_tx_hash", "''"),
-            ("explorer_url", "''"),
-            ("nft_asset_code", "''"),
+        for table, col, decl in [
+            ("reviews", "stellar_tx_hash", "TEXT DEFAULT ''"),
+            ("reviews", "explorer_url", "TEXT DEFAULT ''"),
+            ("reviews", "nft_asset_code", "TEXT DEFAULT ''"),
+            ("reviews", "nft_status", "TEXT DEFAULT ''"),
+            ("reviews", "nft_mint_tx_hash", "TEXT DEFAULT ''"),
+            ("reviews", "nft_mint_issuer", "TEXT DEFAULT ''"),
+            ("reviews", "nft_mint_expires_at", "INTEGER DEFAULT 0"),
+            ("mpesa_collections", "credit_expires_at", "INTEGER DEFAULT 0"),
         ]:
             try:
-                conn.execute(f"ALTER TABLE reviews ADD COLUMN {col} TEXT DEFAULT {default}")
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} {decl}")
             except Exception:
                 pass  # column already exists
+        _migrate_phone_e164(conn)
+        _migrate_rating_summary(conn)
         _initialised = True
 
 
@@ -8,6 +8,15 @@ from .worker_repository import (
 from . import schedule_repository
 from . import claim_repository
 from . import review_repository
+from . import job_repository
+from . import collection_repository
+from . import offramp_payout_repository
+from . import sms_outbox_repository
+from . import payday_notification_repository
+from . import account_snapshot_repository
+from . import review_nft_repository
+from . import ipfs_pin_repository
+from . import horizon_cache_repository
 
 __all__ = [
     "create_worker",
@@ -17,4 +26,13 @@ __all__ = [
     "schedule_repository",
     "claim_repository",
     "review_repository",
+    "job_repository",
+    "collection_repository",
+    "offramp_payout_repository",
+    "sms_outbox_repository",
+    "payday_notification_repository",
+    "account_snapshot_repository",
+    "review_nft_repository",
+    "ipfs_pin_repository",
+    "horizon_cache_repository",
 ]
@@ -0,0 +1,87 @@
+"""Account snapshot repository – SQLite (precomputed USSD balance / mini-statement)."""
+import json
+from app.db import get_connection
+
+_COLS = (
+    "worker_id, balance, recent_payments, pending_claims, generation, refreshes, "
+    "refreshed_at, updated_at"
+)
+
+
+def _row(row) -> dict | None:
+    if row is None:
+        return None
+    data = dict(row)
+    data["recent_payments"] = json.loads(data["recent_payments"] or "[]")
+    return data
+
+
+def mark_stale(worker_id: str) -> dict:
+    """
+    Record that the worker's balance/payments/claims changed.
+
+    Bumps ``generation`` and returns the row; ``refreshes`` tells the caller
+    which refresh round the change belongs to.
+    """
+    conn = get_connection()
+    try:
+        conn.execute(
+            """INSERT INTO account_snapshots (worker_id, generation) VALUES (?, 1)
+               ON CONFLICT(worker_id) DO UPDATE
+               SET generation = generation + 1, updated_at = datetime('now')""",
+            (worker_id,),
+        )
+        conn.commit()
+        row = conn.execute(
+            f"SELECT {_COLS} FROM account_snapshots WHERE worker_id = ?", (worker_id,)
+        ).fetchone()
+        return _row(row)
+    finally:
+        conn.close()
+
+
+def save(
+    worker_id: str,
+    balance: str,
+    recent_payments: list,
+    pending_claims: int,
+    generation: int,
+) -> bool:
+    """
+    Store a freshly computed snapshot and close the current refresh round.
+
+    *generation* is the value read before the data was fetched; returns
+    False when another change arrived meanwhile (the caller should refresh
+    again).
+    """
+    conn = get_connection()
+    try:
+        conn.execute(
+            """INSERT INTO account_snapshots
+                   (worker_id, balance, recent_payments, pending_claims, refreshes, refreshed_at)
+               VALUES (?, ?, ?, ?, 1, datetime('now'))
+               ON CONFLICT(worker_id) DO UPDATE
+               SET balance = excluded.balance, recent_payments = excluded.recent_payments,
+                   pending_claims = excluded.pending_claims, refreshes = refreshes + 1,
+                   refreshed_at = datetime('now'), updated_at = datetime('now')""",
+            (worker_id, balance, json.dumps(recent_payments, separators=(",", ":")), pending_claims),
+        )
+        conn.commit()
+        row = conn.execute(
+            "SELECT generation FROM account_snapshots WHERE worker_id = ?", (worker_id,)
+        ).fetchone()
+        return row["generation"] == generation
+    finally:
+        conn.close()
+
+
+def get(worker_id: str) -> dict | None:
+    """Get the snapshot for a worker (``recent_payments`` decoded)."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            f"SELECT {_COLS} FROM account_snapshots WHERE worker_id = ?", (worker_id,)
+        ).fetchone()
+        return _row(row)
+    finally:
+        conn.close()
@@ -1,6 +1,7 @@
 """Payment claims repository – SQLite."""
 import uuid
 from app.db import get_connection
+from app.utils.pagination import keyset_clause
 
 _COLS = "id, claim_id, schedule_id, worker_id, employer_id, amount, message, status, created_at"
 
@@ -36,30 +37,30 @@ def create(
         conn.close()
 
 
-def get_by_employer(employer_id: str) -> list[dict]:
-    """Get all claims addressed to an employer."""
+def _list_by(owner_column: str, owner_id: str, limit: int | None, after: list | None) -> list[dict]:
+    """Claims for one owner, newest first, optionally one keyset page (see app.utils.pagination)."""
+    where, params = keyset_clause(("created_at", "id"), after)
     conn = get_connection()
     try:
         rows = conn.execute(
-            f"SELECT {_COLS} FROM payment_claims WHERE employer_id = ? ORDER BY created_at DESC",
-            (employer_id,),
+            f"""SELECT {_COLS} FROM payment_claims WHERE {owner_column} = ?{where}
+                ORDER BY created_at DESC, id DESC
+                {"LIMIT ?" if limit is not None else ""}""",
+            [owner_id, *params] + ([limit] if limit is not None else []),
         ).fetchall()
         return [dict(r) for r in rows]
     finally:
         conn.close()
 
 
-def get_by_worker(worker_id: str) -> list[dict]:
-    """Get all claims submitted by a worker."""
-    conn = get_connection()
-    try:
-        rows = conn.execute(
-            f"SELECT {_COLS} FROM payment_claims WHERE worker_id = ? ORDER BY created_at DESC",
-            (worker_id,),
-        ).fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
+def get_by_employer(employer_id: str, limit: int | None = None, after: list | None = None) -> list[dict]:
+    """Get claims addressed to an employer, newest first (all of them unless *limit* is given)."""
+    return _list_by("employer_id", employer_id, limit, after)
+
+
+def get_by_worker(worker_id: str, limit: int | None = None, after: list | None = None) -> list[dict]:
+    """Get claims submitted by a worker, newest first (all of them unless *limit* is given)."""
+    return _list_by("worker_id", worker_id, limit, after)
 
 
 def update_status(claim_id: str, status: str) -> dict | None:
@@ -0,0 +1,96 @@
+"""M-Pesa on-ramp collections repository – SQLite."""
+from app.db import get_connection
+
+_COLS = "id, invoice_id, public_key, phone, amount_kes, amount_ksh, provider, status, stellar_tx_hash, credit_expires_at, message, created_at, updated_at"
+
+
+def create(
+    invoice_id: str,
+    public_key: str,
+    phone: str,
+    amount_kes: str,
+    amount_ksh: str,
+    provider: str = "intasend",
+    status: str = "pending",
+    message: str = "",
+) -> dict:
+    """Record a new collection (STK Push) awaiting confirmation or crediting."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            """INSERT INTO mpesa_collections
+               (invoice_id, public_key, phone, amount_kes, amount_ksh, provider, status, message)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (invoice_id, public_key, phone, amount_kes, amount_ksh, provider, status, message),
+        )
+        conn.commit()
+        row = conn.execute(
+            f"SELECT {_COLS} FROM mpesa_collections WHERE invoice_id = ?",
+            (invoice_id,),
+        ).fetchone()
+        return dict(row)
+    finally:
+        conn.close()
+
+
+def get_by_invoice(invoice_id: str) -> dict | None:
+    """Get a collection by its provider invoice ID."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            f"SELECT {_COLS} FROM mpesa_collections WHERE invoice_id = ?",
+            (invoice_id,),
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def record_event(invoice_id: str, state: str, payload: str) -> bool:
+    """
+    Store a provider webhook event.
+
+    Returns False when the same (invoice_id, state) was already recorded,
+    i.e. the provider is replaying a delivery.
+    """
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            """INSERT OR IGNORE INTO mpesa_collection_events (invoice_id, state, payload)
+               VALUES (?, ?, ?)""",
+            (invoice_id, state, payload),
+        )
+        conn.commit()
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+
+def transition(invoice_id: str, from_status: str, to_status: str, **fields) -> bool:
+    """
+    Compare-and-set the collection status.
+
+    Only succeeds when the row is currently in *from_status*, which is what
+    guarantees a collection is credited at most once. Extra keyword
+    arguments (``stellar_tx_hash``, ``credit_expires_at``, ``message``) are
+    written in the same statement.
+    """
+    allowed = {"stellar_tx_hash", "credit_expires_at", "message"}
+    sets = ["status = ?", "updated_at = datetime('now')"]
+    params: list = [to_status]
+    for key, value in fields.items():
+        if key not in allowed:
+            raise ValueError(f"Unknown collection field '{key}'")
+        sets.append(f"{key} = ?")
+        params.append(value)
+    params.extend([invoice_id, from_status])
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            f"UPDATE mpesa_collections SET {', '.join(sets)} WHERE invoice_id = ? AND status = ?",
+            params,
+        )
+        conn.commit()
+        return cur.rowcount == 1
+    finally:
+        conn.close()
@@ -0,0 +1,31 @@
+"""Horizon response cache repository – SQLite (confirmed transactions / operations)."""
+import json
+from typing import Any
+
+from app.db import get_connection
+
+
+def get(cache_key: str) -> Any | None:
+    """Get the cached payload for *cache_key* (e.g. ``tx:<hash>``), or None."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT payload FROM horizon_cache WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+        return json.loads(row["payload"]) if row else None
+    finally:
+        conn.close()
+
+
+def put(cache_key: str, payload: Any) -> None:
+    """Store a payload; confirmed data never changes, so an existing entry is kept."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            "INSERT OR IGNORE INTO horizon_cache (cache_key, payload) VALUES (?, ?)",
+            (cache_key, json.dumps(payload, separators=(",", ":"))),
+        )
+        conn.commit()
+    finally:
+        conn.close()
@@ -0,0 +1,30 @@
+"""IPFS pin index repository – SQLite (content already pinned, by pin store and local CID)."""
+from app.db import get_connection
+
+_COLS = "content_cid, backend, cid, size, pinned_at"
+
+
+def get(content_cid: str, backend: str = "pinata") -> dict | None:
+    """Get the pin in *backend* for content whose locally computed CID is *content_cid*."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            f"SELECT {_COLS} FROM ipfs_pins WHERE content_cid = ? AND backend = ?",
+            (content_cid, backend),
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def record(content_cid: str, cid: str, size: int, backend: str = "pinata") -> None:
+    """Record that the content was pinned in *backend* (as *cid* on that store)."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO ipfs_pins (content_cid, backend, cid, size) VALUES (?, ?, ?, ?)",
+            (content_cid, backend, cid, size),
+        )
+        conn.commit()
+    finally:
+        conn.close()
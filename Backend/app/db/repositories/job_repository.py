@@ -0,0 +1,165 @@
+"""Background job queue repository – SQLite."""
+import json
+from datetime import datetime, timedelta
+from app.db import get_connection
+
+_COLS = "id, kind, payload, dedupe_key, status, attempts, max_attempts, run_after, last_error, created_at, updated_at"
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _ts(delay_seconds: float = 0) -> str:
+    return (datetime.utcnow() + timedelta(seconds=delay_seconds)).strftime(_TS_FORMAT)
+
+
+def _row_to_job(row) -> dict:
+    job = dict(row)
+    try:
+        job["payload"] = json.loads(job["payload"] or "{}")
+    except (json.JSONDecodeError, TypeError):
+        job["payload"] = {}
+    return job
+
+
+def enqueue(
+    kind: str,
+    payload: dict,
+    dedupe_key: str | None = None,
+    delay_seconds: float = 0,
+    max_attempts: int = 5,
+) -> int | None:
+    """
+    Insert a queued job.
+
+    When *dedupe_key* is given and a job with the same key already exists
+    the insert is ignored and ``None`` is returned.
+    """
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            """INSERT OR IGNORE INTO jobs (kind, payload, dedupe_key, max_attempts, run_after)
+               VALUES (?, ?, ?, ?, ?)""",
+            (kind, json.dumps(payload), dedupe_key, max_attempts, _ts(delay_seconds)),
+        )
+        conn.commit()
+        return cur.lastrowid if cur.rowcount else None
+    finally:
+        conn.close()
+
+
+def claim(limit: int = 20, kinds: list[str] | None = None) -> list[dict]:
+    """
+    Atomically move up to *limit* ready jobs to ``running`` and return them.
+
+    Uses ``BEGIN IMMEDIATE`` so two workers sharing the database never
+    claim the same job.
+    """
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        params: list = [_ts()]
+        kind_filter = ""
+        if kinds:
+            kind_filter = f" AND kind IN ({', '.join('?' for _ in kinds)})"
+            params.extend(kinds)
+        params.append(limit)
+        rows = conn.execute(
+            f"""SELECT {_COLS} FROM jobs
+                WHERE status = 'queued' AND run_after <= ?{kind_filter}
+                ORDER BY run_after, id LIMIT ?""",
+            params,
+        ).fetchall()
+        ids = [r["id"] for r in rows]
+        if ids:
+            conn.execute(
+                f"""UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                       updated_at = datetime('now')
+                    WHERE id IN ({', '.join('?' for _ in ids)})""",
+                ids,
+            )
+        conn.commit()
+        jobs = [_row_to_job(r) for r in rows]
+        for job in jobs:
+            job["attempts"] += 1
+            job["status"] = "running"
+        return jobs
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def complete(job_id: int) -> None:
+    """Mark a job as done."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            "UPDATE jobs SET status = 'done', last_error = '', updated_at = datetime('now') WHERE id = ?",
+            (job_id,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def fail(job_id: int, error: str, retry_in_seconds: float | None) -> None:
+    """Record a failure; requeue after *retry_in_seconds* or mark permanently failed when None."""
+    conn = get_connection()
+    try:
+        if retry_in_seconds is None:
+            conn.execute(
+                """UPDATE jobs SET status = 'failed', last_error = ?, updated_at = datetime('now')
+                   WHERE id = ?""",
+                (error[:500], job_id),
+            )
+        else:
+            conn.execute(
+                """UPDATE jobs SET status = 'queued', last_error = ?, run_after = ?,
+                       updated_at = datetime('now')
+                   WHERE id = ?""",
+                (error[:500], _ts(retry_in_seconds), job_id),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def defer(job_id: int, reason: str, delay_seconds: float) -> None:
+    """Requeue a job after *delay_seconds* without counting the attempt it just used."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            """UPDATE jobs SET status = 'queued', attempts = MAX(attempts - 1, 0), last_error = ?,
+                   run_after = ?, updated_at = datetime('now')
+               WHERE id = ?""",
+            (reason[:500], _ts(delay_seconds), job_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def requeue_stale(older_than_seconds: float = 300) -> int:
+    """Return jobs stuck in ``running`` (e.g. after a crash) to the queue."""
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            """UPDATE jobs SET status = 'queued', updated_at = datetime('now')
+               WHERE status = 'running' AND updated_at <= ?""",
+            (_ts(-older_than_seconds),),
+        )
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def get_by_id(job_id: int) -> dict | None:
+    """Get a single job by its ID."""
+    conn = get_connection()
+    try:
+        row = conn.execute(f"SELECT {_COLS} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+    finally:
+        conn.close()
@@ -0,0 +1,44 @@
+"""Off-ramp payout repository – SQLite (B2C payouts after a Stellar burn)."""
+from app.db import get_connection
+
+_COLS = "id, public_key, phone, amount_ksh, stellar_tx_hash, mpesa_transaction_id, status, message, created_at"
+
+
+def create(
+    public_key: str,
+    phone: str,
+    amount_ksh: str,
+    stellar_tx_hash: str,
+    status: str,
+    mpesa_transaction_id: str = "",
+    message: str = "",
+) -> dict:
+    """Record the outcome of an off-ramp payout."""
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            """INSERT INTO offramp_payouts
+               (public_key, phone, amount_ksh, stellar_tx_hash, mpesa_transaction_id, status, message)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (public_key, phone, amount_ksh, stellar_tx_hash, mpesa_transaction_id, status, message),
+        )
+        conn.commit()
+        row = conn.execute(
+            f"SELECT {_COLS} FROM offramp_payouts WHERE id = ?", (cur.lastrowid,)
+        ).fetchone()
+        return dict(row)
+    finally:
+        conn.close()
+
+
+def get_by_status(status: str, limit: int = 100) -> list[dict]:
+    """Payouts in *status*, oldest first (``failed`` is the support follow-up queue)."""
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            f"SELECT {_COLS} FROM offramp_payouts WHERE status = ? ORDER BY created_at, id LIMIT ?",
+            (status, limit),
+        ).fetchall()
+        return [dict(r) for r in rows]
+    finally:
+        conn.close()
@@ -0,0 +1,106 @@
+"""Payday notification coalescing repository – SQLite."""
+from decimal import Decimal
+from app.db import get_connection
+
+_COLS = (
+    "worker_id, pay_date, total_amount, pending_amount, pending_payments, pending_employers, "
+    "notifications_sent, last_notified_at, updated_at"
+)
+
+
+def record_payment(worker_id: str, pay_date: str, amount: str, employer_id: str) -> dict:
+    """
+    Add one successful payment to the worker's row for *pay_date*.
+
+    Returns the updated row; ``notifications_sent`` tells the caller which
+    notification round the pending amount belongs to.
+    """
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            f"SELECT {_COLS} FROM payday_notifications WHERE worker_id = ? AND pay_date = ?",
+            (worker_id, pay_date),
+        ).fetchone()
+        if row is None:
+            conn.execute(
+                """INSERT INTO payday_notifications
+                   (worker_id, pay_date, total_amount, pending_amount, pending_payments, pending_employers)
+                   VALUES (?, ?, ?, ?, 1, ?)""",
+                (worker_id, pay_date, amount, amount, employer_id),
+            )
+        else:
+            employers = [e for e in row["pending_employers"].split(",") if e]
+            if employer_id not in employers:
+                employers.append(employer_id)
+            conn.execute(
+                """UPDATE payday_notifications
+                   SET total_amount = ?, pending_amount = ?, pending_payments = pending_payments + 1,
+                       pending_employers = ?, updated_at = datetime('now')
+                   WHERE worker_id = ? AND pay_date = ?""",
+                (
+                    str(Decimal(row["total_amount"]) + Decimal(amount)),
+                    str(Decimal(row["pending_amount"]) + Decimal(amount)),
+                    ",".join(employers),
+                    worker_id,
+                    pay_date,
+                ),
+            )
+        conn.commit()
+        row = conn.execute(
+            f"SELECT {_COLS} FROM payday_notifications WHERE worker_id = ? AND pay_date = ?",
+            (worker_id, pay_date),
+        ).fetchone()
+        return dict(row)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def take_pending(worker_id: str, pay_date: str) -> dict | None:
+    """
+    Atomically read and clear the pending totals for a notification round.
+
+    Returns the row as it was before clearing, or None when nothing is
+    pending (already notified).
+    """
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            f"SELECT {_COLS} FROM payday_notifications WHERE worker_id = ? AND pay_date = ?",
+            (worker_id, pay_date),
+        ).fetchone()
+        if row is None or row["pending_payments"] == 0:
+            conn.commit()
+            return None
+        conn.execute(
+            """UPDATE payday_notifications
+               SET pending_amount = '0', pending_payments = 0, pending_employers = '',
+                   notifications_sent = notifications_sent + 1,
+                   last_notified_at = datetime('now'), updated_at = datetime('now')
+               WHERE worker_id = ? AND pay_date = ?""",
+            (worker_id, pay_date),
+        )
+        conn.commit()
+        return dict(row)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get(worker_id: str, pay_date: str) -> dict | None:
+    """Get the notification row for a worker and pay date."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            f"SELECT {_COLS} FROM payday_notifications WHERE worker_id = ? AND pay_date = ?",
+            (worker_id, pay_date),
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
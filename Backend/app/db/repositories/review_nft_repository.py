@@ -0,0 +1,110 @@
+"""Review NFT index repository – SQLite (local copy of immutable on-chain review metadata)."""
+from app.db import get_connection
+
+_COLS = (
+    "asset_code, issuer_public_key, reviewee_public_key, review_id, rating, role, reviewer_type, "
+    "duration, pdf_cid, stellar_tx_hash, status, created_at, updated_at"
+)
+
+# Metadata is immutable on-chain, so an upsert only fills gaps (review_id,
+# tx hash) and tracks the claimable -> owned status change.
+_UPSERT = """
+INSERT INTO review_nfts
+    (asset_code, issuer_public_key, reviewee_public_key, review_id, rating, role, reviewer_type,
+     duration, pdf_cid, stellar_tx_hash, status)
+VALUES (:asset_code, :issuer_public_key, :reviewee_public_key, :review_id, :rating, :role,
+        :reviewer_type, :duration, :pdf_cid, :stellar_tx_hash, :status)
+ON CONFLICT(asset_code, issuer_public_key) DO UPDATE SET
+    review_id = COALESCE(review_nfts.review_id, excluded.review_id),
+    stellar_tx_hash = CASE WHEN review_nfts.stellar_tx_hash = '' THEN excluded.stellar_tx_hash
+                           ELSE review_nfts.stellar_tx_hash END,
+    status = excluded.status,
+    updated_at = datetime('now')
+"""
+
+
+def _params(record: dict) -> dict:
+    return {
+        "asset_code": record["asset_code"],
+        "issuer_public_key": record["issuer_public_key"],
+        "reviewee_public_key": record["reviewee_public_key"],
+        "review_id": record.get("review_id"),
+        "rating": int(record.get("rating") or 0),
+        "role": record.get("role") or "",
+        "reviewer_type": record.get("reviewer_type") or "",
+        "duration": str(record.get("duration") or "0"),
+        "pdf_cid": record.get("pdf_cid") or "",
+        "stellar_tx_hash": record.get("stellar_tx_hash") or "",
+        "status": record.get("status") or "claimable",
+    }
+
+
+def upsert_many(records: list[dict]) -> int:
+    """Insert or refresh review NFT rows; returns the number of records written."""
+    if not records:
+        return 0
+    conn = get_connection()
+    try:
+        conn.executemany(_UPSERT, [_params(r) for r in records])
+        conn.commit()
+        return len(records)
+    finally:
+        conn.close()
+
+
+def upsert(record: dict) -> None:
+    """Insert or refresh one review NFT row."""
+    upsert_many([record])
+
+
+def get_for_reviewee(reviewee_public_key: str) -> list[dict]:
+    """All indexed review NFTs for a reviewee, newest first."""
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            f"""SELECT {_COLS} FROM review_nfts WHERE reviewee_public_key = ?
+                ORDER BY created_at DESC""",
+            (reviewee_public_key,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+    finally:
+        conn.close()
+
+
+def get_by_asset(asset_code: str, issuer_public_key: str) -> dict | None:
+    """Get one review NFT by asset code and issuer."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            f"SELECT {_COLS} FROM review_nfts WHERE asset_code = ? AND issuer_public_key = ?",
+            (asset_code, issuer_public_key),
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def mark_reconciled(public_key: str, reconciled_at: int) -> None:
+    """Record when *public_key*'s review NFTs were last reconciled with Horizon."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            """INSERT INTO review_nft_reconciles (public_key, reconciled_at) VALUES (?, ?)
+               ON CONFLICT(public_key) DO UPDATE SET reconciled_at = excluded.reconciled_at""",
+            (public_key, reconciled_at),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_reconciled_at(public_key: str) -> int | None:
+    """Unix time of *public_key*'s last Horizon reconcile, or None if it never ran."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT reconciled_at FROM review_nft_reconciles WHERE public_key = ?", (public_key,)
+        ).fetchone()
+        return row["reconciled_at"] if row else None
+    finally:
+        conn.close()
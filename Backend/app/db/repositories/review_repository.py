@@ -1,12 +1,55 @@
 """Reviews repository – SQLite."""
 import uuid
 from datetime import datetime, timedelta
-from app.db import get_connection
+from app.db import get_connection, rebuild_rating_summary as _rebuild_rating_summary
+from app.utils.pagination import keyset_clause
 
-_COLS = "id, review_id, reviewer_id, reviewee_id, reviewer_role, rating, comment, schedule_id, stellar_tx_hash, explorer_url, nft_asset_code, created_at"
+_COLS = "id, review_id, reviewer_id, reviewee_id, reviewer_role, rating, comment, schedule_id, stellar_tx_hash, explorer_url, nft_asset_code, nft_status, created_at"
+
+_SUMMARY_COLS = "user_id, review_count, rating_sum, stars_1, stars_2, stars_3, stars_4, stars_5"
+
+_JOIN_COLS = ", ".join(f"r.{col.strip()}" for col in _COLS.split(","))
 
 REVIEW_ELIGIBILITY_DAYS = 0  # TODO: restore to 90 (3 months) after demo
 
+# One row per schedule (schedule_id is unique, so no DISTINCT).  The range on
+# created_at and the selected columns are covered by idx_sched_*_since and the
+# anti-join probes idx_reviews_reviewer_schedule once per candidate schedule.
+_ELIGIBLE_SQL = """
+SELECT sp.{other}_id AS reviewee_id,
+       sp.schedule_id,
+       sp.created_at AS relationship_since,
+       w.name AS reviewee_name,
+       w.role AS reviewee_role
+FROM scheduled_payments sp
+JOIN workers w ON w.worker_id = sp.{other}_id
+WHERE sp.{side}_id = ?
+  AND sp.created_at <= ?
+  AND NOT EXISTS (
+      SELECT 1 FROM reviews r
+      WHERE r.reviewer_id = ? AND r.schedule_id = sp.schedule_id
+  )
+"""
+ELIGIBLE_REVIEWEES_SQL = {
+    # Employer reviews workers they have scheduled payments for
+    "employer": _ELIGIBLE_SQL.format(side="employer", other="worker"),
+    # Worker reviews employers who pay them
+    "worker": _ELIGIBLE_SQL.format(side="worker", other="employer"),
+}
+
+# Two seeks on idx_sched_pair (one per direction) instead of an OR that
+# cannot use a single index; EXISTS stops at the first match.
+HAS_RELATIONSHIP_SQL = """
+SELECT EXISTS (
+           SELECT 1 FROM scheduled_payments
+           WHERE employer_id = ? AND worker_id = ? AND created_at <= ?
+       )
+    OR EXISTS (
+           SELECT 1 FROM scheduled_payments
+           WHERE employer_id = ? AND worker_id = ? AND created_at <= ?
+       ) AS related
+"""
+
 
 def _generate_review_id() -> str:
     return "RV-" + uuid.uuid4().hex[:8].upper()
@@ -25,48 +68,10 @@ def get_eligible_reviewees(user_id: str, user_role: str) -> list[dict]:
     cutoff = (datetime.utcnow() - timedelta(days=REVIEW_ELIGIBILITY_DAYS)).strftime(
         "%Y-%m-%d %H:%M:%S"
     )
+    sql = ELIGIBLE_REVIEWEES_SQL["employer" if user_role == "employer" else "worker"]
     conn = get_connection()
     try:
-        if user_role == "employer":
-            # Employer reviews workers they have scheduled payments for
-            rows = conn.execute(
-                """
-                SELECT DISTINCT sp.worker_id AS reviewee_id,
-                       sp.schedule_id,
-                       sp.created_at AS relationship_since,
-                       w.name AS reviewee_name,
-                       w.role AS reviewee_role
-                FROM scheduled_payments sp
-                JOIN workers w ON w.worker_id = sp.worker_id
-                WHERE sp.employer_id = ?
-                  AND sp.created_at <= ?
-                  AND sp.schedule_id NOT IN (
-                      SELECT r.schedule_id FROM reviews r
-                      WHERE r.reviewer_id = ? AND r.schedule_id IS NOT NULL
-                  )
-                """,
-                (user_id, cutoff, user_id),
-            ).fetchall()
-        else:
-            # Worker reviews employers who pay them
-            rows = conn.execute(
-                """
-                SELECT DISTINCT sp.employer_id AS reviewee_id,
-                       sp.schedule_id,
-                       sp.created_at AS relationship_since,
-                       w.name AS reviewee_name,
-                       w.role AS reviewee_role
-                FROM scheduled_payments sp
-                JOIN workers w ON w.worker_id = sp.employer_id
-                WHERE sp.worker_id = ?
-                  AND sp.created_at <= ?
-                  AND sp.schedule_id NOT IN (
-                      SELECT r.schedule_id FROM reviews r
-                      WHERE r.reviewer_id = ? AND r.schedule_id IS NOT NULL
-                  )
-                """,
-                (user_id, cutoff, user_id),
-            ).fetchall()
+        rows = conn.execute(sql, (user_id, cutoff, user_id)).fetchall()
         return [dict(r) for r in rows]
     finally:
         conn.close()
@@ -80,16 +85,28 @@ def create(
     comment: str = "",
     schedule_id: str | None = None,
 ) -> dict:
-    """Create a new review after validating the 3-month eligibility."""
+    """Create a new review and fold its rating into the reviewee's ``rating_summary`` row."""
     review_id = _generate_review_id()
+    star = int(rating)
     conn = get_connection()
     try:
         conn.execute(
             """INSERT INTO reviews
-               (review_id, reviewer_id, reviewee_id, reviewer_role, rating, comment, schedule_id)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+               (review_id, reviewer_id, reviewee_id, reviewer_role, rating, comment, schedule_id, nft_status)
+               VALUES (?, ?, ?, ?, ?, ?, ?, 'pending')""",
             (review_id, reviewer_id, reviewee_id, reviewer_role, rating, comment, schedule_id),
         )
+        # Same transaction as the insert: a rejected review never touches the aggregate.
+        conn.execute(
+            f"""INSERT INTO rating_summary (user_id, review_count, rating_sum, stars_{star})
+                VALUES (?, 1, ?, 1)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    review_count = review_count + 1,
+                    rating_sum = rating_sum + excluded.rating_sum,
+                    stars_{star} = stars_{star} + 1,
+                    updated_at = datetime('now')""",
+            (reviewee_id, star),
+        )
         conn.commit()
         row = conn.execute(
             f"SELECT {_COLS} FROM reviews WHERE review_id = ?",
@@ -101,11 +118,12 @@ def create(
 
 
 def update_nft_data(review_id: str, stellar_tx_hash: str, explorer_url: str, nft_asset_code: str) -> dict | None:
-    """Update a review record with Stellar NFT data after minting."""
+    """Update a review record with Stellar NFT data after minting (sets ``nft_status`` to minted)."""
     conn = get_connection()
     try:
         conn.execute(
-            "UPDATE reviews SET stellar_tx_hash = ?, explorer_url = ?, nft_asset_code = ? WHERE review_id = ?",
+            """UPDATE reviews SET stellar_tx_hash = ?, explorer_url = ?, nft_asset_code = ?, nft_status = 'minted'
+               WHERE review_id = ?""",
             (stellar_tx_hash, explorer_url, nft_asset_code, review_id),
         )
         conn.commit()
@@ -118,67 +136,146 @@ def update_nft_data(review_id: str, stellar_tx_hash: str, explorer_url: str, nft
         conn.close()
 
 
-def get_reviews_for(reviewee_id: str) -> list[dict]:
-    """Get all reviews written about a user."""
+def set_nft_status(review_id: str, nft_status: str) -> None:
+    """Set the NFT status of a review (pending/minting/minted/failed)."""
+    conn = get_connection()
+    try:
+        conn.execute("UPDATE reviews SET nft_status = ? WHERE review_id = ?", (nft_status, review_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def set_mint_attempt(review_id: str, tx_hash: str, issuer_public_key: str, expires_at: int) -> None:
+    """
+    Record a signed, not yet submitted mint transaction (sets ``nft_status``
+    to minting) so a retry can look it up before minting again.
+    """
+    conn = get_connection()
+    try:
+        conn.execute(
+            """UPDATE reviews SET nft_status = 'minting', nft_mint_tx_hash = ?, nft_mint_issuer = ?,
+                   nft_mint_expires_at = ?
+               WHERE review_id = ?""",
+            (tx_hash, issuer_public_key, expires_at, review_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_mint_attempt(review_id: str) -> dict | None:
+    """The last recorded mint transaction of a review (``tx_hash``, ``issuer_public_key``, ``expires_at``)."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            """SELECT nft_mint_tx_hash AS tx_hash, nft_mint_issuer AS issuer_public_key,
+                      nft_mint_expires_at AS expires_at
+               FROM reviews WHERE review_id = ?""",
+            (review_id,),
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def get_by_review_id(review_id: str) -> dict | None:
+    """Get a single review by review_id."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            f"SELECT {_COLS} FROM reviews WHERE review_id = ?",
+            (review_id,),
+        ).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def _list_reviews(owner: str, other: str, owner_id: str, limit: int | None, after: list | None) -> list[dict]:
+    """
+    Reviews where ``{owner}_id`` is *owner_id*, newest first, with the other
+    party's name as ``{other}_name``.  *limit* / *after* select one keyset
+    page (see app.utils.pagination).
+    """
+    where, params = keyset_clause(("r.created_at", "r.id"), after)
+    limit_sql = "LIMIT ?" if limit is not None else ""
+    params = [owner_id, *params] + ([limit] if limit is not None else [])
     conn = get_connection()
     try:
         rows = conn.execute(
-            f"""SELECT r.{_COLS.replace('id,', 'r.id,')},
-                       w.name AS reviewer_name
+            f"""SELECT {_JOIN_COLS},
+                       w.name AS {other}_name
                 FROM reviews r
-                JOIN workers w ON w.worker_id = r.reviewer_id
-                WHERE r.reviewee_id = ?
-                ORDER BY r.created_at DESC""",
-            (reviewee_id,),
+                JOIN workers w ON w.worker_id = r.{other}_id
+                WHERE r.{owner}_id = ?{where}
+                ORDER BY r.created_at DESC, r.id DESC
+                {limit_sql}""",
+            params,
         ).fetchall()
         return [dict(r) for r in rows]
     except Exception:
         # Fallback without join if workers table issues
         rows = conn.execute(
-            f"SELECT {_COLS} FROM reviews WHERE reviewee_id = ? ORDER BY created_at DESC",
-            (reviewee_id,),
+            f"""SELECT {_JOIN_COLS} FROM reviews r WHERE r.{owner}_id = ?{where}
+                ORDER BY r.created_at DESC, r.id DESC {limit_sql}""",
+            params,
         ).fetchall()
         return [dict(r) for r in rows]
     finally:
         conn.close()
 
 
-def get_reviews_by(reviewer_id: str) -> list[dict]:
-    """Get all reviews written by a user."""
+def get_reviews_for(reviewee_id: str, limit: int | None = None, after: list | None = None) -> list[dict]:
+    """Get reviews written about a user, newest first (all of them unless *limit* is given)."""
+    return _list_reviews("reviewee", "reviewer", reviewee_id, limit, after)
+
+
+def get_reviews_by(reviewer_id: str, limit: int | None = None, after: list | None = None) -> list[dict]:
+    """Get reviews written by a user, newest first (all of them unless *limit* is given)."""
+    return _list_reviews("reviewer", "reviewee", reviewer_id, limit, after)
+
+
+def _rating(row) -> dict:
+    count = row["review_count"] if row else 0
+    return {
+        "avg_rating": round(row["rating_sum"] / count, 1) if count else 0,
+        "count": count,
+        "stars": [row[f"stars_{n}"] for n in range(1, 6)] if row else [0] * 5,
+    }
+
+
+def get_ratings(user_ids: list[str]) -> dict[str, dict]:
+    """
+    Return ``{user_id: {avg_rating, count, stars}}`` for many users in one query.
+
+    ``stars`` is the 1..5 histogram; users without reviews get zeros.
+    """
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
     conn = get_connection()
     try:
         rows = conn.execute(
-            f"""SELECT r.{_COLS.replace('id,', 'r.id,')},
-                       w.name AS reviewee_name
-                FROM reviews r
-                JOIN workers w ON w.worker_id = r.reviewee_id
-                WHERE r.reviewer_id = ?
-                ORDER BY r.created_at DESC""",
-            (reviewer_id,),
-        ).fetchall()
-        return [dict(r) for r in rows]
-    except Exception:
-        rows = conn.execute(
-            f"SELECT {_COLS} FROM reviews WHERE reviewer_id = ? ORDER BY created_at DESC",
-            (reviewer_id,),
+            f"SELECT {_SUMMARY_COLS} FROM rating_summary WHERE user_id IN ({','.join('?' * len(ids))})",
+            ids,
         ).fetchall()
-        return [dict(r) for r in rows]
+        found = {r["user_id"]: r for r in rows}
+        return {user_id: _rating(found.get(user_id)) for user_id in ids}
     finally:
         conn.close()
 
 
 def get_average_rating(reviewee_id: str) -> dict:
-    """Return average rating and count for a user."""
+    """Return average rating, count and star histogram for a user."""
+    return get_ratings([reviewee_id])[reviewee_id]
+
+
+def rebuild_rating_summary() -> int:
+    """Recompute every user's rating summary from the reviews table."""
     conn = get_connection()
     try:
-        row = conn.execute(
-            "SELECT AVG(rating) as avg_rating, COUNT(*) as count FROM reviews WHERE reviewee_id = ?",
-            (reviewee_id,),
-        ).fetchone()
-        return {
-            "avg_rating": round(row["avg_rating"], 1) if row["avg_rating"] else 0,
-            "count": row["count"] or 0,
-        }
+        return _rebuild_rating_summary(conn)
     finally:
         conn.close()
 
@@ -191,11 +288,9 @@ def has_relationship(user_id: str, other_id: str) -> bool:
     conn = get_connection()
     try:
         row = conn.execute(
-            """SELECT COUNT(*) as cnt FROM scheduled_payments
-               WHERE ((employer_id = ? AND worker_id = ?) OR (employer_id = ? AND worker_id = ?))
-                 AND created_at <= ?""",
-            (user_id, other_id, other_id, user_id, cutoff),
+            HAS_RELATIONSHIP_SQL,
+            (user_id, other_id, cutoff, other_id, user_id, cutoff),
         ).fetchone()
-        return row["cnt"] > 0
+        return bool(row["related"])
     finally:
         conn.close()
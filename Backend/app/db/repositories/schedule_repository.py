@@ -2,6 +2,7 @@
 import uuid
 from datetime import datetime, timedelta
 from app.db import get_connection
+from app.utils.pagination import keyset_clause
 
 _COLS = "id, schedule_id, employer_id, worker_id, amount, frequency, next_payment_date, status, memo, created_at"
 
@@ -58,13 +59,23 @@ def create(
         conn.close()
 
 
-def get_by_employer(employer_id: str) -> list[dict]:
-    """Get all schedules created by an employer."""
+def get_by_employer(employer_id: str, limit: int | None = None, after: list | None = None) -> list[dict]:
+    """
+    Get schedules created by an employer, newest first.
+
+    With *limit*, returns one keyset page after the ``(created_at, id)`` in
+    *after* (see app.utils.pagination).  The key is immutable, unlike
+    ``next_payment_date`` which advances after every run and would move
+    schedules between pages.
+    """
+    where, params = keyset_clause(("created_at", "id"), after)
     conn = get_connection()
     try:
         rows = conn.execute(
-            f"SELECT {_COLS} FROM scheduled_payments WHERE employer_id = ? ORDER BY next_payment_date ASC",
-            (employer_id,),
+            f"""SELECT {_COLS} FROM scheduled_payments WHERE employer_id = ?{where}
+                ORDER BY created_at DESC, id DESC
+                {"LIMIT ?" if limit is not None else ""}""",
+            [employer_id, *params] + ([limit] if limit is not None else []),
         ).fetchall()
         return [dict(r) for r in rows]
     finally:
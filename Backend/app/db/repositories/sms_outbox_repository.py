@@ -0,0 +1,159 @@
+"""Outgoing SMS outbox repository – SQLite."""
+from datetime import datetime, timedelta
+from app.db import get_connection
+
+_COLS = (
+    "id, recipient, message, status, attempts, max_attempts, next_attempt_at, "
+    "provider_message_id, provider_status, cost, last_error, created_at, updated_at, sent_at"
+)
+
+_TS_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _ts(delay_seconds: float = 0) -> str:
+    return (datetime.utcnow() + timedelta(seconds=delay_seconds)).strftime(_TS_FORMAT)
+
+
+def enqueue(recipient: str, message: str, max_attempts: int = 5) -> int:
+    """Queue one message for *recipient*. Returns the outbox row id."""
+    return enqueue_many([recipient], message, max_attempts)[0]
+
+
+def enqueue_many(recipients: list[str], message: str, max_attempts: int = 5) -> list[int]:
+    """Queue the same *message* for several recipients in one transaction."""
+    conn = get_connection()
+    try:
+        ids = []
+        for recipient in recipients:
+            cur = conn.execute(
+                "INSERT INTO sms_outbox (recipient, message, max_attempts) VALUES (?, ?, ?)",
+                (recipient, message, max_attempts),
+            )
+            ids.append(cur.lastrowid)
+        conn.commit()
+        return ids
+    finally:
+        conn.close()
+
+
+def claim(limit: int = 500) -> list[dict]:
+    """
+    Atomically move up to *limit* ready messages to ``sending`` and return them.
+
+    Rows come back ordered by message so callers can group identical
+    texts into one provider request.
+    """
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rows = conn.execute(
+            f"""SELECT {_COLS} FROM sms_outbox
+                WHERE status = 'queued' AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, id LIMIT ?""",
+            (_ts(), limit),
+        ).fetchall()
+        ids = [r["id"] for r in rows]
+        if ids:
+            conn.execute(
+                f"""UPDATE sms_outbox SET status = 'sending', attempts = attempts + 1,
+                       updated_at = datetime('now')
+                    WHERE id IN ({', '.join('?' for _ in ids)})""",
+                ids,
+            )
+        conn.commit()
+        messages = [dict(r) for r in rows]
+        for msg in messages:
+            msg["attempts"] += 1
+            msg["status"] = "sending"
+        return sorted(messages, key=lambda m: (m["message"], m["id"]))
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def mark_sent(outbox_id: int, provider_message_id: str, provider_status: str, cost: str = "") -> None:
+    """Record that the provider accepted the message."""
+    conn = get_connection()
+    try:
+        conn.execute(
+            """UPDATE sms_outbox SET status = 'sent', provider_message_id = ?, provider_status = ?,
+                   cost = ?, last_error = '', sent_at = datetime('now'), updated_at = datetime('now')
+               WHERE id = ?""",
+            (provider_message_id, provider_status, cost, outbox_id),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def mark_failed(outbox_id: int, error: str, retry_in_seconds: float | None, provider_status: str = "") -> None:
+    """Record a failure; requeue after *retry_in_seconds* or mark permanently failed when None."""
+    conn = get_connection()
+    try:
+        if retry_in_seconds is None:
+            conn.execute(
+                """UPDATE sms_outbox SET status = 'failed', last_error = ?, provider_status = ?,
+                       updated_at = datetime('now')
+                   WHERE id = ?""",
+                (error[:500], provider_status, outbox_id),
+            )
+        else:
+            conn.execute(
+                """UPDATE sms_outbox SET status = 'queued', last_error = ?, provider_status = ?,
+                       next_attempt_at = ?, updated_at = datetime('now')
+                   WHERE id = ?""",
+                (error[:500], provider_status, _ts(retry_in_seconds), outbox_id),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def update_delivery_status(provider_message_id: str, provider_status: str, error: str = "") -> bool:
+    """
+    Apply a provider delivery report (``Success``, ``Failed``, ``Rejected``...).
+
+    Returns False when no outbox row carries *provider_message_id*.
+    """
+    status = "delivered" if provider_status == "Success" else (
+        "undelivered" if provider_status in ("Failed", "Rejected", "AbsentSubscriber", "Expired") else "sent"
+    )
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            """UPDATE sms_outbox SET status = ?, provider_status = ?, last_error = ?,
+                   updated_at = datetime('now')
+               WHERE provider_message_id = ?""",
+            (status, provider_status, error[:500], provider_message_id),
+        )
+        conn.commit()
+        return cur.rowcount > 0
+    finally:
+        conn.close()
+
+
+def requeue_stale(older_than_seconds: float = 300) -> int:
+    """Return messages stuck in ``sending`` (e.g. after a crash) to the queue."""
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            """UPDATE sms_outbox SET status = 'queued', updated_at = datetime('now')
+               WHERE status = 'sending' AND updated_at <= ?""",
+            (_ts(-older_than_seconds),),
+        )
+        conn.commit()
+        return cur.rowcount
+    finally:
+        conn.close()
+
+
+def get_by_id(outbox_id: int) -> dict | None:
+    """Get a single outbox message by its ID."""
+    conn = get_connection()
+    try:
+        row = conn.execute(f"SELECT {_COLS} FROM sms_outbox WHERE id = ?", (outbox_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
@@ -1,6 +1,7 @@
 """Worker (user) repository – SQLite version."""
 import uuid
 from app.db import get_connection
+from app.utils.phone import to_e164
 
 _COLS = "id, worker_id, phone, name, role, stellar_public_key, created_at"
 
@@ -23,10 +24,11 @@ def create(
     try:
         cur = conn.execute(
             f"""
-            INSERT INTO workers (worker_id, phone, name, role, stellar_public_key, stellar_secret_encrypted)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO workers
+                (worker_id, phone, phone_e164, name, role, stellar_public_key, stellar_secret_encrypted)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             """,
-            (worker_id, phone, name or "", role, stellar_public_key, stellar_secret_encrypted),
+            (worker_id, phone, to_e164(phone), name or "", role, stellar_public_key, stellar_secret_encrypted),
         )
         conn.commit()
         # Fetch the inserted row (SQLite RETURNING requires 3.35+; use lastrowid instead for max compat)
@@ -39,11 +41,11 @@ def create(
 
 
 def get_by_phone(phone: str) -> dict | None:
-    """Retrieve a worker record by phone number."""
+    """Retrieve a worker record by phone number in any accepted format (one indexed lookup on phone_e164)."""
     conn = get_connection()
     try:
         row = conn.execute(
-            f"SELECT {_COLS} FROM workers WHERE phone = ?", (phone,)
+            f"SELECT {_COLS} FROM workers WHERE phone_e164 = ?", (to_e164(phone),)
         ).fetchone()
         return dict(row) if row else None
     finally:
@@ -1,4 +1,4 @@
 # Africa's Talking integration
-from .sms import send_sms
+from .sms import send_sms, send_bulk_sms, RecipientResult, SmsProviderError
 
-__all__ = ["send_sms"]
+__all__ = ["send_sms", "send_bulk_sms", "RecipientResult", "SmsProviderError"]
@@ -1,47 +1,104 @@
-"""Africa's Talking SMS integration."""
-import os
+"""Africa's Talking SMS integration.
+
+Talks to the AT messaging REST endpoint through the pooled
+``africastalking`` HTTP client, so the base URL can be pointed at a
+sandbox or local simulator via ``AT_API_BASE_URL``.
+"""
+import logging
+from dataclasses import dataclass
+from typing import List
 
 from app.config import Config
+from app.integrations import http_clients
+from app.utils.phone import to_e164
+
+logger = logging.getLogger(__name__)
+
+# AT per-recipient status codes that mean the message was accepted
+# (100 Processed, 101 Sent, 102 Queued).
+ACCEPTED_STATUS_CODES = {100, 101, 102}
+# Codes that will not succeed on retry (403 InvalidPhoneNumber,
+# 404 UnsupportedNumberType, 406 UserInBlacklist, 409 DoNotDisturbRejection).
+PERMANENT_STATUS_CODES = {403, 404, 406, 409}
+
+
+class SmsProviderError(Exception):
+    """The messaging API call itself failed (network, auth, 5xx); nothing was sent."""
+
+
+@dataclass
+class RecipientResult:
+    """Outcome for one recipient of a bulk send."""
+    number: str
+    status_code: int
+    status: str
+    message_id: str = ""
+    cost: str = ""
+
+    @property
+    def accepted(self) -> bool:
+        return self.status_code in ACCEPTED_STATUS_CODES
 
-_initialized = False
+    @property
+    def retryable(self) -> bool:
+        return not self.accepted and self.status_code not in PERMANENT_STATUS_CODES
 
 
-def _init():
+def is_configured() -> bool:
+    return bool(Config.AT_USERNAME and Config.AT_API_KEY)
+
+
+def send_bulk_sms(recipients: List[str], message: str) -> List[RecipientResult]:
     """
-    Initialize the Africa's Talking SDK when credentials are available.
-    
-    If the SDK has already been initialized, this function returns immediately. When both Config.AT_USERNAME and Config.AT_API_KEY are set, it initializes the africastalking client and marks the module as initialized; if credentials are missing, it does nothing.
+    Send one *message* to several numbers in a single API call.
+
+    Returns one result per recipient reported by AT (numbers in E.164).
+
+    Raises:
+        SmsProviderError: if credentials are missing or the request failed.
     """
-    global _initialized
-    if _initialized:
-        return
-    if Config.AT_USERNAME and Config.AT_API_KEY:
-        import africastalking
-        africastalking.initialize(Config.AT_USERNAME, Config.AT_API_KEY)
-        _initialized = True
+    if not is_configured():
+        raise SmsProviderError("Africa's Talking credentials are not configured.")
+    numbers = [to_e164(r) for r in recipients]
+    try:
+        resp = http_clients.request(
+            "africastalking",
+            "POST",
+            "/version1/messaging",
+            data={"username": Config.AT_USERNAME, "to": ",".join(numbers), "message": message},
+            headers={"apiKey": Config.AT_API_KEY, "Accept": "application/json"},
+        )
+        resp.raise_for_status()
+        raw = resp.json().get("SMSMessageData", {}).get("Recipients", [])
+    except Exception as e:
+        raise SmsProviderError(str(e)) from e
+    return [
+        RecipientResult(
+            number=r.get("number", ""),
+            status_code=int(r.get("statusCode") or 0),
+            status=r.get("status", ""),
+            message_id=r.get("messageId", "") or "",
+            cost=r.get("cost", "") or "",
+        )
+        for r in raw
+    ]
 
 
 def send_sms(to: str, message: str) -> bool:
     """
     Send an SMS message to a single Kenyan phone number.
-    
+
     Parameters:
         to (str): Recipient number in either "254712345678", "+254712345678", or a local format like "0712345678".
         message (str): Text content of the SMS.
-    
+
     Returns:
         True if the message was sent successfully; False if credentials are missing or if sending failed.
     """
-    _init()
-    if not Config.AT_USERNAME or not Config.AT_API_KEY:
+    if not is_configured():
         return False
-    to_clean = to.lstrip("+")
-    if not to_clean.startswith("254"):
-        to_clean = "254" + to_clean.lstrip("0")
-    to_list = [f"+{to_clean}"]
     try:
-        import africastalking
-        africastalking.SMS.send(message, to_list)
-        return True
-    except Exception:
-        return False
\ No newline at end of file
+        return any(r.accepted for r in send_bulk_sms([to], message))
+    except SmsProviderError as e:
+        logger.warning("SMS to %s failed: %s", to, e)
+        return False
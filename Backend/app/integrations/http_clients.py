@@ -0,0 +1,237 @@
+"""Shared, pooled HTTP clients for outbound integrations.
+
+Every integration (IntaSend, Friendbot, Pinata, Africa's Talking, ...)
+gets one long-lived ``httpx`` client per process instead of opening a
+fresh TCP+TLS connection for each call.  Clients are created lazily from a named profile and closed
+by the FastAPI lifespan on shutdown.
+
+Each profile configures:
+  - base URL (so integrations can be pointed at a local stand-in),
+  - keep-alive pool size and per-host connection limit,
+  - connect / read timeouts,
+  - retry policy: connection failures are retried for every method (the
+    request never reached the server); 429/502/503/504 responses are only
+    retried for idempotent methods, so payment POSTs are never duplicated.
+
+Every request is timed into the ``http.<integration>`` latency histogram.
+"""
+import asyncio
+import math
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Set
+
+import httpx
+
+from app.config import Config, get_settings
+from app.utils import metrics
+
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class ClientProfile:
+    """Connection settings for one outbound integration."""
+
+    base_url: str
+    timeout: float = Config.HTTP_TIMEOUT
+    connect_timeout: float = Config.HTTP_CONNECT_TIMEOUT
+    max_connections: int = Config.HTTP_MAX_CONNECTIONS
+    max_keepalive: int = Config.HTTP_MAX_KEEPALIVE
+    keepalive_expiry: float = Config.HTTP_KEEPALIVE_EXPIRY
+    retries: int = Config.HTTP_RETRIES
+    backoff: float = 0.25
+    headers: Optional[Dict[str, str]] = None
+    transport: Optional[object] = None  # test hook: httpx.MockTransport etc.
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeouts(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+_profiles: Dict[str, ClientProfile] = {
+    "intasend": ClientProfile(base_url=Config.INTASEND_BASE_URL),
+    "friendbot": ClientProfile(base_url=Config.FRIENDBOT_URL),
+    "pinata": ClientProfile(base_url=Config.PINATA_API_URL, timeout=60.0),
+    "africastalking": ClientProfile(base_url=get_settings().at_api_base_url),
+}
+_sync_clients: Dict[str, httpx.Client] = {}
+_async_clients: Dict[str, httpx.AsyncClient] = {}
+_retired_async: List[httpx.AsyncClient] = []  # replaced outside an event loop; closed by aclose_all
+_closing: Set[asyncio.Task] = set()
+_lock = threading.Lock()
+
+
+def register(name: str, base_url: Optional[str] = None, **overrides) -> ClientProfile:
+    """
+    Register (or update) the profile for integration *name*.
+
+    Any existing client for that name is dropped so the next call picks
+    up the new settings.
+    """
+    current = _profiles.get(name)
+    if current is None:
+        if base_url is None:
+            raise ValueError(f"base_url is required for new HTTP profile '{name}'")
+        profile = ClientProfile(base_url=base_url, **overrides)
+    else:
+        if base_url is not None:
+            overrides["base_url"] = base_url
+        profile = replace(current, **overrides)
+    with _lock:
+        _profiles[name] = profile
+        old_sync = _sync_clients.pop(name, None)
+        old_async = _async_clients.pop(name, None)
+    if old_sync is not None:
+        old_sync.close()
+    if old_async is not None:
+        _retire(old_async)
+    return profile
+
+
+def _retire(client: httpx.AsyncClient) -> None:
+    """Close a replaced async client: now when a loop is running, else at ``aclose_all``."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        with _lock:
+            _retired_async.append(client)
+        return
+    task = loop.create_task(client.aclose())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def get_profile(name: str) -> ClientProfile:
+    try:
+        return _profiles[name]
+    except KeyError:
+        raise KeyError(f"No HTTP client profile registered for '{name}'") from None
+
+
+def get_client(name: str) -> httpx.Client:
+    """Return the pooled synchronous client for integration *name*."""
+    client = _sync_clients.get(name)
+    if client is not None:
+        return client
+    profile = get_profile(name)
+    with _lock:
+        client = _sync_clients.get(name)
+        if client is None:
+            transport = profile.transport or httpx.HTTPTransport(
+                retries=profile.retries, limits=profile.limits()
+            )
+            client = httpx.Client(
+                base_url=profile.base_url,
+                timeout=profile.timeouts(),
+                limits=profile.limits(),
+                headers=profile.headers,
+                transport=transport,
+            )
+            _sync_clients[name] = client
+    return client
+
+
+def get_async_client(name: str) -> httpx.AsyncClient:
+    """Return the pooled asynchronous client for integration *name*."""
+    client = _async_clients.get(name)
+    if client is not None:
+        return client
+    profile = get_profile(name)
+    with _lock:
+        client = _async_clients.get(name)
+        if client is None:
+            transport = profile.transport or httpx.AsyncHTTPTransport(
+                retries=profile.retries, limits=profile.limits()
+            )
+            client = httpx.AsyncClient(
+                base_url=profile.base_url,
+                timeout=profile.timeouts(),
+                limits=profile.limits(),
+                headers=profile.headers,
+                transport=transport,
+            )
+            _async_clients[name] = client
+    return client
+
+
+def _retry_delay(profile: ClientProfile, attempt: int, response: httpx.Response) -> float:
+    """Honour a numeric Retry-After (clamped to 0..MAX), else back off exponentially.
+
+    The HTTP-date form and non-finite values (``nan``, ``inf``) use the backoff.
+    """
+    backoff = profile.backoff * (2 ** attempt)
+    try:
+        retry_after = float(response.headers.get("retry-after", ""))
+    except ValueError:
+        return backoff
+    if not math.isfinite(retry_after):
+        return backoff
+    return min(max(0.0, retry_after), MAX_RETRY_AFTER_SECONDS)
+
+
+def _should_retry(method: str, response: httpx.Response, attempt: int, profile: ClientProfile) -> bool:
+    return (
+        attempt < profile.retries
+        and method.upper() in IDEMPOTENT_METHODS
+        and response.status_code in RETRY_STATUSES
+    )
+
+
+def request(name: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a request through the pooled client for *name*, applying the retry policy."""
+    profile = get_profile(name)
+    client = get_client(name)
+    attempt = 0
+    while True:
+        with metrics.timed(f"http.{name}"):
+            response = client.request(method, url, **kwargs)
+        if not _should_retry(method, response, attempt, profile):
+            return response
+        time.sleep(_retry_delay(profile, attempt, response))
+        attempt += 1
+
+
+async def arequest(name: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """Async counterpart of :func:`request`."""
+    profile = get_profile(name)
+    client = get_async_client(name)
+    attempt = 0
+    while True:
+        with metrics.timed(f"http.{name}"):
+            response = await client.request(method, url, **kwargs)
+        if not _should_retry(method, response, attempt, profile):
+            return response
+        await asyncio.sleep(_retry_delay(profile, attempt, response))
+        attempt += 1
+
+
+def close_all() -> None:
+    """Close every synchronous client (safe to call more than once)."""
+    with _lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_all() -> None:
+    """Close every pooled client; called from the application lifespan."""
+    with _lock:
+        clients = list(_async_clients.values()) + _retired_async
+        _async_clients.clear()
+        _retired_async.clear()
+    if _closing:
+        await asyncio.gather(*_closing, return_exceptions=True)
+    for client in clients:
+        await client.aclose()
+    close_all()
@@ -1,26 +1,84 @@
-"""IPFS (Pinata) integration."""
-import httpx
+"""IPFS integration.
+
+Content is pinned to the store selected by ``IPFS_BACKEND``
+(``app.integrations.ipfs.storage``): Pinata, or a local content-addressed
+directory served by the ``/ipfs/{cid}`` gateway route.
+
+Content is addressed locally before upload: ``compute_cid`` gives the CID
+the store will assign, and the ``ipfs_pins`` index records what has been
+pinned to each store, so a retry or re-submission of the same bytes
+returns the CID without any upload.  ``pin_many`` pins a batch with at
+most ``IPFS_PIN_CONCURRENCY`` uploads in flight.
+"""
+import asyncio
+import io
+import logging
+from typing import List
+
 from app.config import Config
+from app.db.repositories import ipfs_pin_repository
+from app.integrations.ipfs.cid import compute_cid
+from app.integrations.ipfs.storage import Content, get_pin_store
+
+logger = logging.getLogger(__name__)
+
+def _size(content: Content) -> int:
+    if isinstance(content, (bytes, bytearray)):
+        return len(content)
+    return content.seek(0, io.SEEK_END)
+
+
+async def _content_cid(content: Content) -> str:
+    if not isinstance(content, (bytes, bytearray)):
+        content.seek(0)
+    return await asyncio.to_thread(compute_cid, content)
+
+
+async def _pin(content: Content, content_cid: str, filename: str) -> str:
+    store = get_pin_store()
+    pinned = await asyncio.to_thread(ipfs_pin_repository.get, content_cid, store.name)
+    if pinned:
+        return pinned["cid"]
+
+    cid = await store.put(content, content_cid, filename)
+    if cid != content_cid:
+        logger.warning("%s CID %s differs from local CID %s", store.name, cid, content_cid)
+    await asyncio.to_thread(
+        ipfs_pin_repository.record, content_cid, cid, _size(content), store.name
+    )
+    return cid
+
+
+async def pin_to_ipfs(content: Content, filename: str = "certificate.pdf") -> str:
+    """
+    Pins content (bytes or a binary file object) to the configured IPFS store. Returns CID.
+
+    Content already in the pin index is not uploaded again.
+    """
+    return await _pin(content, await _content_cid(content), filename)
+
+
+async def pin_many(contents: List[Content], filename: str = "certificate.pdf") -> List[str]:
+    """
+    Pin a batch of contents; returns their CIDs in order.
+
+    Identical contents in the batch are uploaded once, and at most
+    ``IPFS_PIN_CONCURRENCY`` uploads run at the same time.
+    """
+    semaphore = asyncio.Semaphore(max(1, Config.IPFS_PIN_CONCURRENCY))
+    content_cids = [await _content_cid(content) for content in contents]
+    unique = {}
+    for content_cid, content in zip(content_cids, contents):
+        unique.setdefault(content_cid, content)
 
-async def pin_to_ipfs(pdf_bytes: bytes) -> str:
-    """Pins PDF bytes to IPFS via Pinata. Returns CID."""
-    if not Config.PINATA_API_KEY or not Config.PINATA_SECRET_KEY:
-        raise ValueError("Pinata API keys are not configured.")
+    async def pin_one(content_cid: str) -> str:
+        async with semaphore:
+            return await _pin(unique[content_cid], content_cid, filename)
 
-    url = "https://api.pinata.cloud/pinning/pinFileToIPFS"
-    headers = {
-        "pinata_api_key": Config.PINATA_API_KEY,
-        "pinata_secret_api_key": Config.PINATA_SECRET_KEY,
-    }
-    files = {"file": ("certificate.pdf", pdf_bytes, "application/pdf")}
+    pinned = dict(zip(unique, await asyncio.gather(*(pin_one(c) for c in unique))))
+    return [pinned[c] for c in content_cids]
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, files=files, timeout=30.0)
-        response.raise_for_status()
-        return response.json()["IpfsHash"]
 
 def get_ipfs_url(cid: str) -> str:
-    """Returns a gateway URL for a given IPFS CID."""
-    if not Config.PINATA_GATEWAY:
-        raise ValueError("Pinata gateway URL is not configured.")
-    return f"{Config.PINATA_GATEWAY}{cid}"
+    """Returns a gateway URL for a given IPFS CID (on the configured store's gateway)."""
+    return get_pin_store().url(cid)
@@ -0,0 +1,103 @@
+"""Local IPFS CID computation (CIDv0, as returned by Pinata's pinFileToIPFS).
+
+Reproduces the default ``ipfs add`` import: 256 KiB fixed-size chunks,
+each wrapped in a dag-pb node carrying a UnixFS ``File`` message, combined
+into a balanced DAG with at most 174 links per node.  The root node's
+sha2-256 multihash in base58btc is the ``Qm...`` CID, so content can be
+addressed (and looked up in the pin index) before it is uploaded.
+"""
+import hashlib
+from typing import BinaryIO, Iterator, List, Tuple, Union
+
+CHUNK_SIZE = 256 * 1024
+MAX_LINKS = 174
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+_UNIXFS_FILE = 2
+
+
+def _b58encode(raw: bytes) -> str:
+    n = int.from_bytes(raw, "big")
+    out = ""
+    while n:
+        n, rem = divmod(n, 58)
+        out = _B58_ALPHABET[rem] + out
+    return "1" * (len(raw) - len(raw.lstrip(b"\0"))) + out
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte, n = n & 0x7F, n >> 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _field(number: int, value: Union[int, bytes]) -> bytes:
+    """Protobuf field: varint (wire type 0) for ints, length-delimited (2) for bytes."""
+    if isinstance(value, int):
+        return _varint(number << 3) + _varint(value)
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _unixfs_file(data: bytes, filesize: int, blocksizes: List[int] = ()) -> bytes:
+    msg = _field(1, _UNIXFS_FILE)
+    if data:
+        msg += _field(2, data)
+    msg += _field(3, filesize)
+    for size in blocksizes:
+        msg += _field(4, size)
+    return msg
+
+
+def _dag_pb(links: List[Tuple[bytes, int]], data: bytes) -> bytes:
+    # dag-pb canonical order: Links (field 2) before Data (field 1).
+    out = b"".join(_field(2, _field(1, mh) + _field(2, b"") + _field(3, tsize)) for mh, tsize in links)
+    return out + _field(1, data)
+
+
+def _multihash(block: bytes) -> bytes:
+    return b"\x12\x20" + hashlib.sha256(block).digest()
+
+
+def _chunks(content: Union[bytes, BinaryIO]) -> Iterator[bytes]:
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        view = memoryview(content)
+        for start in range(0, len(view), CHUNK_SIZE):
+            yield bytes(view[start:start + CHUNK_SIZE])
+        return
+    while True:
+        chunk = content.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def compute_cid(content: Union[bytes, BinaryIO]) -> str:
+    """
+    Return the CIDv0 ``ipfs add`` (and Pinata) would assign to *content*.
+
+    *content* may be bytes or a binary file object read in chunks; only the
+    block hashes are kept in memory.
+    """
+    # (multihash, cumulative encoded size, file bytes) per node of the current level
+    level = []
+    for chunk in _chunks(content):
+        block = _dag_pb([], _unixfs_file(chunk, len(chunk)))
+        level.append((_multihash(block), len(block), len(chunk)))
+    if not level:
+        block = _dag_pb([], _unixfs_file(b"", 0))
+        level.append((_multihash(block), len(block), 0))
+
+    while len(level) > 1:
+        parents = []
+        for start in range(0, len(level), MAX_LINKS):
+            group = level[start:start + MAX_LINKS]
+            sizes = [size for _, _, size in group]
+            block = _dag_pb([(mh, tsize) for mh, tsize, _ in group], _unixfs_file(b"", sum(sizes), sizes))
+            parents.append((_multihash(block), len(block) + sum(t for _, t, _ in group), sum(sizes)))
+        level = parents
+    return _b58encode(level[0][0])
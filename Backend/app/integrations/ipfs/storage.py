@@ -0,0 +1,164 @@
+"""
+IPFS pin stores.
+
+``IPFS_BACKEND`` selects where pinned content goes:
+
+  - ``pinata`` (default) – uploaded to Pinata, served by ``PINATA_GATEWAY``.
+  - ``local`` – content-addressed files under ``IPFS_LOCAL_DIR``, served by
+    this API's ``/ipfs/{cid}`` gateway route.  No keys or network needed,
+    so the review pipeline runs (and can be benchmarked) offline.
+
+Local files are named by their CIDv0 (computed by ``compute_cid``, the same
+CID Pinata would return) and sharded by the next-to-last two characters of
+the CID, like go-ipfs' flatfs: ``<dir>/<cid[-3:-1]>/<cid>``.  Writes go to
+a temporary file that is renamed into place, and reads are memory-mapped.
+"""
+import asyncio
+import mmap
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Union
+
+from app.config import Config
+from app.integrations import http_clients
+
+Content = Union[bytes, BinaryIO]
+
+# CIDv0: base58btc sha2-256 multihash
+CID_PATTERN = re.compile(r"^Qm[1-9A-HJ-NP-Za-km-z]{44}$")
+_COPY_CHUNK = 256 * 1024
+
+
+class PinStore(ABC):
+    """Interface: ``put`` stores content under its CID; ``url`` is where it is served."""
+
+    name = "base"
+
+    @abstractmethod
+    async def put(self, content: Content, content_cid: str, filename: str) -> str:
+        ...
+
+    @abstractmethod
+    def url(self, cid: str) -> str:
+        ...
+
+
+class PinataStore(PinStore):
+    """Pins through the Pinata API (shared ``pinata`` HTTP client)."""
+
+    name = "pinata"
+
+    async def put(self, content: Content, content_cid: str, filename: str) -> str:
+        if not Config.PINATA_API_KEY or not Config.PINATA_SECRET_KEY:
+            raise ValueError("Pinata API keys are not configured.")
+
+        headers = {
+            "pinata_api_key": Config.PINATA_API_KEY,
+            "pinata_secret_api_key": Config.PINATA_SECRET_KEY,
+        }
+        if not isinstance(content, (bytes, bytearray)):
+            content.seek(0)  # multipart streams the file object from the start
+        files = {"file": (filename, content, "application/pdf")}
+
+        response = await http_clients.arequest(
+            "pinata", "POST", "/pinning/pinFileToIPFS", headers=headers, files=files
+        )
+        response.raise_for_status()
+        return response.json()["IpfsHash"]
+
+    def url(self, cid: str) -> str:
+        if not Config.PINATA_GATEWAY:
+            raise ValueError("Pinata gateway URL is not configured.")
+        return f"{Config.PINATA_GATEWAY}{cid}"
+
+
+class LocalStore(PinStore):
+    """Content-addressed files on the local filesystem (see module docstring)."""
+
+    name = "local"
+
+    def __init__(self, root: str = "", gateway: str = ""):
+        self.root = root or Config.IPFS_LOCAL_DIR
+        self.gateway = gateway or Config.IPFS_LOCAL_GATEWAY
+
+    def path(self, cid: str) -> str:
+        if not CID_PATTERN.match(cid):
+            raise ValueError(f"Not a CIDv0: {cid!r}")
+        return os.path.join(self.root, cid[-3:-1], cid)
+
+    def _write(self, content: Content, cid: str) -> None:
+        path = self.path(cid)
+        if os.path.exists(path):
+            return  # same CID, same bytes
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                if isinstance(content, (bytes, bytearray)):
+                    out.write(content)
+                else:
+                    content.seek(0)
+                    while chunk := content.read(_COPY_CHUNK):
+                        out.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    async def put(self, content: Content, content_cid: str, filename: str) -> str:
+        await asyncio.to_thread(self._write, content, content_cid)
+        return content_cid
+
+    def url(self, cid: str) -> str:
+        return f"{self.gateway}{cid}"
+
+    def size(self, cid: str) -> Optional[int]:
+        """Stored size of *cid* in bytes, or None if it is not stored (or not a CID)."""
+        try:
+            return os.path.getsize(self.path(cid))
+        except (OSError, ValueError):
+            return None
+
+    @contextmanager
+    def open(self, cid: str) -> Iterator[memoryview]:
+        """Memory-map the stored content of *cid* (read-only); FileNotFoundError if absent."""
+        with open(self.path(cid), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b"")
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+
+_store: Optional[PinStore] = None
+
+
+def build_pin_store(backend: str = "") -> PinStore:
+    """Create the store for *backend* (defaults to ``IPFS_BACKEND``)."""
+    backend = (backend or Config.IPFS_BACKEND).lower()
+    if backend == "pinata":
+        return PinataStore()
+    if backend == "local":
+        return LocalStore()
+    raise ValueError(f"Unknown IPFS_BACKEND '{backend}' (expected 'pinata' or 'local')")
+
+
+def get_pin_store() -> PinStore:
+    """Return the process-wide pin store."""
+    global _store
+    if _store is None:
+        _store = build_pin_store()
+    return _store
+
+
+def set_pin_store(store: Optional[PinStore]) -> None:
+    """Replace the process-wide store (None resets to the configured backend)."""
+    global _store
+    _store = store
@@ -18,11 +18,11 @@ import time
 from dataclasses import dataclass
 from typing import Optional
 
-import requests as http_requests
+from app.integrations import http_clients
+from app.utils.phone import normalize_phone
 
 INTASEND_API_KEY = os.getenv("INTASEND_API_KEY", "")
 INTASEND_SECRET = os.getenv("INTASEND_SECRET", "")
-INTASEND_BASE = os.getenv("INTASEND_BASE_URL", "https://sandbox.intasend.com")
 
 # Simulated exchange rate: 1 KSH (Stellar native) ≈ 1 KES  (for demo)
 EXCHANGE_RATE = float(os.getenv("KSH_TO_KES_RATE", "1.0"))
@@ -41,18 +41,6 @@ class MpesaPayoutResult:
     provider: str            # "intasend" | "demo"
 
 
-def _normalize_phone(phone: str) -> str:
-    """Normalize Kenyan phone number to 254XXXXXXXXX format."""
-    phone = phone.strip().replace(" ", "").replace("-", "")
-    if phone.startswith("+"):
-        phone = phone[1:]
-    if phone.startswith("0"):
-        phone = "254" + phone[1:]
-    if not phone.startswith("254"):
-        phone = "254" + phone
-    return phone
-
-
 def _demo_payout(phone: str, amount_ksh: float) -> MpesaPayoutResult:
     """Simulate an M-Pesa payout for demo / testnet usage."""
     amount_kes = round(amount_ksh * EXCHANGE_RATE, 2)
@@ -96,16 +84,17 @@ def _intasend_payout(phone: str, amount_ksh: float) -> MpesaPayoutResult:
     }
 
     try:
-        resp = http_requests.post(
-            f"{INTASEND_BASE}/api/v1/send-money/mpesa/",
+        resp = http_clients.request(
+            "intasend",
+            "POST",
+            "/api/v1/send-money/mpesa/",
             json=payload,
             headers=headers,
-            timeout=30,
         )
 
-        data = resp.json() if resp.ok else {}
+        data = resp.json() if resp.is_success else {}
 
-        if resp.ok:
+        if resp.is_success:
             tracking_id = data.get("tracking_id", data.get("file_id", str(uuid.uuid4())))
             return MpesaPayoutResult(
                 success=True,
@@ -153,7 +142,7 @@ def mpesa_b2c_payout(phone: str, amount_ksh: float) -> MpesaPayoutResult:
     Uses IntaSend when credentials are configured, otherwise falls back
     to a demo simulation.
     """
-    phone = _normalize_phone(phone)
+    phone = normalize_phone(phone)
 
     if INTASEND_API_KEY and INTASEND_SECRET:
         return _intasend_payout(phone, amount_ksh)
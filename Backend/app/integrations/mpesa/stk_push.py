@@ -10,11 +10,13 @@ Production: Use IntaSend STK Push API to trigger M-Pesa prompt on user's phone.
 import os
 import uuid
 from dataclasses import dataclass
-from .b2c import _normalize_phone, EXCHANGE_RATE
+
+from app.integrations import http_clients
+from app.utils.phone import normalize_phone
+from .b2c import EXCHANGE_RATE
 
 INTASEND_API_KEY = os.getenv("INTASEND_API_KEY", "")
 INTASEND_SECRET = os.getenv("INTASEND_SECRET", "")
-INTASEND_BASE = os.getenv("INTASEND_BASE_URL", "https://sandbox.intasend.com")
 
 
 @dataclass
@@ -27,6 +29,7 @@ class MpesaCollectResult:
     status: str       # "completed" | "pending" | "failed"
     message: str
     provider: str    # "intasend" | "demo"
+    invoice_id: str = ""  # provider invoice id; webhooks reference it
 
 
 def _demo_collect(phone: str, amount_kes: float) -> MpesaCollectResult:
@@ -42,6 +45,7 @@ def _demo_collect(phone: str, amount_kes: float) -> MpesaCollectResult:
         status="completed",
         message=f"Demo: KES {amount_kes:,.2f} collected. Account will be credited with {amount_ksh:,.2f} KSH.",
         provider="demo",
+        invoice_id=tx_id,
     )
 
 
@@ -52,9 +56,7 @@ def _intasend_stk_push(phone: str, amount_kes: float, narrative: str = "Paytrace
     User receives prompt on phone to enter M-Pesa PIN.
     Payment is async; we return pending. Webhook confirms completion.
     """
-    import requests as http_requests
-
-    phone = _normalize_phone(phone)
+    phone = normalize_phone(phone)
 
     headers = {
         "Authorization": f"Bearer {INTASEND_SECRET}",
@@ -69,16 +71,17 @@ def _intasend_stk_push(phone: str, amount_kes: float, narrative: str = "Paytrace
     }
 
     try:
-        resp = http_requests.post(
-            f"{INTASEND_BASE}/api/v1/payment/collect/mpesa/",
+        resp = http_clients.request(
+            "intasend",
+            "POST",
+            "/api/v1/payment/collect/mpesa/",
             json=payload,
             headers=headers,
-            timeout=30,
         )
 
-        data = resp.json() if resp.ok else {}
+        data = resp.json() if resp.is_success else {}
 
-        if resp.ok:
+        if resp.is_success:
             inv_id = data.get("invoice", {}).get("invoice_id", data.get("invoice_id", str(uuid.uuid4())))
             return MpesaCollectResult(
                 success=True,
@@ -89,6 +92,7 @@ def _intasend_stk_push(phone: str, amount_kes: float, narrative: str = "Paytrace
                 status="pending",
                 message="M-Pesa prompt sent to your phone. Enter PIN to complete.",
                 provider="intasend",
+                invoice_id=str(inv_id),
             )
         else:
             detail = data.get("errors", data.get("detail", resp.text[:200]))
@@ -116,6 +120,43 @@ def _intasend_stk_push(phone: str, amount_kes: float, narrative: str = "Paytrace
         )
 
 
+class CollectionStatusError(Exception):
+    """IntaSend could not be asked for a collection's state."""
+
+
+def collection_state(invoice_id: str) -> str:
+    """
+    Ask IntaSend for the current state of a collection (``PENDING``,
+    ``PROCESSING``, ``COMPLETE`` or ``FAILED``).
+
+    Webhook deliveries are confirmed with this before anything is credited.
+
+    Raises:
+        CollectionStatusError: IntaSend is not configured or did not answer.
+    """
+    if not (INTASEND_API_KEY and INTASEND_SECRET):
+        raise CollectionStatusError("IntaSend is not configured; cannot confirm the collection.")
+
+    headers = {
+        "Authorization": f"Bearer {INTASEND_SECRET}",
+        "Content-Type": "application/json",
+    }
+    try:
+        resp = http_clients.request(
+            "intasend",
+            "POST",
+            "/api/v1/payment/status/",
+            json={"invoice_id": invoice_id},
+            headers=headers,
+        )
+    except Exception as e:
+        raise CollectionStatusError(f"IntaSend status request error: {e}") from e
+    if not resp.is_success:
+        raise CollectionStatusError(f"IntaSend status request failed: HTTP {resp.status_code}")
+    data = resp.json()
+    return str((data.get("invoice") or {}).get("state") or "").upper()
+
+
 def mpesa_collect(phone: str, amount_kes: float, narrative: str = "Paytrace fund") -> MpesaCollectResult:
     """
     On-ramp: collect KES via M-Pesa and return result.
@@ -123,7 +164,7 @@ def mpesa_collect(phone: str, amount_kes: float, narrative: str = "Paytrace fund
     In demo mode, simulates successful collection.
     With IntaSend credentials, triggers real STK Push.
     """
-    phone = _normalize_phone(phone)
+    phone = normalize_phone(phone)
 
     if INTASEND_API_KEY and INTASEND_SECRET:
         return _intasend_stk_push(phone, amount_kes, narrative)
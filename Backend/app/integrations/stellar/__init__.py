@@ -1,11 +1,14 @@
 # Stellar integration package
 from .wallet import create_wallet_for_user, decrypt_secret, encrypt_secret
-from .nft import mint_review_nft, get_reviews_for_account
+from .nft import NftMintRequest, NftMintResult, mint_review_nft, mint_review_nfts, get_reviews_for_account
 
 __all__ = [
     "create_wallet_for_user",
     "decrypt_secret",
     "encrypt_secret",
+    "NftMintRequest",
+    "NftMintResult",
     "mint_review_nft",
+    "mint_review_nfts",
     "get_reviews_for_account"
 ]
@@ -1,66 +1,99 @@
 """Stellar NFT (review certificate) creation and retrieval using Claimable Balances."""
 import base64
-from stellar_sdk import Keypair, Network, Server, TransactionBuilder, Asset
-from stellar_sdk.exceptions import Ed25519PublicKeyInvalidError, NotFoundError
-from app.config import Config
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Optional
+
+from stellar_sdk import Asset, ClaimPredicate, Claimant, Keypair, Network, Server, TransactionBuilder
+from stellar_sdk.exceptions import BadRequestError, Ed25519PublicKeyInvalidError, NotFoundError
+from app.config import Config, get_settings
+from app.utils.exceptions import StellarError
 from app.integrations.stellar.wallet import decrypt_secret # Assuming decrypt_secret is available for funding
 
-# Initialize Horizon server
-def _get_horizon_server():
-    if Config.STELLAR_NETWORK == "TESTNET":
-        return Server(horizon_url="https://horizon-testnet.stellar.org")
-    return Server(horizon_url="https://horizon.stellar.org")
+# Issuer metadata: issuers are locked (master weight 0) right after minting,
+# so their data entries can never change and are cached for the process
+# lifetime (bounded LRU).  Misses are fetched concurrently.
+ISSUER_FETCH_CONCURRENCY = 8
+ISSUER_CACHE_MAX_ENTRIES = 50_000
 
-def _get_network_passphrase():
-    if Config.STELLAR_NETWORK == "TESTNET":
-        return Network.TESTNET_NETWORK_PASSPHRASE
-    return Network.PUBLIC_NETWORK_PASSPHRASE
+_issuer_cache: "OrderedDict[str, dict]" = OrderedDict()
+_issuer_cache_lock = threading.Lock()
 
-def mint_review_nft(
-    reviewee_public_key: str,
-    pdf_cid: str,
-    asset_code_suffix: str, # Derived from SHA256(engagement_id + reviewer_id + timestamp)
-    metadata: dict # rating, reviewer_type, role, duration, etc.
-) -> dict:
-    """
-    Mints a new review NFT using a unique issuer and makes it claimable by the reviewee.
-    Returns { asset_code, issuer_public_key, transaction_id, explorer_url }.
-    """
-    server = _get_horizon_server()
-    network_passphrase = _get_network_passphrase()
 
-    # 1. Generate fresh issuer keypair for this specific NFT
-    issuer_keypair = Keypair.random()
-    issuer_public_key = issuer_keypair.public_key
-    issuer_secret = issuer_keypair.secret
+@lru_cache(maxsize=4)
+def _server_for(horizon_url: str) -> Server:
+    return Server(horizon_url=horizon_url)
 
-    # Ensure funding account secret is available
-    if not Config.STELLAR_FUNDING_SECRET:
-        raise ValueError("STELLAR_FUNDING_SECRET is not configured for funding new accounts.")
 
-    funding_keypair = Keypair.from_secret(Config.STELLAR_FUNDING_SECRET)
-    funding_account = server.load_account(funding_keypair.public_key)
+# Initialize Horizon server (one per Horizon URL, reused across calls)
+def _get_horizon_server():
+    return _server_for(get_settings().stellar_horizon_url)
 
-    # Asset code is RVW + unique suffix (max 12 chars total)
-    asset_code = f"RVW{asset_code_suffix[:9]}".upper()
-    asset = Asset(asset_code, issuer_public_key)
+def _get_network_passphrase():
+    if Config.STELLAR_NETWORK == "TESTNET":
+        return Network.TESTNET_NETWORK_PASSPHRASE
+    return Network.PUBLIC_NETWORK_PASSPHRASE
 
-    # Build transaction to create issuer, add data, and make asset claimable
-    tx_builder = (
-        TransactionBuilder(
-            source_account=funding_account,
-            network_passphrase=network_passphrase,
-            base_fee=100
-        )
-        .append_create_account_op(
-            destination=issuer_public_key,
-            starting_balance="5" # Min balance for issuer + enough for data entries + trustline to self
-        )
+# Stellar limits that bound how many NFTs fit in one transaction.
+MAX_OPS_PER_TX = 100
+MAX_SIGNATURES_PER_TX = 20  # funding account + one per issuer
+
+
+@dataclass
+class NftMintRequest:
+    """One review NFT to mint; ``key`` maps the result back to the caller (e.g. review_id)."""
+    key: str
+    reviewee_public_key: str
+    pdf_cid: str
+    asset_code_suffix: str  # Deterministic per review (SHA256 of the review id)
+    metadata: dict          # rating, reviewer_type, role, duration, etc.
+    # Called with (tx_hash, issuer_public_key, max_time) once the transaction
+    # is signed and before it is submitted; raising aborts the submission.
+    on_signed: Optional[Callable[[str, str, int], None]] = None
+
+    @property
+    def asset_code(self) -> str:
+        # Asset code is RVW + unique suffix (max 12 chars total)
+        return f"RVW{self.asset_code_suffix[:9]}".upper()
+
+    @property
+    def op_count(self) -> int:
+        # create_account + metadata + pdf_cid + reviewee + set_options + claimable balance
+        return len(self.metadata) + 5
+
+
+@dataclass
+class NftMintResult:
+    """Outcome for one ``NftMintRequest`` (``error`` is set when it was not minted)."""
+    key: str
+    asset_code: str = ""
+    issuer_public_key: str = ""
+    transaction_id: str = ""
+    explorer_url: str = ""
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def _explorer_url(tx_hash: str) -> str:
+    return f"https://stellar.expert/explorer/{'testnet' if Config.STELLAR_NETWORK == 'TESTNET' else 'public'}/tx/{tx_hash}"
+
+
+def _append_mint_ops(tx_builder: TransactionBuilder, issuer_public_key: str, req: NftMintRequest) -> None:
+    """Append the operations that create, describe, lock and deliver one NFT."""
+    tx_builder.append_create_account_op(
+        destination=issuer_public_key,
+        starting_balance="5"  # Min balance for issuer + enough for data entries + trustline to self
     )
 
     # Add ManageData operations to the issuer account
     # Note: Stellar only allows str values for ManageData
-    for key, value in metadata.items():
+    for key, value in req.metadata.items():
         tx_builder.append_manage_data_op(
             source=issuer_public_key,
             data_name=key,
@@ -69,12 +102,12 @@ def mint_review_nft(
     tx_builder.append_manage_data_op(
         source=issuer_public_key,
         data_name="pdf_cid",
-        data_value=pdf_cid.encode('utf-8')
+        data_value=req.pdf_cid.encode('utf-8')
     )
     tx_builder.append_manage_data_op(
         source=issuer_public_key,
         data_name="reviewee",
-        data_value=reviewee_public_key.encode('utf-8')
+        data_value=req.reviewee_public_key.encode('utf-8')
     )
 
     # Lock the issuer account by setting master weight to 0
@@ -86,30 +119,157 @@ def mint_review_nft(
 
     # Create Claimable Balance for 1 unit of the NFT to the reviewee
     tx_builder.append_create_claimable_balance_op(
-        asset=asset,
+        asset=Asset(req.asset_code, issuer_public_key),
         amount="1",
         claimants=[
-            {"destination": reviewee_public_key, "predicate": {"unconditional": True}}
+            Claimant(destination=req.reviewee_public_key, predicate=ClaimPredicate.predicate_unconditional())
         ]
     )
 
-    # Set timeout and build
-    transaction = tx_builder.set_timeout(60).build()
 
-    # Sign with funding account and new issuer account
+def pack_mint_requests(requests: List[NftMintRequest]) -> List[List[NftMintRequest]]:
+    """Split *requests* into transaction-sized groups (op and signature limits), keeping order."""
+    groups: List[List[NftMintRequest]] = []
+    current: List[NftMintRequest] = []
+    ops = 0
+    for req in requests:
+        if req.op_count > MAX_OPS_PER_TX:
+            raise ValueError(f"NFT {req.key} needs {req.op_count} operations (max {MAX_OPS_PER_TX}).")
+        if current and (ops + req.op_count > MAX_OPS_PER_TX or len(current) + 1 >= MAX_SIGNATURES_PER_TX):
+            groups.append(current)
+            current, ops = [], 0
+        current.append(req)
+        ops += req.op_count
+    if current:
+        groups.append(current)
+    return groups
+
+
+def _failed_op_requests(error: BadRequestError, group: List[NftMintRequest]) -> dict:
+    """Map Horizon's per-operation result codes back to the requests that caused them."""
+    extras = getattr(error, "extras", None) or {}
+    op_codes = (extras.get("result_codes") or {}).get("operations") or []
+    failed = {}
+    offset = 0
+    for req in group:
+        codes = op_codes[offset:offset + req.op_count]
+        bad = [c for c in codes if c != "op_success"]
+        if bad:
+            failed[req.key] = bad[0]
+        offset += req.op_count
+    return failed
+
+
+def _submit_group(server, funding_keypair: Keypair, group: List[NftMintRequest]) -> List[NftMintResult]:
+    """Mint *group* in one transaction signed by the funding account and every issuer."""
+    issuers = {req.key: Keypair.random() for req in group}
+    funding_account = server.load_account(funding_keypair.public_key)
+    tx_builder = TransactionBuilder(
+        source_account=funding_account,
+        network_passphrase=_get_network_passphrase(),
+        base_fee=100
+    )
+    for req in group:
+        _append_mint_ops(tx_builder, issuers[req.key].public_key, req)
+
+    transaction = tx_builder.set_timeout(60).build()
     transaction.sign(funding_keypair)
-    transaction.sign(issuer_keypair)
+    for issuer_keypair in issuers.values():
+        transaction.sign(issuer_keypair)
+
+    max_time = transaction.transaction.preconditions.time_bounds.max_time
+    for req in group:
+        if req.on_signed is not None:
+            req.on_signed(transaction.hash_hex(), issuers[req.key].public_key, max_time)
 
-    # Submit to Horizon
     response = server.submit_transaction(transaction)
+    tx_hash = response["hash"]
+    return [
+        NftMintResult(
+            key=req.key,
+            asset_code=req.asset_code,
+            issuer_public_key=issuers[req.key].public_key,
+            transaction_id=tx_hash,
+            explorer_url=_explorer_url(tx_hash),
+        )
+        for req in group
+    ]
+
+
+def mint_review_nfts(requests: List[NftMintRequest]) -> List[NftMintResult]:
+    """
+    Mint several review NFTs, packing as many as fit into each transaction.
+
+    Each NFT still gets its own fresh issuer (which signs for its own ops)
+    and is locked after minting, exactly as a single mint.  Returns one
+    result per request, in order.  When Horizon rejects a transaction
+    because of specific operations, only the NFTs owning those operations
+    fail; the rest of the group is resubmitted once without them.  Any
+    other failure marks the whole group failed so the caller can retry.
+    """
+    # Ensure funding account secret is available
+    if not Config.STELLAR_FUNDING_SECRET:
+        raise ValueError("STELLAR_FUNDING_SECRET is not configured for funding new accounts.")
 
-    explorer_url = f"https://stellar.expert/explorer/{'testnet' if Config.STELLAR_NETWORK == 'TESTNET' else 'public'}/tx/{response['hash']}"
+    server = _get_horizon_server()
+    funding_keypair = Keypair.from_secret(Config.STELLAR_FUNDING_SECRET)
+    results = {}
+
+    for group in pack_mint_requests(requests):
+        try:
+            for result in _submit_group(server, funding_keypair, group):
+                results[result.key] = result
+            continue
+        except BadRequestError as e:
+            failed = _failed_op_requests(e, group)
+            error = str(e)
+        except Exception as e:
+            failed, error = {}, str(e)
+
+        for req in group:
+            if req.key in failed:
+                results[req.key] = NftMintResult(key=req.key, error=f"{failed[req.key]}: {error}")
+        remaining = [req for req in group if req.key not in failed]
+        if failed and remaining:
+            try:
+                for result in _submit_group(server, funding_keypair, remaining):
+                    results[result.key] = result
+                continue
+            except Exception as e:
+                error = str(e)
+        for req in remaining:
+            results[req.key] = NftMintResult(key=req.key, error=error)
+
+    return [results[req.key] for req in requests]
+
+
+def mint_review_nft(
+    reviewee_public_key: str,
+    pdf_cid: str,
+    asset_code_suffix: str, # Derived from SHA256(engagement_id + reviewer_id + timestamp)
+    metadata: dict # rating, reviewer_type, role, duration, etc.
+) -> dict:
+    """
+    Mints a new review NFT using a unique issuer and makes it claimable by the reviewee.
+    Returns { asset_code, issuer_public_key, transaction_id, explorer_url }.
+    """
+    result = mint_review_nfts([
+        NftMintRequest(
+            key=asset_code_suffix,
+            reviewee_public_key=reviewee_public_key,
+            pdf_cid=pdf_cid,
+            asset_code_suffix=asset_code_suffix,
+            metadata=metadata,
+        )
+    ])[0]
+    if not result.success:
+        raise StellarError(message=f"Failed to mint review NFT: {result.error}", operation="mint_review_nft")
 
     return {
-        "asset_code": asset_code,
-        "issuer_public_key": issuer_public_key,
-        "transaction_id": response['hash'],
-        "explorer_url": explorer_url,
+        "asset_code": result.asset_code,
+        "issuer_public_key": result.issuer_public_key,
+        "transaction_id": result.transaction_id,
+        "explorer_url": result.explorer_url,
     }
 
 
@@ -167,35 +327,88 @@ def get_reviews_for_account(stellar_public_key: str) -> list[dict]:
     if not issuer_keys:
         return []
 
-    # 3. Fetch issuer account data for each NFT
+    # 3. Issuer account data for each NFT (cached, misses fetched concurrently)
+    issuer_data = fetch_issuer_data(issuer_keys, server)
     reviews: list[dict] = []
     for i, issuer_pk in enumerate(issuer_keys):
-        try:
-            issuer_acc = server.accounts().account_id(issuer_pk).call()
-            raw_data = issuer_acc.get("data", {})
-            # Decode base64 values
-            decoded = {}
-            for k, v in raw_data.items():
-                try:
-                    decoded[k] = base64.b64decode(v).decode("utf-8")
-                except Exception:
-                    pass
-
-            review_data = _extract_review_data_from_manage_data(decoded)
-            if review_data and review_data.get("reviewee") == stellar_public_key:
-                ctx = metadata_context[i]
-                review_data.update({
-                    "asset_code": ctx["asset_code"],
-                    "issuer_public_key": ctx["issuer"],
-                    "status": ctx["status"],
-                })
-                reviews.append(review_data)
-        except Exception:
+        decoded = issuer_data.get(issuer_pk)
+        if decoded is None:
             continue
+        review_data = _extract_review_data_from_manage_data(decoded)
+        if review_data and review_data.get("reviewee") == stellar_public_key:
+            ctx = metadata_context[i]
+            review_data.update({
+                "asset_code": ctx["asset_code"],
+                "issuer_public_key": ctx["issuer"],
+                "status": ctx["status"],
+            })
+            reviews.append(review_data)
 
     return reviews
 
 
+def _is_locked(account: dict) -> bool:
+    """True when the issuer's master key has weight 0 and no other signer exists."""
+    signers = account.get("signers", [])
+    return bool(signers) and all(s.get("weight", 0) == 0 for s in signers)
+
+
+def _fetch_issuer(server, issuer_pk: str) -> tuple[Optional[dict], bool]:
+    """Return (decoded data entries, locked) for one issuer, or (None, False) on error."""
+    try:
+        issuer_acc = server.accounts().account_id(issuer_pk).call()
+    except Exception:
+        return None, False
+    # Decode base64 values
+    decoded = {}
+    for k, v in issuer_acc.get("data", {}).items():
+        try:
+            decoded[k] = base64.b64decode(v).decode("utf-8")
+        except Exception:
+            pass
+    return decoded, _is_locked(issuer_acc)
+
+
+def fetch_issuer_data(issuer_keys: List[str], server=None) -> dict:
+    """
+    Decoded data entries per issuer public key.
+
+    Locked issuers come from (and go into) the in-process cache; the rest
+    are fetched from Horizon with up to ``ISSUER_FETCH_CONCURRENCY`` calls
+    in flight.  Issuers that could not be loaded are left out.
+    """
+    result: dict = {}
+    missing: List[str] = []
+    with _issuer_cache_lock:
+        for pk in dict.fromkeys(issuer_keys):
+            if pk in _issuer_cache:
+                _issuer_cache.move_to_end(pk)
+                result[pk] = _issuer_cache[pk]
+            else:
+                missing.append(pk)
+    if not missing:
+        return result
+
+    server = server or _get_horizon_server()
+    workers = min(ISSUER_FETCH_CONCURRENCY, len(missing))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="issuer") as pool:
+            fetched = list(pool.map(lambda pk: _fetch_issuer(server, pk), missing))
+    else:
+        fetched = [_fetch_issuer(server, pk) for pk in missing]
+
+    with _issuer_cache_lock:
+        for pk, (decoded, locked) in zip(missing, fetched):
+            if decoded is None:
+                continue
+            result[pk] = decoded
+            if locked:
+                _issuer_cache[pk] = decoded
+                while len(_issuer_cache) > ISSUER_CACHE_MAX_ENTRIES:
+                    _issuer_cache.popitem(last=False)
+    return result
+
+
 def _extract_review_data_from_manage_data(data: dict) -> dict:
     """Extract relevant review metadata from an already-decoded data dict."""
     expected_keys = {"pdf_cid", "rating", "reviewer_type", "role", "duration", "reviewee"}
@@ -6,7 +6,7 @@ from cryptography.fernet import Fernet
 from stellar_sdk import Keypair, Network, Server
 from stellar_sdk.transaction_builder import TransactionBuilder
 
-from app.config import Config
+from app.config import Config, get_settings
 
 
 def _fernet():
@@ -30,11 +30,9 @@ def _get_horizon_url():
     Selects the Horizon server base URL appropriate for the configured Stellar network.
     
     Returns:
-        str: The Horizon base URL: "https://horizon-testnet.stellar.org" when Config.STELLAR_NETWORK is "TESTNET", otherwise "https://horizon.stellar.org".
+        str: The Horizon base URL: ``HORIZON_URL`` when set, otherwise "https://horizon-testnet.stellar.org" when Config.STELLAR_NETWORK is "TESTNET", else "https://horizon.stellar.org".
     """
-    if Config.STELLAR_NETWORK == "TESTNET":
-        return "https://horizon-testnet.stellar.org"
-    return "https://horizon.stellar.org"
+    return get_settings().stellar_horizon_url
 
 
 def encrypt_secret(secret: str) -> str:
@@ -7,12 +7,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.config import Config
+from app.cache import get_async_redis, close_async_redis
+from app.integrations import http_clients
+from app.utils import metrics
 from app.api.v1.reviews import router as reviews_router # Import the new router
 from app.routes.payments import router as payments_router  # Import payments router
 from app.routes.accounts import router as accounts_router  # Import accounts router
 from app.routes.stellar import router as stellar_router  # Import stellar router
 from app.routes.schedules import router as schedules_router  # Import schedules router
 from app.routes.reviews import router as user_reviews_router  # Import user reviews router
+from app.routes.mpesa import router as mpesa_router  # Import M-Pesa webhook router
+from app.routes.sms import router as sms_router  # Import SMS delivery-report router
+from app.routes.ipfs import router as ipfs_router  # Import local IPFS gateway router
+from app.services import jobs, sms_outbox, notifications, snapshots, review_nfts  # noqa: F401 – registers event/job handlers
+from app.services.pdf import shutdown_pdf_pool, warm_pdf_pool
+from app.ussd.handler import handle_ussd
 
 logger = logging.getLogger(__name__)
 
@@ -42,14 +51,29 @@ async def _scheduled_payments_loop():
 @asynccontextmanager
 async def lifespan(application: FastAPI):
     """Startup / shutdown lifecycle."""
-    task = asyncio.create_task(_scheduled_payments_loop())
+    get_async_redis()  # create the shared pool up front
+    try:
+        workers = await asyncio.to_thread(warm_pdf_pool)
+        logger.info("PDF render pool ready (%s workers)", workers)
+    except Exception:
+        logger.exception("Could not start the PDF render pool; certificates will start it on demand")
+    tasks = [
+        asyncio.create_task(_scheduled_payments_loop()),
+        asyncio.create_task(jobs.run_worker_loop()),
+        asyncio.create_task(sms_outbox.run_dispatcher_loop()),
+    ]
     logger.info("Background scheduler started (interval=%ss)", SCHEDULER_INTERVAL_SECONDS)
     yield
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    await asyncio.to_thread(shutdown_pdf_pool)
+    await http_clients.aclose_all()
+    await close_async_redis()
 
 
 app = FastAPI(
@@ -72,6 +96,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Range", "ETag"],  # pagination cursor, IPFS gateway
 )
 
 # Include API routers
@@ -81,6 +106,9 @@ app.include_router(accounts_router, prefix="/api/v1", tags=["Accounts"])
 app.include_router(stellar_router, prefix="/api/v1", tags=["Stellar"])
 app.include_router(schedules_router, prefix="/api/v1", tags=["Schedules & Claims"])
 app.include_router(user_reviews_router, prefix="/api/v1", tags=["User Reviews"])
+app.include_router(mpesa_router, prefix="/api/v1", tags=["M-Pesa"])
+app.include_router(sms_router, prefix="/api/v1", tags=["SMS"])
+app.include_router(ipfs_router, prefix="/api/v1", tags=["IPFS"])
 
 USSD_API_KEY = Config.USSD_API_KEY or None
 
@@ -96,8 +124,19 @@ def health():
     return JSONResponse(content={"status": "ok"})
 
 
+@app.get("/metrics")
+def get_metrics():
+    """
+    Expose in-process latency histograms (outbound integrations, etc.).
+
+    Returns:
+        JSONResponse: Mapping of histogram name to count, sum, percentiles and cumulative buckets.
+    """
+    return JSONResponse(content=metrics.snapshot())
+
+
 @app.post("/ussd", response_class=PlainTextResponse)
-def ussd(
+async def ussd(
     sessionId: str = Form(""),
     phoneNumber: str = Form(""),
     text: str = Form(""),
@@ -120,8 +159,7 @@ def ussd(
         if token != USSD_API_KEY:
             return PlainTextResponse(content="", status_code=403)
 
-    from app.ussd.handler import handle_ussd
-    response_text = handle_ussd(sessionId, phoneNumber, text)
+    response_text = await handle_ussd(sessionId, phoneNumber, text)
     return PlainTextResponse(content=response_text)
 
 
@@ -6,14 +6,12 @@ Account creation, login, profile and balance endpoints.
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional, List
-import requests as http_requests
 
+from app.integrations import http_clients
 from app.services.user_service import create_account
 from app.services.account import AccountService
-from app.services.payments import get_payment_service
 from app.db.repositories import get_worker_by_phone, get_worker_by_public_key, get_by_worker_id
 from app.config import Config, get_settings
-from stellar_sdk import Keypair
 
 router = APIRouter(prefix="/accounts", tags=["Accounts"])
 
@@ -243,10 +241,11 @@ def fund_account(public_key: str):
         )
 
     try:
-        resp = http_requests.get(
-            "https://friendbot.stellar.org",
+        resp = http_clients.request(
+            "friendbot",
+            "GET",
+            "/",
             params={"addr": public_key},
-            timeout=30,
         )
 
         if resp.status_code == 200:
@@ -282,7 +281,9 @@ class FundMpesaRequest(BaseModel):
 class FundMpesaResponse(BaseModel):
     funded: bool
     message: str
+    status: str = "pending"          # pending (awaiting M-Pesa PIN) | paid (credit queued)
     transaction_id: str = ""
+    invoice_id: str = ""
     amount_ksh: str = "0"
     amount_kes: str = "0"
     provider: str = "demo"
@@ -294,10 +295,12 @@ def fund_account_mpesa(public_key: str, request: FundMpesaRequest):
     Fund a Stellar account via M-Pesa on-ramp.
 
     User pays KES via M-Pesa (STK Push); platform credits their account with
-    equivalent KSH.  In demo mode (no IntaSend credentials), simulates the
-    collection and immediately credits the account.
+    equivalent KSH.  The request returns as soon as the STK Push is sent:
+    the Stellar credit is queued once IntaSend confirms the payment through
+    ``POST /mpesa/webhook`` (in demo mode the collection is confirmed
+    immediately and the credit is queued straight away).
     """
-    from app.integrations.mpesa.stk_push import mpesa_collect
+    from app.services.mpesa import initiate_onramp
 
     settings = get_settings()
     if not settings.stellar_platform_public or not settings.stellar_platform_secret:
@@ -318,37 +321,24 @@ def fund_account_mpesa(public_key: str, request: FundMpesaRequest):
             detail="Maximum M-Pesa amount is 150,000 KES.",
         )
 
-    # Step 1: Collect via M-Pesa (STK Push or demo)
-    result = mpesa_collect(phone=request.phone, amount_kes=request.amount)
-
-    if not result.success:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=result.message,
-        )
-
-    # Step 2: Credit Stellar account from platform
-    amount_ksh_str = f"{result.amount_ksh:.7f}"
     try:
-        ps = get_payment_service()
-        kp = Keypair.from_secret(settings.stellar_platform_secret)
-        ps.send_payment(
-            sender_keypair=kp,
-            destination_public_key=public_key,
-            amount=amount_ksh_str,
-            memo="M-Pesa on-ramp",
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"M-Pesa collection succeeded but Stellar credit failed: {e}. Contact support.",
-        )
+        collection = initiate_onramp(public_key, request.phone, request.amount)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    amount_ksh = float(collection["amount_ksh"])
+    if collection["status"] == "paid":
+        message = f"Payment received. {amount_ksh:,.2f} KSH will be credited shortly."
+    else:
+        message = f"{collection['message']} {amount_ksh:,.2f} KSH will be credited once payment completes."
 
     return FundMpesaResponse(
-        funded=True,
-        message=f"Account credited with {result.amount_ksh:,.2f} KSH. {result.message}",
-        transaction_id=result.transaction_id,
-        amount_ksh=str(result.amount_ksh),
-        amount_kes=str(result.amount_kes),
-        provider=result.provider,
-    )
\ No newline at end of file
+        funded=False,
+        message=message,
+        status=collection["status"],
+        transaction_id=collection["transaction_id"],
+        invoice_id=collection["invoice_id"],
+        amount_ksh=str(amount_ksh),
+        amount_kes=collection["amount_kes"],
+        provider=collection["provider"],
+    )
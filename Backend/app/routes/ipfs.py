@@ -0,0 +1,105 @@
+"""
+IPFS Gateway Routes
+
+Serves content pinned to the local store (``IPFS_BACKEND=local``) at the
+URLs ``get_ipfs_url`` hands out, like a read-only IPFS gateway.
+
+Content under a CID never changes, so responses are cacheable forever
+(``Cache-Control: immutable``, ``ETag`` = CID, ``If-None-Match`` -> 304),
+and single byte ranges are supported for PDF viewers and resumed downloads.
+Bodies are streamed from the memory-mapped file in chunks, never copied whole.
+"""
+import re
+from typing import Iterator, Optional, Tuple
+
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.integrations.ipfs.storage import LocalStore, get_pin_store
+from app.utils.http_cache import IMMUTABLE, conditional, make_etag
+
+router = APIRouter(prefix="/ipfs", tags=["IPFS"])
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _content_type(head: bytes) -> str:
+    return "application/pdf" if head.startswith(b"%PDF") else "application/octet-stream"
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive ``(start, end)`` for a single ``bytes=`` range, or None to
+    send the whole body (absent, multi-range or malformed header).
+    Raises 416 when the range lies outside the content.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:  # suffix range: the last N bytes
+        start, end = max(0, size - int(last)), size - 1
+        if int(last) == 0:
+            start = size
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable.",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def _iter_range(store: LocalStore, cid: str, start: int, end: int) -> Iterator[bytes]:
+    """Yield bytes ``start..end`` (inclusive) of *cid* in chunks, keeping the file mapped meanwhile."""
+    with store.open(cid) as data:
+        for offset in range(start, end + 1, STREAM_CHUNK_BYTES):
+            yield bytes(data[offset:min(offset + STREAM_CHUNK_BYTES, end + 1)])
+
+
+@router.get("/{cid}")
+def get_content(
+    cid: str,
+    request: Request,
+    response: Response,
+    range_header: str | None = Header(None, alias="Range"),
+):
+    """
+    Serve pinned content by CID.
+
+    Supports ``Range: bytes=start-end`` (206 Partial Content) and
+    ``If-None-Match`` (304 Not Modified).
+    """
+    store = get_pin_store()
+    size = store.size(cid) if isinstance(store, LocalStore) else None
+    if size is None:
+        raise HTTPException(status_code=404, detail="Content not found.")
+
+    response.headers["Accept-Ranges"] = "bytes"
+    not_modified = conditional(request, response, make_etag(cid), IMMUTABLE)
+    if not_modified is not None:
+        return not_modified
+    headers = dict(response.headers)
+
+    byte_range = _parse_range(range_header, size)
+    with store.open(cid) as data:
+        media_type = _content_type(bytes(data[:4]))
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        status_code = 206
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _iter_range(store, cid, start, end),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
@@ -0,0 +1,83 @@
+"""
+M-Pesa Routes
+
+IntaSend webhook receiver and on-ramp collection status.
+"""
+import hmac
+from typing import Any, Dict
+
+from fastapi import APIRouter, Body, HTTPException, status
+from pydantic import BaseModel
+
+from app.config import Config
+from app.db.repositories import collection_repository
+from app.integrations.mpesa.stk_push import CollectionStatusError
+from app.services.mpesa import handle_collection_event
+
+router = APIRouter(prefix="/mpesa", tags=["M-Pesa"])
+
+
+class WebhookAck(BaseModel):
+    received: bool
+    invoice_id: str
+    state: str
+    duplicate: bool = False
+
+
+class CollectionStatusResponse(BaseModel):
+    invoice_id: str
+    public_key: str
+    phone: str
+    amount_kes: str
+    amount_ksh: str
+    provider: str
+    status: str              # pending | paid | crediting | credited | failed
+    stellar_tx_hash: str = ""
+    message: str = ""
+    created_at: str
+    updated_at: str
+
+
+@router.post("/webhook", response_model=WebhookAck)
+def intasend_webhook(payload: Dict[str, Any] = Body(...)):
+    """
+    Receive IntaSend collection (STK Push) status updates.
+
+    Events are stored and deduplicated by invoice id + state; a ``COMPLETE``
+    event confirmed with IntaSend queues the Stellar credit, so replays never
+    credit twice.  The payload's ``challenge`` must match
+    ``INTASEND_WEBHOOK_CHALLENGE``; with no challenge configured every
+    delivery is rejected.
+    """
+    expected = Config.INTASEND_WEBHOOK_CHALLENGE
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook challenge is not configured.",
+        )
+    if not hmac.compare_digest(str(payload.get("challenge") or ""), expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid webhook challenge.")
+
+    try:
+        result = handle_collection_event(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except CollectionStatusError as e:
+        # Not acknowledged, so IntaSend delivers it again later.
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return WebhookAck(
+        received=True,
+        invoice_id=result["invoice_id"],
+        state=result["state"],
+        duplicate=result.get("duplicate", False),
+    )
+
+
+@router.get("/collections/{invoice_id}", response_model=CollectionStatusResponse)
+def get_collection_status(invoice_id: str):
+    """Poll the status of an on-ramp collection (e.g. after ``fund-mpesa`` returns pending)."""
+    row = collection_repository.get_by_invoice(invoice_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"Collection '{invoice_id}' not found.")
+    return CollectionStatusResponse(**row)
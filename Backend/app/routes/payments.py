@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 
+from app.services import events
 from app.services.payments import get_payment_service, PaymentService
 from app.middlewares.auth_middleware import get_current_user
 from app.utils.validators import validate_stellar_public_key
@@ -211,6 +212,7 @@ async def send_payment(
             memo=request.memo,
         )
         tx_hash = result.get("hash", "")
+        events.emit(events.PAYMENT_SETTLED, {"public_keys": [sender_pk, dest_pk]})
         return SendPaymentResponse(
             successful=result.get("successful", False),
             tx_hash=tx_hash,
@@ -284,6 +286,7 @@ async def withdraw(request: WithdrawRequest, current_user=Depends(get_current_us
                 destination_public_key=dest,
                 amount=request.amount,
             )
+            events.emit(events.PAYMENT_SETTLED, {"public_keys": [dest]})
             return {"submitted": True, "result": result}
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -314,7 +317,7 @@ async def offramp_to_mpesa(
       2. Trigger an M-Pesa B2C payout to the worker's phone number via
          IntaSend (or demo simulation when no credentials are configured).
     """
-    from app.integrations.mpesa import mpesa_b2c_payout
+    from app.services.mpesa import OfframpError, initiate_offramp
 
     sender_pk, sender_row = _resolve_account(request.sender)
     if sender_row is None:
@@ -323,59 +326,12 @@ async def offramp_to_mpesa(
             detail="Sender account not found in the system.",
         )
 
-    platform_public = settings.stellar_platform_public
-    if not platform_public:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Platform Stellar account not configured.",
-        )
-
-    stellar_tx_hash = None
-    stellar_explorer_url = None
     try:
-        secret = decrypt_secret(sender_row["stellar_secret_encrypted"])
-        sender_keypair = Keypair.from_secret(secret)
+        result = initiate_offramp(sender_row, request.phone, request.amount, payment_service)
+    except OfframpError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
-        result = payment_service.send_payment(
-            sender_keypair=sender_keypair,
-            destination_public_key=platform_public,
-            amount=request.amount,
-            memo="M-Pesa off-ramp",
-        )
-        stellar_tx_hash = result.get("hash", "")
-        stellar_explorer_url = build_stellar_explorer_url(stellar_tx_hash)
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Stellar burn transaction failed: {e}",
-        )
-
-    try:
-        mpesa_result = mpesa_b2c_payout(
-            phone=request.phone,
-            amount_ksh=float(request.amount),
-        )
-    except Exception as e:
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Stellar transfer succeeded (tx: {stellar_tx_hash}) but M-Pesa payout failed: {e}. Contact support.",
-        )
-
-    return OfframpResponse(
-        success=mpesa_result.success,
-        stellar_tx_hash=stellar_tx_hash,
-        stellar_explorer_url=stellar_explorer_url,
-        mpesa_transaction_id=mpesa_result.transaction_id,
-        phone=mpesa_result.phone,
-        amount_ksh=mpesa_result.amount_ksh,
-        amount_kes=mpesa_result.amount_kes,
-        exchange_rate=mpesa_result.exchange_rate,
-        mpesa_status=mpesa_result.status,
-        message=mpesa_result.message,
-        provider=mpesa_result.provider,
-    )
+    return OfframpResponse(**result)
 
 
 # ---------------------------------------------------------------------------
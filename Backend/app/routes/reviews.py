@@ -4,18 +4,21 @@ Review Routes
 Practical review system using SQLite + Stellar NFT minting.
 Workers review employers and employers review workers,
 only after a 3-month working relationship (via scheduled payments).
-Every submitted review is also minted as an NFT on Stellar.
+Every submitted review is also minted as an NFT on Stellar by a
+background job (see app.services.review_nfts).
 """
-import hashlib
-import time
-import traceback
 import logging
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from app.db.repositories import review_repository, get_by_worker_id, get_worker_by_public_key
-from app.integrations.stellar.nft import mint_review_nft
+from app.services import certificates
+from app.services.pdf import certificate_key, render_review_pdf_async
+from app.services.review_nfts import enqueue_mint
+from app.utils.http_cache import IMMUTABLE, REVALIDATE, conditional, json_etag, make_etag
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, page
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +55,7 @@ class ReviewResponse(BaseModel):
     stellar_tx_hash: Optional[str] = ""
     explorer_url: Optional[str] = ""
     nft_asset_code: Optional[str] = ""
+    nft_status: Optional[str] = ""  # pending | minting | minted | failed
     created_at: str
     reviewer_name: Optional[str] = None
     reviewee_name: Optional[str] = None
@@ -60,6 +64,9 @@ class ReviewResponse(BaseModel):
 class RatingResponse(BaseModel):
     avg_rating: float
     count: int
+    stars: List[int] = []   # review count per star, 1..5
+
+MAX_RATINGS_PER_REQUEST = 500
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
@@ -129,62 +136,50 @@ def submit_review(req: SubmitReviewRequest):
             )
         raise HTTPException(status_code=500, detail=str(e))
 
-    # Mint Stellar NFT for the reviewee
-    try:
-        reviewee_pk = reviewee["stellar_public_key"]
-        asset_suffix = hashlib.sha256(
-            f"{row['review_id']}-{req.reviewer_id}-{time.time()}".encode()
-        ).hexdigest()[:9]
-
-        nft_metadata = {
-            "rating": str(req.rating),
-            "reviewer_type": reviewer["role"],
-            "role": reviewee["role"],
-            "duration": "0",
-            "reviewer_id": req.reviewer_id.upper(),
-        }
-
-        mint_result = mint_review_nft(
-            reviewee_public_key=reviewee_pk,
-            pdf_cid=row["review_id"],  # use review_id as CID placeholder
-            asset_code_suffix=asset_suffix,
-            metadata=nft_metadata,
-        )
-
-        # Update the review record with NFT data
-        row = review_repository.update_nft_data(
-            review_id=row["review_id"],
-            stellar_tx_hash=mint_result["transaction_id"],
-            explorer_url=mint_result["explorer_url"],
-            nft_asset_code=mint_result["asset_code"],
-        ) or row
-
-        logger.info(
-            "Minted review NFT %s for %s (tx: %s)",
-            mint_result["asset_code"],
-            req.reviewee_id,
-            mint_result["transaction_id"],
-        )
-    except Exception as e:
-        # NFT minting is best-effort; the review is still saved in SQLite
-        logger.warning("NFT minting failed for review %s: %s", row["review_id"], e)
-        traceback.print_exc()
+    # Mint the Stellar NFT in the background; the response carries nft_status="pending".
+    enqueue_mint(row["review_id"])
 
     return ReviewResponse(**row)
 
 
 @router.get("/reviews/for/{user_id}", response_model=List[ReviewResponse])
-def get_reviews_about(user_id: str):
-    """Get all reviews written about a user (received reviews)."""
-    rows = review_repository.get_reviews_for(user_id.upper())
-    return [ReviewResponse(**r) for r in rows]
+def get_reviews_about(
+    user_id: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+):
+    """Get reviews written about a user (received reviews), newest first, one page at a time."""
+    rows = review_repository.get_reviews_for(user_id.upper(), limit + 1, decode_cursor(cursor))
+    reviews = [ReviewResponse(**r) for r in page(rows, limit, ("created_at", "id"), response)]
+    return conditional(request, response, json_etag(reviews)) or reviews
 
 
 @router.get("/reviews/by/{user_id}", response_model=List[ReviewResponse])
-def get_reviews_written_by(user_id: str):
-    """Get all reviews written by a user."""
-    rows = review_repository.get_reviews_by(user_id.upper())
-    return [ReviewResponse(**r) for r in rows]
+def get_reviews_written_by(
+    user_id: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+):
+    """Get reviews written by a user, newest first, one page at a time."""
+    rows = review_repository.get_reviews_by(user_id.upper(), limit + 1, decode_cursor(cursor))
+    reviews = [ReviewResponse(**r) for r in page(rows, limit, ("created_at", "id"), response)]
+    return conditional(request, response, json_etag(reviews)) or reviews
+
+
+@router.get("/reviews/ratings", response_model=Dict[str, RatingResponse])
+def get_user_ratings(user_ids: str = Query(..., description="Comma-separated user ids")):
+    """Get ratings for many users at once (listing pages), keyed by user id."""
+    ids = [u.strip().upper() for u in user_ids.split(",") if u.strip()]
+    if len(ids) > MAX_RATINGS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_RATINGS_PER_REQUEST} user ids per request.")
+    return {
+        user_id: RatingResponse(**rating)
+        for user_id, rating in review_repository.get_ratings(ids).items()
+    }
 
 
 @router.get("/reviews/rating/{user_id}", response_model=RatingResponse)
@@ -192,3 +187,41 @@ def get_user_rating(user_id: str):
     """Get the average rating and total review count for a user."""
     result = review_repository.get_average_rating(user_id.upper())
     return RatingResponse(**result)
+
+
+@router.get("/reviews/certificates/{user_id}/export")
+async def export_certificates(user_id: str, written: bool = False):
+    """
+    Download a ZIP of PDF certificates for every review a user received
+    (``written=true``: every review they wrote, e.g. an agency's references).
+    """
+    user_id = user_id.upper()
+    items = await certificates.export_items(user_id, written)
+    if not items:
+        raise HTTPException(status_code=404, detail=f"No reviews found for '{user_id}'.")
+    return StreamingResponse(
+        certificates.stream_certificates_zip(items),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{user_id}-certificates.zip"'},
+    )
+
+
+@router.get("/reviews/{review_id}/certificate")
+async def get_review_certificate(review_id: str, request: Request, response: Response):
+    """
+    Download the PDF certificate for one review.
+
+    The ETag is the certificate's content key, so a conditional request is
+    answered without rendering; once the review is minted the certificate
+    is final and sent as immutable.
+    """
+    data = await certificates.load_certificate(review_id.upper())
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Review '{review_id}' not found.")
+    response.headers["Content-Disposition"] = f'inline; filename="{review_id.upper()}.pdf"'
+    cache_control = IMMUTABLE if certificates.is_final(data) else REVALIDATE
+    not_modified = conditional(request, response, make_etag(certificate_key(data)), cache_control)
+    if not_modified is not None:
+        return not_modified
+    pdf = await render_review_pdf_async(data)
+    return Response(content=pdf, media_type="application/pdf", headers=dict(response.headers))
@@ -3,16 +3,18 @@ Schedules & Claims Routes
 
 Endpoints for scheduled recurring payments and worker payment claims.
 """
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
 from pydantic import BaseModel
 from typing import Optional, List
 import traceback
 import logging
 
 from app.db.repositories import schedule_repository, claim_repository
+from app.services import events
 from app.services.payments import get_payment_service, PaymentService
 from app.db.repositories import get_by_worker_id, get_worker_by_public_key
 from app.integrations.stellar import decrypt_secret
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, page
 from app.utils.stellar_helpers import build_stellar_explorer_url
 from stellar_sdk import Keypair
 
@@ -103,10 +105,15 @@ def create_schedule(req: CreateScheduleRequest):
 
 
 @router.get("/schedules/employer/{employer_id}", response_model=List[ScheduleResponse])
-def list_employer_schedules(employer_id: str):
-    """List all schedules an employer has created."""
-    rows = schedule_repository.get_by_employer(employer_id.upper())
-    return [ScheduleResponse(**r) for r in rows]
+def list_employer_schedules(
+    employer_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+):
+    """List the schedules an employer has created, newest first, one page at a time."""
+    rows = schedule_repository.get_by_employer(employer_id.upper(), limit + 1, decode_cursor(cursor))
+    return [ScheduleResponse(**r) for r in page(rows, limit, ("created_at", "id"), response)]
 
 
 @router.get("/schedules/worker/{worker_id}", response_model=List[ScheduleResponse])
@@ -175,6 +182,13 @@ def _run_due_payments(payment_service: PaymentService) -> dict:
             tx_hash = result.get("hash", "")
             schedule_repository.advance_next_date(schedule_id)
             executed += 1
+            events.emit(events.SCHEDULED_PAYMENT_SUCCEEDED, {
+                "schedule_id": schedule_id,
+                "employer_id": employer_id,
+                "worker_id": worker_id,
+                "amount": amount,
+                "tx_hash": tx_hash,
+            })
             details.append({
                 "schedule_id": schedule_id,
                 "status": "ok",
@@ -209,21 +223,32 @@ def create_claim(req: CreateClaimRequest):
         message=req.message,
         schedule_id=req.schedule_id,
     )
+    events.emit(events.CLAIM_CHANGED, {"worker_id": row["worker_id"]})
     return ClaimResponse(**row)
 
 
 @router.get("/claims/employer/{employer_id}", response_model=List[ClaimResponse])
-def list_employer_claims(employer_id: str):
-    """Employer views all claims addressed to them."""
-    rows = claim_repository.get_by_employer(employer_id.upper())
-    return [ClaimResponse(**r) for r in rows]
+def list_employer_claims(
+    employer_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+):
+    """Employer views claims addressed to them, newest first, one page at a time."""
+    rows = claim_repository.get_by_employer(employer_id.upper(), limit + 1, decode_cursor(cursor))
+    return [ClaimResponse(**r) for r in page(rows, limit, ("created_at", "id"), response)]
 
 
 @router.get("/claims/worker/{worker_id}", response_model=List[ClaimResponse])
-def list_worker_claims(worker_id: str):
-    """Worker views their submitted claims."""
-    rows = claim_repository.get_by_worker(worker_id.upper())
-    return [ClaimResponse(**r) for r in rows]
+def list_worker_claims(
+    worker_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+):
+    """Worker views their submitted claims, newest first, one page at a time."""
+    rows = claim_repository.get_by_worker(worker_id.upper(), limit + 1, decode_cursor(cursor))
+    return [ClaimResponse(**r) for r in page(rows, limit, ("created_at", "id"), response)]
 
 
 @router.patch("/claims/{claim_id}", response_model=ClaimResponse)
@@ -234,4 +259,5 @@ def update_claim(claim_id: str, req: UpdateClaimRequest):
     row = claim_repository.update_status(claim_id.upper(), req.status)
     if not row:
         raise HTTPException(status_code=404, detail=f"Claim '{claim_id}' not found.")
+    events.emit(events.CLAIM_CHANGED, {"worker_id": row["worker_id"]})
     return ClaimResponse(**row)
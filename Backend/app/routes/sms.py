@@ -0,0 +1,50 @@
+"""
+SMS Routes
+
+Africa's Talking delivery-report callback and outbox status.
+"""
+from fastapi import APIRouter, Form, HTTPException
+from pydantic import BaseModel
+
+from app.db.repositories import sms_outbox_repository
+
+router = APIRouter(prefix="/sms", tags=["SMS"])
+
+
+class DeliveryReportAck(BaseModel):
+    received: bool
+    matched: bool
+
+
+class OutboxStatusResponse(BaseModel):
+    id: int
+    recipient: str
+    status: str              # queued | sending | sent | delivered | undelivered | failed
+    attempts: int
+    provider_message_id: str = ""
+    provider_status: str = ""
+    cost: str = ""
+    last_error: str = ""
+    created_at: str
+    sent_at: str | None = None
+
+
+@router.post("/delivery-report", response_model=DeliveryReportAck)
+def delivery_report(
+    id: str = Form(...),
+    status: str = Form(...),
+    phoneNumber: str = Form(""),
+    failureReason: str = Form(""),
+):
+    """Receive an AT delivery report (configure this URL in the AT dashboard)."""
+    matched = sms_outbox_repository.update_delivery_status(id, status, failureReason)
+    return DeliveryReportAck(received=True, matched=matched)
+
+
+@router.get("/outbox/{outbox_id}", response_model=OutboxStatusResponse)
+def get_outbox_status(outbox_id: int):
+    """Look up the delivery status of a queued SMS."""
+    row = sms_outbox_repository.get_by_id(outbox_id)
+    if not row:
+        raise HTTPException(status_code=404, detail=f"SMS '{outbox_id}' not found.")
+    return OutboxStatusResponse(**row)
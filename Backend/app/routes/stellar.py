@@ -2,15 +2,27 @@
 Stellar Routes
 
 Stellar blockchain related endpoints.
+
+Transactions and their operations are immutable once Horizon returns them:
+they are served from ``HorizonService``'s permanent cache with
+``Cache-Control: immutable`` and the transaction hash as ETag, so a
+conditional request is answered without any lookup.
 """
-from fastapi import APIRouter, HTTPException
+import re
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
-from typing import Optional
 
+from app.services.horizon import get_horizon_service
 from app.services.stellar import StellarService
+from app.utils.exceptions import StellarError
+from app.utils.http_cache import IMMUTABLE, conditional, make_etag
 
 router = APIRouter(prefix="/stellar", tags=["Stellar"])
 
+_TX_HASH = re.compile(r"^[0-9a-fA-F]{64}$")
+
 
 class PlatformKeyResponse(BaseModel):
     platform_public_key: Optional[str]
@@ -26,4 +38,69 @@ def get_platform_public_key():
         public_key = service.platform_public_key
         return PlatformKeyResponse(platform_public_key=public_key)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _tx_hash(tx_hash: str) -> str:
+    if not _TX_HASH.match(tx_hash):
+        raise HTTPException(status_code=400, detail="Invalid transaction hash.")
+    return tx_hash.lower()
+
+
+def _horizon_error(e: StellarError) -> HTTPException:
+    if e.details.get("status") == 404:
+        return HTTPException(status_code=404, detail="Transaction not found.")
+    return HTTPException(status_code=502, detail=e.message)
+
+
+@router.get("/transactions/{tx_hash}", response_model=Dict[str, Any])
+def get_transaction(tx_hash: str, request: Request, response: Response):
+    """
+    Get a confirmed transaction by hash (cached; immutable).
+    """
+    tx_hash = _tx_hash(tx_hash)
+    not_modified = conditional(request, response, make_etag(tx_hash), IMMUTABLE)
+    if not_modified is not None:
+        return not_modified
+    try:
+        return get_horizon_service().get_transaction(tx_hash)
+    except StellarError as e:
+        raise _horizon_error(e)
+
+
+@router.get("/transactions/{tx_hash}/operations", response_model=List[Dict[str, Any]])
+def get_transaction_operations(tx_hash: str, request: Request, response: Response):
+    """
+    Get the operations of a confirmed transaction (cached; immutable).
+    """
+    tx_hash = _tx_hash(tx_hash)
+    not_modified = conditional(request, response, make_etag(tx_hash), IMMUTABLE)
+    if not_modified is not None:
+        return not_modified
+    try:
+        return get_horizon_service().get_transaction_operations(tx_hash)
+    except StellarError as e:
+        raise _horizon_error(e)
+
+
+@router.get("/ledgers/latest", response_model=Dict[str, Any])
+async def get_latest_ledger(request: Request, response: Response):
+    """
+    Get the latest closed ledger (cached for HORIZON_LEDGER_TTL_SECONDS across workers).
+    """
+    service = get_horizon_service()
+    try:
+        ledger = await service.aget_latest_ledger()
+    except StellarError as e:
+        raise HTTPException(status_code=502, detail=e.message)
+    max_age = int(service.settings.HORIZON_LEDGER_TTL_SECONDS)
+    cache_control = f"public, max-age={max_age}"
+    return conditional(request, response, make_etag(ledger.get("hash") or ""), cache_control) or ledger
+
+
+@router.get("/health")
+def horizon_health():
+    """
+    Check Horizon reachability and the latest ledger it reports.
+    """
+    return get_horizon_service().health_check()
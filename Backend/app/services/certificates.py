@@ -0,0 +1,128 @@
+"""
+Review Certificates
+
+PDF certificates for reviews submitted through ``/reviews/submit``.
+
+``certificate_for`` renders one review's certificate and
+``stream_certificates_zip`` renders every review received (or written)
+by a user, e.g. an agency exporting its workers' references.  Rendering
+goes through the PDF process pool (``app.services.pdf``), so exports use
+all cores without blocking the event loop, and the ZIP is streamed as
+certificates finish instead of being assembled in memory.
+"""
+import asyncio
+import io
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.db.repositories import get_by_worker_id, review_repository, schedule_repository
+from app.services.pdf import render_review_pdf_async, render_review_pdfs
+
+MAX_EXPORT_CERTIFICATES = 5000
+
+
+def _months_between(start: str, end: str) -> int:
+    s, e = datetime.strptime(start[:10], "%Y-%m-%d"), datetime.strptime(end[:10], "%Y-%m-%d")
+    return max(0, (e.year - s.year) * 12 + (e.month - s.month))
+
+
+def certificate_data(review: dict, reviewee: dict, schedule: Optional[dict] = None) -> dict:
+    """Build the ``generate_review_pdf`` input for a stored review."""
+    end_date = review["created_at"][:10]
+    start_date = schedule["created_at"][:10] if schedule else end_date
+    return {
+        "worker_name": reviewee.get("name") or f"Worker {reviewee['worker_id']}",
+        "worker_code": reviewee["worker_id"],
+        "role": reviewee.get("role") or "",
+        "start_date": start_date,
+        "end_date": end_date,
+        "duration_months": _months_between(start_date, end_date),
+        "rating": review["rating"],
+        "comment": review.get("comment") or "",
+        "reviewer_type": review["reviewer_role"],
+        "review_date": datetime.strptime(end_date, "%Y-%m-%d").strftime("%b %d, %Y"),
+        "stellar_tx_id": review.get("stellar_tx_hash") or "pending",
+        "explorer_url": review.get("explorer_url") or "pending",
+    }
+
+
+def _load_one(review_id: str) -> Optional[dict]:
+    review = review_repository.get_by_review_id(review_id)
+    if review is None:
+        return None
+    reviewee = get_by_worker_id(review["reviewee_id"]) or {"worker_id": review["reviewee_id"]}
+    schedule = schedule_repository.get_by_id(review["schedule_id"]) if review["schedule_id"] else None
+    return certificate_data(review, reviewee, schedule)
+
+
+def _load_export(user_id: str, written: bool) -> List[dict]:
+    reviews = (review_repository.get_reviews_by if written else review_repository.get_reviews_for)(
+        user_id, limit=MAX_EXPORT_CERTIFICATES
+    )
+    workers: Dict[str, dict] = {}
+    schedules: Dict[str, Optional[dict]] = {}
+    items = []
+    for review in reviews:
+        reviewee_id = review["reviewee_id"]
+        if reviewee_id not in workers:
+            workers[reviewee_id] = get_by_worker_id(reviewee_id) or {"worker_id": reviewee_id}
+        schedule_id = review["schedule_id"]
+        if schedule_id and schedule_id not in schedules:
+            schedules[schedule_id] = schedule_repository.get_by_id(schedule_id)
+        items.append({
+            "name": f"{review['review_id']}.pdf",
+            "data": certificate_data(review, workers[reviewee_id], schedules.get(schedule_id)),
+        })
+    return items
+
+
+async def load_certificate(review_id: str) -> Optional[dict]:
+    """``certificate_data`` for one stored review; None if it does not exist."""
+    return await asyncio.to_thread(_load_one, review_id)
+
+
+def is_final(data: dict) -> bool:
+    """Whether the certificate is final: the review is on-chain, so its content no longer changes."""
+    return data["stellar_tx_id"] != "pending"
+
+
+async def certificate_for(review_id: str) -> Optional[bytes]:
+    """Render (or fetch from cache) the certificate for one review; None if it does not exist."""
+    data = await load_certificate(review_id)
+    return await render_review_pdf_async(data) if data is not None else None
+
+
+async def export_items(user_id: str, written: bool = False) -> List[dict]:
+    """``{"name", "data"}`` per certificate for a user's received (or written) reviews."""
+    return await asyncio.to_thread(_load_export, user_id, written)
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable sink for ``zipfile``: collects written bytes until drained."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_certificates_zip(items: List[dict]) -> AsyncIterator[bytes]:
+    """Yield a ZIP archive of the certificates in *items* chunk by chunk."""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        names = iter(item["name"] for item in items)
+        async for pdf in render_review_pdfs(item["data"] for item in items):
+            archive.writestr(next(names), pdf)  # PDFs arrive in input order
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,39 @@
+"""
+Domain Events
+
+Minimal in-process hook registry.  Producers call ``emit`` after a state
+change has been committed; subscribers must be cheap (enqueue a job or
+write a row) because they run inline.  A failing subscriber is logged
+and never propagates into the producer.
+"""
+import logging
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+SCHEDULED_PAYMENT_SUCCEEDED = "scheduled_payment.succeeded"
+# payload: {"public_keys": [...]} – accounts whose balance changed
+PAYMENT_SETTLED = "payment.settled"
+# payload: {"worker_id": ...} – a worker's payment claim was created or updated
+CLAIM_CHANGED = "claim.changed"
+
+_subscribers: Dict[str, List[Callable[[dict], Any]]] = {}
+
+
+def subscribe(event: str):
+    """Decorator registering *func* to be called with the payload of every *event*."""
+    def decorator(func: Callable[[dict], Any]):
+        handlers = _subscribers.setdefault(event, [])
+        if func not in handlers:
+            handlers.append(func)
+        return func
+    return decorator
+
+
+def emit(event: str, payload: dict) -> None:
+    """Call every subscriber of *event*; exceptions are logged, not raised."""
+    for handler in _subscribers.get(event, []):
+        try:
+            handler(payload)
+        except Exception:
+            logger.exception("Event handler %s for %s failed", getattr(handler, "__name__", handler), event)
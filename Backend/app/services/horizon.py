@@ -2,13 +2,43 @@
 Horizon Service
 
 Direct Horizon API queries for various data.
+
+Horizon only returns transactions that are in a closed ledger, so a
+transaction and its operations never change once fetched.  They are kept
+in a bounded in-process LRU (``HORIZON_CACHE_MAX_ENTRIES``) and, with
+``HORIZON_CACHE_PERSIST``, in the ``horizon_cache`` table, so repeat
+lookups never go back to Horizon.
+
+The latest ledger changes every few seconds; ``aget_latest_ledger`` keeps
+it in Redis for ``HORIZON_LEDGER_TTL_SECONDS``, so all workers share one
+Horizon call per interval (each process also caches it locally, which is
+what is used while Redis is down).
 """
-from typing import Optional, Dict, List, Any
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, List, Any, Callable, Tuple
+
+import redis
 from stellar_sdk import Server
 
+from app.cache import get_async_redis
 from app.config import get_settings
+from app.db.repositories import horizon_cache_repository
 from app.utils.exceptions import StellarError
 
+logger = logging.getLogger(__name__)
+
+LATEST_LEDGER_KEY = "horizon:latest_ledger"
+
+
+def _status(error: Exception) -> Optional[int]:
+    """HTTP status of a Horizon error (404 for an unknown transaction), if any."""
+    return getattr(error, "status", None)
+
 
 class HorizonService:
     """
@@ -21,13 +51,38 @@ class HorizonService:
     - Streaming operations
     """
     
-    def __init__(self):
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
         self.settings = get_settings()
         self.server = Server(self.settings.stellar_horizon_url)
+        self._clock = clock
+        self._confirmed: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ledger: Optional[Tuple[float, Dict[str, Any]]] = None  # (expires_at, ledger)
+    
+    def _confirmed_lookup(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return the cached value for *key*, else *fetch* it and keep it for good."""
+        with self._lock:
+            if key in self._confirmed:
+                self._confirmed.move_to_end(key)
+                return self._confirmed[key]
+        
+        persist = self.settings.HORIZON_CACHE_PERSIST
+        value = horizon_cache_repository.get(key) if persist else None
+        if value is None:
+            value = fetch()
+            if persist:
+                horizon_cache_repository.put(key, value)
+        
+        with self._lock:
+            self._confirmed[key] = value
+            self._confirmed.move_to_end(key)
+            while len(self._confirmed) > self.settings.HORIZON_CACHE_MAX_ENTRIES:
+                self._confirmed.popitem(last=False)
+        return value
     
     def get_transaction(self, tx_hash: str) -> Dict[str, Any]:
         """
-        Get a transaction by its hash.
+        Get a transaction by its hash (cached permanently once fetched).
         
         Args:
             tx_hash: Transaction hash
@@ -35,6 +90,10 @@ class HorizonService:
         Returns:
             Transaction details
         """
+        tx_hash = tx_hash.lower()
+        return self._confirmed_lookup(f"tx:{tx_hash}", lambda: self._fetch_transaction(tx_hash))
+    
+    def _fetch_transaction(self, tx_hash: str) -> Dict[str, Any]:
         try:
             tx = self.server.transactions().transaction(tx_hash).call()
             return {
@@ -53,19 +112,26 @@ class HorizonService:
             raise StellarError(
                 message=f"Failed to get transaction: {str(e)}",
                 operation="get_transaction",
-                tx_hash=tx_hash
+                details={"tx_hash": tx_hash, "status": _status(e)}
             )
     
     def get_transaction_operations(
         self,
         tx_hash: str
     ) -> List[Dict[str, Any]]:
-        """Get operations for a transaction."""
+        """Get operations for a transaction (cached permanently once fetched)."""
+        tx_hash = tx_hash.lower()
+        return self._confirmed_lookup(f"ops:{tx_hash}", lambda: self._fetch_operations(tx_hash))
+    
+    def _fetch_operations(self, tx_hash: str) -> List[Dict[str, Any]]:
         try:
+            # A transaction has at most 100 operations, so one page holds them all.
             response = (
                 self.server
                 .operations()
                 .for_transaction(tx_hash)
+                .include_failed(True)
+                .limit(200)
                 .call()
             )
             return response.get("_embedded", {}).get("records", [])
@@ -73,7 +139,7 @@ class HorizonService:
             raise StellarError(
                 message=f"Failed to get operations: {str(e)}",
                 operation="get_operations",
-                tx_hash=tx_hash
+                details={"tx_hash": tx_hash, "status": _status(e)}
             )
     
     def get_account_transactions(
@@ -128,7 +194,42 @@ class HorizonService:
             )
     
     def get_latest_ledger(self) -> Dict[str, Any]:
-        """Get the latest ledger information."""
+        """Get the latest ledger information (cached in-process for ``HORIZON_LEDGER_TTL_SECONDS``)."""
+        now = self._clock()
+        cached = self._ledger
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        ledger = self._fetch_latest_ledger()
+        if ledger:
+            self._ledger = (now + self.settings.HORIZON_LEDGER_TTL_SECONDS, ledger)
+        return ledger
+    
+    async def aget_latest_ledger(self) -> Dict[str, Any]:
+        """
+        ``get_latest_ledger`` through Redis, so every worker shares one
+        Horizon call per ``HORIZON_LEDGER_TTL_SECONDS``.
+        
+        Falls back to the process-local cache while Redis is unavailable.
+        """
+        client = get_async_redis()
+        try:
+            raw = await client.get(LATEST_LEDGER_KEY)
+        except redis.RedisError as e:
+            logger.warning("Latest-ledger cache unavailable (%s); using local cache", e)
+            return await asyncio.to_thread(self.get_latest_ledger)
+        if raw:
+            return json.loads(raw)
+        
+        ledger = await asyncio.to_thread(self.get_latest_ledger)
+        if ledger:
+            ttl_ms = max(1, int(self.settings.HORIZON_LEDGER_TTL_SECONDS * 1000))
+            try:
+                await client.set(LATEST_LEDGER_KEY, json.dumps(ledger), px=ttl_ms)
+            except redis.RedisError as e:
+                logger.warning("Could not cache latest ledger (%s)", e)
+        return ledger
+    
+    def _fetch_latest_ledger(self) -> Dict[str, Any]:
         try:
             response = self.server.ledgers().limit(1).order("desc").call()
             ledgers = response.get("_embedded", {}).get("records", [])
@@ -160,7 +261,7 @@ class HorizonService:
             ledger = self.get_latest_ledger()
             return {
                 "healthy": True,
-                "network": self.settings.stellar_network,
+                "network": self.settings.STELLAR_NETWORK,
                 "horizon_url": self.settings.stellar_horizon_url,
                 "latest_ledger": ledger.get("sequence"),
                 "latest_ledger_time": ledger.get("closed_at"),
@@ -169,7 +270,7 @@ class HorizonService:
             return {
                 "healthy": False,
                 "error": str(e),
-                "network": self.settings.stellar_network,
+                "network": self.settings.STELLAR_NETWORK,
             }
 
 
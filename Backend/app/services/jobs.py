@@ -0,0 +1,213 @@
+"""
+Background Jobs
+
+Durable, SQLite-backed job queue for work that must not run on the
+request path (e.g. crediting a Stellar account after an M-Pesa payment).
+
+Handlers are plain synchronous functions registered per job kind; they
+run in worker threads (up to ``JOB_CONCURRENCY`` at once) so blocking
+Stellar / HTTP calls don't stall the event loop and slow jobs don't hold
+up the rest of the batch.  A handler that raises is retried with
+exponential backoff until ``max_attempts`` is reached; the optional
+``on_failure`` callback then sees the payload and the last error.
+``RetryLaterError`` postpones a job without using up an attempt.
+
+Kinds registered with a ``serial_key`` run one at a time per key (e.g.
+jobs submitting from the same Stellar account, which would otherwise race
+for its sequence number and fail with ``tx_bad_seq``).
+"""
+import asyncio
+import logging
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.db.repositories import job_repository
+
+logger = logging.getLogger(__name__)
+
+JOB_POLL_INTERVAL_SECONDS = 5
+JOB_BATCH_SIZE = 20
+JOB_CONCURRENCY = 8
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 600
+STALE_SWEEP_INTERVAL_SECONDS = 60
+
+_handlers: Dict[str, Callable[[dict], Any]] = {}
+_failure_handlers: Dict[str, Callable[[dict, str], Any]] = {}
+_serial_keys: Dict[str, Callable[[dict], str]] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_wake_event: Optional[asyncio.Event] = None
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot succeed."""
+
+
+class RetryLaterError(Exception):
+    """Raised by a handler that must wait *delay_seconds* (not a failed attempt)."""
+
+    def __init__(self, message: str, delay_seconds: float):
+        super().__init__(message)
+        self.delay_seconds = delay_seconds
+
+
+def register(
+    kind: str,
+    on_failure: Optional[Callable[[dict, str], Any]] = None,
+    serial_key: Optional[Callable[[dict], str]] = None,
+):
+    """
+    Decorator registering *func* as the handler for jobs of *kind*.
+
+    *on_failure(payload, error)* runs once when a job of this kind fails
+    for good (permanent error or attempts exhausted).  Jobs whose
+    *serial_key(payload)* is equal never run concurrently.
+    """
+    def decorator(func: Callable[[dict], Any]):
+        _handlers[kind] = func
+        if on_failure is not None:
+            _failure_handlers[kind] = on_failure
+        if serial_key is not None:
+            _serial_keys[kind] = serial_key
+        return func
+    return decorator
+
+
+def _gave_up(job: dict, error: str) -> None:
+    callback = _failure_handlers.get(job["kind"])
+    if callback is None:
+        return
+    try:
+        callback(job["payload"], error)
+    except Exception:
+        logger.exception("on_failure for job %s (%s) failed", job["id"], job["kind"])
+
+
+def enqueue(
+    kind: str,
+    payload: dict,
+    dedupe_key: Optional[str] = None,
+    delay_seconds: float = 0,
+    max_attempts: int = 5,
+) -> Optional[int]:
+    """
+    Queue a job and wake the worker.
+
+    Returns the job id, or None when *dedupe_key* was already queued.
+    """
+    job_id = job_repository.enqueue(
+        kind, payload, dedupe_key=dedupe_key,
+        delay_seconds=delay_seconds, max_attempts=max_attempts,
+    )
+    if job_id is not None and delay_seconds <= 0:
+        wake()
+    return job_id
+
+
+def wake() -> None:
+    """Wake the worker loop (safe to call from any thread)."""
+    if _loop is not None and _wake_event is not None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_wake_event.set)
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * (2 ** (attempts - 1)), RETRY_MAX_SECONDS)
+
+
+def run_job(job: dict) -> bool:
+    """Execute one claimed job and record its outcome. Returns True on success."""
+    handler = _handlers.get(job["kind"])
+    if handler is None:
+        job_repository.fail(job["id"], f"No handler for job kind '{job['kind']}'", None)
+        return False
+    try:
+        handler(job["payload"])
+    except RetryLaterError as e:
+        logger.info("Job %s (%s) deferred %.0fs: %s", job["id"], job["kind"], e.delay_seconds, e)
+        job_repository.defer(job["id"], str(e), e.delay_seconds)
+        return False
+    except PermanentJobError as e:
+        logger.warning("Job %s (%s) failed permanently: %s", job["id"], job["kind"], e)
+        job_repository.fail(job["id"], str(e), None)
+        _gave_up(job, str(e))
+        return False
+    except Exception as e:
+        traceback.print_exc()
+        retry = _retry_delay(job["attempts"]) if job["attempts"] < job["max_attempts"] else None
+        logger.warning(
+            "Job %s (%s) attempt %s failed: %s", job["id"], job["kind"], job["attempts"], e
+        )
+        job_repository.fail(job["id"], str(e), retry)
+        if retry is None:
+            _gave_up(job, str(e))
+        return False
+    job_repository.complete(job["id"])
+    return True
+
+
+def _lanes(jobs: List[dict]) -> List[List[dict]]:
+    """Group *jobs* so that those sharing a serial key run in order in one lane."""
+    lanes: List[List[dict]] = []
+    by_key: Dict[str, List[dict]] = {}
+    for job in jobs:
+        key_func = _serial_keys.get(job["kind"])
+        if key_func is None:
+            lanes.append([job])
+            continue
+        key = key_func(job["payload"])
+        if key not in by_key:
+            by_key[key] = []
+            lanes.append(by_key[key])
+        by_key[key].append(job)
+    return lanes
+
+
+def _run_lane(lane: List[dict]) -> List[bool]:
+    return [run_job(job) for job in lane]
+
+
+def run_pending(limit: int = JOB_BATCH_SIZE, concurrency: int = JOB_CONCURRENCY) -> dict:
+    """Claim and run ready jobs once. Returns counts of succeeded / failed jobs."""
+    jobs = job_repository.claim(limit=limit, kinds=list(_handlers) or None)
+    lanes = _lanes(jobs)
+    if len(lanes) > 1 and concurrency > 1:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(lanes)), thread_name_prefix="job") as pool:
+            outcomes = [ok for lane in pool.map(_run_lane, lanes) for ok in lane]
+    else:
+        outcomes = [ok for lane in lanes for ok in _run_lane(lane)]
+    done = sum(1 for ok in outcomes if ok)
+    return {"done": done, "failed": len(outcomes) - done}
+
+
+async def run_worker_loop(poll_interval: float = JOB_POLL_INTERVAL_SECONDS) -> None:
+    """Background loop: run ready jobs whenever woken or every *poll_interval* seconds."""
+    global _loop, _wake_event
+    _loop = asyncio.get_running_loop()
+    _wake_event = asyncio.Event()
+    next_sweep = 0.0
+    try:
+        while True:
+            try:
+                if time.monotonic() >= next_sweep:
+                    # Jobs left 'running' by a crashed worker; not just at startup,
+                    # since after a quick restart they are not stale yet.
+                    requeued = await asyncio.to_thread(job_repository.requeue_stale)
+                    if requeued:
+                        logger.warning("Requeued %s stale running job(s)", requeued)
+                    next_sweep = time.monotonic() + STALE_SWEEP_INTERVAL_SECONDS
+                result = await asyncio.to_thread(run_pending)
+                if result["done"] or result["failed"]:
+                    logger.info("Job run: done=%s failed=%s", result["done"], result["failed"])
+                    continue  # drain the queue before sleeping
+            except Exception:
+                logger.exception("Job worker error")
+            try:
+                await asyncio.wait_for(_wake_event.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            _wake_event.clear()
+    finally:
+        _loop = None
+        _wake_event = None
@@ -0,0 +1,330 @@
+"""
+M-Pesa Service
+
+On-ramp orchestration (STK Push collection, provider webhook handling and
+queued Stellar crediting) and the off-ramp (Stellar burn + B2C payout),
+shared by the REST routes and the USSD menu.
+
+On-ramp flow:
+  1. ``initiate_onramp`` triggers the STK Push and records the collection
+     (``pending``, or ``paid`` when the provider confirms synchronously, as
+     the demo does).  The request returns immediately.
+  2. IntaSend calls the webhook; ``handle_collection_event`` stores the
+     event (deduplicated by invoice id + state) and, on ``COMPLETE``
+     confirmed by IntaSend's status API, moves the collection to ``paid``
+     and queues an ``onramp_credit`` job.
+  3. The job worker runs ``credit_collection``, which claims the row with
+     a ``paid`` → ``crediting`` compare-and-set, records the signed
+     payment's hash and only then submits it.  A retry after an ambiguous
+     outcome (timeout, 5xx, crash) looks that hash up on Horizon before
+     building a new payment, so each collection is credited exactly once.
+"""
+import json
+import logging
+import time
+import traceback
+from typing import Any, Dict, Optional
+
+from stellar_sdk import Keypair
+
+from app.config import get_settings
+from app.db.repositories import collection_repository, offramp_payout_repository
+from app.integrations.mpesa.b2c import mpesa_b2c_payout
+from app.integrations.mpesa.stk_push import collection_state, mpesa_collect
+from app.integrations.stellar import decrypt_secret
+from app.services import events, jobs
+from app.services.horizon import get_horizon_service
+from app.services.payments import PaymentService, get_payment_service
+from app.utils.exceptions import StellarError
+from app.utils.stellar_helpers import build_stellar_explorer_url
+
+logger = logging.getLogger(__name__)
+
+ONRAMP_CREDIT_JOB = "onramp_credit"
+# A credit transaction still missing from Horizon this long after its time
+# bound can never be applied, so a new one may be built.
+CREDIT_EXPIRY_MARGIN_SECONDS = 30
+
+# IntaSend collection states
+STATE_COMPLETE = "COMPLETE"
+STATE_FAILED = "FAILED"
+
+
+class OfframpError(Exception):
+    """
+    An off-ramp step failed.
+
+    ``stage`` is ``"config"``, ``"stellar"`` (nothing moved) or ``"mpesa"``
+    (KSH already burned, ``stellar_tx_hash`` set – needs support follow-up).
+    """
+
+    def __init__(self, message: str, stage: str, stellar_tx_hash: Optional[str] = None):
+        super().__init__(message)
+        self.stage = stage
+        self.stellar_tx_hash = stellar_tx_hash
+
+
+def _queue_credit(invoice_id: str) -> None:
+    jobs.enqueue(
+        ONRAMP_CREDIT_JOB,
+        {"invoice_id": invoice_id},
+        dedupe_key=f"{ONRAMP_CREDIT_JOB}:{invoice_id}",
+    )
+
+
+def initiate_onramp(public_key: str, phone: str, amount_kes: float) -> Dict[str, Any]:
+    """
+    Start an M-Pesa on-ramp for *public_key*.
+
+    Returns the stored collection row merged with the provider message.
+
+    Raises:
+        ValueError: if the provider rejected the collection request.
+    """
+    result = mpesa_collect(phone=phone, amount_kes=amount_kes)
+    if not result.success:
+        raise ValueError(result.message)
+
+    status = "paid" if result.status == "completed" else "pending"
+    row = collection_repository.create(
+        invoice_id=result.invoice_id or result.transaction_id,
+        public_key=public_key,
+        phone=result.phone,
+        amount_kes=str(result.amount_kes),
+        amount_ksh=f"{result.amount_ksh:.7f}",
+        provider=result.provider,
+        status=status,
+        message=result.message,
+    )
+    if status == "paid":
+        _queue_credit(row["invoice_id"])
+
+    row["transaction_id"] = result.transaction_id
+    return row
+
+
+def handle_collection_event(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Process one provider webhook delivery.
+
+    Returns a small status dict; replays and unknown invoices are
+    acknowledged without side effects so the provider stops retrying.
+    A ``COMPLETE`` for a pending collection is only acted on when IntaSend's
+    status API agrees; otherwise it is acknowledged and ignored.
+
+    Raises:
+        ValueError: the payload lacks ``invoice_id`` or ``state``.
+        CollectionStatusError: the state could not be confirmed (retry later).
+    """
+    invoice_id = str(payload.get("invoice_id") or "").strip()
+    state = str(payload.get("state") or "").strip().upper()
+    if not invoice_id or not state:
+        raise ValueError("Webhook payload must include invoice_id and state.")
+
+    if state == STATE_COMPLETE:
+        pending = collection_repository.get_by_invoice(invoice_id)
+        if pending is not None and pending["status"] == "pending":
+            confirmed = collection_state(invoice_id)
+            if confirmed != STATE_COMPLETE:
+                logger.warning(
+                    "M-Pesa webhook reports %s COMPLETE but IntaSend says %r; ignoring",
+                    invoice_id, confirmed,
+                )
+                return {"invoice_id": invoice_id, "state": state, "unconfirmed": True}
+
+    if not collection_repository.record_event(invoice_id, state, json.dumps(payload)):
+        return {"invoice_id": invoice_id, "state": state, "duplicate": True}
+
+    collection = collection_repository.get_by_invoice(invoice_id)
+    if collection is None:
+        logger.warning("M-Pesa webhook for unknown invoice %s (%s)", invoice_id, state)
+        return {"invoice_id": invoice_id, "state": state, "unknown_invoice": True}
+
+    if state == STATE_COMPLETE:
+        if collection_repository.transition(invoice_id, "pending", "paid"):
+            _queue_credit(invoice_id)
+    elif state == STATE_FAILED:
+        reason = payload.get("failed_reason") or "M-Pesa payment failed."
+        collection_repository.transition(invoice_id, "pending", "failed", message=str(reason))
+
+    return {"invoice_id": invoice_id, "state": state, "duplicate": False}
+
+
+def _mark_credited(collection: dict, tx_hash: str) -> None:
+    collection_repository.transition(
+        collection["invoice_id"], "crediting", "credited", stellar_tx_hash=tx_hash
+    )
+    events.emit(events.PAYMENT_SETTLED, {"public_keys": [collection["public_key"]]})
+    logger.info("Credited on-ramp %s to %s", collection["invoice_id"], collection["public_key"])
+
+
+def _reconcile_credit(collection: dict) -> bool:
+    """
+    Settle a collection left in ``crediting`` by an earlier attempt.
+
+    Returns True when its recorded transaction landed (now marked
+    credited), False when a new transaction must be submitted.  Raises
+    while the recorded transaction may still be applied.
+    """
+    tx_hash = collection["stellar_tx_hash"]
+    if not tx_hash:
+        return False  # claimed, but nothing was submitted
+    try:
+        tx = get_horizon_service().get_transaction(tx_hash)
+    except StellarError as e:
+        if e.details.get("status") != 404:
+            raise
+        if time.time() < (collection["credit_expires_at"] or 0) + CREDIT_EXPIRY_MARGIN_SECONDS:
+            raise RuntimeError(
+                f"Credit {tx_hash} for {collection['invoice_id']} is not on-chain yet; checking again later."
+            )
+        return False  # expired without landing
+    if not tx.get("successful"):
+        return False  # failed on-chain: nothing was paid
+    _mark_credited(collection, tx_hash)
+    return True
+
+
+def _release(invoice_id: str) -> None:
+    """Return the claim to ``paid`` (nothing was applied) for the next attempt."""
+    collection_repository.transition(invoice_id, "crediting", "paid", stellar_tx_hash="")
+
+
+# Every credit is paid from the one platform account, so credits run one at
+# a time to keep its sequence number from racing (tx_bad_seq).
+@jobs.register(ONRAMP_CREDIT_JOB, serial_key=lambda payload: "platform")
+def credit_collection(payload: Dict[str, Any]) -> None:
+    """
+    Job handler: credit the Stellar account for a paid collection (exactly once).
+
+    The signed payment's hash is recorded before submission.  The claim is
+    only released when Horizon rejected the payment (HTTP 400); any other
+    failure keeps the collection ``crediting`` and the retry reconciles it
+    against Horizon first.
+    """
+    invoice_id = payload["invoice_id"]
+    if not collection_repository.transition(invoice_id, "paid", "crediting"):
+        collection = collection_repository.get_by_invoice(invoice_id)
+        if collection is None or collection["status"] != "crediting":
+            return  # already credited, failed or not paid – nothing to do
+        if _reconcile_credit(collection):
+            return
+
+    collection = collection_repository.get_by_invoice(invoice_id)
+    settings = get_settings()
+    payment_service = get_payment_service()
+    try:
+        if not settings.stellar_platform_secret:
+            raise jobs.PermanentJobError("Platform Stellar account not configured.")
+        envelope = payment_service.prepare_payment(
+            sender_keypair=Keypair.from_secret(settings.stellar_platform_secret),
+            destination_public_key=collection["public_key"],
+            amount=collection["amount_ksh"],
+            memo=f"M-Pesa {invoice_id}"[:28],
+        )
+    except Exception:
+        _release(invoice_id)
+        raise
+
+    tx_hash = envelope.hash_hex()
+    collection_repository.transition(
+        invoice_id, "crediting", "crediting",
+        stellar_tx_hash=tx_hash,
+        credit_expires_at=envelope.transaction.preconditions.time_bounds.max_time,
+    )
+    try:
+        payment_service.submit(envelope)
+    except StellarError as e:
+        if e.details.get("status") == 400:
+            _release(invoice_id)  # rejected (e.g. tx_bad_seq): nothing was applied
+        raise  # otherwise the outcome is unknown; the retry reconciles via tx_hash
+
+    _mark_credited(collection, tx_hash)
+
+
+def _record_payout(
+    sender_row: dict, phone: str, amount: str, stellar_tx_hash: str, status: str, **fields
+) -> None:
+    """Store the payout outcome; ``failed`` ones were burned but not paid and need follow-up."""
+    if status == "failed":
+        logger.error(
+            "Off-ramp payout to %s failed after burn %s (%s KSH); recorded for support follow-up",
+            phone, stellar_tx_hash, amount,
+        )
+    try:
+        offramp_payout_repository.create(
+            sender_row["stellar_public_key"], phone, str(amount), stellar_tx_hash, status, **fields
+        )
+    except Exception:
+        logger.exception("Could not record off-ramp payout for burn %s", stellar_tx_hash)
+
+
+def initiate_offramp(
+    sender_row: dict,
+    phone: str,
+    amount: str,
+    payment_service: Optional[PaymentService] = None,
+) -> Dict[str, Any]:
+    """
+    Off-ramp *amount* KSH from the sender's Stellar wallet to M-Pesa.
+
+    Burns KSH by paying the platform account, then triggers the B2C payout
+    to *phone*.  *sender_row* is a worker row including
+    ``stellar_secret_encrypted``.  Every payout after a burn is recorded in
+    ``offramp_payouts``; a failed one (``success`` False or
+    ``OfframpError(stage="mpesa")``) is left there as ``failed`` for support.
+
+    Returns the payout fields plus ``stellar_tx_hash`` / ``stellar_explorer_url``.
+
+    Raises:
+        OfframpError: with the failing ``stage``.
+    """
+    platform_public = get_settings().stellar_platform_public
+    if not platform_public:
+        raise OfframpError("Platform Stellar account not configured.", stage="config")
+
+    payment_service = payment_service or get_payment_service()
+    try:
+        sender_keypair = Keypair.from_secret(decrypt_secret(sender_row["stellar_secret_encrypted"]))
+        result = payment_service.send_payment(
+            sender_keypair=sender_keypair,
+            destination_public_key=platform_public,
+            amount=amount,
+            memo="M-Pesa off-ramp",
+        )
+    except Exception as e:
+        traceback.print_exc()
+        raise OfframpError(f"Stellar burn transaction failed: {e}", stage="stellar") from e
+
+    stellar_tx_hash = result.get("hash", "")
+    events.emit(events.PAYMENT_SETTLED, {"public_keys": [sender_row["stellar_public_key"]]})
+    try:
+        payout = mpesa_b2c_payout(phone=phone, amount_ksh=float(amount))
+    except Exception as e:
+        traceback.print_exc()
+        _record_payout(sender_row, phone, amount, stellar_tx_hash, "failed", message=str(e))
+        raise OfframpError(
+            f"Stellar transfer succeeded (tx: {stellar_tx_hash}) but M-Pesa payout failed: {e}. Contact support.",
+            stage="mpesa",
+            stellar_tx_hash=stellar_tx_hash,
+        ) from e
+
+    _record_payout(
+        sender_row, phone, amount, stellar_tx_hash,
+        payout.status if payout.success else "failed",
+        mpesa_transaction_id=payout.transaction_id,
+        message=payout.message,
+    )
+    return {
+        "success": payout.success,
+        "stellar_tx_hash": stellar_tx_hash,
+        "stellar_explorer_url": build_stellar_explorer_url(stellar_tx_hash),
+        "mpesa_transaction_id": payout.transaction_id,
+        "phone": payout.phone,
+        "amount_ksh": payout.amount_ksh,
+        "amount_kes": payout.amount_kes,
+        "exchange_rate": payout.exchange_rate,
+        "mpesa_status": payout.status,
+        "message": payout.message,
+        "provider": payout.provider,
+    }
@@ -0,0 +1,119 @@
+"""
+NFT Mint Batcher
+
+Collects review NFT mint requests from concurrent callers and mints them
+together with ``mint_review_nfts``, so several reviews share one
+transaction (fewer fees and ledger round trips) and the funding account's
+sequence number is only used by one submission at a time per process.
+
+A batch is flushed ``NFT_BATCH_WINDOW_MS`` after its first request, or
+immediately once it holds a full transaction's worth of operations.
+Each caller gets a ``Future`` resolving to its own ``NftMintResult``.
+"""
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from typing import Callable, List, Optional, Tuple
+
+from app.config import Config
+from app.integrations.stellar.nft import (
+    MAX_OPS_PER_TX,
+    MAX_SIGNATURES_PER_TX,
+    NftMintRequest,
+    NftMintResult,
+    mint_review_nfts,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MintBatcher:
+    """Thread-safe micro-batcher in front of ``mint_review_nfts``."""
+
+    def __init__(
+        self,
+        window_seconds: float = Config.NFT_BATCH_WINDOW_MS / 1000.0,
+        minter: Callable[[List[NftMintRequest]], List[NftMintResult]] = mint_review_nfts,
+    ):
+        self.window_seconds = window_seconds
+        self._minter = minter
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()  # one transaction in flight per process
+        self._pending: List[Tuple[NftMintRequest, Future]] = []
+        self._ops = 0
+        self._timer: Optional[threading.Timer] = None
+
+    def submit(self, request: NftMintRequest) -> Future:
+        """Queue *request* for the next batch; the future resolves to its ``NftMintResult``."""
+        future: Future = Future()
+        with self._lock:
+            self._pending.append((request, future))
+            self._ops += request.op_count
+            full = self._ops >= MAX_OPS_PER_TX or len(self._pending) >= MAX_SIGNATURES_PER_TX - 1
+            if full:
+                batch = self._take()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            threading.Thread(target=self._mint, args=(batch,), daemon=True).start()
+        return future
+
+    def mint(self, request: NftMintRequest, timeout: Optional[float] = None) -> NftMintResult:
+        """
+        Submit *request* and block until its batch has been minted.
+
+        On timeout the request is withdrawn if its batch has not started;
+        once it is being submitted this waits for the outcome instead, so
+        a caller that retries never races its own transaction.
+        """
+        future = self.submit(request)
+        try:
+            return future.result(timeout)
+        except FuturesTimeoutError:
+            if future.cancel():
+                raise
+            return future.result()
+
+    def flush(self) -> None:
+        """Mint whatever is pending now (called by the window timer)."""
+        with self._lock:
+            batch = self._take()
+        self._mint(batch)
+
+    def _take(self) -> List[Tuple[NftMintRequest, Future]]:
+        batch, self._pending, self._ops = self._pending, [], 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _mint(self, batch: List[Tuple[NftMintRequest, Future]]) -> None:
+        if not batch:
+            return
+        with self._submit_lock:
+            batch = [(request, future) for request, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                return
+            try:
+                results = self._minter([request for request, _ in batch])
+            except Exception as e:
+                logger.warning("NFT batch of %d failed: %s", len(batch), e)
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+        logger.info("Minted NFT batch of %d (%d failed)", len(batch), sum(1 for r in results if not r.success))
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+_batcher: Optional[MintBatcher] = None
+
+
+def get_mint_batcher() -> MintBatcher:
+    """Get or create the process-wide mint batcher."""
+    global _batcher
+    if _batcher is None:
+        _batcher = MintBatcher()
+    return _batcher
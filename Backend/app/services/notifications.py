@@ -0,0 +1,75 @@
+"""
+Notifications Service
+
+Payday SMS fan-out for scheduled payments.
+
+``_run_due_payments`` emits ``scheduled_payment.succeeded`` per payment.
+The subscriber here only adds the amount to the worker's
+``payday_notifications`` row and queues a ``payday_notify`` job delayed by
+``PAYDAY_NOTIFY_COALESCE_SECONDS``; the job key is per worker, pay date
+and notification round, so every payment landing inside the window
+(e.g. two employers paying the same day) collapses into one job and one
+SMS.  The job hands the message to the SMS outbox, which batches the
+actual Africa's Talking calls.
+"""
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict
+
+from app.config import Config
+from app.db.repositories import get_by_worker_id, payday_notification_repository
+from app.services import events, jobs
+from app.services.sms_outbox import enqueue_sms
+
+logger = logging.getLogger(__name__)
+
+PAYDAY_NOTIFY_JOB = "payday_notify"
+
+
+def _format_amount(amount: str) -> str:
+    return f"{Decimal(amount):,.2f}"
+
+
+def build_payday_message(amount: str, payments: int, employers: int) -> str:
+    """Text of the payday SMS for a coalesced notification round."""
+    if employers > 1:
+        source = f"from {employers} employers"
+    elif payments > 1:
+        source = f"in {payments} payments"
+    else:
+        source = "from your employer"
+    return f"NannyChain: Payday! You received {_format_amount(amount)} KSH {source}. Check your balance on NannyChain."
+
+
+@events.subscribe(events.SCHEDULED_PAYMENT_SUCCEEDED)
+def on_scheduled_payment(payload: Dict[str, Any]) -> None:
+    """Record the payment and queue (or join) the worker's payday notification."""
+    worker_id = payload["worker_id"]
+    pay_date = payload.get("pay_date") or datetime.utcnow().strftime("%Y-%m-%d")
+    row = payday_notification_repository.record_payment(
+        worker_id, pay_date, str(payload["amount"]), payload.get("employer_id", "")
+    )
+    jobs.enqueue(
+        PAYDAY_NOTIFY_JOB,
+        {"worker_id": worker_id, "pay_date": pay_date},
+        dedupe_key=f"{PAYDAY_NOTIFY_JOB}:{worker_id}:{pay_date}:{row['notifications_sent']}",
+        delay_seconds=Config.PAYDAY_NOTIFY_COALESCE_SECONDS,
+    )
+
+
+@jobs.register(PAYDAY_NOTIFY_JOB)
+def send_payday_notification(payload: Dict[str, Any]) -> None:
+    """Job handler: turn the pending payday totals into one queued SMS."""
+    worker = get_by_worker_id(payload["worker_id"])
+    if not worker or not worker.get("phone"):
+        raise jobs.PermanentJobError(f"Worker {payload['worker_id']} has no phone number.")
+
+    pending = payday_notification_repository.take_pending(payload["worker_id"], payload["pay_date"])
+    if pending is None:
+        return  # already covered by an earlier round
+
+    employers = len([e for e in pending["pending_employers"].split(",") if e])
+    message = build_payday_message(pending["pending_amount"], pending["pending_payments"], employers)
+    enqueue_sms(worker["phone"], message)
+    logger.info("Queued payday SMS for %s (%s payments)", payload["worker_id"], pending["pending_payments"])
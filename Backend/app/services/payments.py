@@ -97,6 +97,25 @@ class PaymentService:
         Returns:
             Transaction result
         """
+        return self.submit(self.prepare_payment(sender_keypair, destination_public_key, amount, memo))
+    
+    def prepare_payment(
+        self,
+        sender_keypair: Keypair,
+        destination_public_key: str,
+        amount: str,
+        memo: Optional[str] = None
+    ):
+        """
+        Build and sign a payment without submitting it.
+        
+        The envelope's ``hash_hex()`` identifies the transaction on-chain
+        before it is submitted, so callers can record it first and look it
+        up after an ambiguous submission.
+        
+        Returns:
+            Signed TransactionEnvelope
+        """
         transaction = self.build_payment_transaction(
             source_public_key=sender_keypair.public_key,
             destination_public_key=destination_public_key,
@@ -105,6 +124,10 @@ class PaymentService:
         )
         
         transaction.sign(sender_keypair)
+        return transaction
+    
+    def submit(self, transaction) -> Dict[str, Any]:
+        """Submit a signed transaction (see ``StellarService.submit_transaction``)."""
         return self.stellar.submit_transaction(transaction)
     
     def get_payment_history(
@@ -1,75 +1,282 @@
-"""PDF generation for review certificates."""
+"""PDF generation for review certificates.
+
+Certificates share one fixed layout, so nothing is rebuilt per document:
+paragraph styles are created once at import, the static parts of the page
+(titles, field labels, footer) are drawn by ``_draw_static`` at fixed
+positions, and only the review's own values are laid out per certificate.
+The canvas is ``invariant`` (no timestamp or random document id), so the
+same review data always produces the same bytes.
+
+``generate_review_pdf`` keeps rendered certificates in a bounded in-memory
+cache keyed by a hash of the review data (``certificate_key``); a retry or
+re-download of the same certificate returns the cached bytes.
+
+Rendering is CPU-bound, so async callers use ``render_review_pdf_async`` /
+``render_review_pdfs``, which run cache misses on a shared
+``ProcessPoolExecutor`` (``PDF_RENDER_WORKERS`` processes) instead of on
+the event loop.  Bulk renders keep at most ``2 * PDF_RENDER_WORKERS``
+certificates in flight.  Workers are started with ``forkserver`` (or
+``spawn``), never forked from the threaded app process, and
+``warm_pdf_pool`` starts them all at app startup.
+"""
+import asyncio
+import hashlib
 import io
+import json
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import AsyncIterator, Iterable, Optional
+from xml.sax.saxutils import escape
+
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, KeepInFrame
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.colors import HexColor
 
+from app.config import Config
+
+# Bump when the layout changes so cached certificates are not reused.
+TEMPLATE_VERSION = "1"
+
+_sample = getSampleStyleSheet()
+
 # Custom style for QR code text
 qr_style = ParagraphStyle(
     'QRCodeText',
-    parent=getSampleStyleSheet()['Normal'],
+    parent=_sample['Normal'],
     alignment=TA_CENTER,
     fontSize=8,
     textColor=HexColor('#333333'),
     leading=10
 )
+_body_style = _sample['Normal']
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+MARGIN = inch / 2
+CONTENT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+VALUE_X = MARGIN + 1.2 * inch           # values start right of the field labels
+FIELD_TOP = PAGE_HEIGHT - MARGIN - 1.1 * inch
+FIELD_LEADING = 14
+COMMENT_TOP = FIELD_TOP - 6 * FIELD_LEADING
+COMMENT_HEIGHT = 3.5 * inch             # long comments are shrunk to fit
+REVIEWED_Y = COMMENT_TOP - COMMENT_HEIGHT - 0.3 * inch
+
+_FIELDS = ("Worker:", "Employer Type:", "Role:", "Duration:", "Rating:")
+
+_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _draw_static(c: canvas.Canvas) -> None:
+    """Draw the parts of the certificate that are identical for every review."""
+    top = PAGE_HEIGHT - MARGIN
+    c.setFont("Helvetica-Bold", 18)
+    c.drawString(MARGIN, top - 20, "🔷 NannyChain")
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(MARGIN, top - 48, "Verified Work Review")
+
+    c.setFont("Helvetica-Bold", 10)
+    for i, label in enumerate(_FIELDS):
+        c.drawString(MARGIN, FIELD_TOP - i * FIELD_LEADING, label)
+    c.drawString(MARGIN, COMMENT_TOP + FIELD_LEADING, "Comment:")
+    c.drawString(MARGIN, REVIEWED_Y, "Reviewed:")
+
+    c.setFont("Helvetica-Bold", 8)
+    c.setFillColor(HexColor('#333333'))
+    c.drawCentredString(PAGE_WIDTH / 2, REVIEWED_Y - 24, "Verify on Stellar:")
+
+    c.setFont("Helvetica-Oblique", 10)
+    c.setFillColor(HexColor('#555555'))
+    c.drawString(MARGIN, MARGIN + 24, "Verified by NannyChain")
+    c.setFont("Helvetica-Oblique", 8)
+    c.setFillColor(HexColor('#777777'))
+    c.drawString(MARGIN, MARGIN + 12, "This is a secure, blockchain-verified document.")
+    c.setFillColor(HexColor('#000000'))
+
+
+def _draw_fields(c: canvas.Canvas, review_data: dict) -> None:
+    """Draw the per-review values into the template's slots."""
+    rating = int(review_data['rating'])
+    values = (
+        f"{review_data['worker_name']} ({review_data['worker_code']})",
+        str(review_data['reviewer_type']).capitalize(),
+        str(review_data['role']),
+        f"{review_data['start_date']} – {review_data['end_date']} ({review_data['duration_months']}mo)",
+    )
+    c.setFont("Helvetica", 10)
+    for i, value in enumerate(values):
+        c.drawString(VALUE_X, FIELD_TOP - i * FIELD_LEADING, value)
+    rating_y = FIELD_TOP - len(values) * FIELD_LEADING
+    c.setFillColor(HexColor('#FFD700'))
+    c.drawString(VALUE_X, rating_y, "★" * rating + "☆" * (5 - rating))
+    c.setFillColor(HexColor('#000000'))
+    c.drawString(VALUE_X + 60, rating_y, f"({rating}/5)")
+
+    comment = Paragraph(escape(str(review_data['comment'])), _body_style)
+    _, height = comment.wrapOn(c, CONTENT_WIDTH, COMMENT_HEIGHT)
+    if height > COMMENT_HEIGHT:
+        comment = KeepInFrame(CONTENT_WIDTH, COMMENT_HEIGHT, [comment], mode='shrink')
+        _, height = comment.wrapOn(c, CONTENT_WIDTH, COMMENT_HEIGHT)
+    comment.drawOn(c, MARGIN, COMMENT_TOP - height)
+
+    c.drawString(VALUE_X, REVIEWED_Y, str(review_data['review_date']))
+    c.setFont(qr_style.fontName, qr_style.fontSize)
+    c.setFillColor(qr_style.textColor)
+    for offset, text in ((36, str(review_data['explorer_url'])), (58, f"TX: {review_data['stellar_tx_id']}")):
+        if c.stringWidth(text) <= CONTENT_WIDTH:
+            c.drawCentredString(PAGE_WIDTH / 2, REVIEWED_Y - offset, text)
+        else:  # unusually long: wrap
+            para = Paragraph(escape(text), qr_style)
+            _, height = para.wrap(CONTENT_WIDTH, 3 * qr_style.leading)
+            para.drawOn(c, MARGIN, REVIEWED_Y - offset - height + qr_style.leading)
+
+
+def render_review_pdf(review_data: dict) -> bytes:
+    """Render one certificate (no cache); see ``generate_review_pdf`` for the fields."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, invariant=1)
+    _draw_static(c)
+    _draw_fields(c, review_data)
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def certificate_key(review_data: dict) -> str:
+    """Content hash of the review data (and template version) identifying a certificate."""
+    canonical = json.dumps(review_data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{TEMPLATE_VERSION}:{canonical}".encode()).hexdigest()
+
+
+def _cache_put(key: str, pdf: bytes) -> None:
+    global _cache_bytes
+    with _cache_lock:
+        if key in _cache or len(pdf) > Config.PDF_CACHE_MAX_BYTES:
+            return
+        _cache[key] = pdf
+        _cache_bytes += len(pdf)
+        while _cache_bytes > Config.PDF_CACHE_MAX_BYTES:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+def _cache_get(key: str) -> bytes | None:
+    with _cache_lock:
+        pdf = _cache.get(key)
+        if pdf is not None:
+            _cache.move_to_end(key)
+        return pdf
+
+
+def clear_cache() -> None:
+    """Drop every cached certificate."""
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _cache_bytes = 0
+
 
 def generate_review_pdf(review_data: dict) -> bytes:
     """
     Generates a PDF certificate for a review.
     Input:
-      worker_name, worker_code, role, start_date, end_date,
-      rating, comment, reviewer_type, stellar_tx_id, explorer_url
-    Output: PDF bytes (in-memory).
+      worker_name, worker_code, role, start_date, end_date, duration_months,
+      rating, comment, reviewer_type, review_date, stellar_tx_id, explorer_url
+    Output: PDF bytes (in-memory), served from the render cache when the
+    same data was rendered before.
     """
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
-                            rightMargin=inch/2, leftMargin=inch/2,
-                            topMargin=inch/2, bottomMargin=inch/2)
-    styles = getSampleStyleSheet()
-    story = []
-
-    # Title
-    story.append(Paragraph("<font size='18'><b>🔷 NannyChain</b></font>", styles['h1']))
-    story.append(Paragraph("<font size='16'><b>Verified Work Review</b></font>", styles['h2']))
-    story.append(Spacer(1, 0.2 * inch))
-
-    # Worker and Employer Details
-    story.append(Paragraph(f"<b>Worker:</b> {review_data['worker_name']} ({review_data['worker_code']})", styles['Normal']))
-    story.append(Paragraph(f"<b>Employer Type:</b> {review_data['reviewer_type'].capitalize()}", styles['Normal']))
-    story.append(Paragraph(f"<b>Role:</b> {review_data['role']}", styles['Normal']))
-    story.append(Paragraph(f"<b>Duration:</b> {review_data['start_date']} – {review_data['end_date']} ({review_data['duration_months']}mo)", styles['Normal']))
-    stars = "★" * review_data['rating'] + "☆" * (5 - review_data['rating'])
-    story.append(Paragraph(f"<b>Rating:</b> <font color='#FFD700'>{stars}</font> ({review_data['rating']}/5)", styles['Normal']))
-    story.append(Spacer(1, 0.2 * inch))
-
-    # Comment
-    story.append(Paragraph("<b>Comment:</b>", styles['Normal']))
-    story.append(Paragraph(review_data['comment'], styles['Normal']))
-    story.append(Spacer(1, 0.3 * inch))
-
-    # Review Date and QR Code (Placeholder for now)
-    story.append(Paragraph(f"<b>Reviewed:</b> {review_data['review_date']}", styles['Normal']))
-    story.append(Spacer(1, 0.1 * inch))
-
-    # Placeholder for QR Code image
-    # In a real implementation, you'd generate a QR code image from explorer_url
-    # For now, we'll just put the URL as text.
-    story.append(Paragraph("<b>Verify on Stellar:</b>", qr_style))
-    story.append(Paragraph(f"<font size='8'>{review_data['explorer_url']}</font>", qr_style))
-    story.append(Spacer(1, 0.1 * inch))
-
-    story.append(Paragraph(f"TX: {review_data['stellar_tx_id']}", qr_style))
-    story.append(Spacer(1, 0.3 * inch))
-
-    # Footer
-    story.append(Paragraph("<font size='10' color='#555555'><i>Verified by NannyChain</i></font>", styles['Normal']))
-    story.append(Paragraph("<font size='8' color='#777777'><i>This is a secure, blockchain-verified document.</i></font>", styles['Normal']))
-
-
-    doc.build(story)
-    buffer.seek(0)
-    return buffer.getvalue()
+    key = certificate_key(review_data)
+    pdf = _cache_get(key)
+    if pdf is None:
+        pdf = render_review_pdf(review_data)
+        _cache_put(key, pdf)
+    return pdf
+
+
+def _pool_size() -> int:
+    return Config.PDF_RENDER_WORKERS or os.cpu_count() or 1
+
+
+def _mp_context():
+    # Never fork: the app process runs the event loop, Redis/HTTP clients and
+    # job threads, whose locks and sockets a forked child would inherit.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    """Return the shared certificate render pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=_pool_size(), mp_context=_mp_context())
+        return _pool
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def warm_pdf_pool() -> int:
+    """
+    Start every render worker now (app startup) so the first certificate
+    requests don't pay for process start-up and imports.  Returns the
+    number of worker processes running.
+    """
+    pool = get_pdf_pool()
+    pids = {f.result() for f in [pool.submit(_worker_ready) for _ in range(_pool_size())]}
+    return len(pids)
+
+
+def shutdown_pdf_pool() -> None:
+    """Stop the render pool's worker processes (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+async def render_review_pdf_async(review_data: dict) -> bytes:
+    """``generate_review_pdf`` for async code: cache misses render in the process pool."""
+    key = certificate_key(review_data)
+    pdf = _cache_get(key)
+    if pdf is None:
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(get_pdf_pool(), render_review_pdf, review_data)
+        _cache_put(key, pdf)
+    return pdf
+
+
+async def render_review_pdfs(items: Iterable[dict]) -> AsyncIterator[bytes]:
+    """
+    Render many certificates across the process pool, yielding PDFs in input order.
+
+    At most ``2 * PDF_RENDER_WORKERS`` renders are queued at once, so a
+    large export neither floods the pool nor holds every PDF in memory.
+    """
+    window = 2 * _pool_size()
+    iterator = iter(items)
+    pending: "deque[asyncio.Future]" = deque(
+        asyncio.ensure_future(render_review_pdf_async(data)) for data in islice(iterator, window)
+    )
+    try:
+        while pending:
+            pdf = await pending.popleft()
+            for data in islice(iterator, 1):
+                pending.append(asyncio.ensure_future(render_review_pdf_async(data)))
+            yield pdf
+    finally:
+        for future in pending:
+            future.cancel()
@@ -4,11 +4,12 @@ import time
 from datetime import datetime, timedelta
 
 from app.config import Config
-from app.db.repositories import get_worker_by_phone, get_by_worker_id # Import get_by_worker_id
-from app.integrations.africastalking.sms import send_sms
+from app.db.repositories import get_worker_by_phone, get_by_worker_id, review_nft_repository # Import get_by_worker_id
+from app.services.sms_outbox import enqueue_sms
 from app.integrations.ipfs import pin_to_ipfs, get_ipfs_url
-from app.integrations.stellar.nft import mint_review_nft, get_reviews_for_account
-from app.services.pdf import generate_review_pdf
+from app.integrations.stellar.nft import NftMintResult, mint_review_nft, get_reviews_for_account
+from app.services import review_nfts
+from app.services.pdf import render_review_pdf_async
 from app.schemas.review import ReviewSubmission, ReviewData, ReviewNFTResponse
 from app.utils.review_token import generate_review_token
 
@@ -87,7 +88,7 @@ async def submit_review(
     }
 
     # 2. Generate PDF certificate
-    pdf_bytes = generate_review_pdf(pdf_review_data)
+    pdf_bytes = await render_review_pdf_async(pdf_review_data)  # rendered in the PDF process pool
 
     # 3. Pin PDF to IPFS
     pdf_cid = await pin_to_ipfs(pdf_bytes)
@@ -114,6 +115,18 @@ async def submit_review(
         metadata=nft_metadata
     )
 
+    review_nfts.index_minted(
+        NftMintResult(
+            key=asset_code_suffix,
+            asset_code=mint_result["asset_code"],
+            issuer_public_key=mint_result["issuer_public_key"],
+            transaction_id=mint_result["transaction_id"],
+        ),
+        reviewee_public_key,
+        pdf_cid,
+        nft_metadata,
+    )
+
     # Update PDF data with actual tx info
     pdf_review_data["stellar_tx_id"] = mint_result["transaction_id"]
     pdf_review_data["explorer_url"] = mint_result["explorer_url"]
@@ -127,26 +140,32 @@ async def submit_review(
     )
 
 async def send_review_invitation(engagement_id: str, reviewer_phone: str) -> bool:
-    """Send an SMS with a time-limited review link to the reviewer."""
+    """Queue an SMS with a time-limited review link to the reviewer."""
     token = generate_review_token(engagement_id, reviewer_phone)
     link = f"{Config.REVIEW_FRONTEND_URL}?token={token}"
     message = (
         f"Your review for engagement {engagement_id} is ready. "
         f"Submit it here (link expires in {Config.REVIEW_LINK_EXPIRY_DAYS} days): {link}"
     )
-    return send_sms(reviewer_phone, message)
+    enqueue_sms(reviewer_phone, message)
+    return True
 
 
 async def get_worker_reviews(worker_code: str) -> list[ReviewData]:
     """
-    Fetches all reviews for a given worker code.
+    Fetches all reviews for a given worker code from the local review NFT index.
+
+    A Horizon reconcile for the worker's account is queued when it never
+    ran or is older than ``REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS`` (e.g. NFTs
+    minted before the index existed, or claimed since).
     """
     worker = get_by_worker_id(worker_code) # Use get_by_worker_id here
     if not worker:
         raise ValueError("Worker not found.")
 
     stellar_public_key = worker["stellar_public_key"]
-    nft_records = get_reviews_for_account(stellar_public_key)
+    nft_records = review_nft_repository.get_for_reviewee(stellar_public_key)
+    review_nfts.reconcile_if_stale(stellar_public_key)
 
     reviews_data = []
     for record in nft_records:
@@ -159,7 +178,7 @@ async def get_worker_reviews(worker_code: str) -> list[ReviewData]:
             pdf_url=pdf_url,
             stellar_asset=record["asset_code"],
             stellar_issuer=record["issuer_public_key"],
-            stellar_tx_id="N/A", # Transaction ID of minting not directly in manage data, would require Horizon queries
+            stellar_tx_id=record["stellar_tx_hash"] or "N/A", # unknown for NFTs only seen by the reconciler
             status=record["status"]
         ))
     return reviews_data
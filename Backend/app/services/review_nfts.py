@@ -0,0 +1,221 @@
+"""
+Review NFT Service
+
+Minting of review certificates off the request path.
+
+``/reviews/submit`` stores the review with ``nft_status = pending`` and
+calls ``enqueue_mint``; the ``review_nft_mint`` job later mints the NFT
+(through the shared ``MintBatcher``, so reviews minted around the same
+time share a transaction) and records the result with
+``review_repository.update_nft_data``.  Failed attempts are retried by
+the job queue; once attempts run out the review is marked ``failed``.
+
+Minting is idempotent per review: once the mint transaction is signed,
+its hash, issuer and time bound are stored on the review (``minting``)
+before it is submitted.  A retry looks that hash up on Horizon and
+records the NFT if it landed; while it is missing but its time bound has
+not passed (plus ``MINT_EXPIRY_MARGIN_SECONDS``) the job is deferred, and
+only after that is a new transaction minted.
+
+Every minted NFT is also written to the ``review_nfts`` index (its
+on-chain metadata never changes once the issuer is locked), so review
+listings are a single indexed query.  The ``review_nft_reconcile`` job
+scans an account's claimable balances and held assets on Horizon to fill
+in NFTs minted elsewhere and to record claimable -> owned transitions;
+it is queued whenever an account's last reconcile is older than
+``REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS``.
+"""
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.config import Config
+from app.db.repositories import get_by_worker_id, review_nft_repository, review_repository
+from app.integrations.stellar.nft import (
+    NftMintRequest,
+    NftMintResult,
+    get_reviews_for_account,
+)
+from app.services import jobs
+from app.services.horizon import get_horizon_service
+from app.services.nft_batcher import get_mint_batcher
+from app.utils.exceptions import StellarError
+from app.utils.stellar_helpers import build_stellar_explorer_url
+
+logger = logging.getLogger(__name__)
+
+REVIEW_NFT_MINT_JOB = "review_nft_mint"
+REVIEW_NFT_RECONCILE_JOB = "review_nft_reconcile"
+MINT_MAX_ATTEMPTS = 6
+MINT_TIMEOUT_SECONDS = 120
+# A mint transaction still missing from Horizon this long after its time
+# bound can never be applied, so a new one may be built.
+MINT_EXPIRY_MARGIN_SECONDS = 30
+
+
+def enqueue_mint(review_id: str) -> None:
+    """Queue the NFT mint for a stored review (idempotent per review)."""
+    jobs.enqueue(
+        REVIEW_NFT_MINT_JOB,
+        {"review_id": review_id},
+        dedupe_key=f"{REVIEW_NFT_MINT_JOB}:{review_id}",
+        max_attempts=MINT_MAX_ATTEMPTS,
+    )
+
+
+def index_minted(
+    result: NftMintResult,
+    reviewee_public_key: str,
+    pdf_cid: str,
+    metadata: Dict[str, Any],
+    review_id: Optional[str] = None,
+) -> None:
+    """Record a freshly minted (still claimable) review NFT in the local index."""
+    review_nft_repository.upsert({
+        "asset_code": result.asset_code,
+        "issuer_public_key": result.issuer_public_key,
+        "reviewee_public_key": reviewee_public_key,
+        "review_id": review_id,
+        "rating": metadata.get("rating"),
+        "role": metadata.get("role"),
+        "reviewer_type": metadata.get("reviewer_type"),
+        "duration": metadata.get("duration"),
+        "pdf_cid": pdf_cid,
+        "stellar_tx_hash": result.transaction_id,
+        "status": "claimable",
+    })
+
+
+def reconcile_account(public_key: str) -> int:
+    """Re-read *public_key*'s review NFTs from Horizon into the index; returns the count."""
+    records = get_reviews_for_account(public_key)
+    count = review_nft_repository.upsert_many([
+        {**record, "reviewee_public_key": public_key} for record in records
+    ])
+    review_nft_repository.mark_reconciled(public_key, int(time.time()))
+    return count
+
+
+def enqueue_reconcile(public_key: str) -> None:
+    """Queue a Horizon reconcile for one account (at most once per account per max-age window)."""
+    window = int(time.time() // Config.REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS)
+    jobs.enqueue(
+        REVIEW_NFT_RECONCILE_JOB,
+        {"public_key": public_key},
+        dedupe_key=f"{REVIEW_NFT_RECONCILE_JOB}:{public_key}:{window}",
+    )
+
+
+def reconcile_if_stale(public_key: str) -> bool:
+    """
+    Queue a reconcile when *public_key* was never reconciled or its last one
+    is older than ``REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS``.
+
+    This is what picks up claimable -> owned transitions and NFTs minted
+    elsewhere for accounts whose index is already populated.
+    """
+    reconciled_at = review_nft_repository.get_reconciled_at(public_key)
+    if reconciled_at is not None and time.time() - reconciled_at < Config.REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS:
+        return False
+    enqueue_reconcile(public_key)
+    return True
+
+
+@jobs.register(REVIEW_NFT_RECONCILE_JOB)
+def reconcile(payload: Dict[str, Any]) -> None:
+    """Job handler: reconcile one account's review NFTs with Horizon."""
+    count = reconcile_account(payload["public_key"])
+    logger.info("Reconciled %s review NFT(s) for %s", count, payload["public_key"])
+
+
+def asset_suffix(review_id: str) -> str:
+    """Asset code suffix for a review's NFT (deterministic per review)."""
+    return hashlib.sha256(review_id.encode()).hexdigest()[:9]
+
+
+def _mark_failed(payload: Dict[str, Any], error: str) -> None:
+    logger.warning("Giving up on NFT for review %s: %s", payload["review_id"], error)
+    review_repository.set_nft_status(payload["review_id"], "failed")
+
+
+def _reconcile_mint(review: Dict[str, Any], request: NftMintRequest) -> Optional[NftMintResult]:
+    """
+    Settle a review left ``minting`` by an earlier attempt.
+
+    Returns the NFT when the recorded transaction landed, None when a new
+    one must be minted.  Raises ``RetryLaterError`` while the recorded
+    transaction may still be applied.
+    """
+    attempt = review_repository.get_mint_attempt(review["review_id"])
+    tx_hash = attempt["tx_hash"] if attempt else ""
+    if not tx_hash:
+        return None  # nothing was submitted
+    try:
+        tx = get_horizon_service().get_transaction(tx_hash)
+    except StellarError as e:
+        if e.details.get("status") != 404:
+            raise
+        wait = (attempt["expires_at"] or 0) + MINT_EXPIRY_MARGIN_SECONDS - time.time()
+        if wait > 0:
+            raise jobs.RetryLaterError(f"Mint {tx_hash} for {review['review_id']} is not on-chain yet.", wait)
+        return None  # expired without landing
+    if not tx.get("successful"):
+        return None  # failed on-chain: nothing was minted
+    logger.info("Review NFT for %s already minted in %s", review["review_id"], tx_hash)
+    return NftMintResult(
+        key=review["review_id"],
+        asset_code=request.asset_code,
+        issuer_public_key=attempt["issuer_public_key"],
+        transaction_id=tx_hash,
+        explorer_url=build_stellar_explorer_url(tx_hash),
+    )
+
+
+@jobs.register(REVIEW_NFT_MINT_JOB, on_failure=_mark_failed)
+def mint_review(payload: Dict[str, Any]) -> None:
+    """Job handler: mint the review's NFT for the reviewee and store the result."""
+    review = review_repository.get_by_review_id(payload["review_id"])
+    if review is None:
+        raise jobs.PermanentJobError(f"Review {payload['review_id']} not found.")
+    if review["nft_status"] == "minted":
+        return
+
+    reviewer = get_by_worker_id(review["reviewer_id"])
+    reviewee = get_by_worker_id(review["reviewee_id"])
+    if not reviewer or not reviewee:
+        raise jobs.PermanentJobError(f"Reviewer or reviewee of {review['review_id']} not found.")
+
+    request = NftMintRequest(
+        key=review["review_id"],
+        reviewee_public_key=reviewee["stellar_public_key"],
+        pdf_cid=review["review_id"],  # use review_id as CID placeholder
+        asset_code_suffix=asset_suffix(review["review_id"]),
+        metadata={
+            "rating": str(review["rating"]),
+            "reviewer_type": reviewer["role"],
+            "role": reviewee["role"],
+            "duration": "0",
+            "reviewer_id": review["reviewer_id"],
+        },
+    )
+    result = _reconcile_mint(review, request) if review["nft_status"] == "minting" else None
+    if result is None:
+        request.on_signed = lambda tx_hash, issuer, max_time: review_repository.set_mint_attempt(
+            review["review_id"], tx_hash, issuer, max_time
+        )
+        result = get_mint_batcher().mint(request, timeout=MINT_TIMEOUT_SECONDS)
+        if not result.success:
+            raise RuntimeError(result.error)
+
+    index_minted(result, request.reviewee_public_key, request.pdf_cid, request.metadata, review["review_id"])
+
+    review_repository.update_nft_data(
+        review_id=review["review_id"],
+        stellar_tx_hash=result.transaction_id,
+        explorer_url=result.explorer_url,
+        nft_asset_code=result.asset_code,
+    )
+    logger.info(
+        "Minted review NFT %s for %s (tx: %s)", result.asset_code, review["reviewee_id"], result.transaction_id
+    )
@@ -0,0 +1,177 @@
+"""
+SMS Outbox
+
+Durable, batched delivery of outgoing SMS so Africa's Talking latency
+never sits on the request path.
+
+``enqueue_sms`` only inserts a row and wakes the dispatcher.  The
+dispatcher claims ready rows, groups recipients that share the same text
+into one AT call (up to ``SMS_BATCH_SIZE`` numbers), paces calls to the
+account quota (``SMS_RATE_PER_SECOND`` recipients/second), retries
+transient failures with exponential backoff and stores the per-recipient
+provider status, message id and cost.  Delivery reports posted by AT
+later update the same rows.
+"""
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from app.config import Config
+from app.db.repositories import sms_outbox_repository
+from app.integrations.africastalking.sms import (
+    SmsProviderError,
+    is_configured,
+    send_bulk_sms,
+)
+from app.utils.phone import to_e164
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_POLL_INTERVAL_SECONDS = 5
+DISPATCH_CLAIM_LIMIT = 500
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+STALE_SWEEP_INTERVAL_SECONDS = 60
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_wake_event: Optional[asyncio.Event] = None
+
+
+class _RateLimiter:
+    """Paces sends so the average rate stays within *rate* recipients per second."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_free = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_free)
+            self._next_free = start + n / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+_limiter = _RateLimiter(Config.SMS_RATE_PER_SECOND)
+
+
+def enqueue_sms(to: str, message: str) -> int:
+    """Queue an SMS for background delivery. Returns the outbox id."""
+    outbox_id = sms_outbox_repository.enqueue(
+        to_e164(to), message, max_attempts=Config.SMS_MAX_ATTEMPTS
+    )
+    wake()
+    return outbox_id
+
+
+def enqueue_bulk_sms(recipients: Iterable[str], message: str) -> List[int]:
+    """Queue the same *message* for many recipients (sent as one batched call)."""
+    numbers = [to_e164(r) for r in recipients]
+    if not numbers:
+        return []
+    ids = sms_outbox_repository.enqueue_many(numbers, message, max_attempts=Config.SMS_MAX_ATTEMPTS)
+    wake()
+    return ids
+
+
+def wake() -> None:
+    """Wake the dispatcher loop (safe to call from any thread)."""
+    if _loop is not None and _wake_event is not None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_wake_event.set)
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * (2 ** (attempts - 1)), RETRY_MAX_SECONDS)
+
+
+def _fail(row: dict, error: str, retryable: bool, provider_status: str = "") -> None:
+    retry = _retry_delay(row["attempts"]) if retryable and row["attempts"] < row["max_attempts"] else None
+    sms_outbox_repository.mark_failed(row["id"], error, retry, provider_status)
+
+
+def _send_group(rows: List[dict]) -> dict:
+    """Send one message text to every recipient in *rows*; record each outcome."""
+    numbers = list(dict.fromkeys(r["recipient"] for r in rows))
+    _limiter.acquire(len(numbers))
+    try:
+        results = send_bulk_sms(numbers, rows[0]["message"])
+    except SmsProviderError as e:
+        logger.warning("SMS batch of %s failed: %s", len(numbers), e)
+        for row in rows:
+            _fail(row, str(e), retryable=True)
+        return {"sent": 0, "failed": len(rows)}
+
+    by_number = {r.number: r for r in results}
+    sent = failed = 0
+    for row in rows:
+        result = by_number.get(row["recipient"])
+        if result is None:
+            _fail(row, "No status returned for recipient.", retryable=True)
+            failed += 1
+        elif result.accepted:
+            sms_outbox_repository.mark_sent(row["id"], result.message_id, result.status, result.cost)
+            sent += 1
+        else:
+            _fail(row, f"{result.status_code} {result.status}", result.retryable, result.status)
+            failed += 1
+    return {"sent": sent, "failed": failed}
+
+
+def dispatch_pending(limit: int = DISPATCH_CLAIM_LIMIT) -> dict:
+    """Claim ready messages once and send them in batches. Returns sent / failed counts."""
+    rows = sms_outbox_repository.claim(limit=limit)
+    if not rows:
+        return {"sent": 0, "failed": 0}
+    if not is_configured():
+        for row in rows:
+            sms_outbox_repository.mark_failed(row["id"], "SMS provider not configured.", None)
+        return {"sent": 0, "failed": len(rows)}
+
+    totals = {"sent": 0, "failed": 0}
+    batch_size = max(Config.SMS_BATCH_SIZE, 1)
+    for _, group in itertools.groupby(rows, key=lambda r: r["message"]):
+        group = list(group)
+        for i in range(0, len(group), batch_size):
+            outcome = _send_group(group[i:i + batch_size])
+            totals["sent"] += outcome["sent"]
+            totals["failed"] += outcome["failed"]
+    return totals
+
+
+async def run_dispatcher_loop(poll_interval: float = DISPATCH_POLL_INTERVAL_SECONDS) -> None:
+    """Background loop: dispatch queued SMS whenever woken or every *poll_interval* seconds."""
+    global _loop, _wake_event
+    _loop = asyncio.get_running_loop()
+    _wake_event = asyncio.Event()
+    next_sweep = 0.0
+    try:
+        while True:
+            try:
+                if time.monotonic() >= next_sweep:
+                    # Messages left 'sending' by a crashed dispatcher; not just at
+                    # startup, since after a quick restart they are not stale yet.
+                    requeued = await asyncio.to_thread(sms_outbox_repository.requeue_stale)
+                    if requeued:
+                        logger.warning("Requeued %s stale SMS message(s)", requeued)
+                    next_sweep = time.monotonic() + STALE_SWEEP_INTERVAL_SECONDS
+                result = await asyncio.to_thread(dispatch_pending)
+                if result["sent"] or result["failed"]:
+                    logger.info("SMS dispatch: sent=%s failed=%s", result["sent"], result["failed"])
+                    continue  # drain the outbox before sleeping
+            except Exception:
+                logger.exception("SMS dispatcher error")
+            try:
+                await asyncio.wait_for(_wake_event.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            _wake_event.clear()
+    finally:
+        _loop = None
+        _wake_event = None
@@ -0,0 +1,127 @@
+"""
+Account Snapshots
+
+Precomputed balance / mini-statement per worker for the USSD menu.
+
+USSD screens must answer well inside the gateway deadline, so they never
+call Horizon: they read the worker's ``account_snapshots`` row (balance,
+last ``RECENT_PAYMENTS`` payments, pending claim count) in one lookup.
+
+Rows are kept fresh by events: payments (``payment.settled``, scheduled
+payments) and claim changes mark the row stale and queue a
+``snapshot_refresh`` job delayed by ``SNAPSHOT_COALESCE_SECONDS``.  The job
+key is per worker and refresh round, so a burst of changes becomes one
+Horizon fetch; a change that lands while the job is running queues the
+next round.
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from stellar_sdk.exceptions import NotFoundError
+
+from app.config import Config
+from app.db.repositories import (
+    account_snapshot_repository,
+    claim_repository,
+    get_by_worker_id,
+    get_worker_by_public_key,
+)
+from app.services import events, jobs
+from app.services.payments import get_payment_service
+from app.services.stellar import get_stellar_service
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_REFRESH_JOB = "snapshot_refresh"
+RECENT_PAYMENTS = 5
+
+
+def request_refresh(worker_id: str) -> None:
+    """Mark the worker's snapshot stale and queue (or join) its refresh job."""
+    row = account_snapshot_repository.mark_stale(worker_id)
+    jobs.enqueue(
+        SNAPSHOT_REFRESH_JOB,
+        {"worker_id": worker_id},
+        dedupe_key=f"{SNAPSHOT_REFRESH_JOB}:{worker_id}:{row['refreshes']}",
+        delay_seconds=Config.SNAPSHOT_COALESCE_SECONDS,
+    )
+
+
+def get_snapshot(worker_id: str) -> Optional[Dict[str, Any]]:
+    """Return the last computed snapshot, or None if it was never refreshed."""
+    row = account_snapshot_repository.get(worker_id)
+    if row is None or row["refreshed_at"] is None:
+        return None
+    return row
+
+
+def _native_balance(public_key: str) -> Optional[str]:
+    """Native balance, or None when the account is not yet active on the network."""
+    try:
+        account = get_stellar_service().server.accounts().account_id(public_key).call()
+    except NotFoundError:
+        return None
+    return next(
+        (b["balance"] for b in account.get("balances", []) if b.get("asset_type") == "native"),
+        "0",
+    )
+
+
+def _recent_payments(public_key: str) -> List[Dict[str, str]]:
+    # History skips non-payment operations, so over-fetch a little.
+    records = get_payment_service().get_payment_history(public_key, limit=RECENT_PAYMENTS * 2)
+    payments = []
+    for record in records[:RECENT_PAYMENTS]:
+        incoming = record.get("to") == public_key
+        other = record.get("from") if incoming else record.get("to")
+        worker = get_worker_by_public_key(other) if other else None
+        payments.append({
+            "direction": "in" if incoming else "out",
+            "amount": record.get("amount") or "0",
+            "counterparty": worker["worker_id"] if worker else (other or "")[:6],
+            "date": (record.get("created_at") or "")[:10],
+        })
+    return payments
+
+
+@jobs.register(SNAPSHOT_REFRESH_JOB)
+def refresh_snapshot(payload: Dict[str, Any]) -> None:
+    """Job handler: recompute one worker's snapshot from Horizon and the claims table."""
+    worker_id = payload["worker_id"]
+    worker = get_by_worker_id(worker_id)
+    if not worker:
+        raise jobs.PermanentJobError(f"Worker {worker_id} not found.")
+
+    current = account_snapshot_repository.get(worker_id)
+    generation = current["generation"] if current else 0
+    public_key = worker["stellar_public_key"]
+    balance = _native_balance(public_key)
+    payments = _recent_payments(public_key) if balance is not None else []
+    pending = sum(1 for c in claim_repository.get_by_worker(worker_id) if c["status"] == "pending")
+
+    if not account_snapshot_repository.save(worker_id, balance or "0", payments, pending, generation):
+        request_refresh(worker_id)  # changed while we were fetching
+
+
+def _refresh_public_keys(public_keys: Iterable[str]) -> None:
+    for public_key in set(k for k in public_keys if k):
+        worker = get_worker_by_public_key(public_key)
+        if worker:
+            request_refresh(worker["worker_id"])
+
+
+@events.subscribe(events.PAYMENT_SETTLED)
+def on_payment_settled(payload: Dict[str, Any]) -> None:
+    _refresh_public_keys(payload.get("public_keys", []))
+
+
+@events.subscribe(events.SCHEDULED_PAYMENT_SUCCEEDED)
+def on_scheduled_payment(payload: Dict[str, Any]) -> None:
+    for worker_id in (payload.get("worker_id"), payload.get("employer_id")):
+        if worker_id:
+            request_refresh(worker_id)
+
+
+@events.subscribe(events.CLAIM_CHANGED)
+def on_claim_changed(payload: Dict[str, Any]) -> None:
+    request_refresh(payload["worker_id"])
@@ -154,9 +154,12 @@ class StellarService:
                 "result_xdr": response.get("result_xdr")
             }
         except Exception as e:
+            # details["status"] is Horizon's HTTP status: 400 means the transaction
+            # was rejected; timeouts / 5xx / no response leave its fate unknown.
             raise StellarError(
                 message=f"Transaction submission failed: {str(e)}",
-                operation="submit_transaction"
+                operation="submit_transaction",
+                details={"status": getattr(e, "status", None)}
             )
 
 
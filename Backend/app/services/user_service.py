@@ -9,8 +9,8 @@ def create_account(phone: str, name: str = None, role: str = "worker", send_sms:
 
     If an account with the given phone already exists, returns that account's
     identifiers (including role).  Otherwise creates a new Stellar wallet and
-    record; when *send_sms* is True a welcome SMS is attempted (failures are
-    silently ignored).
+    record; when *send_sms* is True a welcome SMS is queued in the outbox
+    (failures are silently ignored).
 
     Returns:
         dict with worker_id, stellar_public_key, phone, name, role,
@@ -38,9 +38,9 @@ def create_account(phone: str, name: str = None, role: str = "worker", send_sms:
 
     if send_sms:
         try:
-            from app.integrations.africastalking import send_sms
+            from app.services.sms_outbox import enqueue_sms
             msg = f"NannyChain: Your ID is {row['worker_id']}. Stellar wallet: {public_key[:12]}..."
-            send_sms(phone, msg)
+            enqueue_sms(phone, msg)
         except Exception:
             pass
 
@@ -1,25 +1,58 @@
-"""USSD session and menu handler. Africa's Talking callback logic."""
-import json
-import redis
-from app.config import Config
-from app.services.user_service import create_account
+"""USSD session and menu handler. Africa's Talking callback logic.
 
+The menu (registration, balance, mini statement, work history,
+reputation, M-Pesa deposit and withdrawal, payment claims) calls the
+services and repositories in-process; balance and mini statement are read
+from the precomputed account snapshot (app.services.snapshots), never from
+Horizon; blocking calls run in a worker thread via ``asyncio.to_thread``.
+The caller's phone number identifies the account.  The menu itself is the
+graph compiled once in ``MENU`` (see app.ussd.menu); a hop looks up the
+stored step and applies only the newest input segment.
+"""
+import asyncio
+import time
+from decimal import Decimal, InvalidOperation
 
-def _redis():
-    """
-    Return a Redis client configured from Config.REDIS_URL.
-    
-    Returns:
-        redis.Redis: A Redis client instance connected using the configured Redis URL.
-    """
-    return redis.from_url(Config.REDIS_URL)
+from app.db.repositories import (
+    claim_repository,
+    get_by_worker_id,
+    get_worker_by_phone,
+    get_worker_by_public_key,
+    review_repository,
+    schedule_repository,
+)
+from app.services import events, snapshots
+from app.services.mpesa import OfframpError, initiate_offramp, initiate_onramp
+from app.services.user_service import create_account
+from app.utils import metrics
+from app.utils.phone import normalize_phone
+from app.ussd.menu import State, compile_menu, fit_screen, last_input, render_menu
+from app.ussd.sessions import get_session_store
+
+ROOT_MENU = render_menu("Welcome to NannyChain", {
+    "1": "Create account", "2": "My Account", "3": "Payments", "4": "Exit",
+})
+ACCOUNT_MENU = render_menu("My Account", {
+    "1": "Check balance", "2": "Mini statement", "3": "Work history", "4": "Reputation", "0": "Back",
+})
+PAYMENTS_MENU = render_menu("Payments", {
+    "1": "Deposit (M-Pesa)", "2": "Withdraw to M-Pesa", "3": "My claims", "4": "Claim payment", "0": "Back",
+})
+NO_ACCOUNT = "END No account found for this number. Create an account first (option 1)."
+SNAPSHOT_PENDING = "END Your balance is being updated. Please check again in a minute."
+PAYOUT_DELAYED = "END Payout delayed. Your funds are safe; support will complete it."
+SESSION_ENDED = "END This session has ended. Please dial again."
 
+MIN_DEPOSIT_KES = 10
+MAX_DEPOSIT_KES = 150_000
+MIN_WITHDRAW_KSH = 10
+LIST_LIMIT = 3
 
-def get_session(session_id: str) -> dict:
+async def get_session(session_id: str) -> dict:
     """
     Retrieve stored USSD session data for the given session identifier.
     
-    Attempts to read JSON-serialized session data from storage and decode it; returns an empty dict if no session exists or the stored data cannot be decoded.
+    Reads from the configured session store (see app.ussd.sessions); the read also refreshes the session TTL.
     
     Parameters:
         session_id (str): USSD session identifier used to locate the stored session.
@@ -27,112 +60,362 @@ def get_session(session_id: str) -> dict:
     Returns:
         dict: Decoded session data, or an empty dict if not found or invalid.
     """
-    key = f"ussd:session:{session_id}"
-    data = _redis().get(key)
-    if not data:
-        return {}
-    try:
-        return json.loads(data)
-    except (json.JSONDecodeError, TypeError):
-        return {}
-
-
-def set_session(session_id: str, data: dict) -> None:
-    """
-    Persist USSD session data in Redis under a namespaced key with an expiration.
-    
-    Parameters:
-        session_id (str): Identifier for the USSD session; used to construct the Redis key "ussd:session:{session_id}".
-        data (dict): Session state to persist; the dictionary will be JSON-serialized before storage. The entry expires after Config.USSD_SESSION_TTL seconds.
-    """
-    key = f"ussd:session:{session_id}"
-    _redis().setex(key, Config.USSD_SESSION_TTL, json.dumps(data))
+    store = get_session_store()
+    with metrics.timed(f"ussd.session.{store.name}.get"):
+        return await store.get(session_id)
 
 
-def _normalize_phone(raw: str) -> str:
+async def set_session(session_id: str, data: dict) -> None:
     """
-    Convert a phone number into the Kenyan international format `254XXXXXXXXX`.
-    
-    Accepts numbers with surrounding whitespace, spaces, hyphens, a leading `+`, local format starting with `0`, or already in `254` format and returns a string beginning with `254` followed by the subscriber digits.
+    Persist USSD session data in the configured session store with an expiration.
     
     Parameters:
-    	raw (str): The raw phone input.
-    
-    Returns:
-    	normalized (str): Phone number normalized to the `254XXXXXXXXX` format.
+        session_id (str): Identifier for the USSD session.
+        data (dict): Session state to persist; stored as compact JSON. The entry expires after Config.USSD_SESSION_TTL seconds.
     """
-    raw = raw.strip().replace(" ", "").replace("-", "")
-    if raw.startswith("+"):
-        raw = raw[1:]
-    if raw.startswith("254"):
-        return raw
-    if raw.startswith("0"):
-        return "254" + raw[1:]
-    return "254" + raw
+    store = get_session_store()
+    with metrics.timed(f"ussd.session.{store.name}.set"):
+        await store.set(session_id, data)
 
 
-def handle_ussd(session_id: str, phone_number: str, text: str) -> str:
+async def handle_ussd(session_id: str, phone_number: str, text: str) -> str:
     """
     Handle an incoming USSD interaction for a session and return the appropriate Africa's Talking response.
     
-    Parses the incoming USSD text, advances the session state stored in Redis, and returns a response string that begins with either "CON" (continue) or "END" (terminate) followed by the message. This function persists session state and may create a new user account or look up an existing account; account creation can trigger an SMS notification.
+    Parses the newest input segment of the USSD text, advances the session state, and returns a response string that begins with either "CON" (continue) or "END" (terminate) followed by the message. Menu actions call the account, M-Pesa and repository layers directly.
     
     Parameters:
     	session_id (str): Unique USSD session identifier used to load and persist session state.
     	phone_number (str): Originating caller's phone number (raw format as provided by the gateway).
-    	text (str): Raw USSD payload submitted by the user (e.g., "1", "1*254712345678", or an empty string for initial requests).
+    	text (str): Raw USSD payload submitted by the user (e.g., "1", "2*1", or an empty string for initial requests).
     
     Returns:
     	response (str): A single-line Africa's Talking response starting with "CON" or "END" and the message to show the user.
     """
-    session = get_session(session_id)
-    parts = (text or "").strip().split("*")
-    choice = (parts[-1].strip() if parts else "").strip()
+    choice = last_input(text)
+    started = time.perf_counter()
 
     if not choice:
-        session["step"] = "main"
-        set_session(session_id, session)
-        return "CON Welcome to NannyChain\n1. Create account\n2. Sign in\n3. Exit"
-
-    step = session.get("step", "main")
-
-    if step == "main":
-        if choice == "1":
-            session["step"] = "register_phone"
-            set_session(session_id, session)
-            return "CON Enter your phone number (e.g. 254712345678)"
-        if choice == "2":
-            session["step"] = "login_phone"
-            set_session(session_id, session)
-            return "CON Enter your phone number"
-        if choice == "3":
-            return "END Goodbye."
+        # New dial: no need to read the old session, just reset it.
+        step, session = MENU.root, {}
+    else:
+        session = await get_session(session_id)
+        if session.get("finished"):
+            # A replayed hop (gateway retry, duplicate callback) of a session
+            # that already ended must not run its final action again.
+            return SESSION_ENDED
+        step = session.get("step", MENU.root)
+
+    before = dict(session)
+    phone = normalize_phone(phone_number)
+    if choice:
+        response = await MENU.advance(session, choice, phone)
+    else:
+        response = await MENU.enter(MENU.root, session, phone)
+    response = fit_screen(response)
+
+    # Session writes are buffered: at most one write per hop, and none when
+    # the state did not change.  An END marks the session finished.
+    if response.startswith("END"):
+        await set_session(session_id, {"finished": True})
+    elif session != before:
+        await set_session(session_id, session)
+
+    metrics.observe(f"ussd.step.{step}", (time.perf_counter() - started) * 1000.0)
+    return response
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────
+
+async def _caller(session: dict, phone: str) -> dict | None:
+    """Return ``{worker_id, public_key, name}`` for the caller, cached in the session."""
+    cached = session.get("caller")
+    if cached:
+        return cached
+    worker = await asyncio.to_thread(get_worker_by_phone, phone)
+    if not worker:
+        return None
+    session["caller"] = {
+        "worker_id": worker["worker_id"],
+        "public_key": worker["stellar_public_key"],
+        "name": worker.get("name") or "",
+    }
+    return session["caller"]
+
+
+def _parse_amount(choice: str) -> Decimal | None:
+    try:
+        amount = Decimal(choice.replace(",", ""))
+    except InvalidOperation:
+        return None
+    return amount if amount.is_finite() and amount > 0 else None
+
+
+def _fmt(amount) -> str:
+    return f"{Decimal(str(amount)):,.2f}"
+
+
+def _goto(session: dict, step: str, screen: str) -> str:
+    session["step"] = step
+    return screen
+
+
+async def _require_caller(session: dict, phone: str) -> str | None:
+    """on_enter guard: ``None`` (show the screen) when the caller has an account."""
+    return None if await _caller(session, phone) else NO_ACCOUNT
+
+
+# ── Root / registration ──────────────────────────────────────────────────
+
+async def _enter_register(session: dict, phone: str) -> str | None:
+    caller = await _caller(session, phone)
+    if caller:
+        return f"END Account already exists. Worker ID: {caller['worker_id']}"
+    return None
+
+
+async def _register_name(choice: str, session: dict, phone: str) -> str:
+    name = choice.strip()
+    if len(name) < 3:
+        return "CON Name too short. Enter your full name:"
+    session["name"] = name[:60]
+    return _goto(session, "register_confirm", f"CON Create account for {name[:40]}?\n1. Yes\n2. No")
+
+
+async def _register_confirm(choice: str, session: dict, phone: str) -> str:
+    if choice != "1":
+        return "END Registration cancelled."
+    try:
+        result = await asyncio.to_thread(create_account, phone, name=session.get("name"), send_sms=True)
+    except Exception:
+        return "END Registration failed. Please try again later."
+    if result.get("already_exists"):
+        return f"END Account already exists. Worker ID: {result['worker_id']}"
+    return f"END Account created. Worker ID: {result['worker_id']}. Check SMS for details."
+
+
+# ── My Account ───────────────────────────────────────────────────────────
+
+async def _snapshot(caller: dict) -> dict | None:
+    """The caller's precomputed snapshot; queues a refresh when there is none yet."""
+    snapshot = await asyncio.to_thread(snapshots.get_snapshot, caller["worker_id"])
+    if snapshot is None:
+        await asyncio.to_thread(snapshots.request_refresh, caller["worker_id"])
+    return snapshot
+
+
+async def _balance(session: dict, phone: str) -> str:
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+    snapshot = await _snapshot(caller)
+    if snapshot is None:
+        return SNAPSHOT_PENDING
+    lines = [f"END Balance: {_fmt(snapshot['balance'])} KSH", f"Worker ID: {caller['worker_id']}"]
+    if snapshot["pending_claims"]:
+        lines.append(f"Pending claims: {snapshot['pending_claims']}")
+    lines.append(f"As of {snapshot['refreshed_at'][:16]} UTC")
+    return "\n".join(lines)
+
+
+async def _mini_statement(session: dict, phone: str) -> str:
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+    snapshot = await _snapshot(caller)
+    if snapshot is None:
+        return SNAPSHOT_PENDING
+    if not snapshot["recent_payments"]:
+        return "END No payments yet."
+    lines = ["END Last payments:"]
+    for p in snapshot["recent_payments"]:
+        sign = "+" if p["direction"] == "in" else "-"
+        lines.append(f"{p['date'][5:]} {sign}{_fmt(p['amount'])} {p['counterparty']}")
+    return "\n".join(lines)
+
+
+async def _work_history(session: dict, phone: str) -> str:
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+
+    def load():
+        rows = schedule_repository.get_for_worker(caller["worker_id"])
+        for row in rows[:LIST_LIMIT]:
+            employer = get_by_worker_id(row["employer_id"]) or {}
+            row["employer_name"] = (employer.get("name") or row["employer_id"])[:16]
+        return rows
+
+    rows = await asyncio.to_thread(load)
+    if not rows:
+        return "END No work history yet."
+    lines = [f"END Work history ({len(rows)}):"]
+    for i, row in enumerate(rows[:LIST_LIMIT], 1):
+        lines.append(f"{i}. {row['employer_name']} {_fmt(row['amount'])} {row['frequency']}")
+    return "\n".join(lines)
+
+
+async def _reputation(session: dict, phone: str) -> str:
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+    rating = await asyncio.to_thread(review_repository.get_average_rating, caller["worker_id"])
+    if not rating["count"]:
+        return "END No reviews yet."
+    return f"END Reputation:\nRating: {rating['avg_rating']}/5\nReviews: {rating['count']}"
+
+
+# ── Payments ─────────────────────────────────────────────────────────────
+
+async def _my_claims(session: dict, phone: str) -> str:
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+    claims = await asyncio.to_thread(claim_repository.get_by_worker, caller["worker_id"])
+    if not claims:
+        return "END You have no payment claims."
+    lines = [f"END Your claims ({len(claims)}):"]
+    for i, claim in enumerate(claims[:LIST_LIMIT], 1):
+        lines.append(f"{i}. {_fmt(claim['amount'])} KSH {claim['status']}")
+    return "\n".join(lines)
+
+
+async def _deposit_amount(choice: str, session: dict, phone: str) -> str:
+    amount = _parse_amount(choice)
+    if amount is None or not MIN_DEPOSIT_KES <= amount <= MAX_DEPOSIT_KES:
+        return f"CON Amount must be {MIN_DEPOSIT_KES}-{MAX_DEPOSIT_KES:,} KES. Enter amount:"
+    session["amount"] = str(amount)
+    return _goto(session, "deposit_confirm", f"CON Deposit {_fmt(amount)} KES via M-Pesa?\n1. Yes\n2. No")
+
+
+async def _deposit_confirm(choice: str, session: dict, phone: str) -> str:
+    if choice != "1":
+        return "END Cancelled."
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+    try:
+        row = await asyncio.to_thread(initiate_onramp, caller["public_key"], phone, float(session["amount"]))
+    except ValueError as e:
+        return f"END Deposit failed: {e}"[:160]
+    except Exception:
+        return "END Deposit failed. Please try again later."
+    if row["status"] == "paid":
+        return f"END Deposit of {_fmt(row['amount_kes'])} KES received. Your wallet will be credited shortly."
+    return f"END M-Pesa prompt sent. Enter your PIN to deposit {_fmt(row['amount_kes'])} KES."
+
+
+async def _withdraw_amount(choice: str, session: dict, phone: str) -> str:
+    amount = _parse_amount(choice)
+    if amount is None or amount < MIN_WITHDRAW_KSH:
+        return f"CON Minimum {MIN_WITHDRAW_KSH} KSH. Enter amount:"
+    session["amount"] = str(amount)
+    return _goto(session, "withdraw_phone", "CON Enter M-Pesa number\n(0 for this phone):")
+
+
+async def _withdraw_phone(choice: str, session: dict, phone: str) -> str:
+    mpesa = phone if choice == "0" else normalize_phone(choice)
+    if len(mpesa) != 12 or not mpesa.isdigit():
+        return "CON Invalid number. Enter M-Pesa number\n(0 for this phone):"
+    session["mpesa_phone"] = mpesa
+    return _goto(
+        session, "withdraw_confirm",
+        f"CON Withdraw {_fmt(session['amount'])} KSH to {mpesa}?\n1. Yes\n2. No",
+    )
+
+
+async def _withdraw_confirm(choice: str, session: dict, phone: str) -> str:
+    if choice != "1":
+        return "END Cancelled."
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+    sender_row = await asyncio.to_thread(get_worker_by_public_key, caller["public_key"])
+    try:
+        result = await asyncio.to_thread(initiate_offramp, sender_row, session["mpesa_phone"], session["amount"])
+    except OfframpError as e:
+        if e.stage == "mpesa":
+            return PAYOUT_DELAYED
+        return "END Withdrawal failed. Please try again later."
+    if not result["success"]:
+        return PAYOUT_DELAYED  # KSH already burned; the payout is recorded for support
+    return f"END Withdrawal of {_fmt(result['amount_kes'])} KES to {result['phone']} is on its way."
+
+
+async def _claim_options(session: dict, phone: str) -> str:
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+
+    def load():
+        rows = schedule_repository.get_for_worker(caller["worker_id"])[:LIST_LIMIT]
+        for row in rows:
+            employer = get_by_worker_id(row["employer_id"]) or {}
+            row["employer_name"] = (employer.get("name") or row["employer_id"])[:16]
+        return rows
+
+    rows = await asyncio.to_thread(load)
+    if not rows:
+        return "END No active payment schedules to claim from."
+    session["claim_options"] = [r["schedule_id"] for r in rows]
+    lines = ["CON Select payment to claim:"]
+    for i, row in enumerate(rows, 1):
+        lines.append(f"{i}. {row['employer_name']} {_fmt(row['amount'])} KSH")
+    lines.append("0. Back")
+    return _goto(session, "claim_select", "\n".join(lines))
+
+
+async def _claim_select(choice: str, session: dict, phone: str) -> str:
+    options = session.get("claim_options") or []
+    if not choice.isdigit() or not 1 <= int(choice) <= len(options):
         return "END Invalid option. Try again."
+    caller = await _caller(session, phone)
+    if not caller:
+        return NO_ACCOUNT
+
+    def submit():
+        schedule = schedule_repository.get_by_id(options[int(choice) - 1])
+        if not schedule or schedule["worker_id"] != caller["worker_id"]:
+            return None
+        return claim_repository.create(
+            worker_id=caller["worker_id"],
+            employer_id=schedule["employer_id"],
+            amount=schedule["amount"],
+            message="Claimed via USSD",
+            schedule_id=schedule["schedule_id"],
+        )
+
+    claim = await asyncio.to_thread(submit)
+    if claim is None:
+        return "END That payment is no longer available."
+    await asyncio.to_thread(events.emit, events.CLAIM_CHANGED, {"worker_id": caller["worker_id"]})
+    return f"END Claim {claim['claim_id']} for {_fmt(claim['amount'])} KSH sent to your employer."
+
 
-    if step == "register_phone":
-        phone = _normalize_phone(choice)
-        if len(phone) < 10:
-            return "END Invalid phone number. Use format 254712345678."
-        try:
-            result = create_account(phone, send_sms=True)
-            session["step"] = "main"
-            set_session(session_id, session)
-            if result.get("already_exists"):
-                return f"END Account already exists. Worker ID: {result['worker_id']}"
-            return f"END Account created. Worker ID: {result['worker_id']}. Check SMS for details."
-        except Exception:
-            return "END Registration failed. Please try again later."
-
-    if step == "login_phone":
-        phone = _normalize_phone(choice)
-        from app.db.repositories import get_worker_by_phone
-        worker = get_worker_by_phone(phone)
-        session["step"] = "main"
-        set_session(session_id, session)
-        if not worker:
-            return "END No account found for this number. Create an account first (option 1)."
-        return f"END Signed in. Worker ID: {worker['worker_id']}"
-
-    session["step"] = "main"
-    set_session(session_id, session)
-    return "END Invalid option. Try again."
\ No newline at end of file
+MENU = compile_menu({
+    "main": State(ROOT_MENU, routes={"1": "register_name", "2": "account", "3": "payments", "4": "exit"}),
+    "exit": State("END Goodbye."),
+    "register_name": State("CON Enter your full name:", on_enter=_enter_register, on_input=_register_name),
+    "register_confirm": State(on_input=_register_confirm),
+    "account": State(
+        ACCOUNT_MENU,
+        routes={"1": "balance", "2": "mini_statement", "3": "work_history", "4": "reputation", "0": "main"},
+        on_enter=_require_caller,
+    ),
+    "balance": State(on_enter=_balance),
+    "mini_statement": State(on_enter=_mini_statement),
+    "work_history": State(on_enter=_work_history),
+    "reputation": State(on_enter=_reputation),
+    "payments": State(
+        PAYMENTS_MENU,
+        routes={"1": "deposit_amount", "2": "withdraw_amount", "3": "my_claims", "4": "claim_select", "0": "main"},
+        on_enter=_require_caller,
+    ),
+    "deposit_amount": State("CON Enter amount to deposit (KES):", on_input=_deposit_amount),
+    "deposit_confirm": State(on_input=_deposit_confirm),
+    "withdraw_amount": State("CON Enter amount to withdraw (KSH):", on_input=_withdraw_amount),
+    "withdraw_phone": State(on_input=_withdraw_phone),
+    "withdraw_confirm": State(on_input=_withdraw_confirm),
+    "my_claims": State(on_enter=_my_claims),
+    "claim_select": State(routes={"0": "payments"}, on_enter=_claim_options, on_input=_claim_select),
+})
@@ -0,0 +1,111 @@
+"""
+USSD menu graph.
+
+The menu is declared once as a mapping of state name -> ``State`` and
+compiled at import time: transitions are checked against the state table
+and static screens are pre-rendered and checked against the 182-character
+USSD limit, so a hop is just a dict lookup on the stored step plus the
+newest input segment.
+
+A ``State`` has:
+
+  - ``screen``  – text shown on entering the state.  A screen starting with
+    ``END`` makes the state terminal (no step is stored).
+  - ``routes``  – fixed choices (``"1"``, ``"0"``…) and the state they lead to.
+  - ``on_enter`` – optional ``(session, phone) -> str | None``; returning a
+    string replaces the screen (dynamic content or a guard), ``None`` shows
+    the pre-rendered screen.
+  - ``on_input`` – optional ``(choice, session, phone) -> str`` for free-text
+    input (names, amounts) that is not one of ``routes``.  Input-only states
+    with a dynamic prompt ("Withdraw 500.00 KSH to ...?") are entered by the
+    previous state's handler setting ``session["step"]`` and returning the
+    prompt itself.
+"""
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+MAX_SCREEN_CHARS = 182
+
+EnterHandler = Callable[[dict, str], Awaitable[Optional[str]]]
+InputHandler = Callable[[str, dict, str], Awaitable[str]]
+
+
+@dataclass(frozen=True)
+class State:
+    """One node of the menu graph (see module docstring)."""
+
+    screen: str = ""
+    routes: Mapping[str, str] = field(default_factory=dict)
+    on_enter: Optional[EnterHandler] = None
+    on_input: Optional[InputHandler] = None
+
+
+def render_menu(title: str, options: Mapping[str, str]) -> str:
+    """Pre-render a ``CON`` menu screen: title line then ``key. label`` per option."""
+    return "\n".join([f"CON {title}"] + [f"{key}. {label}" for key, label in options.items()])
+
+
+def fit_screen(text: str) -> str:
+    """Clamp a response to the USSD screen limit (gateways drop longer payloads)."""
+    return text if len(text) <= MAX_SCREEN_CHARS else text[: MAX_SCREEN_CHARS - 3] + "..."
+
+
+def last_input(text: str) -> str:
+    """
+    Return the newest segment of the cumulative USSD ``text``.
+
+    Africa's Talking resends the whole history ("3*2*500"); the session
+    already holds the state it produced, so only the part after the last
+    ``*`` is parsed.
+    """
+    return (text or "").rpartition("*")[2].strip()
+
+
+class MenuGraph:
+    """Compiled, read-only menu: validated states plus the transition function."""
+
+    def __init__(self, states: Mapping[str, State], root: str):
+        self.states: Dict[str, State] = dict(states)
+        self.root = root
+        self._validate()
+
+    def _validate(self) -> None:
+        if self.root not in self.states:
+            raise ValueError(f"Menu root '{self.root}' is not a state")
+        for name, state in self.states.items():
+            if len(state.screen) > MAX_SCREEN_CHARS:
+                raise ValueError(f"Screen for '{name}' is {len(state.screen)} chars (max {MAX_SCREEN_CHARS})")
+            if state.screen and not state.screen.startswith(("CON ", "END ")):
+                raise ValueError(f"Screen for '{name}' must start with CON or END")
+            if not (state.screen or state.on_enter or state.on_input):
+                raise ValueError(f"State '{name}' needs a screen or a handler")
+            for choice, target in state.routes.items():
+                if target not in self.states:
+                    raise ValueError(f"State '{name}' routes '{choice}' to unknown state '{target}'")
+
+    async def enter(self, name: str, session: dict, phone: str) -> str:
+        """Move the session into state *name* and return its screen."""
+        state = self.states[name]
+        if state.on_enter is not None:
+            response = await state.on_enter(session, phone)
+            if response is not None:
+                return response
+        if state.screen.startswith("CON"):
+            session["step"] = name
+        return state.screen
+
+    async def advance(self, session: dict, choice: str, phone: str) -> str:
+        """Apply *choice* to the session's current state and return the response."""
+        step = session.get("step", self.root)
+        state = self.states.get(step) or self.states[self.root]
+        target = state.routes.get(choice)
+        if target is not None:
+            return await self.enter(target, session, phone)
+        if state.on_input is not None:
+            return await state.on_input(choice, session, phone)
+        return state.screen or await self.enter(self.root, session, phone)
+
+
+def compile_menu(states: Mapping[str, State], root: str = "main") -> MenuGraph:
+    """Validate *states* and return the compiled graph (call once, at import)."""
+    return MenuGraph(states, root)
@@ -0,0 +1,206 @@
+"""
+USSD session stores.
+
+``USSD_SESSION_BACKEND`` selects where menu state lives between hops:
+
+  - ``redis``  (default) – shared across workers/nodes; if Redis is slow or
+    unreachable the store degrades to the in-process store for
+    ``USSD_REDIS_RETRY_SECONDS`` instead of failing the callback.
+  - ``memory`` – in-process TTL store for single-node deployments; saves a
+    network hop per keypress.
+
+Both keep the same key/TTL semantics (``USSD_SESSION_TTL``, refreshed on
+every read) and store the session as compact JSON.  The interface is
+async so the ``/ussd`` route never blocks the event loop on Redis.
+"""
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.cache import get_async_redis
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _decode(raw) -> dict:
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+    except (json.JSONDecodeError, TypeError, UnicodeDecodeError):
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+class SessionStore(ABC):
+    """Interface: ``get`` returns ``{}`` for unknown sessions; ``set`` (re)starts the TTL."""
+
+    name = "base"
+
+    @abstractmethod
+    async def get(self, session_id: str) -> dict:
+        ...
+
+    @abstractmethod
+    async def set(self, session_id: str, data: dict) -> None:
+        ...
+
+
+class RedisSessionStore(SessionStore):
+    """Sessions in Redis under ``ussd:session:{id}`` (asyncio client)."""
+
+    name = "redis"
+
+    def __init__(
+        self,
+        ttl: int = Config.USSD_SESSION_TTL,
+        client_factory: Callable[[], aioredis.Redis] = get_async_redis,
+    ):
+        self.ttl = ttl
+        self._client = client_factory
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"ussd:session:{session_id}"
+
+    async def get(self, session_id: str) -> dict:
+        return _decode(await self._client().getex(self._key(session_id), ex=self.ttl))
+
+    async def set(self, session_id: str, data: dict) -> None:
+        await self._client().set(self._key(session_id), _encode(data), ex=self.ttl)
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Bounded in-process store with TTL eviction.
+
+    Entries expire ``ttl`` seconds after their last access; when
+    ``max_entries`` is reached the least recently used entry is dropped.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self,
+        ttl: int = Config.USSD_SESSION_TTL,
+        max_entries: int = Config.USSD_SESSION_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._data: "OrderedDict[str, tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _purge_expired(self, now: float) -> None:
+        # Entries are kept in last-access order, so expired ones are at the front.
+        while self._data:
+            key, (expires_at, _) = next(iter(self._data.items()))
+            if expires_at > now:
+                break
+            del self._data[key]
+
+    async def get(self, session_id: str) -> dict:
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(session_id)
+            if entry is None:
+                return {}
+            if entry[0] <= now:
+                del self._data[session_id]
+                return {}
+            self._data[session_id] = (now + self.ttl, entry[1])
+            self._data.move_to_end(session_id)
+            raw = entry[1]
+        return _decode(raw)
+
+    async def set(self, session_id: str, data: dict) -> None:
+        raw = _encode(data)
+        now = self._clock()
+        with self._lock:
+            self._data[session_id] = (now + self.ttl, raw)
+            self._data.move_to_end(session_id)
+            self._purge_expired(now)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class FallbackSessionStore(SessionStore):
+    """Use *primary*; on Redis errors switch to *fallback* for ``retry_after`` seconds."""
+
+    def __init__(
+        self,
+        primary: SessionStore,
+        fallback: SessionStore,
+        retry_after: float = Config.USSD_REDIS_RETRY_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self._clock = clock
+        self._down_until = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.fallback.name if self._clock() < self._down_until else self.primary.name
+
+    async def _call(self, method: str, *args):
+        if self._clock() >= self._down_until:
+            try:
+                return await getattr(self.primary, method)(*args)
+            except redis.RedisError as e:
+                logger.warning(
+                    "USSD session store %s failed (%s); using %s for %ss",
+                    self.primary.name, e, self.fallback.name, self.retry_after,
+                )
+                self._down_until = self._clock() + self.retry_after
+        return await getattr(self.fallback, method)(*args)
+
+    async def get(self, session_id: str) -> dict:
+        return await self._call("get", session_id)
+
+    async def set(self, session_id: str, data: dict) -> None:
+        await self._call("set", session_id, data)
+
+
+_store: Optional[SessionStore] = None
+
+
+def build_session_store(backend: str = "") -> SessionStore:
+    """Create the store for *backend* (defaults to ``USSD_SESSION_BACKEND``)."""
+    backend = (backend or Config.USSD_SESSION_BACKEND).lower()
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "redis":
+        return FallbackSessionStore(RedisSessionStore(), MemorySessionStore())
+    raise ValueError(f"Unknown USSD_SESSION_BACKEND '{backend}' (expected 'redis' or 'memory')")
+
+
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store."""
+    global _store
+    if _store is None:
+        _store = build_session_store()
+    return _store
+
+
+def set_session_store(store: Optional[SessionStore]) -> None:
+    """Replace the process-wide store (None resets to the configured backend)."""
+    global _store
+    _store = store
@@ -0,0 +1,63 @@
+"""HTTP caching headers and conditional GET.
+
+Responses carry an ``ETag`` and a ``Cache-Control`` policy:
+
+  - ``IMMUTABLE`` for content that never changes under its URL (IPFS
+    content by CID, certificates of minted reviews, confirmed
+    transactions): browsers and CDNs keep it for a year without asking.
+  - ``REVALIDATE`` for everything else: caches may keep a copy but must
+    check it, and an unchanged resource is answered with an empty 304.
+
+``conditional`` sets both headers on the route's ``Response`` and returns
+the 304 when the request's ``If-None-Match`` already has the ETag, so
+routes can skip the expensive part (rendering, serialising) entirely.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+def make_etag(value: str) -> str:
+    """Quote *value* (a content hash, CID, ...) as a strong ETag."""
+    return f'"{value}"'
+
+
+def etag_for(data: bytes) -> str:
+    """Strong ETag for a response body."""
+    return make_etag(hashlib.sha256(data).hexdigest()[:32])
+
+
+def json_etag(data: Any) -> str:
+    """ETag for a JSON-serialisable value (models included), independent of key order."""
+    body = json.dumps(jsonable_encoder(data), sort_keys=True, separators=(",", ":"), default=str)
+    return etag_for(body.encode())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """``If-None-Match`` check (weak comparison, as RFC 9110 requires for GET)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional(
+    request: Request, response: Response, etag: str, cache_control: str = REVALIDATE
+) -> Optional[Response]:
+    """
+    Set ``ETag`` / ``Cache-Control`` on *response*; return a 304 carrying
+    its headers when the client's copy is current, else None.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
@@ -0,0 +1,126 @@
+"""In-process latency histograms.
+
+Lightweight, dependency-free metrics used to time outbound integration
+calls and other hot paths.  Each histogram keeps cumulative bucket counts
+(milliseconds) plus count/sum so percentiles can be estimated from a
+``snapshot()`` exposed on ``GET /metrics``.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+# Upper bounds (ms) of the latency buckets; the last bucket is +Inf.
+DEFAULT_BUCKETS_MS: Tuple[float, ...] = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000,
+)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket latency histogram (values in milliseconds)."""
+
+    def __init__(self, name: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS_MS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        """Record a single observation."""
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                idx = i
+                break
+        with self._lock:
+            self._counts[idx] += 1
+            self._count += 1
+            self._sum += value_ms
+            if value_ms > self._max:
+                self._max = value_ms
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0–100) from bucket upper bounds."""
+        with self._lock:
+            total = self._count
+            counts = list(self._counts)
+            largest = self._max
+        if not total:
+            return 0.0
+        target = total * q / 100.0
+        running = 0
+        for i, c in enumerate(counts):
+            running += c
+            if running >= target:
+                return min(self.buckets[i], largest) if i < len(self.buckets) else largest
+        return largest
+
+    def snapshot(self) -> Dict:
+        """Return count, sum, mean, max, p50/p95/p99 and cumulative buckets."""
+        with self._lock:
+            counts = list(self._counts)
+            count, total, largest = self._count, self._sum, self._max
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for bound, c in zip(list(self.buckets) + ["+Inf"], counts):
+            running += c
+            cumulative[str(bound)] = running
+        return {
+            "count": count,
+            "sum_ms": round(total, 3),
+            "mean_ms": round(total / count, 3) if count else 0.0,
+            "max_ms": round(largest, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "buckets": cumulative,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * (len(self.buckets) + 1)
+            self._count = 0
+            self._sum = 0.0
+            self._max = 0.0
+
+
+_registry: Dict[str, Histogram] = {}
+_registry_lock = threading.Lock()
+
+
+def histogram(name: str) -> Histogram:
+    """Get or create the histogram registered under *name*."""
+    hist = _registry.get(name)
+    if hist is None:
+        with _registry_lock:
+            hist = _registry.setdefault(name, Histogram(name))
+    return hist
+
+
+def observe(name: str, value_ms: float) -> None:
+    """Record *value_ms* on the histogram called *name*."""
+    histogram(name).observe(value_ms)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Context manager that records the elapsed wall time of its block."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - start) * 1000.0)
+
+
+def snapshot(prefix: Optional[str] = None) -> Dict[str, Dict]:
+    """Snapshot every registered histogram (optionally filtered by name prefix)."""
+    with _registry_lock:
+        items = list(_registry.items())
+    return {
+        name: hist.snapshot()
+        for name, hist in sorted(items)
+        if prefix is None or name.startswith(prefix)
+    }
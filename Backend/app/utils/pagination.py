@@ -0,0 +1,60 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+A page is ordered by a sort column plus the row ``id`` as tie-breaker, and
+the cursor is the (sort value, id) of the last row returned, encoded as an
+opaque URL-safe token.  The next page is ``WHERE (sort, id) < (?, ?)`` (or
+``>`` for ascending lists), which an ``(owner_id, sort)`` index answers
+with a range seek — no OFFSET, and rows inserted meanwhile do not shift
+pages.
+
+List endpoints still return a plain JSON array; when more rows exist the
+cursor for the next page is sent in the ``X-Next-Cursor`` header.
+"""
+import base64
+import json
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the keyset values of a row as an opaque cursor."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int = 2) -> Optional[list]:
+    """Decode a cursor from ``encode_cursor``; raises HTTP 400 when it is malformed."""
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+    return values
+
+
+def keyset_clause(columns: Tuple[str, str], after: Optional[list], descending: bool = True) -> Tuple[str, list]:
+    """Return ``(" AND (a, b) < (?, ?)", params)`` for *after*, or ``("", [])`` on the first page."""
+    if after is None:
+        return "", []
+    op = "<" if descending else ">"
+    return f" AND ({columns[0]}, {columns[1]}) {op} (?, ?)", list(after)
+
+
+def page(rows: List[dict], limit: Optional[int], keys: Tuple[str, str], response: Response) -> List[dict]:
+    """
+    Trim rows fetched with ``limit + 1`` to *limit* and set ``X-Next-Cursor``
+    when the extra row shows another page exists.
+    """
+    if limit is None or len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor([rows[-1][k] for k in keys])
+    return rows
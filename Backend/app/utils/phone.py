@@ -0,0 +1,33 @@
+"""Phone number normalization (Kenyan numbers).
+
+One implementation shared by USSD, M-Pesa, SMS and the worker repository:
+
+  - ``normalize_phone``  -> ``254XXXXXXXXX`` (MSISDN, the form M-Pesa and
+    Africa's Talking expect)
+  - ``to_e164``          -> ``+254XXXXXXXXX`` (stored in ``workers.phone_e164``)
+  - ``normalize_phones`` -> the MSISDN form for a batch (migrations, imports)
+"""
+from typing import Iterable, List
+
+# Separators people type or gateways add: spaces, dashes, brackets, dots, '+'.
+_STRIP = str.maketrans("", "", " -().+")
+
+
+def normalize_phone(raw: str) -> str:
+    """Return *raw* as ``254XXXXXXXXX`` (accepts ``0712…``, ``+254 712…``, ``712…``)."""
+    digits = (raw or "").strip().translate(_STRIP)
+    if digits.startswith("254"):
+        return digits
+    if digits.startswith("0"):
+        return "254" + digits[1:]
+    return "254" + digits
+
+
+def to_e164(raw: str) -> str:
+    """Return *raw* in E.164 form, ``+254XXXXXXXXX``."""
+    return "+" + normalize_phone(raw)
+
+
+def normalize_phones(values: Iterable[str]) -> List[str]:
+    """Normalize many numbers at once (same rules as ``normalize_phone``)."""
+    return [normalize_phone(v) for v in values]
@@ -0,0 +1,56 @@
+"""
+Backfill / verify the local review NFT index against Horizon.
+
+Reconciles every worker's account (or only the ``--worker`` ids given):
+claimable balances and held ``RVW*`` assets are read from Horizon and
+upserted into ``review_nfts``, which also records NFTs that have since been
+claimed.  Safe to re-run; rows are keyed by asset code and issuer.
+
+    python scripts/backfill_review_nfts.py [--worker NC1234 ...]
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db import get_connection  # noqa: E402
+from app.services.review_nfts import reconcile_account  # noqa: E402
+
+
+def _public_keys(worker_ids: List[str]) -> List[str]:
+    conn = get_connection()
+    try:
+        if worker_ids:
+            marks = ",".join("?" * len(worker_ids))
+            rows = conn.execute(
+                f"SELECT stellar_public_key FROM workers WHERE worker_id IN ({marks})", worker_ids
+            ).fetchall()
+        else:
+            rows = conn.execute("SELECT stellar_public_key FROM workers").fetchall()
+        return [r["stellar_public_key"] for r in rows]
+    finally:
+        conn.close()
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--worker", action="append", default=[], help="Worker id to reconcile (repeatable)")
+    args = parser.parse_args(argv)
+
+    total = 0
+    for public_key in _public_keys(args.worker):
+        try:
+            count = reconcile_account(public_key)
+        except Exception as e:
+            print(f"{public_key}: failed ({e})")
+            continue
+        total += count
+        if count:
+            print(f"{public_key}: {count} review NFT(s)")
+    print(f"Indexed {total} review NFT(s)")
+
+
+if __name__ == "__main__":
+    main()
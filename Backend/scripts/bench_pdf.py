@@ -0,0 +1,82 @@
+"""
+Throughput benchmark for review certificate PDFs.
+
+Renders ``--certificates`` distinct certificates (cold: every one is laid
+out and serialized) and then requests them all again (warm: served from the
+content-addressed render cache), printing certificates/second for each.
+``pool`` renders the same set (cache cleared) through the process pool used
+by exports, with ``--workers`` processes.
+
+    python scripts/bench_pdf.py --certificates 1000 --workers 4
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.config import Config  # noqa: E402
+from app.services import pdf  # noqa: E402
+
+
+def sample(i: int) -> dict:
+    return {
+        "worker_name": f"Worker {i}",
+        "worker_code": f"NW-{i:06d}",
+        "role": "Childcare",
+        "start_date": "2024-01-01",
+        "end_date": "2024-07-01",
+        "duration_months": 6,
+        "rating": 1 + i % 5,
+        "comment": "Punctual, caring and trusted with the household keys. " * 3,
+        "reviewer_type": "employer",
+        "review_date": "Feb 11, 2026",
+        "stellar_tx_id": f"{i:064x}",
+        "explorer_url": f"https://stellar.expert/explorer/testnet/tx/{i:064x}",
+    }
+
+
+def _rate(label: str, items: List[dict]) -> None:
+    start = time.perf_counter()
+    total = sum(len(pdf.generate_review_pdf(data)) for data in items)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<6} {len(items) / elapsed:>10.1f} certificates/s  "
+          f"({elapsed * 1000 / len(items):.2f} ms each, {total / len(items):.0f} bytes avg)")
+
+
+async def _render_all(items: List[dict]) -> int:
+    return sum([len(data) async for data in pdf.render_review_pdfs(items)])
+
+
+def _rate_pool(items: List[dict]) -> None:
+    pdf.clear_cache()
+    pdf.get_pdf_pool()
+    asyncio.run(_render_all(items[:Config.PDF_RENDER_WORKERS or 1]))  # start the worker processes
+    pdf.clear_cache()
+    start = time.perf_counter()
+    total = asyncio.run(_render_all(items))
+    elapsed = time.perf_counter() - start
+    pdf.shutdown_pdf_pool()
+    print(f"{'pool':<6} {len(items) / elapsed:>10.1f} certificates/s  "
+          f"({pdf._pool_size()} processes, {total / len(items):.0f} bytes avg)")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--certificates", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=0, help="Render processes (0 = one per CPU)")
+    args = parser.parse_args(argv)
+    Config.PDF_RENDER_WORKERS = args.workers
+
+    items = [sample(i) for i in range(args.certificates)]
+    pdf.clear_cache()
+    _rate("cold", items)
+    _rate("warm", items)
+    _rate_pool(items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark for the review eligibility / relationship queries.
+
+Builds a throwaway SQLite database with ``--rows`` scheduled payments
+(default 1,000,000) between ``--users`` employers and as many workers, and
+about as many reviews, then times the previous queries (``NOT IN`` +
+``DISTINCT``, ``OR`` pair check, single-column indexes) against the current
+ones in ``review_repository``.  Each query's ``EXPLAIN QUERY PLAN`` is
+printed and the current plans are checked for full scans of
+``scheduled_payments``.
+
+    python scripts/bench_review_queries.py --rows 1000000 --users 20000 --lookups 2000
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app.db as db  # noqa: E402
+from app.db.repositories import review_repository  # noqa: E402
+from app.utils.metrics import Histogram  # noqa: E402
+
+CUTOFF = "2100-01-01 00:00:00"
+
+LEGACY_INDEXES = """
+DROP INDEX IF EXISTS idx_sched_employer_since;
+DROP INDEX IF EXISTS idx_sched_worker_since;
+DROP INDEX IF EXISTS idx_sched_pair;
+DROP INDEX IF EXISTS idx_reviews_reviewer_schedule;
+CREATE INDEX idx_sched_employer ON scheduled_payments(employer_id);
+CREATE INDEX idx_sched_worker ON scheduled_payments(worker_id);
+CREATE INDEX idx_reviews_reviewer ON reviews(reviewer_id);
+"""
+
+LEGACY_ELIGIBLE_SQL = """
+SELECT DISTINCT sp.worker_id AS reviewee_id, sp.schedule_id, sp.created_at AS relationship_since,
+       w.name AS reviewee_name, w.role AS reviewee_role
+FROM scheduled_payments sp
+JOIN workers w ON w.worker_id = sp.worker_id
+WHERE sp.employer_id = ?
+  AND sp.created_at <= ?
+  AND sp.schedule_id NOT IN (
+      SELECT r.schedule_id FROM reviews r
+      WHERE r.reviewer_id = ? AND r.schedule_id IS NOT NULL
+  )
+"""
+
+LEGACY_RELATIONSHIP_SQL = """
+SELECT COUNT(*) AS cnt FROM scheduled_payments
+WHERE ((employer_id = ? AND worker_id = ?) OR (employer_id = ? AND worker_id = ?))
+  AND created_at <= ?
+"""
+
+
+def populate(path: str, rows: int, users: int) -> None:
+    """Create the schema at *path* and bulk-load workers, schedules and reviews."""
+    db._DB_PATH, db._initialised = path, False
+    db.get_connection().close()  # creates the schema
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    rng = random.Random(42)
+    employers = [f"NE-{i:06d}" for i in range(users)]
+    workers = [f"NW-{i:06d}" for i in range(users)]
+    conn.executemany(
+        "INSERT INTO workers (worker_id, phone, stellar_public_key, stellar_secret_encrypted, name, role) "
+        "VALUES (?, ?, ?, 'x', ?, ?)",
+        [(uid, f"p{uid}", f"G{uid}", uid, "employer" if uid.startswith("NE") else "worker")
+         for uid in employers + workers],
+    )
+
+    def schedules():
+        for i in range(rows):
+            day = rng.randrange(0, 3 * 365)
+            yield (f"SP-{i:08d}", rng.choice(employers), rng.choice(workers), "100", "2030-01-01",
+                   f"2023-{1 + day // 31 % 12:02d}-{1 + day % 28:02d} 00:00:00")
+
+    conn.executemany(
+        "INSERT INTO scheduled_payments (schedule_id, employer_id, worker_id, amount, next_payment_date, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        schedules(),
+    )
+
+    def reviews():
+        for schedule_id, employer, worker in conn.execute(
+            "SELECT schedule_id, employer_id, worker_id FROM scheduled_payments"
+        ).fetchall():
+            # ~ one review per schedule: mostly employer -> worker, some both ways
+            if rng.random() < 0.7:
+                yield (f"RV-E{schedule_id}", employer, worker, "employer", rng.randint(1, 5), schedule_id)
+            if rng.random() < 0.3:
+                yield (f"RV-W{schedule_id}", worker, employer, "worker", rng.randint(1, 5), schedule_id)
+
+    conn.executemany(
+        "INSERT INTO reviews (review_id, reviewer_id, reviewee_id, reviewer_role, rating, schedule_id) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        reviews(),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+def plan(conn: sqlite3.Connection, sql: str, params: tuple) -> str:
+    return " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+
+def measure(name: str, fn: Callable[[str, str], object], pairs: List[Tuple[str, str]]) -> dict:
+    hist = Histogram(name, buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250))
+    for a, b in pairs:
+        start = time.perf_counter()
+        fn(a, b)
+        hist.observe((time.perf_counter() - start) * 1000.0)
+    return {"name": name, **hist.snapshot()}
+
+
+def run_suite(label: str, conn: sqlite3.Connection, eligible_sql: str, relationship: Tuple[str, Callable],
+              pairs: List[Tuple[str, str]]) -> List[dict]:
+    rel_sql, rel_params = relationship
+    print(f"\n[{label}]")
+    print(f"  eligible plan:     {plan(conn, eligible_sql, (pairs[0][0], CUTOFF, pairs[0][0]))}")
+    print(f"  relationship plan: {plan(conn, rel_sql, rel_params(*pairs[0]))}")
+    return [
+        measure(f"{label} eligible", lambda e, _: conn.execute(eligible_sql, (e, CUTOFF, e)).fetchall(), pairs),
+        measure(f"{label} relationship", lambda a, b: conn.execute(rel_sql, rel_params(a, b)).fetchone(), pairs),
+    ]
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Scheduled payments to generate")
+    parser.add_argument("--users", type=int, default=20_000, help="Employers (and workers) to generate")
+    parser.add_argument("--lookups", type=int, default=2_000, help="Queries timed per variant")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        start = time.perf_counter()
+        populate(path, args.rows, args.users)
+        conn = sqlite3.connect(path)
+        counts = [conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("scheduled_payments", "reviews")]
+        print(f"Loaded {counts[0]:,} schedules and {counts[1]:,} reviews in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(7)
+        pairs = [(f"NE-{rng.randrange(args.users):06d}", f"NW-{rng.randrange(args.users):06d}")
+                 for _ in range(args.lookups)]
+
+        current = run_suite(
+            "current", conn, review_repository.ELIGIBLE_REVIEWEES_SQL["employer"],
+            (review_repository.HAS_RELATIONSHIP_SQL, lambda a, b: (a, b, CUTOFF, b, a, CUTOFF)), pairs,
+        )
+        employer, worker = pairs[0]
+        for sql, params in [
+            (review_repository.ELIGIBLE_REVIEWEES_SQL["employer"], (employer, CUTOFF, employer)),
+            (review_repository.ELIGIBLE_REVIEWEES_SQL["worker"], (worker, CUTOFF, worker)),
+            (review_repository.HAS_RELATIONSHIP_SQL, (employer, worker, CUTOFF, worker, employer, CUTOFF)),
+        ]:
+            text = plan(conn, sql, params)
+            if "SCAN sp" in text or "SCAN scheduled_payments" in text:
+                raise SystemExit(f"Full scan of scheduled_payments in current plan: {text}")
+
+        conn.executescript(LEGACY_INDEXES + "ANALYZE;")
+        legacy = run_suite(
+            "legacy", conn, LEGACY_ELIGIBLE_SQL,
+            (LEGACY_RELATIONSHIP_SQL, lambda a, b: (a, b, b, a, CUTOFF)), pairs,
+        )
+        conn.close()
+
+    print(f"\n{'query':<24}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for snap in legacy + current:
+        cols = "".join(f"{round(snap[k], 3):>10}" for k in ("p50_ms", "p95_ms", "p99_ms", "max_ms"))
+        print(f"{snap['name']:<24}{cols}")
+
+
+if __name__ == "__main__":
+    main()
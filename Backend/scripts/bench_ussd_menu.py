@@ -0,0 +1,76 @@
+"""
+Throughput benchmark for the compiled USSD menu.
+
+Simulates N complete sessions (default 10,000) through ``handle_ussd`` with
+the in-process session store and a throwaway SQLite database holding one
+worker.  Each session walks Payments -> Withdraw -> amount -> "this phone",
+stopping at the confirm screen so no M-Pesa or Stellar call is made.
+
+    python scripts/bench_ussd_menu.py --sessions 10000 --concurrency 100
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app.db as db  # noqa: E402
+from app.db.repositories import create_worker  # noqa: E402
+from app.utils.metrics import Histogram  # noqa: E402
+from app.ussd import handler  # noqa: E402
+from app.ussd.sessions import MemorySessionStore, set_session_store  # noqa: E402
+
+PHONE = "254700000001"
+PATH = ["", "3", "3*2", "3*2*500", "3*2*500*0"]  # each value is one hop's USSD text
+BUCKETS_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+
+async def run_session(hist: Histogram) -> None:
+    session_id = uuid.uuid4().hex
+    for text in PATH:
+        start = time.perf_counter()
+        response = await handler.handle_ussd(session_id, PHONE, text)
+        hist.observe((time.perf_counter() - start) * 1000.0)
+        if not response.startswith("CON"):
+            raise RuntimeError(f"Unexpected response at {text!r}: {response}")
+
+
+async def bench(sessions: int, concurrency: int) -> None:
+    set_session_store(MemorySessionStore(max_entries=max(sessions, 1)))
+    hist = Histogram("ussd.hop", buckets=BUCKETS_MS)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await run_session(hist)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(sessions)))
+    elapsed = time.perf_counter() - started
+    set_session_store(None)
+
+    snap = hist.snapshot()
+    print(f"{sessions} sessions / {snap['count']} hops in {elapsed:.2f}s "
+          f"({sessions / elapsed:,.0f} sessions/s, {snap['count'] / elapsed:,.0f} hops/s)")
+    print(f"hop latency ms: p50={snap['p50_ms']} p95={snap['p95_ms']} p99={snap['p99_ms']} max={snap['max_ms']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db._DB_PATH = str(Path(tmp) / "bench.db")
+        db._initialised = False
+        create_worker(phone=PHONE, stellar_public_key="GBENCH", stellar_secret_encrypted="x")
+        asyncio.run(bench(args.sessions, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
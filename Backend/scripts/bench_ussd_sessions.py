@@ -0,0 +1,70 @@
+"""
+Benchmark USSD hop latency per session backend.
+
+Runs ``handle_ussd`` through a menu path that touches only the session
+store plus one account lookup (open menu -> "Create account" -> enter a
+name, stopping before the confirm step) for N sessions and
+reports p50 / p95 / p99 hop latency for the in-process store and, when
+reachable, Redis.
+
+    python scripts/bench_ussd_sessions.py --sessions 5000
+    REDIS_URL=redis://localhost:6379/0 python scripts/bench_ussd_sessions.py
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import redis  # noqa: E402
+
+from app.cache import close_async_redis, get_async_redis  # noqa: E402
+from app.utils.metrics import Histogram  # noqa: E402
+from app.ussd import handler  # noqa: E402
+from app.ussd.sessions import MemorySessionStore, RedisSessionStore, set_session_store  # noqa: E402
+
+PATH = ["", "1", "1*Bench User"]  # each value is one hop's USSD text
+# Sub-millisecond buckets: in-process hops are far below the default 5 ms floor.
+BUCKETS_MS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100)
+
+
+async def run(store, sessions: int) -> dict:
+    set_session_store(store)
+    hist = Histogram(store.name, buckets=BUCKETS_MS)
+    for _ in range(sessions):
+        session_id = uuid.uuid4().hex
+        for text in PATH:
+            start = time.perf_counter()
+            await handler.handle_ussd(session_id, "254700000000", text)
+            hist.observe((time.perf_counter() - start) * 1000.0)
+    return hist.snapshot()
+
+
+async def bench(sessions: int) -> None:
+    stores = [MemorySessionStore()]
+    try:
+        await get_async_redis().ping()
+        stores.append(RedisSessionStore())
+    except redis.RedisError as e:
+        print(f"Redis unavailable ({e}); benchmarking memory only.\n")
+
+    print(f"{'backend':<10}{'hops':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for store in stores:
+        snap = await run(store, sessions)
+        print(f"{store.name:<10}{snap['count']:>8}{snap['p50_ms']:>10}{snap['p95_ms']:>10}"
+              f"{snap['p99_ms']:>10}{snap['max_ms']:>10}")
+    set_session_store(None)
+    await close_async_redis()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(bench(args.sessions))
+
+if __name__ == "__main__":
+    main()
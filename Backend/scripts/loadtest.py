@@ -0,0 +1,217 @@
+"""
+Load-test harness for the NannyChain API.
+
+Drives concurrent payment sends, off-ramps and USSD sessions against a
+running backend and reports p50 / p95 / p99 latency per endpoint.  Run the
+backend against ``scripts/simulator.py`` (see its docstring for the env
+vars) so no real IntaSend / Horizon / Africa's Talking credentials are used.
+
+    python scripts/loadtest.py --base-url http://127.0.0.1:5000 \\
+        --accounts 20 --concurrency 50 --duration 60 --mix send=5,offramp=2,ussd=3
+
+Backend-side latency of each integration is available from ``GET /metrics``;
+the harness prints the ``http.*`` entries at the end of the run.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.utils.metrics import Histogram  # noqa: E402
+
+DEFAULT_USSD_STEPS = ["", "2", "2*1"]  # My Account > Check balance
+
+
+class Recorder:
+    """Per-endpoint latency histograms and status-code counts."""
+
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def record(self, name: str, elapsed_ms: float, status: str) -> None:
+        self.histograms.setdefault(name, Histogram(name)).observe(elapsed_ms)
+        counts = self.statuses.setdefault(name, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    async def call(self, name: str, coro):
+        start = time.perf_counter()
+        try:
+            response = await coro
+            status = str(response.status_code)
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        self.record(name, (time.perf_counter() - start) * 1000.0, status)
+        return response
+
+    def report(self, duration: float) -> List[dict]:
+        rows = []
+        for name, hist in sorted(self.histograms.items()):
+            snap = hist.snapshot()
+            rows.append({
+                "endpoint": name,
+                "count": snap["count"],
+                "rps": round(snap["count"] / duration, 2) if duration else 0.0,
+                "p50_ms": snap["p50_ms"],
+                "p95_ms": snap["p95_ms"],
+                "p99_ms": snap["p99_ms"],
+                "max_ms": snap["max_ms"],
+                "statuses": self.statuses.get(name, {}),
+            })
+        return rows
+
+
+def _random_phone() -> str:
+    return "2547" + "".join(random.choice("0123456789") for _ in range(8))
+
+
+def _parse_mix(raw: str) -> Dict[str, int]:
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("send", "offramp", "ussd"):
+            raise SystemExit(f"Unknown scenario '{name}' in --mix")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+async def setup_accounts(client: httpx.AsyncClient, count: int, recorder: Recorder) -> List[dict]:
+    """Create *count* worker accounts (no SMS) to send payments between."""
+    async def create_one():
+        phone = _random_phone()
+        response = await recorder.call(
+            "POST /accounts/create",
+            client.post("/api/v1/accounts/create", json={"phone": phone, "send_sms": False}),
+        )
+        if response is not None and response.status_code == 200:
+            return response.json()
+        return None
+
+    created = await asyncio.gather(*(create_one() for _ in range(count)))
+    return [a for a in created if a]
+
+
+async def scenario_send(client, accounts, recorder, args):
+    sender, destination = random.sample(accounts, 2)
+    await recorder.call(
+        "POST /payments/send",
+        client.post("/api/v1/payments/send", json={
+            "sender": sender["worker_id"],
+            "destination": destination["worker_id"],
+            "amount": args.amount,
+        }),
+    )
+
+
+async def scenario_offramp(client, accounts, recorder, args):
+    sender = random.choice(accounts)
+    await recorder.call(
+        "POST /payments/offramp",
+        client.post("/api/v1/payments/offramp", json={
+            "sender": sender["worker_id"],
+            "phone": sender["phone"],
+            "amount": args.amount,
+        }),
+    )
+
+
+async def scenario_ussd(client, accounts, recorder, args):
+    account = random.choice(accounts)
+    session_id = f"load-{uuid.uuid4().hex[:12]}"
+    headers = {"Authorization": f"Bearer {args.ussd_api_key}"} if args.ussd_api_key else None
+    for step in args.ussd_steps:
+        response = await recorder.call(
+            "POST /ussd",
+            client.post(
+                "/ussd",
+                data={
+                    "sessionId": session_id,
+                    "phoneNumber": account["phone"],
+                    "text": step.format(phone=account["phone"]),
+                },
+                headers=headers,
+            ),
+        )
+        if response is None or response.status_code != 200 or response.text.startswith("END"):
+            break
+
+
+SCENARIOS = {"send": scenario_send, "offramp": scenario_offramp, "ussd": scenario_ussd}
+
+
+async def run(args: argparse.Namespace) -> None:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        accounts = await setup_accounts(client, args.accounts, recorder)
+        if len(accounts) < 2:
+            raise SystemExit("Account setup failed; is the backend (and simulator) running?")
+        print(f"Created {len(accounts)} accounts; running for {args.duration}s "
+              f"at concurrency {args.concurrency}")
+
+        mix = _parse_mix(args.mix)
+        names, weights = list(mix), list(mix.values())
+        deadline = time.monotonic() + args.duration
+
+        async def worker():
+            while time.monotonic() < deadline:
+                name = random.choices(names, weights)[0]
+                await SCENARIOS[name](client, accounts, recorder, args)
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.monotonic() - started
+
+        try:
+            backend = (await client.get("/metrics")).json()
+        except (httpx.HTTPError, ValueError):
+            backend = {}
+
+    rows = recorder.report(elapsed)
+    if args.json:
+        print(json.dumps({"endpoints": rows, "backend": backend}, indent=2))
+        return
+
+    print(f"\n{'endpoint':<24}{'count':>8}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  statuses")
+    for row in rows:
+        print(
+            f"{row['endpoint']:<24}{row['count']:>8}{row['rps']:>9}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}"
+            f"  {row['statuses']}"
+        )
+    upstream = {k: v for k, v in backend.items() if k.startswith("http.")}
+    if upstream:
+        print("\nBackend upstream latency (ms):")
+        for name, snap in sorted(upstream.items()):
+            print(f"  {name:<22} n={snap['count']:<7} p50={snap['p50_ms']:<9} "
+                  f"p95={snap['p95_ms']:<9} p99={snap['p99_ms']}")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:5000")
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--mix", default="send=5,offramp=2,ussd=3",
+                        help="Scenario weights, e.g. send=5,offramp=2,ussd=3")
+    parser.add_argument("--amount", default="1")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--ussd-api-key", default="")
+    parser.add_argument("--ussd-steps", nargs="*", default=DEFAULT_USSD_STEPS,
+                        help="USSD 'text' values for one session; {phone} is substituted")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Rebuild the ``rating_summary`` aggregate table from ``reviews``.
+
+The table is maintained incrementally by ``review_repository.create``;
+run this after editing or importing reviews outside the API.
+
+    python scripts/rebuild_rating_summary.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.repositories import review_repository  # noqa: E402
+
+
+def main() -> None:
+    count = review_repository.rebuild_rating_summary()
+    print(f"Rebuilt rating summaries for {count} user(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Local stand-in for IntaSend, Stellar Horizon, Friendbot, Pinata and
+Africa's Talking, for load testing without real credentials.
+
+Unlike the in-process demo fallbacks, every simulated call goes over HTTP
+through the backend's pooled clients and can be given a realistic latency
+distribution, error rate, rate limit (429 + Retry-After) and slow SSE
+streams.  Point the backend at it via base-URL settings:
+
+    INTASEND_BASE_URL=http://127.0.0.1:8100
+    INTASEND_API_KEY=sim INTASEND_SECRET=sim
+    HORIZON_URL=http://127.0.0.1:8100
+    FRIENDBOT_URL=http://127.0.0.1:8100/friendbot
+    PINATA_API_URL=http://127.0.0.1:8100
+    AT_API_BASE_URL=http://127.0.0.1:8100 AT_USERNAME=sim AT_API_KEY=sim
+
+Run:
+
+    python scripts/simulator.py --port 8100 \\
+        --latency horizon=lognormal:400,0.5 --latency intasend=uniform:300,1500 \\
+        --error-rate intasend=0.02 --throttle-rps africastalking=10 \\
+        --webhook-url http://127.0.0.1:5000/api/v1/mpesa/webhook \\
+        --webhook-challenge "$INTASEND_WEBHOOK_CHALLENGE"
+
+Latency specs: ``fixed:MS``, ``uniform:MIN,MAX``, ``normal:MEAN,STDDEV``,
+``lognormal:MEDIAN,SIGMA``.  ``GET /_sim/stats`` reports per-service counters.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from fastapi import FastAPI, Form, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SERVICES = ("horizon", "intasend", "africastalking", "friendbot", "pinata")
+
+# Result XDR for a successful single-op transaction; the backend never decodes it.
+_SUCCESS_RESULT_XDR = "AAAAAAAAAGQAAAAAAAAAAQAAAAAAAAABAAAAAAAAAAA="
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """Turn a latency spec into a sampler returning milliseconds."""
+    kind, _, raw = spec.partition(":")
+    args = [float(a) for a in raw.split(",") if a]
+    if kind == "fixed":
+        return lambda: args[0]
+    if kind == "uniform":
+        return lambda: random.uniform(args[0], args[1])
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(args[0], args[1]))
+    if kind == "lognormal":
+        mu = math.log(max(args[0], 0.001))
+        return lambda: random.lognormvariate(mu, args[1])
+    raise ValueError(f"Unknown latency distribution '{spec}'")
+
+
+class TokenBucket:
+    """Simple token bucket; ``take()`` returns False when the caller should get a 429."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+@dataclass
+class ServiceSettings:
+    latency: Callable[[], float] = field(default=lambda: 0.0)
+    latency_spec: str = "fixed:0"
+    error_rate: float = 0.0
+    throttle: TokenBucket | None = None
+
+
+@dataclass
+class SimulatorState:
+    services: Dict[str, ServiceSettings]
+    sse_interval: float = 5.0
+    collect_fail_rate: float = 0.0
+    webhook_url: str = ""
+    webhook_challenge: str = ""
+    webhook_delay: float = 2.0
+    collections: Dict[str, str] = field(default_factory=dict)  # invoice id -> state
+    ledger: int = 1_000_000
+    counters: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    payments: Dict[str, List[dict]] = field(default_factory=dict)
+    transactions: Dict[str, dict] = field(default_factory=dict)
+
+    def count(self, service: str, key: str) -> None:
+        bucket = self.counters.setdefault(service, {})
+        bucket[key] = bucket.get(key, 0) + 1
+
+
+def _service_for(path: str) -> str:
+    if path.startswith("/api/v1/send-money") or path.startswith("/api/v1/payment"):
+        return "intasend"
+    if path.startswith("/version1/messaging"):
+        return "africastalking"
+    if path.startswith("/friendbot"):
+        return "friendbot"
+    if path.startswith("/pinning"):
+        return "pinata"
+    return "horizon"
+
+
+def _now() -> str:
+    return datetime.now(tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _account(account_id: str, state: SimulatorState) -> dict:
+    return {
+        "id": account_id,
+        "account_id": account_id,
+        "sequence": str(int(time.time() * 1000)),
+        "subentry_count": 0,
+        "thresholds": {"low_threshold": 0, "med_threshold": 0, "high_threshold": 0},
+        "flags": {"auth_required": False, "auth_revocable": False},
+        "balances": [{"asset_type": "native", "balance": "10000.0000000"}],
+        "signers": [{"key": account_id, "weight": 1, "type": "ed25519_public_key"}],
+        "data": {},
+        "last_modified_ledger": state.ledger,
+    }
+
+
+def _record_operations(xdr: str, tx_hash: str, state: SimulatorState) -> int:
+    """Best-effort decode of payment / create-account ops so history endpoints return data."""
+    try:
+        from stellar_sdk import CreateAccount, Network, Payment, TransactionEnvelope
+
+        env = TransactionEnvelope.from_xdr(xdr, Network.TESTNET_NETWORK_PASSPHRASE)
+    except Exception:
+        return 1
+    tx = env.transaction
+    source = tx.source.account_id
+    for i, op in enumerate(tx.operations):
+        op_source = op.source.account_id if op.source else source
+        if isinstance(op, Payment):
+            dest, amount = op.destination.account_id, str(op.amount)
+        elif isinstance(op, CreateAccount):
+            dest, amount = op.destination, str(op.starting_balance)
+        else:
+            continue
+        record = {
+            "id": f"{state.ledger}{i:04d}",
+            "paging_token": f"{state.ledger}{i:04d}",
+            "type": "payment",
+            "from": op_source,
+            "to": dest,
+            "amount": amount,
+            "asset_type": "native",
+            "created_at": _now(),
+            "transaction_hash": tx_hash,
+        }
+        for account in {op_source, dest}:
+            state.payments.setdefault(account, []).insert(0, record)
+            del state.payments[account][200:]
+    return len(tx.operations)
+
+
+def create_app(state: SimulatorState) -> FastAPI:
+    app = FastAPI(title="NannyChain integration simulator")
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith("/_sim"):
+            return await call_next(request)
+        service = _service_for(request.url.path)
+        settings = state.services[service]
+        state.count(service, "requests")
+        if settings.throttle is not None and not settings.throttle.take():
+            state.count(service, "throttled")
+            return JSONResponse(
+                {"detail": "Too Many Requests"}, status_code=429, headers={"Retry-After": "1"}
+            )
+        await asyncio.sleep(settings.latency() / 1000.0)
+        if settings.error_rate and random.random() < settings.error_rate:
+            state.count(service, "errors")
+            return JSONResponse({"detail": "Simulated upstream failure"}, status_code=503)
+        return await call_next(request)
+
+    # ── Simulator control ─────────────────────────────────────────────
+    @app.get("/_sim/stats")
+    def stats():
+        return {
+            "counters": state.counters,
+            "config": {
+                name: {
+                    "latency": s.latency_spec,
+                    "error_rate": s.error_rate,
+                    "throttle_rps": s.throttle.rate if s.throttle else None,
+                }
+                for name, s in state.services.items()
+            },
+        }
+
+    # ── IntaSend ──────────────────────────────────────────────────────
+    @app.post("/api/v1/send-money/mpesa/")
+    async def intasend_payout(request: Request):
+        body = await request.json()
+        return {
+            "file_id": uuid.uuid4().hex[:10].upper(),
+            "tracking_id": str(uuid.uuid4()),
+            "status": "Preview and approve",
+            "transactions": body.get("transactions", []),
+        }
+
+    async def _fire_webhook(invoice_id: str, amount: float, phone: str):
+        await asyncio.sleep(state.webhook_delay)
+        failed = random.random() < state.collect_fail_rate
+        state.collections[invoice_id] = "FAILED" if failed else "COMPLETE"
+        payload = {
+            "invoice_id": invoice_id,
+            "state": state.collections[invoice_id],
+            "challenge": state.webhook_challenge,
+            "value": amount,
+            "account": phone,
+            "failed_reason": "Request cancelled by user" if failed else None,
+        }
+        import httpx
+
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                await client.post(state.webhook_url, json=payload)
+        except Exception as e:
+            print(f"[simulator] webhook delivery failed: {e}", file=sys.stderr)
+
+    @app.post("/api/v1/payment/collect/mpesa/")
+    async def intasend_collect(request: Request):
+        body = await request.json()
+        invoice_id = uuid.uuid4().hex[:7].upper()
+        state.collections[invoice_id] = "PENDING"
+        if state.webhook_url:
+            asyncio.create_task(
+                _fire_webhook(invoice_id, body.get("amount", 0), body.get("phone_number", ""))
+            )
+        return {"invoice": {"invoice_id": invoice_id, "state": "PENDING", "value": body.get("amount")}}
+
+    @app.post("/api/v1/payment/status/")
+    async def intasend_status(request: Request):
+        invoice_id = (await request.json()).get("invoice_id", "")
+        if invoice_id not in state.collections:
+            return JSONResponse({"detail": "Invoice not found"}, status_code=404)
+        return {"invoice": {"invoice_id": invoice_id, "state": state.collections[invoice_id]}}
+
+    # ── Africa's Talking ──────────────────────────────────────────────
+    @app.post("/version1/messaging")
+    def at_send(to: str = Form(...), message: str = Form(...), username: str = Form("")):
+        recipients = [
+            {
+                "statusCode": 101,
+                "number": number.strip(),
+                "status": "Success",
+                "cost": "KES 0.8000",
+                "messageId": f"ATXid_{uuid.uuid4().hex}",
+            }
+            for number in to.split(",")
+            if number.strip()
+        ]
+        return {
+            "SMSMessageData": {
+                "Message": f"Sent to {len(recipients)}/{len(recipients)} Total Cost: KES {0.8 * len(recipients):.4f}",
+                "Recipients": recipients,
+            }
+        }
+
+    # ── Friendbot / Pinata ────────────────────────────────────────────
+    @app.get("/friendbot")
+    @app.get("/friendbot/")
+    def friendbot(addr: str = ""):
+        return {"hash": hashlib.sha256(addr.encode()).hexdigest(), "successful": True}
+
+    @app.post("/pinning/pinFileToIPFS")
+    async def pinata_pin(request: Request):
+        body = await request.body()
+        digest = hashlib.sha256(body).hexdigest()
+        return {"IpfsHash": f"Qm{digest[:44]}", "PinSize": len(body), "Timestamp": _now()}
+
+    # ── Horizon ───────────────────────────────────────────────────────
+    @app.get("/accounts/{account_id}")
+    def horizon_account(account_id: str):
+        return _account(account_id, state)
+
+    @app.get("/accounts/{account_id}/payments")
+    async def horizon_payments(account_id: str, request: Request, limit: int = 10):
+        if "text/event-stream" in request.headers.get("accept", ""):
+            return StreamingResponse(_payment_stream(account_id), media_type="text/event-stream")
+        records = state.payments.get(account_id, [])[:limit]
+        return {"_links": {}, "_embedded": {"records": records}}
+
+    async def _payment_stream(account_id: str):
+        yield 'retry: 1000\nevent: open\ndata: "hello"\n\n'
+        while True:
+            await asyncio.sleep(state.sse_interval)
+            state.ledger += 1
+            record = {
+                "id": str(state.ledger),
+                "paging_token": str(state.ledger),
+                "type": "payment",
+                "from": "GSIMULATEDSENDER",
+                "to": account_id,
+                "amount": "1.0000000",
+                "asset_type": "native",
+                "created_at": _now(),
+                "transaction_hash": hashlib.sha256(str(state.ledger).encode()).hexdigest(),
+            }
+            yield f"id: {record['paging_token']}\ndata: {json.dumps(record)}\n\n"
+
+    @app.get("/accounts/{account_id}/transactions")
+    def horizon_account_transactions(account_id: str):
+        return {"_links": {}, "_embedded": {"records": []}}
+
+    @app.get("/accounts/{account_id}/effects")
+    def horizon_account_effects(account_id: str):
+        return {"_links": {}, "_embedded": {"records": []}}
+
+    @app.post("/transactions")
+    def horizon_submit(tx: str = Form(...)):
+        state.ledger += 1
+        tx_hash = hashlib.sha256(tx.encode()).hexdigest()
+        op_count = _record_operations(tx, tx_hash, state)
+        record = {
+            "id": tx_hash,
+            "hash": tx_hash,
+            "ledger": state.ledger,
+            "created_at": _now(),
+            "successful": True,
+            "operation_count": op_count,
+            "fee_charged": str(100 * op_count),
+            "envelope_xdr": tx,
+            "result_xdr": _SUCCESS_RESULT_XDR,
+            "memo_type": "none",
+        }
+        state.transactions[tx_hash] = record
+        return record
+
+    @app.get("/transactions/{tx_hash}")
+    def horizon_transaction(tx_hash: str):
+        record = state.transactions.get(tx_hash)
+        if record is None:
+            return JSONResponse({"status": 404, "title": "Resource Missing"}, status_code=404)
+        return record
+
+    @app.get("/transactions/{tx_hash}/operations")
+    def horizon_transaction_operations(tx_hash: str):
+        return {"_links": {}, "_embedded": {"records": []}}
+
+    @app.get("/ledgers")
+    def horizon_ledgers():
+        return {
+            "_embedded": {
+                "records": [
+                    {
+                        "sequence": state.ledger,
+                        "hash": hashlib.sha256(str(state.ledger).encode()).hexdigest(),
+                        "closed_at": _now(),
+                        "successful_transaction_count": 1,
+                        "operation_count": 1,
+                    }
+                ]
+            }
+        }
+
+    @app.get("/claimable_balances")
+    def horizon_claimable_balances():
+        return {"_links": {}, "_embedded": {"records": []}}
+
+    return app
+
+
+def _parse_pairs(values: List[str], convert) -> Dict[str, object]:
+    out: Dict[str, object] = {}
+    for value in values or []:
+        name, _, spec = value.partition("=")
+        if name not in SERVICES and name != "all":
+            raise SystemExit(f"Unknown service '{name}' (expected one of {', '.join(SERVICES)} or 'all')")
+        out[name] = convert(spec)
+    return out
+
+
+def build_state(args: argparse.Namespace) -> SimulatorState:
+    latencies = _parse_pairs(args.latency, str)
+    errors = _parse_pairs(args.error_rate, float)
+    throttles = _parse_pairs(args.throttle_rps, float)
+    services = {}
+    for name in SERVICES:
+        spec = latencies.get(name, latencies.get("all", "fixed:0"))
+        throttle_rate = throttles.get(name, throttles.get("all"))
+        services[name] = ServiceSettings(
+            latency=parse_latency(spec),
+            latency_spec=spec,
+            error_rate=errors.get(name, errors.get("all", 0.0)),
+            throttle=TokenBucket(throttle_rate) if throttle_rate else None,
+        )
+    return SimulatorState(
+        services=services,
+        sse_interval=args.sse_interval,
+        collect_fail_rate=args.collect_fail_rate,
+        webhook_url=args.webhook_url,
+        webhook_challenge=args.webhook_challenge,
+        webhook_delay=args.webhook_delay,
+    )
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", action="append", metavar="SERVICE=SPEC",
+                        help="Latency distribution per service (or 'all'), e.g. horizon=lognormal:400,0.5")
+    parser.add_argument("--error-rate", action="append", metavar="SERVICE=P",
+                        help="Probability of a 503 response, e.g. intasend=0.02")
+    parser.add_argument("--throttle-rps", action="append", metavar="SERVICE=RPS",
+                        help="Token-bucket rate limit; excess requests get 429 + Retry-After")
+    parser.add_argument("--sse-interval", type=float, default=5.0,
+                        help="Seconds between events on Horizon payment streams")
+    parser.add_argument("--webhook-url", default="",
+                        help="Backend IntaSend webhook URL to call after each STK Push")
+    parser.add_argument("--webhook-challenge", default="",
+                        help="Challenge sent with each webhook (the backend's INTASEND_WEBHOOK_CHALLENGE)")
+    parser.add_argument("--webhook-delay", type=float, default=2.0,
+                        help="Seconds between STK Push and the webhook (simulated PIN entry)")
+    parser.add_argument("--collect-fail-rate", type=float, default=0.0,
+                        help="Fraction of STK Push collections reported as FAILED")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    uvicorn.run(create_app(build_state(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    main()
@@ -13,4 +13,49 @@ def client():
     Returns:
         TestClient: A TestClient instance configured with the application's FastAPI app.
     """
-    return TestClient(app)
\ No newline at end of file
+    return TestClient(app)
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """
+    Point the SQLite layer at a fresh database file for the duration of a test.
+
+    Returns:
+        pathlib.Path: Path of the temporary database file.
+    """
+    import app.db as db
+
+    path = tmp_path / "test.db"
+    monkeypatch.setattr(db, "_DB_PATH", str(path))
+    monkeypatch.setattr(db, "_initialised", False)
+    yield path
+    db._initialised = False
+
+
+@pytest.fixture
+def make_user(temp_db):
+    """
+    Factory creating users in the temporary database.
+
+    Each user gets a fresh Stellar keypair with its secret encrypted as the
+    app stores it, so payments from the account can be signed.
+
+    Returns:
+        Callable[..., dict]: ``make_user(phone, role="worker", name=None)`` returning the stored worker row.
+    """
+    from stellar_sdk import Keypair
+
+    from app.db.repositories import create_worker
+    from app.integrations.stellar.wallet import encrypt_secret
+
+    def make(phone, role="worker", name=None):
+        keypair = Keypair.random()
+        return create_worker(
+            phone=phone,
+            stellar_public_key=keypair.public_key,
+            stellar_secret_encrypted=encrypt_secret(keypair.secret),
+            role=role,
+            name=name,
+        )
+
+    return make
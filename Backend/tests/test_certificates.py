@@ -0,0 +1,54 @@
+"""Tests for review certificate download and bulk ZIP export."""
+import io
+import zipfile
+
+import pytest
+
+from app.config import Config
+from app.db.repositories import review_repository, schedule_repository
+from app.services import pdf
+
+
+@pytest.fixture
+def render_pool(monkeypatch):
+    monkeypatch.setattr(Config, "PDF_RENDER_WORKERS", 2)
+    pdf.clear_cache()
+    yield
+    pdf.shutdown_pdf_pool()
+
+
+def _reviews(make_user):
+    agency = make_user("254718000001", "employer", "Agency")["worker_id"]
+    workers = [make_user(f"25471800001{i}", "worker", f"Nanny {i}")["worker_id"] for i in range(3)]
+    ids = []
+    for i, worker in enumerate(workers):
+        schedule = schedule_repository.create(agency, worker, "100")["schedule_id"]
+        ids.append(review_repository.create(agency, worker, "employer", 1 + i, f"comment {i}", schedule)["review_id"])
+    return agency, workers, ids
+
+
+def test_single_certificate(client, make_user, render_pool):
+    _, _, ids = _reviews(make_user)
+    response = client.get(f"/api/v1/reviews/{ids[0].lower()}/certificate")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.content.startswith(b"%PDF")
+    assert client.get("/api/v1/reviews/RV-MISSING/certificate").status_code == 404
+
+
+def test_agency_export_streams_zip(client, make_user, render_pool):
+    agency, workers, ids = _reviews(make_user)
+    response = client.get(f"/api/v1/reviews/certificates/{agency}/export", params={"written": "true"})
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert sorted(archive.namelist()) == sorted(f"{i}.pdf" for i in ids)
+    assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+    received = client.get(f"/api/v1/reviews/certificates/{workers[0]}/export")
+    assert zipfile.ZipFile(io.BytesIO(received.content)).namelist() == [f"{ids[0]}.pdf"]
+    assert client.get(f"/api/v1/reviews/certificates/{agency}/export").status_code == 404
+
+
+def test_pool_is_warmed_without_forking(render_pool):
+    assert pdf.warm_pdf_pool() == 2
+    assert pdf.get_pdf_pool()._mp_context.get_start_method() in ("forkserver", "spawn")
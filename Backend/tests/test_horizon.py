@@ -0,0 +1,123 @@
+"""Tests for the cached Horizon service and its transaction / ledger endpoints."""
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+from app.config import Config
+from app.services import horizon
+from app.utils.exceptions import StellarError
+
+TX_HASH = "ab" * 32
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+
+class _DownRedis:
+    async def get(self, key):
+        raise redis.ConnectionError("unreachable")
+
+
+class _NotFoundError(Exception):
+    status = 404
+
+
+@pytest.fixture
+def service(monkeypatch):
+    svc = horizon.HorizonService()
+    svc.server = MagicMock()
+    svc.server.transactions.return_value.transaction.return_value.call.return_value = {
+        "id": TX_HASH, "hash": TX_HASH, "ledger": 7, "successful": True,
+    }
+    svc.server.operations.return_value.for_transaction.return_value.include_failed.return_value \
+        .limit.return_value.call.return_value = {"_embedded": {"records": [{"type": "payment"}]}}
+    svc.server.ledgers.return_value.limit.return_value.order.return_value.call.return_value = {
+        "_embedded": {"records": [{"sequence": 42, "hash": "ledgerhash", "closed_at": "2026-01-01T00:00:00Z"}]}
+    }
+    monkeypatch.setattr(horizon, "_horizon_service", svc)
+    return svc
+
+
+def _tx_calls(svc):
+    return svc.server.transactions.return_value.transaction.return_value.call.call_count
+
+
+def test_confirmed_transactions_fetched_once(client, service):
+    first = client.get(f"/api/v1/stellar/transactions/{TX_HASH.upper()}")
+    assert first.status_code == 200 and first.json()["ledger"] == 7
+    assert "immutable" in first.headers["cache-control"]
+    assert client.get(f"/api/v1/stellar/transactions/{TX_HASH}").json() == first.json()
+    assert _tx_calls(service) == 1
+
+    ops = client.get(f"/api/v1/stellar/transactions/{TX_HASH}/operations")
+    assert ops.json() == [{"type": "payment"}]
+    cached = client.get(f"/api/v1/stellar/transactions/{TX_HASH}", headers={"If-None-Match": first.headers["etag"]})
+    assert cached.status_code == 304
+    assert client.get("/api/v1/stellar/transactions/not-a-hash").status_code == 400
+
+
+def test_unknown_transaction_is_404_and_not_cached(client, service):
+    service.server.transactions.return_value.transaction.return_value.call.side_effect = _NotFoundError("nope")
+    assert client.get(f"/api/v1/stellar/transactions/{TX_HASH}").status_code == 404
+    assert client.get(f"/api/v1/stellar/transactions/{TX_HASH}").status_code == 404
+    assert _tx_calls(service) == 2
+    with pytest.raises(StellarError) as err:
+        service.get_transaction(TX_HASH)
+    assert err.value.details == {"tx_hash": TX_HASH, "status": 404}
+
+
+def test_lru_is_bounded_and_optionally_persisted(service, temp_db, monkeypatch):
+    monkeypatch.setattr(Config, "HORIZON_CACHE_MAX_ENTRIES", 1)
+    monkeypatch.setattr(Config, "HORIZON_CACHE_PERSIST", True)
+    service.get_transaction(TX_HASH)
+    service.get_transaction_operations(TX_HASH)  # evicts the transaction from memory
+    assert list(service._confirmed) == [f"ops:{TX_HASH}"]
+
+    service.get_transaction(TX_HASH)
+    restarted = horizon.HorizonService()
+    restarted.server = MagicMock()
+    assert restarted.get_transaction(TX_HASH)["ledger"] == 7  # from SQLite
+    assert _tx_calls(service) == 1
+    restarted.server.transactions.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_latest_ledger_shared_through_redis(service, monkeypatch):
+    shared = _FakeRedis()
+    monkeypatch.setattr(horizon, "get_async_redis", lambda: shared)
+    assert (await service.aget_latest_ledger())["sequence"] == 42
+
+    other_worker = horizon.HorizonService()
+    other_worker.server = MagicMock()
+    assert (await other_worker.aget_latest_ledger())["sequence"] == 42
+    other_worker.server.ledgers.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_latest_ledger_ttl_without_redis(service, monkeypatch):
+    clock = [0.0]
+    service._clock = lambda: clock[0]
+    monkeypatch.setattr(horizon, "get_async_redis", lambda: _DownRedis())
+    ledger_call = service.server.ledgers.return_value.limit.return_value.order.return_value.call
+
+    await service.aget_latest_ledger()
+    await service.aget_latest_ledger()
+    assert ledger_call.call_count == 1
+    clock[0] = Config.HORIZON_LEDGER_TTL_SECONDS + 1
+    await service.aget_latest_ledger()
+    assert ledger_call.call_count == 2
+
+
+def test_health_reports_network(client, service):
+    body = client.get("/api/v1/stellar/health").json()
+    assert body["healthy"] is True
+    assert body["network"] == Config.STELLAR_NETWORK
+    assert body["latest_ledger"] == 42
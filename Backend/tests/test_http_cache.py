@@ -0,0 +1,66 @@
+"""Tests for ETag / Cache-Control headers and conditional GET (304)."""
+import pytest
+
+from app.db.repositories import review_repository, schedule_repository
+from app.services import pdf
+from app.utils.http_cache import IMMUTABLE, REVALIDATE, etag_matches
+
+
+@pytest.fixture
+def no_render_pool(monkeypatch):
+    """Render in-process instead of starting the pool's worker processes."""
+    pdf.clear_cache()
+
+    async def render(data):
+        return pdf.generate_review_pdf(data)
+
+    monkeypatch.setattr("app.routes.reviews.render_review_pdf_async", render)
+
+
+def _review(make_user):
+    employer = make_user("254719000001", "employer", "Employer")["worker_id"]
+    worker = make_user("254719000002", "worker", "Worker")["worker_id"]
+    schedule = schedule_repository.create(employer, worker, "100")["schedule_id"]
+    return worker, review_repository.create(employer, worker, "employer", 5, "great work", schedule)["review_id"]
+
+
+def test_etag_matches():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"b", W/"a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_certificate_revalidates_until_minted(client, make_user, no_render_pool):
+    _, review_id = _review(make_user)
+    url = f"/api/v1/reviews/{review_id}/certificate"
+
+    first = client.get(url)
+    assert first.status_code == 200 and first.content.startswith(b"%PDF")
+    assert first.headers["cache-control"] == REVALIDATE
+    etag = first.headers["etag"]
+    cached = client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    review_repository.update_nft_data(review_id, "ab" * 32, "https://explorer/tx", "RV0001")
+    minted = client.get(url, headers={"If-None-Match": etag})
+    assert minted.status_code == 200  # content changed: now shows the transaction
+    assert minted.headers["etag"] != etag
+    assert minted.headers["cache-control"] == IMMUTABLE
+
+
+def test_review_list_not_modified_until_new_review(client, make_user):
+    worker, _ = _review(make_user)
+    url = f"/api/v1/reviews/for/{worker}"
+
+    first = client.get(url)
+    assert first.status_code == 200 and len(first.json()) == 1
+    assert client.get(url, headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    employer = make_user("254719000003", "employer", "Second")["worker_id"]
+    schedule = schedule_repository.create(employer, worker, "100")["schedule_id"]
+    review_repository.create(employer, worker, "employer", 4, "also good", schedule)
+    changed = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200 and len(changed.json()) == 2
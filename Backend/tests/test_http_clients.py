@@ -0,0 +1,122 @@
+"""Tests for the pooled outbound HTTP client registry."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.integrations import http_clients
+from app.utils import metrics
+
+
+@pytest.fixture
+def flaky_profile():
+    """Register a throwaway profile whose transport fails with 503 once, then succeeds."""
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx.Response(503, headers={"retry-after": "0"})
+        return httpx.Response(200, json={"ok": True, "method": request.method})
+
+    http_clients.register(
+        "test-flaky",
+        "http://stand-in.local",
+        transport=httpx.MockTransport(handler),
+        retries=2,
+    )
+    metrics.histogram("http.test-flaky").reset()
+    yield calls
+    http_clients.close_all()
+
+
+def test_same_client_is_reused():
+    """The registry hands out one pooled client per integration."""
+    assert http_clients.get_client("intasend") is http_clients.get_client("intasend")
+    http_clients.close_all()
+
+
+def test_idempotent_request_retried_on_503(flaky_profile):
+    """GETs are retried on retryable statuses and every attempt is timed."""
+    resp = http_clients.request("test-flaky", "GET", "/ping")
+    assert resp.status_code == 200
+    assert flaky_profile["n"] == 2
+    assert metrics.histogram("http.test-flaky").snapshot()["count"] == 2
+
+
+def test_post_not_retried_on_503(flaky_profile):
+    """Non-idempotent requests (payments) are never replayed on a 5xx."""
+    resp = http_clients.request("test-flaky", "POST", "/pay", json={})
+    assert resp.status_code == 503
+    assert flaky_profile["n"] == 1
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("2", 2.0),
+    ("600", http_clients.MAX_RETRY_AFTER_SECONDS),
+    ("-5", 0.0),
+    ("nan", 0.4),
+    ("inf", 0.4),
+    ("Wed, 21 Oct 2026 07:28:00 GMT", 0.4),
+    ("", 0.4),
+])
+def test_retry_delay_clamps_retry_after(header, expected):
+    """Retry-After is clamped to 0..MAX; dates and non-finite values fall back to backoff."""
+    profile = http_clients.ClientProfile(base_url="http://stand-in.local", backoff=0.1)
+    response = httpx.Response(503, headers={"retry-after": header})
+    assert http_clients._retry_delay(profile, 2, response) == pytest.approx(expected)
+
+
+def test_histogram_percentiles():
+    hist = metrics.Histogram("t", buckets=(10, 100))
+    for v in (1, 2, 50, 500):
+        hist.observe(v)
+    snap = hist.snapshot()
+    assert snap["count"] == 4
+    assert snap["buckets"] == {"10": 2, "100": 3, "+Inf": 4}
+    assert snap["p50_ms"] == 10
+    assert snap["max_ms"] == 500
+
+
+def test_send_sms_posts_to_at_rest_endpoint(monkeypatch):
+    """SMS goes through the pooled africastalking client, so a stand-in base URL works."""
+    from app.integrations.africastalking import sms
+
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["url"] = str(request.url)
+        seen["body"] = request.content.decode()
+        return httpx.Response(201, json={"SMSMessageData": {"Recipients": [{"statusCode": 101}]}})
+
+    monkeypatch.setattr(sms.Config, "AT_USERNAME", "sim")
+    monkeypatch.setattr(sms.Config, "AT_API_KEY", "sim")
+    original = http_clients.get_profile("africastalking")
+    http_clients.register(
+        "africastalking", "http://sim.local", transport=httpx.MockTransport(handler)
+    )
+    try:
+        assert sms.send_sms("0712345678", "hi") is True
+    finally:
+        http_clients.register(
+            "africastalking", original.base_url, transport=original.transport
+        )
+    assert seen["url"] == "http://sim.local/version1/messaging"
+    assert "to=%2B254712345678" in seen["body"]
+
+
+@pytest.mark.asyncio
+async def test_register_closes_replaced_async_client():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    http_clients.register("test-replaced", "http://stand-in.local", transport=transport)
+    first = http_clients.get_async_client("test-replaced")
+
+    http_clients.register("test-replaced", timeout=1.0)  # inside a loop: closed right away
+    await asyncio.sleep(0)
+    assert first.is_closed
+
+    second = http_clients.get_async_client("test-replaced")
+    await asyncio.to_thread(http_clients.register, "test-replaced", timeout=2.0)  # no loop in that thread
+    assert not second.is_closed
+    await http_clients.aclose_all()
+    assert second.is_closed
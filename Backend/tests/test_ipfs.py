@@ -0,0 +1,135 @@
+"""Tests for local CID computation, the IPFS pin index and the local store / gateway."""
+import asyncio
+import io
+
+import pytest
+
+from app.db.repositories import ipfs_pin_repository
+from app.integrations import ipfs
+from app.integrations.ipfs import storage
+from app.integrations.ipfs.cid import CHUNK_SIZE, compute_cid
+
+
+def test_cid_matches_ipfs_add():
+    # Reference values from `ipfs add` (CIDv0, default chunker)
+    assert compute_cid(b"hello world\n") == "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+    assert compute_cid(b"") == "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"
+
+
+def test_cid_same_for_bytes_and_stream():
+    data = bytes(range(256)) * (CHUNK_SIZE // 128 + 7)  # three chunks
+    assert compute_cid(io.BytesIO(data)) == compute_cid(data) != compute_cid(data[:-1])
+
+
+def _fake_upload(monkeypatch):
+    uploads = []
+
+    class FakeStore(storage.PinStore):
+        name = "pinata"
+
+        async def put(self, content, content_cid, filename):
+            if not isinstance(content, bytes):
+                content.seek(0)
+                content = content.read()
+            uploads.append(content)
+            return compute_cid(content)
+
+        def url(self, cid):
+            return f"https://gateway.test/ipfs/{cid}"
+
+    monkeypatch.setattr(storage, "_store", FakeStore())
+    return uploads
+
+
+def test_repeat_pin_skips_upload(temp_db, monkeypatch):
+    uploads = _fake_upload(monkeypatch)
+    first = asyncio.run(ipfs.pin_to_ipfs(b"%PDF certificate"))
+    again = asyncio.run(ipfs.pin_to_ipfs(io.BytesIO(b"%PDF certificate")))
+    assert first == again == compute_cid(b"%PDF certificate")
+    assert uploads == [b"%PDF certificate"]
+
+
+def test_pin_many_dedupes_and_keeps_order(temp_db, monkeypatch):
+    uploads = _fake_upload(monkeypatch)
+    cids = asyncio.run(ipfs.pin_many([b"a", b"b", b"a", io.BytesIO(b"b")]))
+    assert cids == [compute_cid(b"a"), compute_cid(b"b"), compute_cid(b"a"), compute_cid(b"b")]
+    assert sorted(uploads) == [b"a", b"b"]
+
+
+def _local_store(monkeypatch, tmp_path):
+    store = storage.LocalStore(root=str(tmp_path), gateway="http://testserver/api/v1/ipfs/")
+    monkeypatch.setattr(storage, "_store", store)
+    return store
+
+
+def test_local_store_pins_by_cid(temp_db, monkeypatch, tmp_path):
+    store = _local_store(monkeypatch, tmp_path)
+    data = b"%PDF-1.4 " + bytes(range(256)) * 2000  # spans two chunks
+    cid = asyncio.run(ipfs.pin_to_ipfs(io.BytesIO(data)))
+
+    assert cid == compute_cid(data)
+    assert store.path(cid) == str(tmp_path / cid[-3:-1] / cid)
+    with store.open(cid) as stored:
+        assert bytes(stored) == data
+    assert ipfs.get_ipfs_url(cid) == f"http://testserver/api/v1/ipfs/{cid}"
+    # the pin index is per store: Pinata has no record of it
+    assert ipfs_pin_repository.get(cid, "local")["cid"] == cid
+    assert ipfs_pin_repository.get(cid, "pinata") is None
+
+
+def test_local_gateway_serves_ranges_and_caching_headers(client, temp_db, monkeypatch, tmp_path):
+    _local_store(monkeypatch, tmp_path)
+    data = b"%PDF-1.4 certificate body"
+    cid = asyncio.run(ipfs.pin_to_ipfs(data))
+    url = f"/api/v1/ipfs/{cid}"
+
+    full = client.get(url)
+    assert full.status_code == 200 and full.content == data
+    assert full.headers["content-type"] == "application/pdf"
+    assert full.headers["etag"] == f'"{cid}"'
+    assert "immutable" in full.headers["cache-control"]
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-length"] == str(len(data))
+
+    part = client.get(url, headers={"Range": "bytes=4-7"})
+    assert part.status_code == 206 and part.content == data[4:8]
+    assert part.headers["content-range"] == f"bytes 4-7/{len(data)}"
+    assert part.headers["content-length"] == "4"
+    assert client.get(url, headers={"Range": "bytes=-4"}).content == data[-4:]
+    assert client.get(url, headers={"Range": "bytes=20-"}).content == data[20:]
+
+    unsatisfiable = client.get(url, headers={"Range": f"bytes={len(data)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(data)}"
+
+    assert client.get(url, headers={"If-None-Match": f'"{cid}"'}).status_code == 304
+    assert client.get(f"/api/v1/ipfs/{compute_cid(b'missing')}").status_code == 404
+    assert client.get("/api/v1/ipfs/..%2F..%2Fetc").status_code == 404
+
+
+def test_local_gateway_streams_in_chunks(client, temp_db, monkeypatch, tmp_path):
+    """Bodies larger than one chunk are streamed piecewise and arrive intact."""
+    from app.routes import ipfs as ipfs_routes
+
+    _local_store(monkeypatch, tmp_path)
+    monkeypatch.setattr(ipfs_routes, "STREAM_CHUNK_BYTES", 3)
+    data = bytes(range(256)) * 4
+    cid = asyncio.run(ipfs.pin_to_ipfs(data))
+
+    assert client.get(f"/api/v1/ipfs/{cid}").content == data
+    part = client.get(f"/api/v1/ipfs/{cid}", headers={"Range": "bytes=100-510"})
+    assert part.content == data[100:511]
+
+
+def test_store_missing_a_method_cannot_be_created():
+    class NoUrl(storage.PinStore):
+        async def put(self, content, content_cid, filename):
+            return content_cid
+
+    with pytest.raises(TypeError):
+        NoUrl()
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        storage.build_pin_store("s3")
@@ -0,0 +1,210 @@
+"""Tests for the M-Pesa on-ramp webhook and queued crediting."""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.config import Config
+from app.db.repositories import collection_repository
+from app.services import jobs, mpesa
+from app.utils.exceptions import StellarError
+
+PLATFORM_SECRET = "SA5YLPJF2ZYVN5UTD5FHA4D7HPFLDMLZT3Y2X2BYUL2KDLZFB72CZS2W"
+WORKER_PK = "GCVIRJD4FVV7F3KXB2GLH2IQYZRJR6N66S252AQCCOWKYIRQMXMPMSFW"
+
+
+def _envelope(tx_hash, expires_in=30):
+    envelope = MagicMock()
+    envelope.hash_hex.return_value = tx_hash
+    envelope.transaction.preconditions.time_bounds.max_time = int(time.time()) + expires_in
+    return envelope
+
+
+@pytest.fixture
+def horizon(monkeypatch):
+    """Stub Horizon transaction lookups: tx hash -> transaction (missing = 404)."""
+    landed = {}
+
+    def get_transaction(tx_hash):
+        if tx_hash not in landed:
+            raise StellarError("not found", "get_transaction", {"tx_hash": tx_hash, "status": 404})
+        return landed[tx_hash]
+
+    monkeypatch.setattr(mpesa, "get_horizon_service", lambda: MagicMock(get_transaction=get_transaction))
+    return landed
+
+
+@pytest.fixture
+def payment_service(temp_db, monkeypatch):
+    """Stub the Stellar payment service and configure a platform account."""
+    ps = MagicMock()
+    ps.prepare_payment.side_effect = lambda **kw: _envelope("credit_tx")
+    ps.submit.return_value = {"successful": True, "hash": "credit_tx"}
+    monkeypatch.setattr(mpesa, "get_payment_service", lambda: ps)
+    settings = MagicMock(stellar_platform_secret=PLATFORM_SECRET)
+    monkeypatch.setattr(mpesa, "get_settings", lambda: settings)
+    return ps
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Configure the webhook challenge and stub IntaSend's status API (invoice -> state)."""
+    monkeypatch.setattr(Config, "INTASEND_WEBHOOK_CHALLENGE", "s3cret")
+    states = {}
+    monkeypatch.setattr(mpesa, "collection_state", lambda invoice_id: states.get(invoice_id, "PENDING"))
+    return states
+
+
+def _deliver(client, invoice_id, state, challenge="s3cret"):
+    body = {"invoice_id": invoice_id, "state": state, "challenge": challenge}
+    return client.post("/api/v1/mpesa/webhook", json=body)
+
+
+def _pending_collection(invoice_id="INV123"):
+    return collection_repository.create(
+        invoice_id=invoice_id,
+        public_key=WORKER_PK,
+        phone="254712345678",
+        amount_kes="100",
+        amount_ksh="100.0000000",
+        status="pending",
+    )
+
+
+def test_webhook_credits_exactly_once(client, payment_service, provider):
+    """Replayed COMPLETE deliveries are acknowledged but only credit once."""
+    _pending_collection()
+    provider["INV123"] = "COMPLETE"
+
+    first = _deliver(client, "INV123", "COMPLETE")
+    replay = _deliver(client, "INV123", "COMPLETE")
+    assert first.status_code == 200 and first.json()["duplicate"] is False
+    assert replay.json()["duplicate"] is True
+
+    assert jobs.run_pending()["done"] == 1
+    assert jobs.run_pending()["done"] == 0
+    payment_service.submit.assert_called_once()
+
+    row = collection_repository.get_by_invoice("INV123")
+    assert row["status"] == "credited"
+    assert row["stellar_tx_hash"] == "credit_tx"
+
+
+def test_failed_payment_is_not_credited(client, payment_service, provider):
+    _pending_collection("INV999")
+    r = _deliver(client, "INV999", "FAILED")
+    assert r.status_code == 200
+    assert jobs.run_pending()["done"] == 0
+    payment_service.submit.assert_not_called()
+    assert collection_repository.get_by_invoice("INV999")["status"] == "failed"
+
+
+def test_webhook_rejected_without_valid_challenge(client, payment_service, monkeypatch):
+    _pending_collection("INV555")
+    monkeypatch.setattr(Config, "INTASEND_WEBHOOK_CHALLENGE", "")
+    assert _deliver(client, "INV555", "COMPLETE", challenge="").status_code == 503
+
+    monkeypatch.setattr(Config, "INTASEND_WEBHOOK_CHALLENGE", "s3cret")
+    assert _deliver(client, "INV555", "COMPLETE", challenge="guess").status_code == 403
+    assert collection_repository.get_by_invoice("INV555")["status"] == "pending"
+
+
+def test_unconfirmed_complete_is_ignored(client, payment_service, provider):
+    """A COMPLETE that IntaSend does not confirm neither credits nor blocks the real one."""
+    _pending_collection("INV444")
+    forged = _deliver(client, "INV444", "COMPLETE")
+    assert forged.status_code == 200 and forged.json()["duplicate"] is False
+    assert collection_repository.get_by_invoice("INV444")["status"] == "pending"
+    assert jobs.run_pending()["done"] == 0
+
+    provider["INV444"] = "COMPLETE"
+    assert _deliver(client, "INV444", "COMPLETE").json()["duplicate"] is False
+    assert collection_repository.get_by_invoice("INV444")["status"] == "paid"
+
+
+def _paid_collection(invoice_id):
+    _pending_collection(invoice_id)
+    collection_repository.transition(invoice_id, "pending", "paid")
+
+
+def test_rejected_credit_releases_claim(payment_service):
+    """A payment Horizon rejected (HTTP 400) returns the collection to 'paid' for the next attempt."""
+    _paid_collection("INV777")
+    payment_service.submit.side_effect = StellarError("tx_bad_seq", "submit_transaction", {"status": 400})
+
+    with pytest.raises(StellarError):
+        mpesa.credit_collection({"invoice_id": "INV777"})
+    row = collection_repository.get_by_invoice("INV777")
+    assert row["status"] == "paid" and row["stellar_tx_hash"] == ""
+
+
+def test_ambiguous_credit_that_landed_is_not_resubmitted(payment_service, horizon):
+    """A timeout after the payment landed: the retry finds it on Horizon instead of paying twice."""
+    _paid_collection("INV778")
+    payment_service.submit.side_effect = StellarError("timeout", "submit_transaction", {"status": 504})
+    with pytest.raises(StellarError):
+        mpesa.credit_collection({"invoice_id": "INV778"})
+    row = collection_repository.get_by_invoice("INV778")
+    assert row["status"] == "crediting" and row["stellar_tx_hash"] == "credit_tx"
+
+    horizon["credit_tx"] = {"hash": "credit_tx", "successful": True}
+    mpesa.credit_collection({"invoice_id": "INV778"})
+    assert collection_repository.get_by_invoice("INV778")["status"] == "credited"
+    assert payment_service.submit.call_count == 1
+
+
+def test_ambiguous_credit_resubmitted_only_after_expiry(payment_service, horizon):
+    _paid_collection("INV779")
+    payment_service.submit.side_effect = StellarError("no response", "submit_transaction", {"status": None})
+    with pytest.raises(StellarError):
+        mpesa.credit_collection({"invoice_id": "INV779"})
+
+    with pytest.raises(RuntimeError):  # may still land: wait
+        mpesa.credit_collection({"invoice_id": "INV779"})
+    assert payment_service.submit.call_count == 1
+
+    collection_repository.transition(
+        "INV779", "crediting", "crediting", credit_expires_at=int(time.time()) - 3600
+    )
+    payment_service.submit.side_effect = None
+    payment_service.prepare_payment.side_effect = lambda **kw: _envelope("second_tx")
+    mpesa.credit_collection({"invoice_id": "INV779"})
+    row = collection_repository.get_by_invoice("INV779")
+    assert row["status"] == "credited" and row["stellar_tx_hash"] == "second_tx"
+
+
+def test_credits_from_the_platform_account_run_one_at_a_time(temp_db, monkeypatch):
+    """Credit jobs share the platform account's sequence number, so they never overlap."""
+    running, overlaps = [], []
+
+    def handler(payload):
+        running.append(payload["invoice_id"])
+        overlaps.append(len(running))
+        time.sleep(0.02)
+        running.remove(payload["invoice_id"])
+
+    monkeypatch.setitem(jobs._handlers, mpesa.ONRAMP_CREDIT_JOB, handler)
+    for i in range(4):
+        mpesa._queue_credit(f"INV90{i}")
+
+    assert jobs.run_pending() == {"done": 4, "failed": 0}
+    assert overlaps == [1, 1, 1, 1]
+
+
+def test_worker_loop_keeps_requeueing_stale_jobs(temp_db, monkeypatch):
+    """Jobs left 'running' by a crash are swept periodically, not only at startup."""
+    import asyncio
+
+    sweeps = []
+    monkeypatch.setattr(jobs.job_repository, "requeue_stale", lambda: sweeps.append(1) or 0)
+    monkeypatch.setattr(jobs, "STALE_SWEEP_INTERVAL_SECONDS", 0.01)
+
+    async def run():
+        task = asyncio.create_task(jobs.run_worker_loop(poll_interval=0.01))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert len(sweeps) > 1
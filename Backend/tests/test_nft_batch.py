@@ -0,0 +1,130 @@
+"""Tests for batched review NFT minting."""
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from stellar_sdk import Account, Keypair
+from stellar_sdk.exceptions import BadRequestError
+
+from app.integrations.stellar import nft
+from app.integrations.stellar.nft import NftMintRequest, NftMintResult, mint_review_nfts, pack_mint_requests
+from app.services.nft_batcher import MintBatcher
+
+FUNDING = Keypair.random()
+
+
+def _req(i, metadata_keys=5):
+    return NftMintRequest(
+        key=f"RV-{i:04d}",
+        reviewee_public_key=Keypair.random().public_key,
+        pdf_cid=f"cid{i}",
+        asset_code_suffix=f"{i:09d}",
+        metadata={f"k{j}": "v" for j in range(metadata_keys)},
+    )
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(nft.Config, "STELLAR_FUNDING_SECRET", FUNDING.secret)
+    server = MagicMock()
+    server.load_account.side_effect = lambda pk: Account(pk, 1)
+    server.submit_transaction.side_effect = lambda tx: {"hash": f"tx{server.submit_transaction.call_count}"}
+    monkeypatch.setattr(nft, "_get_horizon_server", lambda: server)
+    return server
+
+
+def test_pack_respects_op_and_signature_limits():
+    # 10 ops each -> 10 per transaction by the 100-op limit
+    assert [len(g) for g in pack_mint_requests([_req(i) for i in range(25)])] == [10, 10, 5]
+    # 6 ops each -> 16 per transaction (op limit is reached before the signature limit)
+    assert [len(g) for g in pack_mint_requests([_req(i, 1) for i in range(40)])] == [16, 16, 8]
+    # 5 ops each -> 20 by ops, capped at 19 by the 20-signature limit
+    assert [len(g) for g in pack_mint_requests([_req(i, 0) for i in range(20)])] == [19, 1]
+
+
+def test_batch_mints_in_one_transaction_with_per_review_results(server):
+    requests = [_req(i) for i in range(3)]
+    results = mint_review_nfts(requests)
+
+    assert server.submit_transaction.call_count == 1
+    tx = server.submit_transaction.call_args[0][0]
+    assert len(tx.transaction.operations) == 30
+    assert len(tx.signatures) == 4  # funding + 3 issuers
+    assert [r.key for r in results] == [r.key for r in requests]
+    assert all(r.success and r.transaction_id == "tx1" for r in results)
+    assert len({r.issuer_public_key for r in results}) == 3
+    assert results[0].asset_code == "RVW000000000"
+
+
+def test_failing_operation_only_fails_its_review(server):
+    requests = [_req(i) for i in range(3)]
+    response = MagicMock(status_code=400, text="tx_failed")
+    response.json.return_value = {"extras": {"result_codes": {
+        "transaction": "tx_failed",
+        "operations": ["op_success"] * 19 + ["op_no_destination"] + ["op_success"] * 10,
+    }}}
+    calls = []
+
+    def submit(tx):
+        calls.append(len(tx.transaction.operations))
+        if len(calls) == 1:
+            raise BadRequestError(response)
+        return {"hash": "tx-retry"}
+
+    server.submit_transaction.side_effect = submit
+    results = mint_review_nfts(requests)
+
+    assert calls == [30, 20]
+    assert [r.success for r in results] == [True, False, True]
+    assert results[1].error.startswith("op_no_destination")
+    assert results[0].transaction_id == results[2].transaction_id == "tx-retry"
+
+
+def test_batcher_coalesces_concurrent_requests():
+    batches = []
+
+    def minter(requests):
+        batches.append([r.key for r in requests])
+        return [NftMintResult(key=r.key, transaction_id="tx") for r in requests]
+
+    batcher = MintBatcher(window_seconds=0.05, minter=minter)
+    results = {}
+    threads = [
+        threading.Thread(target=lambda i=i: results.setdefault(i, batcher.mint(_req(i), timeout=5)))
+        for i in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(batches) == 1 and sorted(batches[0]) == [f"RV-{i:04d}" for i in range(4)]
+    assert all(results[i].key == f"RV-{i:04d}" for i in range(4))
+
+
+def test_timed_out_request_is_withdrawn_before_submission():
+    """A mint that times out while still queued is never submitted later."""
+    minted = []
+    batcher = MintBatcher(window_seconds=0.2, minter=lambda reqs: minted.extend(reqs) or [
+        NftMintResult(key=r.key) for r in reqs
+    ])
+    with pytest.raises(TimeoutError):
+        batcher.mint(_req(1), timeout=0.01)
+    batcher.flush()
+    assert minted == []
+
+
+def test_signed_hash_is_reported_before_submission(server):
+    seen = []
+    requests = [_req(i) for i in range(2)]
+    for r in requests:
+        r.on_signed = lambda tx_hash, issuer, max_time: seen.append(
+            (tx_hash, issuer, max_time, server.submit_transaction.call_count)
+        )
+    results = mint_review_nfts(requests)
+
+    tx = server.submit_transaction.call_args[0][0]
+    assert [s[0] for s in seen] == [tx.hash_hex()] * 2
+    assert [s[1] for s in seen] == [r.issuer_public_key for r in results]
+    assert {s[2] for s in seen} == {tx.transaction.preconditions.time_bounds.max_time}
+    assert [s[3] for s in seen] == [0, 0]  # before submit_transaction was called
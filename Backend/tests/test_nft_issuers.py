@@ -0,0 +1,76 @@
+"""Tests for cached, concurrent issuer metadata loading in get_reviews_for_account."""
+import base64
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.integrations.stellar import nft
+
+REVIEWEE = "GREVIEWEE"
+
+
+def _b64(value):
+    return base64.b64encode(value.encode()).decode()
+
+
+def _issuer_account(pk, locked=True):
+    return {
+        "id": pk,
+        "signers": [{"key": pk, "weight": 0 if locked else 1}],
+        "data": {"rating": _b64("5"), "role": _b64("worker"), "reviewee": _b64(REVIEWEE), "pdf_cid": _b64("cid")},
+    }
+
+
+@pytest.fixture
+def horizon(monkeypatch):
+    monkeypatch.setattr(nft, "_issuer_cache", nft.OrderedDict())
+    issuers = [f"GISSUER{i:02d}" for i in range(12)]
+    state = {"in_flight": 0, "max_in_flight": 0, "issuer_calls": 0, "locked": True}
+    lock = threading.Lock()
+
+    def account_id(pk):
+        call = MagicMock()
+        if pk == REVIEWEE:
+            call.call.return_value = {"balances": []}
+            return call
+
+        def load():
+            with lock:
+                state["issuer_calls"] += 1
+                state["in_flight"] += 1
+                state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            time.sleep(0.02)
+            with lock:
+                state["in_flight"] -= 1
+            return _issuer_account(pk, state["locked"])
+
+        call.call.side_effect = load
+        return call
+
+    server = MagicMock()
+    server.accounts.return_value.account_id.side_effect = account_id
+    server.claimable_balances.return_value.for_claimant.return_value.call.return_value = {
+        "_embedded": {"records": [{"asset": f"RVW{i:09d}:{pk}"} for i, pk in enumerate(issuers)]},
+    }
+    monkeypatch.setattr(nft, "_get_horizon_server", lambda: server)
+    return state
+
+
+def test_issuers_fetched_concurrently_then_cached(horizon):
+    reviews = nft.get_reviews_for_account(REVIEWEE)
+    assert len(reviews) == 12 and reviews[0]["rating"] == "5"
+    assert horizon["issuer_calls"] == 12
+    assert 1 < horizon["max_in_flight"] <= nft.ISSUER_FETCH_CONCURRENCY
+
+    # Locked issuers are immutable: the second load is served from the cache.
+    assert len(nft.get_reviews_for_account(REVIEWEE)) == 12
+    assert horizon["issuer_calls"] == 12
+
+
+def test_unlocked_issuers_are_not_cached(horizon):
+    horizon["locked"] = False
+    nft.get_reviews_for_account(REVIEWEE)
+    nft.get_reviews_for_account(REVIEWEE)
+    assert horizon["issuer_calls"] == 24
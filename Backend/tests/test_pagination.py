@@ -0,0 +1,63 @@
+"""Tests for keyset pagination of listing endpoints."""
+
+from app.db import get_connection
+from app.db.repositories import claim_repository, schedule_repository
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+
+def _walk(client, url, limit, cursor=None):
+    pages = []
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+
+
+def test_claims_page_newest_first_without_gaps(client, make_user):
+    employer = make_user("254717000001", "employer")["worker_id"]
+    worker = make_user("254717000002", "worker")["worker_id"]
+    created = [claim_repository.create(worker, employer, str(i))["claim_id"] for i in range(5)]
+
+    pages = _walk(client, f"/api/v1/claims/employer/{employer}", limit=2)
+    assert [len(p) for p in pages] == [2, 2, 1]
+    # Same-second created_at values are ordered by id, newest first.
+    assert [c["claim_id"] for p in pages for c in p] == created[::-1]
+    assert len(client.get(f"/api/v1/claims/worker/{worker}").json()) == 5
+
+
+def test_schedules_page_on_creation_not_next_payment(client, make_user):
+    employer = make_user("254717000101", "employer")["worker_id"]
+    worker = make_user("254717000102", "worker")["worker_id"]
+    created = [
+        schedule_repository.create(employer, worker, "100", next_payment_date=day)["schedule_id"]
+        for day in ("2030-01-03", "2030-01-01", "2030-01-02")
+    ]
+
+    url = f"/api/v1/schedules/employer/{employer}"
+    first = client.get(url, params={"limit": 1})
+    # A payment run advancing next_payment_date between pages must not skip or repeat a schedule.
+    schedule_repository.advance_next_date(created[-1])
+    rest = _walk(client, url, limit=1, cursor=first.headers[NEXT_CURSOR_HEADER])
+    assert [s["schedule_id"] for p in [first.json(), *rest] for s in p] == created[::-1]
+
+
+def test_invalid_cursor_and_limit_rejected(client, temp_db):
+    assert client.get("/api/v1/reviews/for/NW-1", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/reviews/by/NW-1", params={"limit": 0}).status_code == 422
+
+
+def test_claim_pages_use_owner_index(temp_db):
+    conn = get_connection()
+    try:
+        detail = " | ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM payment_claims WHERE employer_id = ? "
+            "AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT 10",
+            ("NW-1", "2030-01-01", 5),
+        ))
+    finally:
+        conn.close()
+    assert "idx_claims_employer_created" in detail and "TEMP B-TREE" not in detail
@@ -0,0 +1,42 @@
+"""Tests for payday SMS fan-out from scheduled payments."""
+from unittest.mock import MagicMock
+
+from app.db.repositories import schedule_repository
+from app.routes.schedules import _run_due_payments
+from app.services import jobs, notifications
+
+
+def test_two_employers_same_day_coalesce_into_one_sms(make_user, monkeypatch):
+    monkeypatch.setattr(notifications.Config, "PAYDAY_NOTIFY_COALESCE_SECONDS", 0)
+    queued = []
+    monkeypatch.setattr(notifications, "enqueue_sms", lambda to, msg: queued.append((to, msg)))
+
+    worker = make_user("254712000001", "worker")
+    for i, amount in enumerate(("3000", "2000")):
+        employer = make_user(f"25472200000{i}", "employer")
+        schedule_repository.create(employer["worker_id"], worker["worker_id"], amount)
+
+    ps = MagicMock()
+    ps.send_payment.return_value = {"successful": True, "hash": "tx"}
+    assert _run_due_payments(ps)["executed"] == 2
+
+    # One coalesced job for the worker, not one per payment
+    assert jobs.run_pending() == {"done": 1, "failed": 0}
+    assert queued == [
+        ("254712000001", "NannyChain: Payday! You received 5,000.00 KSH from 2 employers. Check your balance on NannyChain."),
+    ]
+    assert jobs.run_pending() == {"done": 0, "failed": 0}
+
+
+def test_failing_subscriber_does_not_break_payments(make_user, monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(notifications.payday_notification_repository, "record_payment", boom)
+    worker = make_user("254712000001", "worker")
+    employer = make_user("254722000000", "employer")
+    schedule_repository.create(employer["worker_id"], worker["worker_id"], "100")
+
+    ps = MagicMock()
+    ps.send_payment.return_value = {"successful": True, "hash": "tx"}
+    assert _run_due_payments(ps)["executed"] == 1
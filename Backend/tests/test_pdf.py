@@ -0,0 +1,43 @@
+"""Tests for review certificate rendering and its cache."""
+from app.config import Config
+from app.services import pdf
+
+DATA = {
+    "worker_name": "Jane <Doe>", "worker_code": "NW-1", "role": "Childcare",
+    "start_date": "2024-01-01", "end_date": "2024-02-01", "duration_months": 1, "rating": 4,
+    "comment": "Great & reliable", "reviewer_type": "employer", "review_date": "Feb 11, 2026",
+    "stellar_tx_id": "abc", "explorer_url": "https://stellar.expert/tx/abc",
+}
+
+
+def test_render_is_deterministic_and_handles_long_text():
+    first = pdf.render_review_pdf(DATA)
+    assert first.startswith(b"%PDF") and first == pdf.render_review_pdf(dict(DATA))
+    assert pdf.render_review_pdf(dict(DATA, comment="word " * 5000, explorer_url="x" * 400)).startswith(b"%PDF")
+
+
+def test_cache_serves_repeat_requests(monkeypatch):
+    pdf.clear_cache()
+    rendered = []
+    real = pdf.render_review_pdf
+    monkeypatch.setattr(pdf, "render_review_pdf", lambda data: rendered.append(1) or real(data))
+
+    first = pdf.generate_review_pdf(DATA)
+    assert pdf.generate_review_pdf(dict(DATA)) == first
+    assert len(rendered) == 1
+    pdf.generate_review_pdf(dict(DATA, rating=5))
+    assert len(rendered) == 2
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    pdf.clear_cache()
+    monkeypatch.setattr(pdf, "render_review_pdf", lambda data: b"x" * 100)
+    monkeypatch.setattr(Config, "PDF_CACHE_MAX_BYTES", 250)
+    a, b, c = (dict(DATA, worker_code=code) for code in ("A", "B", "C"))
+    pdf.generate_review_pdf(a)
+    pdf.generate_review_pdf(b)
+    pdf.generate_review_pdf(a)  # a is now most recent
+    pdf.generate_review_pdf(c)  # evicts b
+    assert pdf._cache_get(pdf.certificate_key(a)) is not None
+    assert pdf._cache_get(pdf.certificate_key(b)) is None
+    pdf.clear_cache()
@@ -0,0 +1,57 @@
+"""Tests for phone normalization and the workers.phone_e164 lookup column."""
+import sqlite3
+
+from app.db.repositories import create_worker, get_worker_by_phone
+from app.utils.phone import normalize_phone, normalize_phones, to_e164
+
+
+def test_normalize_phone_formats():
+    """Local, international and spaced forms all map to one MSISDN."""
+    expected = "254712345678"
+    for raw in ("0712345678", "254712345678", "+254 712 345 678", "712-345-678", " (0712) 345678 "):
+        assert normalize_phone(raw) == expected
+    assert to_e164("0712345678") == "+254712345678"
+    assert normalize_phones(["0712345678", "+254700000000"]) == ["254712345678", "254700000000"]
+
+
+def test_lookup_matches_any_format(temp_db):
+    """A worker registered as 0712… is found by 254712… and +254 712… (and vice versa)."""
+    row = create_worker(phone="0712345678", stellar_public_key="GPHONE1", stellar_secret_encrypted="x")
+    for query in ("254712345678", "+254 712 345 678", "0712345678"):
+        assert get_worker_by_phone(query)["worker_id"] == row["worker_id"]
+    assert get_worker_by_phone("0799999999") is None
+
+
+def test_backfill_migration_on_existing_db(temp_db):
+    """Pre-existing rows get phone_e164 backfilled; a duplicate in another format stays NULL."""
+    import app.db as db
+
+    conn = sqlite3.connect(temp_db)
+    conn.executescript("""
+        CREATE TABLE workers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            worker_id TEXT UNIQUE NOT NULL,
+            phone TEXT UNIQUE NOT NULL,
+            name TEXT DEFAULT '',
+            role TEXT NOT NULL DEFAULT 'worker',
+            stellar_public_key TEXT UNIQUE NOT NULL,
+            stellar_secret_encrypted TEXT NOT NULL,
+            created_at TEXT DEFAULT (datetime('now'))
+        );
+        INSERT INTO workers (worker_id, phone, stellar_public_key, stellar_secret_encrypted)
+        VALUES ('NW-OLD00001', '0711000001', 'GOLD1', 'x'),
+               ('NW-OLD00002', '254711000002', 'GOLD2', 'x'),
+               ('NW-OLD00003', '254711000001', 'GOLD3', 'x');
+    """)
+    conn.close()
+
+    conn = db.get_connection()
+    try:
+        rows = {r["worker_id"]: r["phone_e164"] for r in conn.execute("SELECT worker_id, phone_e164 FROM workers")}
+        indexes = {r["name"] for r in conn.execute("PRAGMA index_list(workers)")}
+    finally:
+        conn.close()
+
+    assert rows == {"NW-OLD00001": "+254711000001", "NW-OLD00002": "+254711000002", "NW-OLD00003": None}
+    assert "idx_workers_phone_e164" in indexes
+    assert get_worker_by_phone("+254711000001")["worker_id"] == "NW-OLD00001"
@@ -0,0 +1,57 @@
+"""Tests for the incrementally maintained rating summary."""
+import pytest
+
+from app.db import get_connection
+from app.db.repositories import review_repository
+
+
+def _review(reviewer, reviewee, rating, schedule):
+    review_repository.create(reviewer, reviewee, "employer", rating, schedule_id=schedule)
+
+
+def test_create_updates_summary_and_bulk_read(make_user):
+    employer = make_user("254715000001", "employer")["worker_id"]
+    a, b, c = (make_user(f"25471500001{i}", "worker")["worker_id"] for i in range(3))
+    _review(employer, a, 5, "S1")
+    _review(employer, a, 4, "S2")
+    _review(employer, b, 1, "S3")
+
+    ratings = review_repository.get_ratings([a, b, c])
+    assert ratings[a] == {"avg_rating": 4.5, "count": 2, "stars": [0, 0, 0, 1, 1]}
+    assert ratings[b]["stars"] == [1, 0, 0, 0, 0]
+    assert ratings[c] == {"avg_rating": 0, "count": 0, "stars": [0] * 5}
+    assert review_repository.get_average_rating(a) == ratings[a]
+
+
+def test_rejected_review_leaves_summary_untouched(make_user):
+    employer = make_user("254715000101", "employer")["worker_id"]
+    worker = make_user("254715000102", "worker")["worker_id"]
+    _review(employer, worker, 5, "S1")
+    with pytest.raises(Exception, match="UNIQUE"):
+        _review(employer, worker, 1, "S1")
+    assert review_repository.get_average_rating(worker)["count"] == 1
+
+
+def test_rebuild_matches_reviews(make_user):
+    employer = make_user("254715000201", "employer")["worker_id"]
+    worker = make_user("254715000202", "worker")["worker_id"]
+    _review(employer, worker, 3, "S1")
+    _review(employer, worker, 2, "S2")
+    before = review_repository.get_ratings([worker])
+    conn = get_connection()
+    conn.execute("UPDATE rating_summary SET review_count = 99")
+    conn.commit()
+    conn.close()
+
+    assert review_repository.rebuild_rating_summary() == 1
+    assert review_repository.get_ratings([worker]) == before
+
+
+def test_bulk_ratings_endpoint(client, make_user):
+    employer = make_user("254715000301", "employer")["worker_id"]
+    worker = make_user("254715000302", "worker")["worker_id"]
+    _review(employer, worker, 4, "S1")
+    response = client.get("/api/v1/reviews/ratings", params={"user_ids": f"{worker.lower()},{employer}"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body[worker]["avg_rating"] == 4.0 and body[employer]["count"] == 0
@@ -0,0 +1,78 @@
+"""Tests for the local review NFT index."""
+import asyncio
+import time
+
+from app.config import Config
+from app.db.repositories import review_nft_repository
+from app.integrations.stellar.nft import NftMintResult
+from app.services import jobs, review, review_nfts
+
+
+def test_worker_reviews_read_from_index(make_user, monkeypatch):
+    worker = make_user("254714000001")
+    monkeypatch.setattr(review_nfts, "get_reviews_for_account", lambda pk: (_ for _ in ()).throw(AssertionError))
+    review_nfts.index_minted(
+        NftMintResult(key="k", asset_code="RVWABC123", issuer_public_key="GISSUER", transaction_id="tx1"),
+        worker["stellar_public_key"], "cid1",
+        {"rating": 4, "role": "nanny", "reviewer_type": "employer", "duration": 6},
+    )
+
+    [data] = asyncio.run(review.get_worker_reviews(worker["worker_id"]))
+    assert (data.rating, data.role, data.duration_months) == (4, "nanny", 6)
+    assert (data.stellar_asset, data.stellar_tx_id, data.status) == ("RVWABC123", "tx1", "claimable")
+
+
+def test_empty_index_queues_reconcile(make_user, monkeypatch):
+    worker = make_user("254714000001")
+    pk = worker["stellar_public_key"]
+    horizon = [{
+        "asset_code": "RVWOLD", "issuer_public_key": "GOLD", "status": "owned", "rating": "5",
+        "role": "cook", "reviewer_type": "employer", "duration": "12", "pdf_cid": "cid", "reviewee": pk,
+    }]
+    monkeypatch.setattr(review_nfts, "get_reviews_for_account", lambda public_key: horizon)
+
+    assert asyncio.run(review.get_worker_reviews(worker["worker_id"])) == []
+    asyncio.run(review.get_worker_reviews(worker["worker_id"]))  # same day: not queued twice
+    assert jobs.run_pending() == {"done": 1, "failed": 0}
+
+    [row] = review_nft_repository.get_for_reviewee(pk)
+    assert (row["asset_code"], row["status"], row["stellar_tx_hash"]) == ("RVWOLD", "owned", "")
+
+
+def test_populated_index_reconciles_once_stale(make_user, monkeypatch):
+    """Indexed accounts are still re-read from Horizon once their last reconcile is too old."""
+    worker = make_user("254714000001")
+    pk = worker["stellar_public_key"]
+    review_nfts.index_minted(
+        NftMintResult(key="k", asset_code="RVWABC", issuer_public_key="GISS", transaction_id="tx9"),
+        pk, "cid", {"rating": "3"},
+    )
+    monkeypatch.setattr(review_nfts, "get_reviews_for_account", lambda public_key: [
+        {"asset_code": "RVWABC", "issuer_public_key": "GISS", "status": "owned", "rating": "3"},
+    ])
+    review_nft_repository.mark_reconciled(pk, int(time.time()))
+    asyncio.run(review.get_worker_reviews(worker["worker_id"]))
+    assert jobs.run_pending() == {"done": 0, "failed": 0}  # fresh: nothing queued
+
+    review_nft_repository.mark_reconciled(pk, int(time.time()) - Config.REVIEW_NFT_RECONCILE_MAX_AGE_SECONDS - 1)
+    [data] = asyncio.run(review.get_worker_reviews(worker["worker_id"]))
+    assert data.status == "claimable"
+    assert jobs.run_pending() == {"done": 1, "failed": 0}
+    assert review_nft_repository.get_by_asset("RVWABC", "GISS")["status"] == "owned"
+    assert time.time() - review_nft_repository.get_reconciled_at(pk) < 60
+
+
+def test_reconcile_keeps_mint_data_and_updates_status(make_user, monkeypatch):
+    worker = make_user("254714000001")
+    pk = worker["stellar_public_key"]
+    review_nfts.index_minted(
+        NftMintResult(key="k", asset_code="RVWABC", issuer_public_key="GISS", transaction_id="tx9"),
+        pk, "cid", {"rating": "3"}, review_id="R1",
+    )
+    monkeypatch.setattr(review_nfts, "get_reviews_for_account", lambda public_key: [
+        {"asset_code": "RVWABC", "issuer_public_key": "GISS", "status": "owned", "rating": "3", "pdf_cid": "cid"},
+    ])
+
+    assert review_nfts.reconcile_account(pk) == 1
+    row = review_nft_repository.get_by_asset("RVWABC", "GISS")
+    assert (row["status"], row["stellar_tx_hash"], row["review_id"]) == ("owned", "tx9", "R1")
@@ -0,0 +1,136 @@
+"""Tests for background review NFT minting."""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.db.repositories import review_repository, schedule_repository
+from app.integrations.stellar.nft import NftMintResult
+from app.services import jobs, review_nfts
+from app.services.nft_batcher import MintBatcher
+from app.utils.exceptions import StellarError
+
+
+def _submit(client, make_user):
+    employer, worker = make_user("254713000001", "employer"), make_user("254713000002", "worker")
+    schedule_repository.create(employer["worker_id"], worker["worker_id"], "1000")
+    response = client.post("/api/v1/reviews/submit", json={
+        "reviewer_id": employer["worker_id"], "reviewee_id": worker["worker_id"], "rating": 5,
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+def _use_minter(monkeypatch, minter):
+    batcher = MintBatcher(window_seconds=0.01, minter=minter)
+    monkeypatch.setattr(review_nfts, "get_mint_batcher", lambda: batcher)
+
+
+def test_submit_returns_pending_and_job_mints(client, make_user, monkeypatch):
+    minted = []
+
+    def minter(requests):
+        minted.extend(r.key for r in requests)
+        return [NftMintResult(key=r.key, asset_code="RVWABC", transaction_id="tx1", explorer_url="u") for r in requests]
+
+    _use_minter(monkeypatch, minter)
+    body = _submit(client, make_user)
+    assert body["nft_status"] == "pending" and body["stellar_tx_hash"] == ""
+    assert minted == []  # nothing minted on the request path
+
+    assert jobs.run_pending() == {"done": 1, "failed": 0}
+    assert minted == [body["review_id"]]
+    row = review_repository.get_by_review_id(body["review_id"])
+    assert (row["nft_status"], row["stellar_tx_hash"], row["nft_asset_code"]) == ("minted", "tx1", "RVWABC")
+
+
+def test_exhausted_retries_mark_review_failed(client, make_user, monkeypatch):
+    _use_minter(monkeypatch, lambda requests: [NftMintResult(key=r.key, error="tx_bad_seq") for r in requests])
+    monkeypatch.setattr(review_nfts, "MINT_MAX_ATTEMPTS", 1)
+    body = _submit(client, make_user)
+
+    assert jobs.run_pending() == {"done": 0, "failed": 1}
+    assert review_repository.get_by_review_id(body["review_id"])["nft_status"] == "failed"
+
+
+@pytest.fixture
+def horizon(monkeypatch):
+    """Stub Horizon transaction lookups: tx hash -> transaction (missing = 404)."""
+    landed = {}
+
+    def get_transaction(tx_hash):
+        if tx_hash not in landed:
+            raise StellarError("not found", "get_transaction", {"tx_hash": tx_hash, "status": 404})
+        return landed[tx_hash]
+
+    monkeypatch.setattr(review_nfts, "get_horizon_service", lambda: MagicMock(get_transaction=get_transaction))
+    return landed
+
+
+def _unclear_submit(monkeypatch, minted, expires_in):
+    """Minter that signs (recording the attempt) and then loses the submit result."""
+    def minter(requests):
+        for r in requests:
+            minted.append(r.key)
+            r.on_signed(f"tx{len(minted)}", "GISSUER", int(time.time()) + expires_in)
+        raise TimeoutError("504 Gateway Timeout")
+
+    _use_minter(monkeypatch, minter)
+
+
+def test_retry_records_earlier_mint_that_landed(client, make_user, monkeypatch, horizon):
+    minted = []
+    _unclear_submit(monkeypatch, minted, expires_in=60)
+    body = _submit(client, make_user)
+    assert jobs.run_pending() == {"done": 0, "failed": 1}
+    assert review_repository.get_by_review_id(body["review_id"])["nft_status"] == "minting"
+
+    horizon["tx1"] = {"successful": True}
+    review_nfts.mint_review({"review_id": body["review_id"]})
+    assert minted == [body["review_id"]]  # not minted a second time
+    row = review_repository.get_by_review_id(body["review_id"])
+    assert (row["nft_status"], row["stellar_tx_hash"]) == ("minted", "tx1")
+    assert row["nft_asset_code"] == f"RVW{review_nfts.asset_suffix(body['review_id'])}".upper()
+
+
+def test_retry_defers_while_earlier_mint_may_land(client, make_user, monkeypatch, horizon):
+    minted = []
+    _unclear_submit(monkeypatch, minted, expires_in=60)
+    body = _submit(client, make_user)
+    jobs.run_pending()
+
+    with pytest.raises(jobs.RetryLaterError) as deferred:
+        review_nfts.mint_review({"review_id": body["review_id"]})
+    assert 60 < deferred.value.delay_seconds <= 60 + review_nfts.MINT_EXPIRY_MARGIN_SECONDS
+    assert minted == [body["review_id"]]
+
+
+def test_retry_mints_again_once_earlier_mint_expired(client, make_user, monkeypatch, horizon):
+    minted = []
+    _unclear_submit(monkeypatch, minted, expires_in=-review_nfts.MINT_EXPIRY_MARGIN_SECONDS - 1)
+    body = _submit(client, make_user)
+    jobs.run_pending()
+
+    with pytest.raises(TimeoutError):
+        review_nfts.mint_review({"review_id": body["review_id"]})
+    assert minted == [body["review_id"]] * 2
+    assert review_repository.get_mint_attempt(body["review_id"])["tx_hash"] == "tx2"
+
+
+def test_asset_suffix_depends_only_on_review():
+    assert review_nfts.asset_suffix("RV-1") == review_nfts.asset_suffix("RV-1") != review_nfts.asset_suffix("RV-2")
+
+
+def test_retry_later_defers_without_using_an_attempt(temp_db, monkeypatch):
+    from app.db.repositories import job_repository
+
+    def handler(payload):
+        raise jobs.RetryLaterError("not yet", 30)
+
+    monkeypatch.setitem(jobs._handlers, "deferred_test", handler)
+    job_id = jobs.enqueue("deferred_test", {}, max_attempts=1)
+
+    assert jobs.run_pending() == {"done": 0, "failed": 1}
+    job = job_repository.get_by_id(job_id)
+    assert (job["status"], job["attempts"], job["last_error"]) == ("queued", 0, "not yet")
+    assert jobs.run_pending() == {"done": 0, "failed": 0}  # not due for 30s
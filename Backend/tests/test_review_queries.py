@@ -0,0 +1,48 @@
+"""Tests for review eligibility / relationship queries and their index plans."""
+
+from app.db import get_connection
+from app.db.repositories import review_repository, schedule_repository
+
+
+def test_eligible_reviewees_exclude_reviewed_schedules(make_user):
+    employer = make_user("254716000001", "employer", "Amina")["worker_id"]
+    worker = make_user("254716000002", "worker", "Baraka")["worker_id"]
+    reviewed = schedule_repository.create(employer, worker, "1000")["schedule_id"]
+    open_ = schedule_repository.create(employer, worker, "500")["schedule_id"]
+    review_repository.create(employer, worker, "employer", 5, schedule_id=reviewed)
+
+    eligible = review_repository.get_eligible_reviewees(employer, "employer")
+    assert [(e["schedule_id"], e["reviewee_name"]) for e in eligible] == [(open_, "Baraka")]
+    assert {e["schedule_id"] for e in review_repository.get_eligible_reviewees(worker, "worker")} == {reviewed, open_}
+
+    assert review_repository.has_relationship(employer, worker)
+    assert review_repository.has_relationship(worker, employer)
+    assert not review_repository.has_relationship(worker, make_user("254716000003", "worker")["worker_id"])
+
+
+def test_received_reviews_include_reviewer_name(make_user):
+    employer = make_user("254716000101", "employer", "Amina")["worker_id"]
+    worker = make_user("254716000102", "worker", "Baraka")["worker_id"]
+    review_repository.create(employer, worker, "employer", 4, schedule_id="S1")
+    assert review_repository.get_reviews_for(worker)[0]["reviewer_name"] == "Amina"
+    assert review_repository.get_reviews_by(employer)[0]["reviewee_name"] == "Baraka"
+
+
+def test_queries_use_indexes(temp_db):
+    conn = get_connection()
+    try:
+        plans = [
+            " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+            for sql, params in [
+                (review_repository.ELIGIBLE_REVIEWEES_SQL["employer"], ("E", "2030-01-01", "E")),
+                (review_repository.ELIGIBLE_REVIEWEES_SQL["worker"], ("W", "2030-01-01", "W")),
+                (review_repository.HAS_RELATIONSHIP_SQL, ("A", "B", "2030", "B", "A", "2030")),
+            ]
+        ]
+    finally:
+        conn.close()
+    assert "COVERING INDEX idx_sched_employer_since" in plans[0]
+    assert "COVERING INDEX idx_sched_worker_since" in plans[1]
+    assert "idx_reviews_reviewer_schedule" in plans[0]
+    assert plans[2].count("COVERING INDEX idx_sched_pair") == 2
+    assert not any("SCAN sp" in p or "SCAN scheduled_payments" in p for p in plans)
@@ -82,21 +82,22 @@ async def test_submit_review_success(mock_db, mock_existing_reviews, mock_mint,
 
 @pytest.mark.asyncio
 @patch("app.services.review.get_by_worker_id")
-@patch("app.services.review.get_reviews_for_account")
-async def test_get_worker_reviews(mock_get_nfts, mock_get_worker, mock_worker):
-    """Test retrieval of worker reviews."""
+@patch("app.services.review.review_nft_repository.get_for_reviewee")
+@patch("app.services.review.review_nfts.reconcile_if_stale")
+async def test_get_worker_reviews(mock_reconcile, mock_get_nfts, mock_get_worker, mock_worker):
+    """Test retrieval of worker reviews (and the staleness check for their Horizon reconcile)."""
     mock_get_worker.return_value = mock_worker
     mock_get_nfts.return_value = [
         {
-            "rating": "5",
+            "rating": 5,
             "role": "Childcare",
             "duration": "1",
             "reviewer_type": "employer",
             "pdf_cid": "Qm123",
             "asset_code": "RVWABC",
             "issuer_public_key": "GD...ISSUER",
+            "stellar_tx_hash": "abc123",
             "status": "claimable",
-            "reviewee": "GD...WORKER"
         }
     ]
 
@@ -106,15 +107,17 @@ async def test_get_worker_reviews(mock_get_nfts, mock_get_worker, mock_worker):
     assert reviews[0].rating == 5
     assert reviews[0].stellar_asset == "RVWABC"
     assert reviews[0].status == "claimable"
+    assert reviews[0].stellar_tx_id == "abc123"
+    mock_reconcile.assert_called_once_with(mock_worker["stellar_public_key"])
 
 
 @pytest.mark.asyncio
-@patch("app.services.review.send_sms")
+@patch("app.services.review.enqueue_sms")
 @patch("app.services.review.generate_review_token", return_value="mock-token-abc")
-async def test_send_review_invitation(mock_gen_token, mock_send_sms):
-    """Test that send_review_invitation builds the correct message and calls send_sms."""
+async def test_send_review_invitation(mock_gen_token, mock_enqueue_sms):
+    """Test that send_review_invitation builds the correct message and queues the SMS."""
     from app.config import Config
-    mock_send_sms.return_value = True
+    mock_enqueue_sms.return_value = 1
 
     result = await send_review_invitation("eng-001", "+254700000001")
 
@@ -125,7 +128,7 @@ async def test_send_review_invitation(mock_gen_token, mock_send_sms):
         f"Your review for engagement eng-001 is ready. "
         f"Submit it here (link expires in {Config.REVIEW_LINK_EXPIRY_DAYS} days): {expected_link}"
     )
-    mock_send_sms.assert_called_once_with("+254700000001", expected_message)
+    mock_enqueue_sms.assert_called_once_with("+254700000001", expected_message)
 
 
 def test_review_token_expiry():
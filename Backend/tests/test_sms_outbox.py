@@ -0,0 +1,98 @@
+"""Tests for the batched SMS outbox dispatcher."""
+import pytest
+
+from app.db.repositories import sms_outbox_repository
+from app.integrations.africastalking.sms import RecipientResult, SmsProviderError
+from app.services import sms_outbox
+
+
+@pytest.fixture
+def provider(temp_db, monkeypatch):
+    """Record bulk sends instead of calling Africa's Talking."""
+    calls = []
+
+    def fake_send_bulk(recipients, message):
+        calls.append((list(recipients), message))
+        return [
+            RecipientResult(number=n, status_code=101, status="Success", message_id=f"id-{n}", cost="KES 0.8")
+            for n in recipients
+        ]
+
+    monkeypatch.setattr(sms_outbox, "send_bulk_sms", fake_send_bulk)
+    monkeypatch.setattr(sms_outbox, "is_configured", lambda: True)
+    monkeypatch.setattr(sms_outbox, "_limiter", sms_outbox._RateLimiter(0))
+    return calls
+
+
+def test_identical_messages_are_batched(provider):
+    """Recipients sharing a text go out in one provider call; others are separate."""
+    a = sms_outbox.enqueue_sms("0712000001", "Payday!")
+    b = sms_outbox.enqueue_sms("+254712000002", "Payday!")
+    c = sms_outbox.enqueue_sms("254712000003", "Welcome")
+
+    assert sms_outbox.dispatch_pending() == {"sent": 3, "failed": 0}
+    assert sorted(provider) == [
+        (["+254712000001", "+254712000002"], "Payday!"),
+        (["+254712000003"], "Welcome"),
+    ]
+    row = sms_outbox_repository.get_by_id(a)
+    assert row["status"] == "sent"
+    assert row["provider_message_id"] == "id-+254712000001"
+    assert sms_outbox_repository.get_by_id(b)["status"] == "sent"
+    assert sms_outbox_repository.get_by_id(c)["attempts"] == 1
+
+
+def test_transient_failure_is_retried_permanent_is_not(provider, monkeypatch):
+    """Provider outages requeue the batch; invalid numbers fail permanently."""
+    ok = sms_outbox.enqueue_sms("0712000001", "Hi")
+
+    def outage(recipients, message):
+        raise SmsProviderError("503")
+
+    monkeypatch.setattr(sms_outbox, "send_bulk_sms", outage)
+    assert sms_outbox.dispatch_pending() == {"sent": 0, "failed": 1}
+    row = sms_outbox_repository.get_by_id(ok)
+    assert row["status"] == "queued"
+    assert row["last_error"] == "503"
+
+    bad = sms_outbox.enqueue_sms("0700000000", "Hi there")
+    monkeypatch.setattr(
+        sms_outbox,
+        "send_bulk_sms",
+        lambda recipients, message: [RecipientResult(recipients[0], 403, "InvalidPhoneNumber")],
+    )
+    sms_outbox.dispatch_pending()
+    assert sms_outbox_repository.get_by_id(bad)["status"] == "failed"
+
+
+def test_delivery_report_updates_status(client, provider):
+    """AT delivery reports are matched by provider message id."""
+    outbox_id = sms_outbox.enqueue_sms("0712000001", "Hi")
+    sms_outbox.dispatch_pending()
+
+    resp = client.post(
+        "/api/v1/sms/delivery-report",
+        data={"id": "id-+254712000001", "status": "Success", "phoneNumber": "+254712000001"},
+    )
+    assert resp.json() == {"received": True, "matched": True}
+    status = client.get(f"/api/v1/sms/outbox/{outbox_id}").json()
+    assert status["status"] == "delivered"
+
+
+def test_dispatcher_keeps_requeueing_stale_messages(temp_db, monkeypatch):
+    """Messages claimed by a crashed dispatcher are swept periodically, not only at startup."""
+    import asyncio
+
+    sweeps = []
+    monkeypatch.setattr(sms_outbox_repository, "requeue_stale", lambda: sweeps.append(1) or 0)
+    monkeypatch.setattr(sms_outbox, "STALE_SWEEP_INTERVAL_SECONDS", 0.01)
+
+    async def run():
+        task = asyncio.create_task(sms_outbox.run_dispatcher_loop(poll_interval=0.01))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert len(sweeps) > 1
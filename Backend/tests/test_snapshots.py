@@ -0,0 +1,75 @@
+"""Tests for precomputed account snapshots (USSD balance / mini statement)."""
+from unittest.mock import MagicMock
+
+from stellar_sdk.exceptions import NotFoundError
+
+from app.db.repositories import account_snapshot_repository, claim_repository, create_worker
+from app.services import events, jobs, snapshots
+
+
+def _worker(phone, public_key):
+    return create_worker(phone=phone, stellar_public_key=public_key, stellar_secret_encrypted="x")
+
+
+def _horizon(monkeypatch, balance="100.0000000", history=()):
+    stellar = MagicMock()
+    stellar.server.accounts.return_value.account_id.return_value.call.return_value = {
+        "balances": [{"asset_type": "native", "balance": balance}],
+    }
+    payments = MagicMock()
+    payments.get_payment_history.return_value = list(history)
+    monkeypatch.setattr(snapshots, "get_stellar_service", lambda: stellar)
+    monkeypatch.setattr(snapshots, "get_payment_service", lambda: payments)
+    return stellar
+
+
+def test_payment_event_refreshes_both_sides_once(temp_db, monkeypatch):
+    """A burst of payment events coalesces into one refresh job per worker."""
+    monkeypatch.setattr(snapshots.Config, "SNAPSHOT_COALESCE_SECONDS", 0)
+    alice, bob = _worker("254711000001", "GALICE"), _worker("254711000002", "GBOB")
+    _horizon(monkeypatch, history=[
+        {"from": "GALICE", "to": "GBOB", "amount": "25.0000000", "created_at": "2026-10-02T08:00:00Z"},
+    ])
+    claim_repository.create(worker_id=bob["worker_id"], employer_id=alice["worker_id"], amount="10", message="")
+
+    for _ in range(3):
+        events.emit(events.PAYMENT_SETTLED, {"public_keys": ["GALICE", "GBOB"]})
+
+    assert jobs.run_pending() == {"done": 2, "failed": 0}
+    snap = snapshots.get_snapshot(bob["worker_id"])
+    assert snap["balance"] == "100.0000000"
+    assert snap["pending_claims"] == 1
+    assert snap["recent_payments"] == [
+        {"direction": "in", "amount": "25.0000000", "counterparty": alice["worker_id"], "date": "2026-10-02"},
+    ]
+    assert snapshots.get_snapshot(alice["worker_id"])["recent_payments"][0]["direction"] == "out"
+
+    # The next change after a completed round queues a new refresh.
+    events.emit(events.CLAIM_CHANGED, {"worker_id": bob["worker_id"]})
+    assert jobs.run_pending() == {"done": 1, "failed": 0}
+
+
+def test_change_during_refresh_queues_another_round(temp_db, monkeypatch):
+    monkeypatch.setattr(snapshots.Config, "SNAPSHOT_COALESCE_SECONDS", 0)
+    worker = _worker("254711000003", "GCAROL")
+    stellar = _horizon(monkeypatch)
+
+    def call_and_change():
+        account_snapshot_repository.mark_stale(worker["worker_id"])  # payment lands mid-fetch
+        return {"balances": [{"asset_type": "native", "balance": "5.0000000"}]}
+
+    stellar.server.accounts.return_value.account_id.return_value.call.side_effect = call_and_change
+    snapshots.request_refresh(worker["worker_id"])
+    assert jobs.run_pending(limit=1) == {"done": 1, "failed": 0}
+    assert jobs.run_pending(limit=1) == {"done": 1, "failed": 0}  # follow-up round
+
+
+def test_inactive_account_snapshot_is_zero(temp_db, monkeypatch):
+    worker = _worker("254711000004", "GDAVE")
+    stellar = _horizon(monkeypatch)
+    response = MagicMock(status_code=404, text="", json=lambda: {})
+    stellar.server.accounts.return_value.account_id.return_value.call.side_effect = NotFoundError(response)
+
+    snapshots.refresh_snapshot({"worker_id": worker["worker_id"]})
+    snap = snapshots.get_snapshot(worker["worker_id"])
+    assert snap["balance"] == "0" and snap["recent_payments"] == []
@@ -7,13 +7,13 @@ def mock_redis(monkeypatch):
     """
     Replace Redis-backed session access with in-memory stubs for tests.
     
-    Patches app.ussd.handler.get_session and app.ussd.handler.set_session to use a module-local
+    Patches app.ussd.handler.get_session and app.ussd.handler.set_session (async) to use a module-local
     in-memory session_store dict, preventing network access to Redis and keeping session data
     isolated to the test process.
     """
     session_store = {}
 
-    def get_session(session_id):
+    async def get_session(session_id):
         """
         Retrieve session data for a given session ID from the in-memory session store.
         
@@ -25,7 +25,7 @@ def mock_redis(monkeypatch):
         """
         return session_store.get(session_id, {})
 
-    def set_session(session_id, data):
+    async def set_session(session_id, data):
         """
         Store the given session data in the in-memory session store under the provided session ID.
         
@@ -58,4 +58,191 @@ def test_ussd_optional_auth_no_key_required_when_unset(client):
         "/ussd",
         data={"sessionId": "s1", "phoneNumber": "254711111111", "text": ""},
     )
-    assert r.status_code == 200
\ No newline at end of file
+    assert r.status_code == 200
+
+def test_ussd_hop_does_at_most_one_read_and_one_write(client, monkeypatch):
+    """The opening hop skips the session read; each later hop reads once and writes at most once."""
+    from app.utils import metrics
+
+    calls = {"get": 0, "set": 0}
+    store = {}
+
+    async def get_session(session_id):
+        calls["get"] += 1
+        return dict(store.get(session_id, {}))
+
+    async def set_session(session_id, data):
+        calls["set"] += 1
+        store[session_id] = dict(data)
+
+    monkeypatch.setattr("app.ussd.handler.get_session", get_session)
+    monkeypatch.setattr("app.ussd.handler.set_session", set_session)
+    metrics.histogram("ussd.step.main").reset()
+
+    client.post("/ussd", data={"sessionId": "s2", "phoneNumber": "254711111111", "text": ""})
+    assert calls == {"get": 0, "set": 1}
+
+    r = client.post("/ussd", data={"sessionId": "s2", "phoneNumber": "254711111111", "text": "4"})
+    assert r.text.startswith("END")
+    assert calls == {"get": 1, "set": 2}  # session ends: marked finished
+    assert store["s2"] == {"finished": True}
+    assert metrics.histogram("ussd.step.main").snapshot()["count"] == 2
+
+
+def _dial(client, *texts, session_id="flow-1", phone="254711111111"):
+    """Send each cumulative USSD text in turn and return the last response body."""
+    body = ""
+    for text in texts:
+        body = client.post(
+            "/ussd", data={"sessionId": session_id, "phoneNumber": phone, "text": text}
+        ).text
+    return body
+
+
+def test_ussd_registration_uses_caller_phone(client, temp_db, monkeypatch):
+    """Create account asks for a name, confirms, and registers the caller's number in-process."""
+    created = {}
+
+    def fake_create_account(phone, name=None, send_sms=True):
+        created.update(phone=phone, name=name)
+        return {"worker_id": "NW-TEST0001", "already_exists": False}
+
+    monkeypatch.setattr("app.ussd.handler.create_account", fake_create_account)
+
+    assert _dial(client, "", "1") == "CON Enter your full name:"
+    assert "Jane Wanjiru" in _dial(client, "1*Jane Wanjiru")
+    body = _dial(client, "1*Jane Wanjiru*1")
+    assert body.startswith("END Account created. Worker ID: NW-TEST0001")
+    assert created == {"phone": "254711111111", "name": "Jane Wanjiru"}
+
+
+def test_ussd_balance_reads_snapshot(client, temp_db, monkeypatch):
+    """Balance and mini statement render the precomputed snapshot without calling Horizon."""
+    from app.db.repositories import account_snapshot_repository, create_worker
+
+    worker = create_worker(phone="254711111111", stellar_public_key="GTESTPK", stellar_secret_encrypted="x")
+    account_snapshot_repository.save(
+        worker["worker_id"], "1250.5000000",
+        [{"direction": "in", "amount": "500", "counterparty": "NW-EMP00001", "date": "2026-10-01"}],
+        pending_claims=2, generation=0,
+    )
+    monkeypatch.setattr("app.services.snapshots.get_stellar_service", lambda: pytest.fail("Horizon called"))
+
+    assert _dial(client, "", "2").startswith("CON My Account")
+    body = _dial(client, "2*1")
+    assert body.startswith("END Balance: 1,250.50 KSH")
+    assert "Pending claims: 2" in body
+    _dial(client, "", "2", session_id="flow-3")
+    assert _dial(client, "2*2", session_id="flow-3") == "END Last payments:\n10-01 +500.00 NW-EMP00001"
+
+
+def test_ussd_balance_without_snapshot_queues_refresh(client, temp_db):
+    """With no snapshot yet the caller is asked to retry and a refresh job is queued."""
+    from app.db import get_connection
+    from app.db.repositories import create_worker
+
+    create_worker(phone="254711111111", stellar_public_key="GTESTPK", stellar_secret_encrypted="x")
+    _dial(client, "", "2")
+    assert _dial(client, "2*1").startswith("END Your balance is being updated")
+    conn = get_connection()
+    try:
+        kinds = [r["kind"] for r in conn.execute("SELECT kind FROM jobs WHERE status = 'queued'")]
+    finally:
+        conn.close()
+    assert kinds == ["snapshot_refresh"]
+
+
+def test_ussd_withdraw_runs_offramp(client, temp_db, monkeypatch):
+    """Payments > Withdraw collects amount and number, then calls the off-ramp service."""
+    from app.db.repositories import create_worker
+
+    create_worker(phone="254711111111", stellar_public_key="GTESTPK", stellar_secret_encrypted="x")
+    calls = []
+
+    def fake_offramp(sender_row, phone, amount):
+        calls.append((sender_row["stellar_public_key"], phone, amount))
+        return {"success": True, "amount_kes": "500", "phone": phone, "message": "ok"}
+
+    monkeypatch.setattr("app.ussd.handler.initiate_offramp", fake_offramp)
+
+    _dial(client, "", "3", "3*2", "3*2*500")
+    assert "Withdraw 500.00 KSH to 254711111111" in _dial(client, "3*2*500*0")
+    body = _dial(client, "3*2*500*0*1")
+    assert body.startswith("END Withdrawal of 500.00 KES")
+    assert calls == [("GTESTPK", "254711111111", "500")]
+
+
+def test_ussd_finished_session_rejects_replayed_hops(client, temp_db, monkeypatch):
+    """Once a hop returns END, replaying it (or any later hop) does not run the action again."""
+    from app.db.repositories import create_worker
+
+    create_worker(phone="254711111111", stellar_public_key="GTESTPK", stellar_secret_encrypted="x")
+    calls = []
+
+    def fake_offramp(sender_row, phone, amount):
+        calls.append(amount)
+        return {"success": True, "amount_kes": amount, "phone": phone, "message": "ok"}
+
+    monkeypatch.setattr("app.ussd.handler.initiate_offramp", fake_offramp)
+
+    _dial(client, "", "3", "3*2", "3*2*500", "3*2*500*0")
+    assert _dial(client, "3*2*500*0*1").startswith("END Withdrawal of 500.00 KES")
+    assert _dial(client, "3*2*500*0*1") == "END This session has ended. Please dial again."
+    assert _dial(client, "3*2*500*0*1*1").startswith("END This session has ended")
+    assert calls == ["500"]
+
+
+def test_ussd_withdraw_failed_payout_is_delayed_and_recorded(client, temp_db, monkeypatch):
+    """A burn whose B2C payout fails tells the caller it is delayed and leaves a failed payout row."""
+    from stellar_sdk import Keypair
+
+    import app.services.mpesa as mpesa_service
+    from app.config import Config
+    from app.db.repositories import create_worker, offramp_payout_repository
+    from app.integrations.mpesa.b2c import MpesaPayoutResult
+
+    class FakePayments:
+        def send_payment(self, **kwargs):
+            return {"hash": "burnhash"}
+
+    create_worker(phone="254711111111", stellar_public_key="GTESTPK", stellar_secret_encrypted="x")
+    monkeypatch.setattr(Config, "stellar_platform_public", "G" + "A" * 55)
+    monkeypatch.setattr(mpesa_service, "get_payment_service", FakePayments)
+    monkeypatch.setattr(mpesa_service, "decrypt_secret", lambda _: Keypair.random().secret)
+    monkeypatch.setattr(mpesa_service, "mpesa_b2c_payout", lambda phone, amount_ksh: MpesaPayoutResult(
+        success=False, transaction_id="", phone=phone, amount_ksh=str(amount_ksh),
+        amount_kes=str(amount_ksh), exchange_rate=1.0, status="failed",
+        message="B2C rejected", provider="intasend",
+    ))
+
+    _dial(client, "", "3", "3*2", "3*2*500", "3*2*500*0")
+    assert _dial(client, "3*2*500*0*1").startswith("END Payout delayed")
+    [row] = offramp_payout_repository.get_by_status("failed")
+    assert (row["public_key"], row["stellar_tx_hash"], row["message"]) == ("GTESTPK", "burnhash", "B2C rejected")
+
+
+def test_menu_compile_rejects_bad_graphs():
+    """The menu graph is validated once at import: unknown routes and over-long screens fail fast."""
+    import pytest
+
+    from app.ussd.menu import MAX_SCREEN_CHARS, State, compile_menu
+
+    with pytest.raises(ValueError, match="unknown state"):
+        compile_menu({"main": State("CON Hi\n1. Go", routes={"1": "missing"})})
+    with pytest.raises(ValueError, match="chars"):
+        compile_menu({"main": State("CON " + "x" * MAX_SCREEN_CHARS)})
+
+
+def test_ussd_parses_only_newest_segment(client, temp_db):
+    """A stale text history is ignored: the stored step plus the last segment decide the response."""
+    from app.ussd.handler import MENU
+    from app.ussd.menu import last_input
+
+    assert last_input("3*2*500") == "500"
+    assert last_input("") == ""
+    assert all(len(s.screen) <= 182 for s in MENU.states.values())
+
+    _dial(client, "", session_id="flow-2")
+    # Africa's Talking always resends the full history; only "9" (invalid) is applied.
+    body = _dial(client, "1*2*3*9", session_id="flow-2")
+    assert body.startswith("CON Welcome to NannyChain")
@@ -0,0 +1,73 @@
+"""Tests for the pluggable USSD session stores."""
+import pytest
+import redis
+from app.ussd.sessions import FallbackSessionStore, MemorySessionStore, SessionStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_memory_store_expires_after_ttl_and_refreshes_on_read():
+    clock = _Clock()
+    store = MemorySessionStore(ttl=10, max_entries=10, clock=clock)
+    await store.set("s1", {"step": "main"})
+
+    clock.now = 8
+    assert await store.get("s1") == {"step": "main"}  # read refreshes TTL
+    clock.now = 16
+    assert await store.get("s1") == {"step": "main"}
+    clock.now = 30
+    assert await store.get("s1") == {}
+    assert len(store) == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_store_is_bounded_lru():
+    store = MemorySessionStore(ttl=60, max_entries=2)
+    await store.set("a", {"step": "1"})
+    await store.set("b", {"step": "2"})
+    await store.get("a")
+    await store.set("c", {"step": "3"})
+    assert await store.get("b") == {}
+    assert await store.get("a") == {"step": "1"}
+    assert len(store) == 2
+
+
+@pytest.mark.asyncio
+async def test_fallback_store_survives_redis_outage():
+    class DownRedis(SessionStore):
+        name = "redis"
+        calls = 0
+
+        async def get(self, session_id):
+            DownRedis.calls += 1
+            raise redis.ConnectionError("unreachable")
+
+        async def set(self, session_id, data):
+            await self.get(session_id)
+
+    clock = _Clock()
+    store = FallbackSessionStore(DownRedis(), MemorySessionStore(clock=clock), retry_after=30, clock=clock)
+    await store.set("s1", {"step": "login_phone"})
+    assert await store.get("s1") == {"step": "login_phone"}
+    assert store.name == "memory"
+    assert DownRedis.calls == 1  # not retried until retry_after elapses
+
+    clock.now = 31
+    await store.get("s1")
+    assert DownRedis.calls == 2
+
+
+def test_store_missing_a_method_cannot_be_created():
+    class GetOnly(SessionStore):
+        async def get(self, session_id):
+            return {}
+
+    with pytest.raises(TypeError):
+        GetOnly()
@@ -0,0 +1,36 @@
+import { useState } from 'react';
+
+interface LoadMoreButtonProps {
+    nextCursor: string | null;
+    onLoadMore: (cursor: string) => Promise<void>;
+}
+
+/** "Load more" footer for a paginated list; renders nothing on the last page. */
+export default function LoadMoreButton({ nextCursor, onLoadMore }: LoadMoreButtonProps) {
+    const [loading, setLoading] = useState(false);
+
+    if (!nextCursor) return null;
+
+    const handleClick = async () => {
+        setLoading(true);
+        try {
+            await onLoadMore(nextCursor);
+        } catch {
+            /* keep the cursor so the user can retry */
+        } finally {
+            setLoading(false);
+        }
+    };
+
+    return (
+        <div className="p-4 flex justify-center">
+            <button
+                onClick={handleClick}
+                disabled={loading}
+                className="px-4 py-2 text-sm font-medium text-primary hover:bg-primary/10 rounded-lg transition-colors disabled:opacity-50"
+            >
+                {loading ? 'Loading…' : 'Load more'}
+            </button>
+        </div>
+    );
+}
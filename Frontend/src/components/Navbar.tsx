@@ -38,7 +38,7 @@ export default function Navbar() {
                 getReviewsFor(resolved.worker_id),
                 resolved.role === 'worker'
                     ? getWorkerSchedules(resolved.worker_id)
-                    : getEmployerSchedules(resolved.worker_id),
+                    : getEmployerSchedules(resolved.worker_id).then(page => page.items),
             ]);
 
             // Stellar verification: account exists on-chain with real balance
@@ -53,9 +53,11 @@ export default function Navbar() {
             else setRating({ avg_rating: 0, count: 0 });
 
             if (revRes.status === 'fulfilled') {
-                setReviews(revRes.value);
+                // The modal previews the latest reviews, so the first page is enough
+                const recent = revRes.value.items;
+                setReviews(recent);
                 // Count reviews that have been minted as NFTs on Stellar
-                setNftVerifiedCount(revRes.value.filter(r => r.stellar_tx_hash).length);
+                setNftVerifiedCount(recent.filter(r => r.stellar_tx_hash).length);
             } else {
                 setReviews([]);
                 setNftVerifiedCount(0);
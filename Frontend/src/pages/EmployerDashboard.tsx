@@ -6,6 +6,7 @@ import { getPaymentHistory, sendPayment } from '../services/payments';
 import { getEmployerSchedules, createSchedule, updateScheduleStatus, getEmployerClaims, updateClaimStatus } from '../services/schedules';
 import { getEligibleReviewees, submitReview, getReviewsFor, getUserRating } from '../services/reviews';
 import FundModal from '../components/FundModal';
+import LoadMoreButton from '../components/LoadMoreButton';
 import type { PaymentRecord, BalanceItem, SendPaymentResponse, ResolveResponse, Schedule, PaymentClaim, EligibleReviewee, UserReview, UserRating } from '../types';
 
 export default function EmployerDashboard() {
@@ -138,6 +139,8 @@ export default function EmployerDashboard() {
     // ── Schedules & Claims state ───────────────────────────────────
     const [schedules, setSchedules] = useState<Schedule[]>([]);
     const [claims, setClaims] = useState<PaymentClaim[]>([]);
+    const [schedulesCursor, setSchedulesCursor] = useState<string | null>(null);
+    const [claimsCursor, setClaimsCursor] = useState<string | null>(null);
     const [showScheduleForm, setShowScheduleForm] = useState(false);
     const [schedWorker, setSchedWorker] = useState('');
     const [schedAmount, setSchedAmount] = useState('');
@@ -179,14 +182,32 @@ export default function EmployerDashboard() {
                     getEmployerClaims(session!.worker_id),
                 ]);
                 if (cancelled) return;
-                if (s.status === 'fulfilled') setSchedules(s.value);
-                if (c.status === 'fulfilled') setClaims(c.value);
+                if (s.status === 'fulfilled') {
+                    setSchedules(s.value.items);
+                    setSchedulesCursor(s.value.nextCursor);
+                }
+                if (c.status === 'fulfilled') {
+                    setClaims(c.value.items);
+                    setClaimsCursor(c.value.nextCursor);
+                }
             } catch { /* best-effort */ }
         }
         load();
         return () => { cancelled = true; };
     }, [session?.worker_id]);
 
+    const handleLoadMoreSchedules = async (cursor: string) => {
+        const page = await getEmployerSchedules(session!.worker_id, cursor);
+        setSchedules(prev => [...prev, ...page.items]);
+        setSchedulesCursor(page.nextCursor);
+    };
+
+    const handleLoadMoreClaims = async (cursor: string) => {
+        const page = await getEmployerClaims(session!.worker_id, cursor);
+        setClaims(prev => [...prev, ...page.items]);
+        setClaimsCursor(page.nextCursor);
+    };
+
     const handleCreateSchedule = async (e: React.FormEvent) => {
         e.preventDefault();
         if (!session?.worker_id) return;
@@ -201,7 +222,7 @@ export default function EmployerDashboard() {
                 next_payment_date: schedDate || undefined,
                 memo: schedMemo || undefined,
             });
-            setSchedules(prev => [...prev, newSched]);
+            setSchedules(prev => [newSched, ...prev]);
             setShowScheduleForm(false);
             setSchedWorker(''); setSchedAmount(''); setSchedMemo(''); setSchedDate('');
         } catch (err: unknown) {
@@ -236,6 +257,7 @@ export default function EmployerDashboard() {
     // ── Reviews state ─────────────────────────────────────────────
     const [eligibleReviewees, setEligibleReviewees] = useState<EligibleReviewee[]>([]);
     const [receivedReviews, setReceivedReviews] = useState<UserReview[]>([]);
+    const [reviewsCursor, setReviewsCursor] = useState<string | null>(null);
     const [myRating, setMyRating] = useState<UserRating>({ avg_rating: 0, count: 0 });
     const [reviewTarget, setReviewTarget] = useState<EligibleReviewee | null>(null);
     const [reviewRating, setReviewRating] = useState(5);
@@ -255,7 +277,10 @@ export default function EmployerDashboard() {
                 ]);
                 if (cancelled) return;
                 if (e.status === 'fulfilled') setEligibleReviewees(e.value);
-                if (r.status === 'fulfilled') setReceivedReviews(r.value);
+                if (r.status === 'fulfilled') {
+                    setReceivedReviews(r.value.items);
+                    setReviewsCursor(r.value.nextCursor);
+                }
                 if (rt.status === 'fulfilled') setMyRating(rt.value);
             } catch { /* best-effort */ }
         }
@@ -263,6 +288,12 @@ export default function EmployerDashboard() {
         return () => { cancelled = true; };
     }, [session?.worker_id]);
 
+    const handleLoadMoreReviews = async (cursor: string) => {
+        const page = await getReviewsFor(session!.worker_id, cursor);
+        setReceivedReviews(prev => [...prev, ...page.items]);
+        setReviewsCursor(page.nextCursor);
+    };
+
     const handleSubmitReview = async (e: React.FormEvent) => {
         e.preventDefault();
         if (!session?.worker_id || !reviewTarget) return;
@@ -285,7 +316,10 @@ export default function EmployerDashboard() {
             setReviewRating(5);
             setReviewComment('');
             // Refresh received reviews
-            getReviewsFor(session.worker_id).then(setReceivedReviews).catch(() => {});
+            getReviewsFor(session.worker_id).then(page => {
+                setReceivedReviews(page.items);
+                setReviewsCursor(page.nextCursor);
+            }).catch(() => {});
             void newReview;
         } catch (err: unknown) {
             setReviewFeedback(err instanceof Error ? err.message : 'Failed to submit review.');
@@ -723,6 +757,7 @@ export default function EmployerDashboard() {
                                     </div>
                                 ))}
                             </div>
+                            <LoadMoreButton nextCursor={schedulesCursor} onLoadMore={handleLoadMoreSchedules} />
                         </div>
                     )}
 
@@ -794,6 +829,7 @@ export default function EmployerDashboard() {
                                     </div>
                                 ))}
                             </div>
+                            <LoadMoreButton nextCursor={claimsCursor} onLoadMore={handleLoadMoreClaims} />
                         </div>
                     )}
 
@@ -993,6 +1029,7 @@ export default function EmployerDashboard() {
                                         </div>
                                     ))}
                                 </div>
+                                <LoadMoreButton nextCursor={reviewsCursor} onLoadMore={handleLoadMoreReviews} />
                             </div>
                         </div>
                     )}
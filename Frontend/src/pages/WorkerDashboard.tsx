@@ -5,6 +5,7 @@ import { getBalance } from '../services/accounts';
 import { getPaymentHistory, getPaymentStats, offrampToMpesa } from '../services/payments';
 import { getWorkerReviews, getEligibleReviewees, submitReview, getReviewsFor, getUserRating } from '../services/reviews';
 import { getWorkerSchedules, createClaim, getWorkerClaims } from '../services/schedules';
+import LoadMoreButton from '../components/LoadMoreButton';
 import type { PaymentRecord, PaymentStats, ReviewData, BalanceItem, Schedule, PaymentClaim, EligibleReviewee, UserReview, UserRating, OfframpResponse } from '../types';
 
 
@@ -137,6 +138,7 @@ export default function WorkerDashboard() {
     // ── Schedules & Claims state ───────────────────────────────────
     const [workerSchedules, setWorkerSchedules] = useState<Schedule[]>([]);
     const [workerClaims, setWorkerClaims] = useState<PaymentClaim[]>([]);
+    const [claimsCursor, setClaimsCursor] = useState<string | null>(null);
     const [claimingScheduleId, setClaimingScheduleId] = useState<string | null>(null);
     const [claimMessage, setClaimMessage] = useState('');
     const [claimSubmitting, setClaimSubmitting] = useState(false);
@@ -153,13 +155,22 @@ export default function WorkerDashboard() {
                 ]);
                 if (cancelled) return;
                 if (s.status === 'fulfilled') setWorkerSchedules(s.value);
-                if (c.status === 'fulfilled') setWorkerClaims(c.value);
+                if (c.status === 'fulfilled') {
+                    setWorkerClaims(c.value.items);
+                    setClaimsCursor(c.value.nextCursor);
+                }
             } catch { /* best-effort */ }
         }
         load();
         return () => { cancelled = true; };
     }, [session?.worker_id]);
 
+    const handleLoadMoreClaims = async (cursor: string) => {
+        const page = await getWorkerClaims(session!.worker_id, cursor);
+        setWorkerClaims(prev => [...prev, ...page.items]);
+        setClaimsCursor(page.nextCursor);
+    };
+
     const handleClaimPayment = async (sched: Schedule) => {
         if (!session?.worker_id) return;
         setClaimSubmitting(true);
@@ -188,6 +199,7 @@ export default function WorkerDashboard() {
     // ── Reviews state (app-based) ──────────────────────────────────
     const [eligibleReviewees, setEligibleReviewees] = useState<EligibleReviewee[]>([]);
     const [receivedReviews, setReceivedReviews] = useState<UserReview[]>([]);
+    const [reviewsCursor, setReviewsCursor] = useState<string | null>(null);
     const [myRating, setMyRating] = useState<UserRating>({ avg_rating: 0, count: 0 });
     const [reviewTarget, setReviewTarget] = useState<EligibleReviewee | null>(null);
     const [reviewRating, setReviewRating] = useState(5);
@@ -207,7 +219,10 @@ export default function WorkerDashboard() {
                 ]);
                 if (cancelled) return;
                 if (e.status === 'fulfilled') setEligibleReviewees(e.value);
-                if (r.status === 'fulfilled') setReceivedReviews(r.value);
+                if (r.status === 'fulfilled') {
+                    setReceivedReviews(r.value.items);
+                    setReviewsCursor(r.value.nextCursor);
+                }
                 if (rt.status === 'fulfilled') setMyRating(rt.value);
             } catch { /* best-effort */ }
         }
@@ -215,6 +230,12 @@ export default function WorkerDashboard() {
         return () => { cancelled = true; };
     }, [session?.worker_id]);
 
+    const handleLoadMoreReviews = async (cursor: string) => {
+        const page = await getReviewsFor(session!.worker_id, cursor);
+        setReceivedReviews(prev => [...prev, ...page.items]);
+        setReviewsCursor(page.nextCursor);
+    };
+
     const handleSubmitReview = async (e: React.FormEvent) => {
         e.preventDefault();
         if (!session?.worker_id || !reviewTarget) return;
@@ -235,7 +256,10 @@ export default function WorkerDashboard() {
             setReviewTarget(null);
             setReviewRating(5);
             setReviewComment('');
-            getReviewsFor(session.worker_id).then(setReceivedReviews).catch(() => {});
+            getReviewsFor(session.worker_id).then(page => {
+                setReceivedReviews(page.items);
+                setReviewsCursor(page.nextCursor);
+            }).catch(() => {});
             getUserRating(session.worker_id).then(setMyRating).catch(() => {});
         } catch (err: unknown) {
             setReviewFeedback(err instanceof Error ? err.message : 'Failed to submit review.');
@@ -834,6 +858,7 @@ export default function WorkerDashboard() {
                                             </div>
                                         ))}
                                     </div>
+                                    <LoadMoreButton nextCursor={claimsCursor} onLoadMore={handleLoadMoreClaims} />
                                 </div>
                             )}
 
@@ -1186,6 +1211,7 @@ export default function WorkerDashboard() {
                                             </div>
                                         </div>
                                     ))}
+                                    <LoadMoreButton nextCursor={reviewsCursor} onLoadMore={handleLoadMoreReviews} />
                                     {/* Legacy NFT reviews */}
                                     {reviews.map((review, idx) => (
                                         <div key={`nft-${idx}`} className="p-5">
@@ -2,9 +2,12 @@
  * Thin fetch wrapper around the backend API.
  *
  * Every service module imports `api` and calls `api.get(…)`, `api.post(…)` etc.
+ * Cursor-paginated list endpoints are read one page at a time with `api.getPage(…)`.
  * The base URL comes from the VITE_API_BASE_URL env variable.
  */
 
+import type { Page } from "../types";
+
 const BASE_URL = import.meta.env.VITE_API_BASE_URL ?? "http://localhost:5000";
 
 export class ApiError extends Error {
@@ -18,12 +21,15 @@ export class ApiError extends Error {
   }
 }
 
-async function request<T>(
+/** Response header carrying the cursor of the next page of a list endpoint. */
+const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+
+async function send(
   method: string,
   path: string,
   body?: unknown,
   params?: Record<string, string | number>,
-): Promise<T> {
+): Promise<Response> {
   let url = `${BASE_URL}${path}`;
 
   if (params) {
@@ -56,13 +62,42 @@ async function request<T>(
     throw new ApiError(res.status, detail);
   }
 
+  return res;
+}
+
+async function request<T>(
+  method: string,
+  path: string,
+  body?: unknown,
+  params?: Record<string, string | number>,
+): Promise<T> {
+  const res = await send(method, path, body, params);
   return res.json() as Promise<T>;
 }
 
+/** GET one page of a cursor-paginated list endpoint; pass `nextCursor` back for the next. */
+async function getPage<T>(
+  path: string,
+  cursor?: string | null,
+  params?: Record<string, string | number>,
+): Promise<Page<T>> {
+  const res = await send("GET", path, undefined, {
+    ...params,
+    ...(cursor ? { cursor } : {}),
+  });
+  return {
+    items: (await res.json()) as T[],
+    nextCursor: res.headers.get(NEXT_CURSOR_HEADER),
+  };
+}
+
 const api = {
   get: <T>(path: string, params?: Record<string, string | number>) =>
     request<T>("GET", path, undefined, params),
 
+  getPage: <T>(path: string, cursor?: string | null, params?: Record<string, string | number>) =>
+    getPage<T>(path, cursor, params),
+
   post: <T>(path: string, body?: unknown) =>
     request<T>("POST", path, body),
 
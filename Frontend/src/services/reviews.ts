@@ -26,14 +26,14 @@ export function submitReview(data: SubmitReviewRequest) {
   return api.post<UserReview>("/api/v1/reviews/submit", data);
 }
 
-/** Get all reviews written about a user (received). */
-export function getReviewsFor(userId: string) {
-  return api.get<UserReview[]>(`/api/v1/reviews/for/${userId}`);
+/** Get a page of reviews written about a user (received), newest first. */
+export function getReviewsFor(userId: string, cursor?: string | null) {
+  return api.getPage<UserReview>(`/api/v1/reviews/for/${userId}`, cursor);
 }
 
-/** Get all reviews written by a user. */
-export function getReviewsBy(userId: string) {
-  return api.get<UserReview[]>(`/api/v1/reviews/by/${userId}`);
+/** Get a page of reviews written by a user, newest first. */
+export function getReviewsBy(userId: string, cursor?: string | null) {
+  return api.getPage<UserReview>(`/api/v1/reviews/by/${userId}`, cursor);
 }
 
 /** Get average rating and review count for a user. */
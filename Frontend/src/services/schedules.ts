@@ -13,9 +13,9 @@ export function createSchedule(data: CreateScheduleRequest) {
   return api.post<Schedule>("/api/v1/schedules", data);
 }
 
-/** List all schedules created by an employer. */
-export function getEmployerSchedules(employerId: string) {
-  return api.get<Schedule[]>(`/api/v1/schedules/employer/${employerId}`);
+/** List a page of the schedules created by an employer. */
+export function getEmployerSchedules(employerId: string, cursor?: string | null) {
+  return api.getPage<Schedule>(`/api/v1/schedules/employer/${employerId}`, cursor);
 }
 
 /** List active schedules targeting a worker (upcoming payments). */
@@ -35,14 +35,14 @@ export function createClaim(data: CreateClaimRequest) {
   return api.post<PaymentClaim>("/api/v1/claims", data);
 }
 
-/** Employer views all claims addressed to them. */
-export function getEmployerClaims(employerId: string) {
-  return api.get<PaymentClaim[]>(`/api/v1/claims/employer/${employerId}`);
+/** Employer views a page of the claims addressed to them. */
+export function getEmployerClaims(employerId: string, cursor?: string | null) {
+  return api.getPage<PaymentClaim>(`/api/v1/claims/employer/${employerId}`, cursor);
 }
 
-/** Worker views their submitted claims. */
-export function getWorkerClaims(workerId: string) {
-  return api.get<PaymentClaim[]>(`/api/v1/claims/worker/${workerId}`);
+/** Worker views a page of their submitted claims. */
+export function getWorkerClaims(workerId: string, cursor?: string | null) {
+  return api.getPage<PaymentClaim>(`/api/v1/claims/worker/${workerId}`, cursor);
 }
 
 /** Employer approves or rejects a claim. */
@@ -229,6 +229,13 @@ export interface UserRating {
   count: number;
 }
 
+// ─── Pagination ──────────────────────────────────────────────────────
+/** One page of a list endpoint; `nextCursor` is null on the last page. */
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
 // ─── Local session (stored in localStorage) ──────────────────────────
 export interface UserSession {
   worker_id: string;